@@ -1,14 +1,31 @@
 import os
 import re
 import shutil
+import sqlite3
+import time
+from functools import partial
 from openpyxl import load_workbook
 
 
-from backend.script_execl import Execl_Brut
-from backend.script_extraction import AgeAnalyzer, Conjonction, Country, Dates_, Distance_Miss, Inclination, Maneuvrable, Object_type, Probabilite
+from backend.script_execl import Execl_Brut, Execl_Donnees, Execl_Flux, Execl_Modele, Execl_Ods
+from backend.script_extraction import AgeAnalyzer, AnalysisGraph, CDMCache, CDMEpoch, CDMIndex, CDMManifeste, CDMParser, CDMResume, CDMTable, Conjonction, Country, Dates_, Distance_Miss, Inclination, Maneuvrable, Object_type, Probabilite
 
 import pandas as pd
-from openpyxl.utils.dataframe import dataframe_to_rows
+
+# Étapes signalées à la fonction de progression, dans l'ordre de l'analyse
+ETAPES_ANALYSE = {
+    "lecture": "Lecture des CDM",
+    "conjonctions": "Recherche des conjonctions",
+    "analyseurs": "Calcul des statistiques",
+    "export": "Écriture du rapport",
+    "classeurs_tous": "Écriture des classeurs TOUS",
+    "donnees": "Export des données",
+}
+
+class AnalyseAnnulee(Exception):
+    """
+    Levée par executer_analyse quand l'annulation de l'analyse a été demandée.
+    """
 
 class SatelliteDataProcessor:
     """
@@ -32,6 +49,27 @@ class SatelliteDataProcessor:
         
         self.chemin_modele = "sortie.xlsx"
         self.format_type = "excel"  # Format par défaut
+        
+        # Chemin de sortie dont le contenu est encore celui du modèle : le classeur
+        # est alors copié depuis le modèle gardé en mémoire au lieu d'être relu
+        self.copie_modele = None
+        
+        # Table en colonnes des CDM du dossier, construite une seule fois par exécution
+        self.table = None
+        
+        # Cache persistant des CDM analysés (seuls les fichiers modifiés sont relus)
+        self.utiliser_cache = True
+        self.cache = None
+        
+        # Ingestion incrémentale : seuls les CDM ajoutés ou modifiés depuis la dernière
+        # analyse du dossier sont lus (voir ManifesteCDM)
+        self.ingestion_incrementale = True
+        self.manifeste = None
+        
+        # Index SQLite des CDM : s'il est activé, il est rempli après la lecture et les
+        # analyseurs qui le savent répondent par des agrégats SQL
+        self.utiliser_index = False
+        self.index = None
             
         # Initialisation des analyseurs
         self.conjunction_analyzer = None
@@ -44,10 +82,134 @@ class SatelliteDataProcessor:
         self.miss_distance_analyzer = None
         self.satelliteAgeAnalyzer = None
         
+        # Graphe d'exécution partageant les résultats communs entre les analyseurs
+        self.graphe = None
+        
+        # Exécution des analyseurs indépendants ("serial", "thread" ou "process")
+        self.mode_execution = AnalysisGraph.MODE_SERIE
+        self.nombre_workers = None
+        self.resultats_analyse = {}
+        
+        # Durée de chaque phase de la dernière analyse (secondes)
+        self.durees = {}
+        
+        # Export optionnel de TOUS et SHORTLIST en colonnes ("parquet" ou "arrow"), à côté du rapport
+        self.format_donnees = None
+        self.fichiers_donnees = {}
+        
+        # Découpage de TOUS ("taille" : au-delà de la limite d'Excel, "mois" : par mois de
+        # CREATION_DATE), dans le rapport ou dans des classeurs séparés
+        self.decoupage_tous = "taille"
+        self.classeurs_tous_separes = False
+        self.classeurs_tous = []
+        
+        # Résumé de la dernière analyse (voir construire_resume)
+        self.resume = None
+        
+        # Suivi de l'analyse depuis un autre thread (interface graphique)
+        self.progression = None
+        self.annulation = None
+        
         if dossier and chemin_sortie:
             self.initialize_analyzers()
     
     
+    def set_mode_execution(self, mode, nombre_workers=None):
+        """
+        Définit comment les analyseurs indépendants sont exécutés.
+        
+        Args:
+            mode (str): "serial" (l'un après l'autre), "thread" ou "process" (en parallèle).
+            nombre_workers (int, optional): Nombre de threads ou de processus. Si None, un par cœur.
+        """
+        if mode not in AnalysisGraph.MODES_EXECUTION:
+            print(f"Mode d'exécution {mode} non reconnu. Utilisation du mode séquentiel.")
+            mode = AnalysisGraph.MODE_SERIE
+        self.mode_execution = mode
+        self.nombre_workers = nombre_workers
+    
+    def set_format_donnees(self, format_donnees):
+        """
+        Demande l'export de TOUS et SHORTLIST en jeux de données en colonnes,
+        en plus du rapport.
+        
+        Args:
+            format_donnees (str or None): "parquet", "arrow", ou None pour ne pas exporter.
+        
+        Returns:
+            bool: False si l'export demandé est impossible (format inconnu ou pyarrow absent).
+        """
+        self.format_donnees = None
+        if format_donnees is None:
+            return True
+        if format_donnees not in Execl_Donnees.FORMATS_DONNEES:
+            print(f"Format de données {format_donnees} non reconnu. Aucun export en colonnes.")
+            return False
+        if not Execl_Donnees.pyarrow_disponible():
+            print("Erreur: pyarrow non disponible pour l'export Parquet/Arrow. Aucun export en colonnes.")
+            print("Installez la bibliothèque nécessaire avec: pip install pyarrow")
+            return False
+        self.format_donnees = format_donnees
+        return True
+    
+    def set_decoupage_tous(self, decoupage="taille", classeurs_separes=False):
+        """
+        Définit comment les CDM de la feuille TOUS sont répartis.
+        
+        Args:
+            decoupage (str): "taille" (plusieurs feuilles seulement au-delà de la limite
+                             d'Excel) ou "mois" (une feuille par mois de CREATION_DATE).
+            classeurs_separes (bool): Si True, TOUS n'est pas dans le rapport : chaque
+                                      morceau est écrit dans son propre classeur.
+        """
+        if decoupage not in Execl_Brut.DECOUPAGES_TOUS:
+            print(f"Découpage {decoupage} non reconnu. Découpage par taille.")
+            decoupage = "taille"
+        self.decoupage_tous = decoupage
+        self.classeurs_tous_separes = classeurs_separes
+    
+    def set_progression(self, progression=None, annulation=None):
+        """
+        Permet de suivre et d'annuler l'analyse, par exemple quand elle s'exécute
+        dans un thread de l'interface graphique.
+        
+        Args:
+            progression (callable, optional): Appelée avec (étape, fait, total) au début de
+                                              chaque étape (voir ETAPES_ANALYSE) et, pendant la
+                                              lecture, avec le nombre de fichiers lus.
+            annulation (threading.Event, optional): Une fois positionné, l'analyse s'arrête
+                                                    à la prochaine étape ou au prochain lot de
+                                                    fichiers en levant AnalyseAnnulee.
+        """
+        self.progression = progression
+        self.annulation = annulation
+    
+    def signaler(self, etape, fait=None, total=None):
+        """
+        Signale l'avancement de l'analyse, ou l'interrompt si l'annulation est demandée.
+        
+        Raises:
+            AnalyseAnnulee: Si l'annulation a été demandée.
+        """
+        if self.annulation is not None and self.annulation.is_set():
+            raise AnalyseAnnulee()
+        if self.progression is not None:
+            self.progression(etape, fait, total)
+    
+    def analyseurs_independants(self):
+        """
+        Renvoie les analyseurs qui ne dépendent pas des résultats des autres
+        (seulement des résultats partagés du graphe) et qui écrivent dans le classeur.
+        
+        Returns:
+            dict: Analyseurs par nom d'étape.
+        """
+        return {
+            "pays": self.country_analyzer,
+            "inclinaisons": self.inclination_analyzer,
+            "ages": self.satelliteAgeAnalyzer,
+        }
+    
     def setCheminModel(self, chemin_modele):
         self.chemin_modele = chemin_modele
     
@@ -68,7 +230,10 @@ class SatelliteDataProcessor:
             return """
         
         try:
-            self.wb = load_workbook(self.chemin_sortie)
+            if self.copie_modele == self.chemin_sortie:
+                self.wb = Execl_Modele.charger_modele(self.chemin_modele)
+            else:
+                self.wb = load_workbook(self.chemin_sortie)
             if 'STATISTIQUES' not in self.wb.sheetnames:
                 self.ws = self.wb.create_sheet('STATISTIQUES')
             else:
@@ -84,8 +249,68 @@ class SatelliteDataProcessor:
         Args:
             dossier (str): Chemin du dossier contenant les fichiers à analyser.
         """
+        if dossier != self.dossier:
+            self.table = None
+            if self.cache:
+                self.cache.fermer()
+                self.cache = None
+            if self.index:
+                self.index.fermer()
+                self.index = None
+            self.manifeste = None
         self.dossier = dossier
     
+    def charger_enregistrements(self):
+        """
+        Analyse tous les fichiers CDM du dossier (chaque fichier est lu une seule fois)
+        et construit la table en colonnes partagée par les analyseurs et les exports.
+        
+        Returns:
+            CDMTable: Table des CDM (une ligne par fichier).
+        """
+        if self.utiliser_cache and self.cache is None:
+            self.cache = CDMCache.CDMCache.pour_dossier(self.dossier)
+        
+        cache = self.cache if self.utiliser_cache else None
+        if self.ingestion_incrementale:
+            # Le manifeste est relu à chaque analyse : une analyse interrompue n'a pas été enregistrée
+            self.manifeste = CDMManifeste.ManifesteCDM.charger(self.dossier)
+            self.table = self.manifeste.ingerer(cache, self.nombre_workers, partial(self.signaler, "lecture"))
+        else:
+            self.manifeste = None
+            # Les gros dossiers sont lus par lots dans plusieurs processus
+            self.table = CDMTable.CDMTable.from_files(
+                CDMParser.list_files(self.dossier), cache=cache, workers=self.nombre_workers,
+                progression=partial(self.signaler, "lecture")
+            )
+        
+        if cache:
+            stats = cache.statistiques()
+            print(f"Cache CDM : {stats['hits']} hits, {stats['misses']} misses ({stats['entrees']} entrées)")
+        
+        if self.utiliser_index:
+            self.indexer_enregistrements()
+        
+        return self.table
+    
+    def indexer_enregistrements(self):
+        """
+        Remplit l'index SQLite du dossier avec la table des CDM.
+        
+        Returns:
+            CDMIndex or None: Index à jour, ou None s'il n'est pas utilisable.
+        """
+        if self.index is None:
+            self.index = CDMIndex.CDMIndex.pour_dossier(self.dossier)
+        if self.index is not None:
+            try:
+                self.index.indexer(self.table, self.manifeste)
+            except sqlite3.Error as e:
+                print(f"Impossible d'indexer les CDM ({self.index.chemin_base}): {e}")
+                self.index.fermer()
+                self.index = None
+        return self.index
+    
     def set_chemin_sortie(self, chemin_sortie):
         """
         Définit le chemin du fichier Excel de sortie.
@@ -133,21 +358,67 @@ class SatelliteDataProcessor:
             print("Chemin de sortie non spécifié")
             return
 
-        self.set_wb()
+        # Le classeur de l'analyse en cours est réutilisé s'il est déjà chargé
+        if self.wb is None:
+            self.set_wb()
         
         if not self.wb:
             print("Impossible de charger le fichier Excel.")
             return
              
-        self.conjunction_analyzer = Conjonction.ConjunctionAnalyzer(self.dossier, self.chemin_sortie, self.ws, self.wb)
-        self.country_analyzer = Country.CountryAnalyzer(self.dossier, self.chemin_sortie, self.ws, self.wb)
-        self.date_analyzer = Dates_.DateAnalyzer(self.dossier, self.chemin_sortie, self.ws, self.wb)
-        self.satelliteAgeAnalyzer = AgeAnalyzer.SatelliteAgeAnalyzer(self.dossier, self.chemin_sortie, self.ws, self.wb)
-        self.inclination_analyzer = Inclination.InclinationAnalyzer(self.dossier, self.chemin_sortie, self.ws, self.wb)
-        self.maneuvrable_analyzer = Maneuvrable.ManeuvrableAnalyzer(self.dossier, self.chemin_sortie, self.ws, self.wb)
-        self.object_type_analyzer = Object_type.ObjectTypeAnalyzer(self.dossier, self.chemin_sortie, self.ws, self.wb)
-        self.probability_analyzer = Probabilite.CollisionProbabilityAnalyzer(self.dossier, self.chemin_sortie, self.ws, self.wb)
-        self.miss_distance_analyzer = Distance_Miss.MissDistanceAnalyzer(self.dossier, self.chemin_sortie, self.ws, self.wb)
+        table = self.table
+        self.conjunction_analyzer = Conjonction.ConjunctionAnalyzer(self.dossier, self.chemin_sortie, self.ws, self.wb, table)
+        self.country_analyzer = Country.CountryAnalyzer(self.dossier, self.chemin_sortie, self.ws, self.wb, table)
+        self.date_analyzer = Dates_.DateAnalyzer(self.dossier, self.chemin_sortie, self.ws, self.wb, table)
+        self.satelliteAgeAnalyzer = AgeAnalyzer.SatelliteAgeAnalyzer(self.dossier, self.chemin_sortie, self.ws, self.wb, table)
+        self.inclination_analyzer = Inclination.InclinationAnalyzer(self.dossier, self.chemin_sortie, self.ws, self.wb, table)
+        self.maneuvrable_analyzer = Maneuvrable.ManeuvrableAnalyzer(self.dossier, self.chemin_sortie, self.ws, self.wb, table)
+        self.object_type_analyzer = Object_type.ObjectTypeAnalyzer(self.dossier, self.chemin_sortie, self.ws, self.wb, table)
+        self.probability_analyzer = Probabilite.CollisionProbabilityAnalyzer(self.dossier, self.chemin_sortie, self.ws, self.wb, table)
+        self.miss_distance_analyzer = Distance_Miss.MissDistanceAnalyzer(self.dossier, self.chemin_sortie, self.ws, self.wb, table)
+        
+        # Groupes de conjonction de l'analyse précédente, repris pour les objets inchangés
+        if self.manifeste is not None and table is self.manifeste.table:
+            self.conjunction_analyzer.set_groupes_precedents(self.manifeste.groupes, self.manifeste.modifies)
+        
+        # L'index n'est fourni que s'il a été rempli avec la table de cette analyse
+        if self.index is not None and table is not None:
+            for analyseur in self.analyseurs_independants().values():
+                analyseur.set_index(self.index)
+        
+        self.construire_graphe()
+    
+    def construire_graphe(self):
+        """
+        Construit le graphe d'exécution de l'analyse : la table des CDM, les groupes
+        de conjonction et la correspondance opérateur-pays y sont calculés une seule
+        fois, puis transmis aux analyseurs qui en dépendent.
+        
+        Returns:
+            AnalysisGraph: Graphe de l'analyse.
+        """
+        graphe = AnalysisGraph.AnalysisGraph()
+        
+        # Résultats partagés
+        if self.table is not None:
+            graphe.fournir(AnalysisGraph.RESULTAT_TABLE, self.table)
+        else:
+            graphe.declarer(AnalysisGraph.RESULTAT_TABLE, self.charger_enregistrements)
+        graphe.declarer(AnalysisGraph.RESULTAT_CONJONCTIONS, self.conjunction_analyzer.calculer_conjonctions,
+                        (AnalysisGraph.RESULTAT_TABLE,))
+        graphe.declarer(AnalysisGraph.RESULTAT_OPERATEURS, self.country_analyzer._get_operator_country_mapping)
+        
+        # Étapes des analyseurs qui écrivent dans le classeur (enregistré une seule fois, à la fin)
+        self.conjunction_analyzer.set_graphe(graphe)
+        graphe.declarer("shortlist", partial(self.conjunction_analyzer.generer_excel_avec_donnees, sauvegarder=False),
+                        (AnalysisGraph.RESULTAT_TABLE, AnalysisGraph.RESULTAT_CONJONCTIONS))
+        
+        # Les autres analyseurs lisent aussi les résultats partagés dans le graphe
+        for analyseur in [self.date_analyzer] + list(self.analyseurs_independants().values()):
+            analyseur.set_graphe(graphe)
+        
+        self.graphe = graphe
+        return graphe
        
     def nom_satellite(self):
         """
@@ -201,6 +472,50 @@ class SatelliteDataProcessor:
             
         return len([f for f in os.listdir(self.dossier) if os.path.isfile(os.path.join(self.dossier, f))])
     
+    def construire_resume(self, empreinte, nom_satellite, min_date, max_date, conjonctions):
+        """
+        Construit le résumé d'une analyse, enregistré pour le tableau de bord.
+        
+        Args:
+            empreinte (str): Empreinte du dossier (CDMResume.empreinte_dossier).
+            nom_satellite (str or None): Nom du satellite.
+            min_date (datetime or None): Première CREATION_DATE.
+            max_date (datetime or None): Dernière CREATION_DATE.
+            conjonctions (int): Nombre de conjonctions.
+        
+        Returns:
+            dict: Résumé de l'analyse.
+        """
+        return {
+            "empreinte": empreinte,
+            "satellite": nom_satellite,
+            "fichiers": self.compter_fichiers(),
+            "debut": min_date.strftime('%Y-%m-%d') if min_date else None,
+            "fin": max_date.strftime('%Y-%m-%d') if max_date else None,
+            "conjonctions": conjonctions,
+        }
+    
+    def calculer_resume(self):
+        """
+        Calcule et enregistre le résumé du dossier sans produire de rapport : seuls
+        la table des CDM, les dates et les groupes de conjonction sont calculés.
+        
+        Returns:
+            dict: Résumé du dossier (voir construire_resume).
+        """
+        empreinte = CDMResume.empreinte_dossier(self.dossier)
+        table = self.charger_enregistrements()
+        date_analyzer = Dates_.DateAnalyzer(self.dossier, None, None, None, table)
+        dates = date_analyzer._collect_dates()
+        conjonctions = Conjonction.ConjunctionAnalyzer(self.dossier, None, None, None, table).calculer_conjonctions()
+        
+        self.resume = self.construire_resume(
+            empreinte, self.nom_satellite(), date_analyzer.find_min_date(dates),
+            date_analyzer.find_max_date(dates), len(conjonctions)
+        )
+        CDMResume.ecrire_resume(self.dossier, self.resume)
+        return self.resume
+    
     def getConjonctionAnalyzer(self):
         return self.conjunction_analyzer
         
@@ -238,7 +553,10 @@ class SatelliteDataProcessor:
             # Copier le fichier
             shutil.copy2(chemin_modele, chemin_nouveau_fichier)
             
-            # Mettre à jour le chemin de sortie de l'instance
+            # Mettre à jour le chemin de sortie de l'instance (classeur copié depuis le modèle en mémoire) ;
+            # set_wb charge le modèle courant, qui doit donc être celui qui vient d'être copié
+            self.chemin_modele = chemin_modele
+            self.copie_modele = chemin_nouveau_fichier
             self.set_chemin_sortie(chemin_nouveau_fichier)
             
             return chemin_nouveau_fichier
@@ -275,8 +593,9 @@ class SatelliteDataProcessor:
             original_set_wb = self.set_wb
             
             def set_wb_wrapper():
-                if self.format_type == "excel":
-                    # Utiliser le code existant pour Excel
+                if self.format_type in ("excel", "calc"):
+                    # Le classeur est construit avec openpyxl dans les deux cas ;
+                    # seul l'enregistrement final diffère (.xlsx ou .ods)
                     original_set_wb()
                     """ elif self.format_type == "calc":
                     # Chargement spécifique pour LibreOffice Calc
@@ -351,61 +670,24 @@ class SatelliteDataProcessor:
         # Retourner le nom complet du fichier
         return f"{prefix}-{version}"
     
-    def extract_data_from_txt_all(self, file_path):
-        data = {}
-        with open(file_path, 'r') as file:
-            lines = file.readlines()
-            for line in lines:
-                if line.strip():
-                    # Enlever les unités entre crochets
-                    line = re.sub(r'\[.*?\]', '', line).strip()
-                    
-                    parts = line.split('=')
-                    if len(parts) == 2:
-                        key = parts[0].strip()
-                        value = parts[1].strip()
-                        data[key] = value
-        return data
+    def extract_data_from_txt_all(self, file_path, keys=None):
+        return CDMParser.parse_file(file_path, keys).as_dict()
 
     def generer_execl_avec_toute_les_donnees(self):
-        all_data = []
-
-        for file_name in os.listdir(self.dossier):
-            file_path = os.path.join(self.dossier, file_name)
-
-            if file_name.endswith(".txt") and os.path.isfile(file_path):
-                file_data = self.extract_data_from_txt_all(file_path)
-                all_data.append(file_data)
-
-        # Créer un DataFrame avec les données extraites
-        df = pd.DataFrame(all_data)
-        
-        # Si TCA n'existe pas, trier par CREATION_DATE
-        if 'CREATION_DATE' in df.columns:
-            df['CREATION_DATE'] = pd.to_datetime(df['CREATION_DATE'])
-            df = df.sort_values(by='CREATION_DATE')
-            # Reconvertir en string si nécessaire
-            df['CREATION_DATE'] = df['CREATION_DATE'].dt.strftime('%Y-%m-%dT%H:%M:%S.%f')
+        """
+        Remplace la feuille TOUS par tous les CDM du dossier (découpée selon decoupage_tous).
+        Ses lignes sont écrites en flux lors de l'unique enregistrement du classeur.
+        """
+        if self.table is None:
+            self.charger_enregistrements()
         
-        # Créer un nouveau classeur ou charger l'existant
-
-        # Supprimer la feuille 'TOUS' si elle existe déjà
-        if 'TOUS' in self.wb.sheetnames:
-            del self.wb['TOUS']
+        if self.classeurs_tous_separes:
+            # TOUS est écrite dans des classeurs séparés après l'enregistrement du rapport
+            if 'TOUS' in self.wb.sheetnames:
+                del self.wb['TOUS']
+            return
         
-        # Créer une nouvelle feuille 'TOUS'
-        self.ws = self.wb.create_sheet('TOUS')
-
-        # Ajouter l'en-tête
-        for col_num, column_name in enumerate(df.columns, 1):
-            self.ws.cell(row=1, column=col_num, value=column_name)
-
-        # Ajouter les données
-        for r in dataframe_to_rows(df, index=False, header=False):
-            self.ws.append(r)
-            
-        # Sauvegarder le fichier
-        self.wb.save(self.chemin_sortie)
+        self.ws = Execl_Brut.ajouter_feuille_tous(self.wb, self.table, self.decoupage_tous)
         
     def convert_to_format(self, source_path, target_path, format_type):
         """
@@ -425,18 +707,10 @@ class SatelliteDataProcessor:
                 if not target_path.endswith('.ods'):
                     target_path = target_path.rsplit('.', 1)[0] + '.ods'
                 
-                import pandas as pd
-                
-                # Lire toutes les feuilles Excel
-                excel_file = pd.ExcelFile(source_path)
-                sheet_names = excel_file.sheet_names
-                
-                # Créer un writer pour le format ODS
-                with pd.ExcelWriter(target_path, engine='odf') as writer:
-                    # Copier chaque feuille
-                    for sheet_name in sheet_names:
-                        df = pd.read_excel(excel_file, sheet_name=sheet_name)
-                        df.to_excel(writer, sheet_name=sheet_name, index=False)
+                # Relire le classeur (formules et mise en forme comprises) et l'écrire en flux
+                wb = load_workbook(source_path)
+                Execl_Ods.enregistrer_ods(wb, target_path, self.nombre_workers)
+                wb.close()
                 
                 # Vérifier que le fichier a bien été créé
                 if os.path.exists(target_path):
@@ -450,10 +724,6 @@ class SatelliteDataProcessor:
                 print(f"Format de conversion '{format_type}' non supporté.")
                 return False
                 
-        except ImportError:
-            print("Erreur: Pandas avec support ODF non disponible.")
-            print("Installez les bibliothèques nécessaires avec: pip install pandas odfpy")
-            return False
         except Exception as e:
             print(f"Erreur lors de la conversion: {e}")
             import traceback
@@ -470,6 +740,9 @@ class SatelliteDataProcessor:
         
         Returns:
             bool: True si l'analyse s'est bien déroulée, False sinon.
+            
+        Raises:
+            AnalyseAnnulee: Si l'annulation a été demandée (voir set_progression).
         """
         try:
             # Vérifier que le chemin de sortie est configuré
@@ -490,18 +763,27 @@ class SatelliteDataProcessor:
             if self.format_type == "calc":
                 temp_excel_path = original_chemin_sortie.rsplit('.', 1)[0] + '.xlsx'
             
-            # Copier le fichier modèle vers le chemin temporaire Excel
-            try:
-                shutil.copy2(self.chemin_modele, temp_excel_path)
-            except Exception as e:
-                print(f"Erreur lors de la copie du modèle: {e}")
+            # Partir d'une copie du modèle (lu une seule fois par processus) ;
+            # le fichier n'est écrit qu'à la fin de l'analyse
+            if not os.path.exists(self.chemin_modele):
+                print(f"Erreur lors de la copie du modèle: {self.chemin_modele} introuvable")
                 return False
             
-            # Charger le nouveau fichier Excel pour le traitement
+            # Charger le nouveau classeur pour le traitement
             temp_chemin_sortie = self.chemin_sortie
             self.chemin_sortie = temp_excel_path
+            self.copie_modele = temp_excel_path
             self.set_wb()
             
+            # Lire chaque fichier CDM une seule fois pour tous les analyseurs
+            self.durees = {}
+            debut = time.perf_counter()
+            self.signaler("lecture")
+            # Empreinte prise avant la lecture : un fichier modifié pendant l'analyse invalide le résumé
+            empreinte = CDMResume.empreinte_dossier(self.dossier)
+            self.charger_enregistrements()
+            self.durees["lecture"] = time.perf_counter() - debut
+            
             # S'assurer que les analyseurs sont correctement initialisés
             self.initialize_analyzers()
             
@@ -511,6 +793,8 @@ class SatelliteDataProcessor:
                 return False
             
             # Générer toutes les données dans le fichier Excel temporaire
+            self.signaler("conjonctions")
+            debut = time.perf_counter()
             self.generer_execl_avec_toute_les_donnees()
             
             # Vérifier que le classeur est chargé
@@ -518,9 +802,9 @@ class SatelliteDataProcessor:
                 print("Classeur non chargé.")
                 return False
             
-            # Traitement des conjonctions
-            self.conjunction_analyzer.process_data()
-            self.conjunction_analyzer.generer_excel_avec_donnees()
+            # Traitement des conjonctions (groupes calculés une seule fois pour toute l'analyse)
+            self.graphe.executer(["shortlist"])
+            self.durees["conjonctions"] = time.perf_counter() - debut
             
             # Traitement des dates
             all_dates = self.date_analyzer._collect_dates()
@@ -551,41 +835,72 @@ class SatelliteDataProcessor:
                 self.ws['D6'] = min_date.strftime('%Y-%m-%d') if min_date else 'Aucune date trouvée'
                 self.ws['D7'] = max_date.strftime('%Y-%m-%d') if max_date else 'Aucune date trouvée'
                 
-                # Sauvegarder immédiatement les modifications
-                self.wb.save(temp_excel_path)
-                
             except Exception as e:
                 print(f"Erreur lors de l'écriture dans les cellules : {e}")
                 
-            self.country_analyzer.process_data()
-            self.inclination_analyzer.process_data()
+            # Analyseurs indépendants, éventuellement en parallèle, puis fusion
+            # de leurs résultats dans le classeur en une seule étape
+            self.signaler("analyseurs")
+            debut = time.perf_counter()
+            analyseurs = self.analyseurs_independants()
+            self.resultats_analyse = self.graphe.calculer_analyseurs(analyseurs, self.mode_execution, self.nombre_workers)
+            for nom, analyseur in analyseurs.items():
+                analyseur.exporter(self.resultats_analyse[nom])
+            self.durees["analyseurs"] = time.perf_counter() - debut
             
-            self.satelliteAgeAnalyzer.process_data()
+            # Enregistrer le classeur en une seule fois : STATISTIQUES, puis TOUS
+            # et SHORTLIST écrites en flux depuis la table (rendues en parallèle si volumineuses)
+            self.signaler("export")
+            debut = time.perf_counter()
+            if self.format_type == "calc":
+                # Écrire directement le fichier .ods, sans passer par un .xlsx
+                self.chemin_sortie = temp_chemin_sortie
+                Execl_Ods.enregistrer_ods(self.wb, self.chemin_sortie, self.nombre_workers)
+            else:
+                Execl_Flux.enregistrer_classeur(self.wb, temp_excel_path, self.nombre_workers)
+            self.copie_modele = None
+            self.durees["export"] = time.perf_counter() - debut
             
-            # Générer tous les données brutes
-            Execl_Brut.generer_execl_avec_toute_les_donnees(self.dossier, temp_excel_path)
+            # Rapport enregistré : la table et les groupes servent à la prochaine ingestion
+            if self.manifeste is not None and self.manifeste.table is self.table:
+                self.manifeste.groupes = self.conjunction_analyzer.groupes_par_designateur
+                self.manifeste.enregistrer()
             
-            # Sauvegarder le fichier Excel temporaire
-            self.wb.save(temp_excel_path)
+            # Classeurs TOUS séparés, enregistrés un par un
+            self.classeurs_tous = []
+            if self.classeurs_tous_separes:
+                self.signaler("classeurs_tous")
+                debut = time.perf_counter()
+                self.classeurs_tous = Execl_Brut.exporter_classeurs_tous(
+                    self.table, os.path.splitext(self.chemin_sortie)[0], self.decoupage_tous, self.nombre_workers
+                )
+                self.durees["classeurs_tous"] = time.perf_counter() - debut
             
-            # Si un format autre que Excel est demandé, convertir le fichier
-            if self.format_type != "excel":
-                # Restaurer le chemin de sortie original (potentiellement avec extension .ods)
-                self.chemin_sortie = temp_chemin_sortie
-                
-                if self.convert_to_format(temp_excel_path, self.chemin_sortie, self.format_type):
-                    print(f"Conversion réussie vers le format {self.format_type}: {self.chemin_sortie}")
-                    # Si conversion réussie, supprimer le fichier Excel temporaire
-                    if os.path.exists(self.chemin_sortie) and os.path.exists(temp_excel_path):
-                        os.remove(temp_excel_path)
-                else:
-                    print(f"Échec de la conversion vers {self.format_type}. Le fichier Excel est conservé.")
-                    # En cas d'échec, restaurer le chemin vers le fichier Excel
-                    self.chemin_sortie = temp_excel_path
+            # Jeux de données en colonnes (Parquet/Arrow) à côté du rapport
+            self.fichiers_donnees = {}
+            if self.format_donnees:
+                self.signaler("donnees")
+                debut = time.perf_counter()
+                self.fichiers_donnees = Execl_Donnees.exporter_donnees(
+                    self.table, self.conjunction_analyzer.lignes_shortlist(),
+                    os.path.splitext(self.chemin_sortie)[0], self.format_donnees
+                )
+                self.durees["donnees"] = time.perf_counter() - debut
+            
+            # Résumé affiché par le tableau de bord sans relire le dossier
+            self.resume = self.construire_resume(
+                empreinte, nom_satellite, min_date, max_date, self.conjunction_analyzer.get_conjunction_count()
+            )
+            CDMResume.ecrire_resume(self.dossier, self.resume)
             
             print(f"Analyse terminée. Fichier sauvegardé : {self.chemin_sortie}")
             return True
         
+        except AnalyseAnnulee:
+            # Le classeur en cours de construction est abandonné
+            print("Analyse annulée.")
+            self.copie_modele = None
+            raise
         except Exception as e:
             import traceback
             print(f"Erreur lors de l'exécution de l'analyse: {e}")
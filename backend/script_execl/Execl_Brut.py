@@ -1,65 +1,164 @@
-import os
-import pandas as pd
-import re
+import numpy as np
 from openpyxl import Workbook, load_workbook
-from openpyxl.utils.dataframe import dataframe_to_rows
 
-def extract_data_from_txt(file_path):
-    data = {}
-    with open(file_path, 'r') as file:
-        lines = file.readlines()
-        for line in lines:
-            if line.strip():
-                # Enlever les unités entre crochets
-                line = re.sub(r'\[.*?\]', '', line).strip()
-                
-                parts = line.split('=')
-                if len(parts) == 2:
-                    key = parts[0].strip()
-                    value = parts[1].strip()
-                    data[key] = value
-    return data
+from backend.script_execl.Execl_Flux import enregistrer_classeur, lignes_dataframe, remplacer_feuille
+from backend.script_extraction import CDMParser
+from backend.script_extraction.CDMEpoch import EPOQUE_ABSENTE, format_epochs
+from backend.script_extraction.CDMTable import CDMTable
 
-def generer_execl_avec_toute_les_donnees(directory_path, output_file):
-    all_data = []
+# Nombre maximal de lignes d'une feuille Excel (en-tête compris)
+LIGNES_MAX_EXCEL = 1048576
 
-    for file_name in os.listdir(directory_path):
-        file_path = os.path.join(directory_path, file_name)
+# Découpages possibles de TOUS : par taille (seulement au-delà de la limite d'Excel) ou par mois de CREATION_DATE
+DECOUPAGES_TOUS = ("taille", "mois")
 
-        if file_name.endswith(".txt") and os.path.isfile(file_path):
-            file_data = extract_data_from_txt(file_path)
-            all_data.append(file_data)
+def extract_data_from_txt(file_path, keys=None):
+    return CDMParser.parse_file(file_path, keys).as_dict()
 
-    # Créer un DataFrame avec les données extraites
-    df = pd.DataFrame(all_data)
+def dataframe_tous(table):
+    """
+    Construit les données de la feuille TOUS : tous les CDM, triés par CREATION_DATE.
     
-    # Si TCA n'existe pas, trier par CREATION_DATE
+    Args:
+        table (CDMTable): Table des CDM.
+        
+    Returns:
+        DataFrame: Une ligne par fichier.
+    """
+    # Créer un DataFrame avec les données de la table
+    df = table.to_frame()
+    
+    # Si TCA n'existe pas, trier par CREATION_DATE (époques déjà décodées dans la table)
     if 'CREATION_DATE' in df.columns:
-        df['CREATION_DATE'] = pd.to_datetime(df['CREATION_DATE'])
-        df = df.sort_values(by='CREATION_DATE')
-        # Reconvertir en string si nécessaire
-        df['CREATION_DATE'] = df['CREATION_DATE'].dt.strftime('%Y-%m-%dT%H:%M:%S.%f')
+        ordre = table.sorted_rows('CREATION_DATE')
+        df = df.iloc[ordre]
+        df['CREATION_DATE'] = format_epochs(table.epochs('CREATION_DATE')[ordre], 'us')
+    return df
+
+def lignes_tous(table):
+    """
+    Renvoie les lignes de la feuille TOUS (en-tête compris), produites à la demande.
     
-    # Créer un nouveau classeur ou charger l'existant
-    try:
-        wb = load_workbook(output_file)
-    except FileNotFoundError:
-        wb = Workbook()
+    Args:
+        table (CDMTable): Table des CDM.
+    """
+    return lignes_dataframe(dataframe_tous(table))
+
+def decouper_tous(table, decoupage="taille", lignes_max=LIGNES_MAX_EXCEL - 1):
+    """
+    Répartit les CDM de TOUS en morceaux de taille bornée, dans l'ordre de la feuille
+    (par CREATION_DATE). Chaque morceau est une table restreinte à ses lignes, qui
+    peut être écrite (ou transmise à un processus) indépendamment des autres.
+    Les morceaux sont produits à la demande.
+    
+    Args:
+        table (CDMTable): Table des CDM.
+        decoupage (str): "taille" (un seul morceau tant que la limite n'est pas atteinte)
+                         ou "mois" (un morceau par mois de CREATION_DATE).
+        lignes_max (int): Nombre maximal de CDM par morceau.
+        
+    Returns:
+        generator: Couples (suffixe du nom, CDMTable), ex: ("", ...), ("_2", ...) ou ("_2024-01", ...).
+    """
+    if not len(table) or (decoupage != "mois" and len(table) <= lignes_max):
+        yield "", table
+        return
+    
+    if table.has('CREATION_DATE'):
+        ordre = table.sorted_rows('CREATION_DATE')
+        epoques = table.epochs('CREATION_DATE')[ordre]
+    else:
+        ordre = np.arange(len(table))
+        epoques = np.full(len(table), EPOQUE_ABSENTE, dtype=np.int64)
+    
+    if decoupage == "mois":
+        # Lignes triées par date : chaque mois est un intervalle contigu (dates absentes en dernier)
+        mois = epoques.view('datetime64[ns]').astype('datetime64[M]')
+        # Comparaison sur les entiers : NaT (dates absentes) n'est égal à rien
+        cles = mois.view(np.int64)
+        debuts = np.flatnonzero(np.r_[True, cles[1:] != cles[:-1]])
+        groupes = []
+        for debut, fin in zip(debuts, np.r_[debuts[1:], len(mois)]):
+            nom = "SANS_DATE" if epoques[debut] == EPOQUE_ABSENTE else str(mois[debut])
+            groupes.append((f"_{nom}", ordre[debut:fin]))
+    else:
+        groupes = [("", ordre)]
+    
+    for suffixe, lignes in groupes:
+        for numero, debut in enumerate(range(0, len(lignes), lignes_max), start=1):
+            yield (suffixe if numero == 1 else f"{suffixe}_{numero}"), table.select(lignes[debut:debut + lignes_max])
 
-    # Supprimer la feuille 'TOUS' si elle existe déjà
+def ajouter_feuille_tous(wb, table, decoupage="taille"):
+    """
+    Remplace la feuille TOUS du classeur par tous les CDM de la table.
+    Les lignes sont écrites en flux à l'enregistrement du classeur,
+    éventuellement dans un autre processus à partir de la table.
+    
+    Au-delà de la limite d'Excel, ou par mois avec decoupage="mois", TOUS est
+    répartie en plusieurs feuilles (TOUS, TOUS_2, ... ou TOUS_2024-01, ...)
+    placées à la suite, chacune écrite en flux depuis ses seules lignes.
+    
+    Args:
+        wb (Workbook): Classeur à compléter.
+        table (CDMTable): Table des CDM.
+        decoupage (str): "taille" ou "mois" (voir decouper_tous).
+        
+    Returns:
+        FeuilleFlux: Première feuille TOUS.
+    """
+    morceaux = list(decouper_tous(table, decoupage))
+    if len(morceaux) == 1 and not morceaux[0][0]:
+        return remplacer_feuille(wb, 'TOUS', lignes_tous, (table,), len(table))
+    
+    # Les feuilles découpées prennent la place de la feuille TOUS du modèle
+    index = wb.sheetnames.index('TOUS') if 'TOUS' in wb.sheetnames else len(wb.sheetnames)
     if 'TOUS' in wb.sheetnames:
         del wb['TOUS']
+    feuilles = [
+        remplacer_feuille(wb, f'TOUS{suffixe}', lignes_tous, (morceau,), len(morceau), index + numero)
+        for numero, (suffixe, morceau) in enumerate(morceaux)
+    ]
+    return feuilles[0]
+
+def exporter_classeurs_tous(table, chemin_base, decoupage="mois", workers=None):
+    """
+    Écrit TOUS dans des classeurs séparés du rapport, un par morceau
+    ("<chemin_base>_TOUS_2024-01.xlsx", ...). Chaque classeur est enregistré dès
+    qu'il est complet : un seul morceau est écrit à la fois, quelle que soit la
+    taille de l'archive.
     
-    # Créer une nouvelle feuille 'TOUS'
-    ws = wb.create_sheet('TOUS')
+    Args:
+        table (CDMTable): Table des CDM.
+        chemin_base (str): Chemin du rapport sans extension.
+        decoupage (str): "taille" ou "mois" (voir decouper_tous).
+        workers (int, optional): Nombre de processus utilisés pour chaque enregistrement.
+        
+    Returns:
+        list: Chemins des classeurs écrits.
+    """
+    chemins = []
+    for suffixe, morceau in decouper_tous(table, decoupage):
+        chemin = f"{chemin_base}_TOUS{suffixe}.xlsx"
+        wb = Workbook()
+        del wb[wb.active.title]
+        remplacer_feuille(wb, 'TOUS', lignes_tous, (morceau,), len(morceau))
+        enregistrer_classeur(wb, chemin, workers)
+        chemins.append(chemin)
+    return chemins
 
-    # Ajouter l'en-tête
-    for col_num, column_name in enumerate(df.columns, 1):
-        ws.cell(row=1, column=col_num, value=column_name)
+def generer_execl_avec_toute_les_donnees(directory_path, output_file, table=None):
+    # Réutiliser la table déjà construite si disponible
+    if table is None:
+        table = CDMTable.from_files(CDMParser.list_files(directory_path))
+    
+    # Créer un nouveau classeur ou charger l'existant
+    try:
+        wb = load_workbook(output_file)
+    except FileNotFoundError:
+        wb = Workbook()
 
-    # Ajouter les données
-    for r in dataframe_to_rows(df, index=False, header=False):
-        ws.append(r)
+    # Remplacer la feuille 'TOUS'
+    ajouter_feuille_tous(wb, table)
         
-    # Sauvegarder le fichier
-    wb.save(output_file)
\ No newline at end of file
+    # Sauvegarder le fichier (une seule écriture)
+    enregistrer_classeur(wb, output_file)
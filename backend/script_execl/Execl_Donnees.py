@@ -0,0 +1,112 @@
+import importlib.util
+import os
+
+from backend.script_extraction.CDMTable import CDMTable
+
+
+# Formats des jeux de données en colonnes et extension de leurs fichiers
+FORMATS_DONNEES = ("parquet", "arrow")
+EXTENSIONS_DONNEES = {"parquet": ".parquet", "arrow": ".arrow"}
+
+
+def pyarrow_disponible():
+    """
+    Indique si pyarrow, nécessaire à l'export Parquet/Arrow, est installé.
+
+    Returns:
+        bool: True si pyarrow peut être importé.
+    """
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def dataframe_tous_types(table: CDMTable):
+    """
+    Construit le jeu de données TOUS typé : tous les CDM, triés par CREATION_DATE
+    comme la feuille TOUS, suivis du nom de leur fichier.
+
+    Args:
+        table (CDMTable): Table des CDM.
+
+    Returns:
+        DataFrame: Une ligne par fichier (float64, dates UTC, catégories).
+    """
+    rows = table.sorted_rows('CREATION_DATE') if table.has('CREATION_DATE') else None
+    df = table.to_typed_frame(rows)
+    df['FILENAME'] = table.filenames if rows is None else table.filenames[rows]
+    return df
+
+
+def dataframe_shortlist_types(table: CDMTable, rows):
+    """
+    Construit le jeu de données SHORTLIST typé (premier CDM de chaque conjonction).
+
+    Args:
+        table (CDMTable): Table des CDM.
+        rows (ndarray): Lignes retenues (ConjunctionAnalyzer.lignes_shortlist()).
+
+    Returns:
+        DataFrame: Une ligne par conjonction.
+    """
+    df = table.to_typed_frame(rows)
+    df['FILENAME'] = table.filenames[rows]
+    return df
+
+
+def ecrire_donnees(df, chemin, format_donnees="parquet"):
+    """
+    Écrit un DataFrame au format Parquet ou Arrow IPC (fichier Feather V2).
+
+    Args:
+        df (DataFrame): Données à écrire.
+        chemin (str): Fichier de destination.
+        format_donnees (str): "parquet" ou "arrow".
+    """
+    if format_donnees == "parquet":
+        df.to_parquet(chemin, index=False)
+    elif format_donnees == "arrow":
+        df.to_feather(chemin)
+    else:
+        raise ValueError(f"Format de données '{format_donnees}' non supporté.")
+
+
+def exporter_donnees(table: CDMTable, lignes_shortlist, chemin_base, format_donnees="parquet"):
+    """
+    Exporte TOUS et SHORTLIST en jeux de données en colonnes, à côté du rapport :
+    "<chemin_base>_TOUS.parquet" et "<chemin_base>_SHORTLIST.parquet" (ou .arrow).
+
+    Contrairement à la feuille TOUS, ces fichiers ne sont pas limités en nombre de
+    lignes et gardent le type de chaque colonne (probabilités en float64, dates en
+    époques int64, noms en catégories) : ils se relisent sans openpyxl.
+
+    Args:
+        table (CDMTable): Table des CDM.
+        lignes_shortlist (ndarray): Lignes de la SHORTLIST.
+        chemin_base (str): Chemin du rapport sans extension.
+        format_donnees (str): "parquet" ou "arrow".
+
+    Returns:
+        dict: Fichiers écrits {"TOUS": chemin, "SHORTLIST": chemin}, vide en cas d'échec.
+    """
+    extension = EXTENSIONS_DONNEES.get(format_donnees)
+    if extension is None:
+        print(f"Format de données '{format_donnees}' non supporté.")
+        return {}
+
+    fichiers = {}
+    try:
+        for nom, df in (("TOUS", dataframe_tous_types(table)),
+                        ("SHORTLIST", dataframe_shortlist_types(table, lignes_shortlist))):
+            chemin = f"{chemin_base}_{nom}{extension}"
+            ecrire_donnees(df, chemin, format_donnees)
+            fichiers[nom] = chemin
+    except ImportError:
+        print("Erreur: pyarrow non disponible pour l'export Parquet/Arrow.")
+        print("Installez la bibliothèque nécessaire avec: pip install pyarrow")
+        return {}
+    except Exception as e:
+        print(f"Erreur lors de l'export des données en {format_donnees}: {e}")
+        return {}
+
+    for chemin in fichiers.values():
+        print(f"Données exportées : {os.path.basename(chemin)}")
+    return fichiers
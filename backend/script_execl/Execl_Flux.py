@@ -0,0 +1,242 @@
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timezone
+from zipfile import ZipFile, ZIP_DEFLATED
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.drawing.spreadsheet_drawing import SpreadsheetDrawing
+from openpyxl.packaging.relationship import RelationshipList
+from openpyxl.utils.indexed_list import IndexedList
+from openpyxl.utils.dataframe import dataframe_to_rows
+from openpyxl.worksheet._write_only import WriteOnlyWorksheet
+from openpyxl.worksheet._writer import WorksheetWriter
+from openpyxl.writer.excel import ExcelWriter
+
+
+# Nombre minimal de lignes en flux pour rendre les feuilles dans plusieurs processus
+SEUIL_PARALLELE = 5000
+
+
+class FeuilleFlux(WriteOnlyWorksheet):
+    """
+    Feuille en écriture seule insérée dans un classeur ordinaire (ex: TOUS, SHORTLIST).
+
+    Ses lignes sont produites par fonction(*args) au moment de l'enregistrement
+    du classeur et écrites directement dans le fichier, sans créer de cellules
+    en mémoire. La fonction et ses arguments doivent pouvoir être transmis à un
+    autre processus, qui peut alors rendre la feuille en parallèle. Le classeur
+    qui la contient ne peut être enregistré qu'une seule fois.
+    """
+
+    def __init__(self, parent, title, fonction, args=(), taille=0, formats=None):
+        """
+        Args:
+            parent (Workbook): Classeur de la feuille.
+            title (str): Nom de la feuille.
+            fonction (callable): Fonction (de module) qui renvoie les lignes de la feuille, en-tête compris.
+            args (tuple): Arguments de la fonction.
+            taille (int): Nombre de lignes prévu, pour décider d'un rendu en parallèle.
+            formats (dict, optional): Format de nombre de certaines colonnes {index (0 = A): format Excel}.
+        """
+        super().__init__(parent, title)
+        self.fonction = fonction
+        self.args = args
+        self.taille = taille
+        self.formats = formats or {}
+
+    def close(self):
+        for ligne in _lignes_formatees(self, self.fonction(*self.args), self.formats):
+            self.append(ligne)
+        self.args = ()
+        super().close()
+
+
+def _lignes_formatees(ws, lignes, formats):
+    """
+    Applique les formats de nombre des colonnes aux lignes de données (pas à l'en-tête).
+    Seules les valeurs des colonnes formatées deviennent des cellules.
+    """
+    if not formats:
+        yield from lignes
+        return
+    lignes = iter(lignes)
+    yield next(lignes, [])
+    for ligne in lignes:
+        ligne = list(ligne)
+        for index, format_nombre in formats.items():
+            if index < len(ligne) and ligne[index] is not None:
+                cellule = WriteOnlyCell(ws, ligne[index])
+                cellule.number_format = format_nombre
+                ligne[index] = cellule
+        yield ligne
+
+
+def _rendre_feuille(fonction, args, formats=None, styles=None):
+    """
+    Rend le XML d'une feuille en flux dans un processus de calcul.
+
+    Args:
+        formats (dict, optional): Formats de nombre des colonnes (voir FeuilleFlux).
+        styles (tuple, optional): Styles de cellule et formats de nombre du classeur final,
+                                  pour que les cellules formatées y gardent leur index.
+
+    Returns:
+        str or None: Fichier XML de la feuille, ou None si ses cellules utilisent des
+                     styles absents du classeur final (leurs index seraient faux).
+    """
+    classeur = Workbook(write_only=True)
+    if styles is not None:
+        classeur._cell_styles = IndexedList(styles[0])
+        classeur._number_formats = IndexedList(styles[1])
+    nombre_styles = len(classeur._cell_styles)
+    feuille = classeur.create_sheet()
+    descripteur, chemin = tempfile.mkstemp(prefix='star_guardian.', suffix='.xml')
+    os.close(descripteur)
+    feuille._writer = WorksheetWriter(feuille, out=chemin)
+    feuille._writer.write_top()
+    for ligne in _lignes_formatees(feuille, fonction(*args), formats):
+        feuille.append(ligne)
+    feuille.close()
+
+    if len(classeur._cell_styles) > nombre_styles:
+        os.remove(chemin)
+        return None
+    return chemin
+
+
+def _styles_formats(wb, feuilles):
+    """
+    Enregistre dans le classeur les styles des formats de nombre des feuilles en flux
+    et renvoie ses tables de styles, à transmettre aux processus de calcul.
+    """
+    for ws in feuilles:
+        for format_nombre in ws.formats.values():
+            cellule = WriteOnlyCell(ws)
+            cellule.number_format = format_nombre
+            wb._cell_styles.add(cellule._style)
+    return list(wb._cell_styles), list(wb._number_formats)
+
+
+class _ExcelWriterFlux(ExcelWriter):
+    """
+    Écrit un classeur dont certaines feuilles sont des FeuilleFlux, rendues ici
+    ou déjà rendues par des processus de calcul.
+    """
+
+    def __init__(self, workbook, archive, rendus=None):
+        super().__init__(workbook, archive)
+        self.rendus = rendus or {}
+
+    def write_worksheet(self, ws):
+        if not isinstance(ws, FeuilleFlux):
+            return super().write_worksheet(ws)
+
+        chemin = None
+        rendu = self.rendus.get(ws.title)
+        if rendu is not None:
+            try:
+                chemin = rendu.result()
+            except (OSError, BrokenProcessPool) as e:
+                print(f"Rendu parallèle de la feuille {ws.title} impossible ({e}), rendu séquentiel.")
+
+        ws._drawing = SpreadsheetDrawing()
+        ws._drawing.charts = ws._charts
+        ws._drawing.images = ws._images
+        if chemin is not None:
+            # Feuille sans graphique ni commentaire : aucune relation
+            ws._rels = RelationshipList()
+            self._archive.write(chemin, ws.path[1:])
+            self.manifest.append(ws)
+            os.remove(chemin)
+            return
+
+        if not ws.closed:
+            ws.close()
+        writer = ws._writer
+
+        ws._rels = writer._rels
+        self._archive.write(writer.out, ws.path[1:])
+        self.manifest.append(ws)
+        writer.cleanup()
+
+
+def lignes_dataframe(df):
+    """
+    Renvoie les lignes d'un DataFrame à écrire dans une feuille : l'en-tête puis les données.
+
+    Args:
+        df (DataFrame): Données à écrire.
+
+    Returns:
+        generator: Listes de valeurs, produites à la demande.
+    """
+    yield list(df.columns)
+    yield from dataframe_to_rows(df, index=False, header=False)
+
+
+def remplacer_feuille(wb, titre, fonction, args=(), taille=0, index=None, formats=None):
+    """
+    Remplace (ou ajoute) une feuille du classeur par une feuille écrite en flux.
+
+    Args:
+        wb (Workbook): Classeur à modifier.
+        titre (str): Nom de la feuille.
+        fonction (callable): Fonction qui renvoie les lignes de la feuille, en-tête compris.
+        args (tuple): Arguments de la fonction.
+        taille (int): Nombre de lignes prévu.
+        index (int, optional): Position de la feuille. Si None, elle est ajoutée à la fin.
+        formats (dict, optional): Format de nombre de certaines colonnes {index (0 = A): format Excel}.
+
+    Returns:
+        FeuilleFlux: Nouvelle feuille.
+    """
+    if titre in wb.sheetnames:
+        del wb[titre]
+    feuille = FeuilleFlux(wb, titre, fonction, args, taille, formats)
+    wb._add_sheet(feuille, index)
+    return feuille
+
+
+def enregistrer_classeur(wb, chemin, workers=None):
+    """
+    Enregistre le classeur en une seule passe.
+
+    Pour les gros classeurs, le XML de chaque feuille en flux est rendu dans un
+    processus séparé pendant que ce processus écrit les autres feuilles (mise en
+    forme du modèle, graphiques), puis les parties sont assemblées dans le fichier.
+
+    Args:
+        wb (Workbook): Classeur à enregistrer.
+        chemin (str): Chemin du fichier .xlsx.
+        workers (int, optional): Nombre de processus. Si None, un par cœur ; 1 pour tout rendre ici.
+    """
+    feuilles = [ws for ws in wb.worksheets if isinstance(ws, FeuilleFlux) and not ws.closed]
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = min(workers, len(feuilles))
+
+    wb.properties.modified = datetime.now(tz=timezone.utc).replace(tzinfo=None)
+    archive = ZipFile(chemin, 'w', ZIP_DEFLATED, allowZip64=True)
+    executor = None
+    rendus = {}
+    try:
+        if workers > 1 and sum(ws.taille for ws in feuilles) >= SEUIL_PARALLELE:
+            try:
+                styles = _styles_formats(wb, feuilles)
+                executor = ProcessPoolExecutor(max_workers=workers)
+                rendus = {ws.title: executor.submit(_rendre_feuille, ws.fonction, ws.args, ws.formats, styles)
+                          for ws in feuilles}
+            except OSError as e:
+                print(f"Rendu parallèle indisponible ({e}), rendu séquentiel des feuilles.")
+        _ExcelWriterFlux(wb, archive, rendus).save()
+    finally:
+        archive.close()
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+            # Fichiers rendus mais non utilisés (erreur pendant l'enregistrement)
+            for rendu in rendus.values():
+                if rendu.done() and rendu.exception() is None and rendu.result() and os.path.exists(rendu.result()):
+                    os.remove(rendu.result())
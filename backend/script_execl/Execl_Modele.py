@@ -0,0 +1,48 @@
+import os
+import pickle
+import threading
+
+from openpyxl import load_workbook
+
+
+# Modèles déjà analysés : {chemin: ((mtime_ns, taille), classeur sérialisé)}
+_modeles = {}
+_verrou = threading.Lock()
+
+
+def _signature(chemin):
+    stat = os.stat(chemin)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def charger_modele(chemin):
+    """
+    Renvoie une copie du classeur modèle (ex: config/config_excel.xlsx), prête à être remplie.
+
+    Le modèle n'est lu qu'une fois par processus : il est gardé en mémoire sous forme
+    d'instantané sérialisé, jamais modifié, dont chaque rapport reçoit sa propre copie.
+    Créer une copie coûte bien moins cher que relire le fichier. L'instantané est
+    relu si la date de modification ou la taille du modèle change.
+
+    Args:
+        chemin (str): Chemin du modèle Excel.
+
+    Returns:
+        Workbook: Copie indépendante du modèle.
+    """
+    chemin = os.path.abspath(chemin)
+    signature = _signature(chemin)
+    with _verrou:
+        entree = _modeles.get(chemin)
+        if entree is None or entree[0] != signature:
+            instantane = pickle.dumps(load_workbook(chemin), protocol=pickle.HIGHEST_PROTOCOL)
+            _modeles[chemin] = entree = (signature, instantane)
+    return pickle.loads(entree[1])
+
+
+def vider_cache_modeles():
+    """
+    Oublie tous les modèles gardés en mémoire.
+    """
+    with _verrou:
+        _modeles.clear()
@@ -0,0 +1,673 @@
+import colorsys
+import math
+import numbers
+import os
+import re
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import date, datetime, time
+from xml.etree import ElementTree
+from zipfile import ZipFile, ZIP_DEFLATED, ZIP_STORED
+
+from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+from openpyxl.formula.tokenizer import Token, Tokenizer
+
+from backend.script_execl.Execl_Flux import SEUIL_PARALLELE, FeuilleFlux
+
+
+MIMETYPE = "application/vnd.oasis.opendocument.spreadsheet"
+
+NAMESPACES = (
+    'xmlns:office="urn:oasis:names:tc:opendocument:xmlns:office:1.0" '
+    'xmlns:style="urn:oasis:names:tc:opendocument:xmlns:style:1.0" '
+    'xmlns:text="urn:oasis:names:tc:opendocument:xmlns:text:1.0" '
+    'xmlns:table="urn:oasis:names:tc:opendocument:xmlns:table:1.0" '
+    'xmlns:fo="urn:oasis:names:tc:opendocument:xmlns:xsl-fo-compatible:1.0" '
+    'xmlns:svg="urn:oasis:names:tc:opendocument:xmlns:svg-compatible:1.0" '
+    'xmlns:number="urn:oasis:names:tc:opendocument:xmlns:datastyle:1.0" '
+    'xmlns:meta="urn:oasis:names:tc:opendocument:xmlns:meta:1.0" '
+    'xmlns:of="urn:oasis:names:tc:opendocument:xmlns:of:1.2" '
+    'office:version="1.2"'
+)
+
+# Style des dates écrites dans les feuilles en flux (toujours déclaré)
+STYLE_DATE = "ceDate"
+
+# Nombre de lignes XML regroupées avant chaque écriture dans l'archive
+LIGNES_PAR_BLOC = 500
+
+# Ordre des couleurs du thème dans les index Excel (0 = lt1, 1 = dk1, ...)
+_COULEURS_THEME = ("lt1", "dk1", "lt2", "dk2", "accent1", "accent2", "accent3",
+                   "accent4", "accent5", "accent6", "hlink", "folHlink")
+
+_ALIGNEMENTS = {"left": "start", "center": "center", "right": "end", "justify": "justify",
+                "centerContinuous": "center", "distributed": "justify"}
+_ALIGNEMENTS_VERTICAUX = {"top": "top", "center": "middle", "bottom": "bottom",
+                          "justify": "middle", "distributed": "middle"}
+_BORDURES = {"hair": "0.26pt solid", "thin": "0.74pt solid", "medium": "1.76pt solid",
+             "thick": "2.49pt solid", "double": "2.49pt double", "dotted": "0.74pt dotted",
+             "dashed": "0.74pt dashed", "mediumDashed": "1.76pt dashed", "dashDot": "0.74pt dashed",
+             "mediumDashDot": "1.76pt dashed", "dashDotDot": "0.74pt dotted",
+             "mediumDashDotDot": "1.76pt dotted", "slantDashDot": "1.76pt dashed"}
+
+_REF_CELLULE = r"\$?[A-Za-z]{1,3}\$?\d+"
+_REF_PLAGE = re.compile(
+    rf"{_REF_CELLULE}(:{_REF_CELLULE})?|\$?[A-Za-z]{{1,3}}:\$?[A-Za-z]{{1,3}}|\$?\d+:\$?\d+"
+)
+_JETONS_DATE = re.compile(r'yyyy|yy|mmmm|mmm|mm|m|dddd|ddd|dd|d|hh|h|ss|s|AM/PM|"[^"]*"|\\.|.', re.IGNORECASE)
+
+
+def _echapper(texte, attribut=False):
+    texte = texte.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+    if attribut:
+        texte = texte.replace('"', "&quot;")
+    return texte
+
+
+def _espaces(match):
+    # En ODF, les espaces consécutifs (ou en début de texte) doivent être explicites
+    nombre = len(match.group())
+    if match.start() == 0:
+        return f'<text:s text:c="{nombre}"/>'
+    return f' <text:s text:c="{nombre - 1}"/>'
+
+
+def _paragraphe(texte):
+    """
+    Contenu texte d'une cellule (text:p), espaces multiples, tabulations et
+    retours à la ligne compris.
+    """
+    texte = _echapper(ILLEGAL_CHARACTERS_RE.sub("", texte))
+    if "  " in texte or "\t" in texte or "\n" in texte or texte[:1] == " ":
+        texte = re.sub(r"^ +| {2,}", _espaces, texte)
+        texte = texte.replace("\t", "<text:tab/>").replace("\r\n", "\n").replace("\n", "</text:p><text:p>")
+    return f"<text:p>{texte}</text:p>"
+
+
+def _cellule_valeur(valeur, style=None):
+    """
+    XML d'une cellule contenant une valeur (nombre, texte, booléen ou date).
+
+    Args:
+        valeur: Valeur de la cellule.
+        style (str, optional): Style de la cellule ; les dates sans style reçoivent STYLE_DATE.
+
+    Returns:
+        str: Élément table:table-cell.
+    """
+    attribut_style = f' table:style-name="{style}"' if style else ""
+    if isinstance(valeur, str):
+        return f'<table:table-cell{attribut_style} office:value-type="string">{_paragraphe(valeur)}</table:table-cell>'
+    if isinstance(valeur, bool):
+        texte = "true" if valeur else "false"
+        return f'<table:table-cell{attribut_style} office:value-type="boolean" office:boolean-value="{texte}"/>'
+    if isinstance(valeur, numbers.Number):
+        valeur = float(valeur)
+        if math.isnan(valeur) or math.isinf(valeur):
+            return f"<table:table-cell{attribut_style}/>"
+        return f'<table:table-cell{attribut_style} office:value-type="float" office:value="{valeur!r}"/>'
+    if isinstance(valeur, (datetime, date)):
+        if valeur != valeur:  # NaT
+            return f"<table:table-cell{attribut_style}/>"
+        if isinstance(valeur, datetime):
+            valeur = valeur.replace(tzinfo=None)
+        attribut_style = f' table:style-name="{style or STYLE_DATE}"'
+        return f'<table:table-cell{attribut_style} office:value-type="date" office:date-value="{valeur.isoformat()}"/>'
+    if isinstance(valeur, time):
+        duree = f"PT{valeur.hour:02d}H{valeur.minute:02d}M{valeur.second + valeur.microsecond / 1e6:02.0f}S"
+        return f'<table:table-cell{attribut_style} office:value-type="time" office:time-value="{duree}"/>'
+    if valeur is None or valeur != valeur:
+        return f"<table:table-cell{attribut_style}/>"
+    return _cellule_valeur(str(valeur), style)
+
+
+def _reference_ods(reference):
+    """
+    Convertit une référence Excel ("SHORTLIST!H2:H9000") en référence OpenFormula
+    ("[$SHORTLIST.H2:.H9000]"). Les noms définis sont laissés tels quels.
+    """
+    feuille, _, plage = reference.rpartition("!")
+    if not _REF_PLAGE.fullmatch(plage):
+        return reference
+    prefixe = f"${feuille}" if feuille else ""
+    debut, _, fin = plage.partition(":")
+    return f"[{prefixe}.{debut}:.{fin}]" if fin else f"[{prefixe}.{debut}]"
+
+
+def formule_ods(formule):
+    """
+    Traduit une formule Excel en formule OpenFormula.
+
+    Args:
+        formule (str): Formule Excel (ex: '=COUNTIF(SHORTLIST!H2:H9000,"<=100")').
+
+    Returns:
+        str: Formule OpenFormula (ex: 'of:=COUNTIF([$SHORTLIST.H2:.H9000];"<=100")').
+    """
+    parties = []
+    for jeton in Tokenizer(formule).items:
+        if jeton.type == Token.OPERAND and jeton.subtype == Token.RANGE:
+            parties.append(_reference_ods(jeton.value))
+        elif jeton.type == Token.SEP and jeton.value == ",":
+            parties.append(";")
+        else:
+            parties.append(jeton.value)
+    return "of:=" + "".join(parties)
+
+
+class _Styles:
+    """
+    Styles automatiques du document : cellules, colonnes, lignes, formats de
+    nombre et polices, déclarés à partir de la mise en forme openpyxl.
+    """
+
+    def __init__(self, theme=None):
+        self.cellules = {}
+        self.colonnes = {}
+        self.lignes = {}
+        self.nombres = {}
+        self.polices = set()
+        self.couleurs_theme = self._lire_theme(theme)
+
+    @staticmethod
+    def _lire_theme(theme):
+        if not theme:
+            return []
+        try:
+            racine = ElementTree.fromstring(theme)
+        except ElementTree.ParseError:
+            return []
+        schema = racine.find(".//{http://schemas.openxmlformats.org/drawingml/2006/main}clrScheme")
+        if schema is None:
+            return []
+        couleurs = {}
+        for element in schema:
+            nom = element.tag.rpartition("}")[2]
+            for couleur in element:
+                couleurs[nom] = couleur.get("lastClr") or couleur.get("val")
+        return [couleurs.get(nom) for nom in _COULEURS_THEME]
+
+    def couleur(self, couleur):
+        """
+        Renvoie la couleur "#RRGGBB" d'une couleur openpyxl (RGB ou thème avec teinte).
+        """
+        if couleur is None:
+            return None
+        if couleur.type == "rgb" and isinstance(couleur.rgb, str):
+            rgb = couleur.rgb[-6:]
+        elif couleur.type == "theme" and couleur.theme is not None and couleur.theme < len(self.couleurs_theme):
+            rgb = self.couleurs_theme[couleur.theme]
+        else:
+            return None
+        if not rgb or len(rgb) != 6:
+            return None
+        teinte = couleur.tint or 0
+        if teinte:
+            r, v, b = (int(rgb[i:i + 2], 16) / 255 for i in (0, 2, 4))
+            t, l, s = colorsys.rgb_to_hls(r, v, b)
+            l = l * (1 + teinte) if teinte < 0 else l * (1 - teinte) + teinte
+            rgb = "".join(f"{round(c * 255):02X}" for c in colorsys.hls_to_rgb(t, l, s))
+        return f"#{rgb.upper()}"
+
+    def format_nombre(self, format_excel):
+        """
+        Déclare le format de nombre ODF correspondant à un format Excel.
+
+        Returns:
+            str or None: Nom du format, ou None pour le format standard ou non pris en charge.
+        """
+        if not format_excel or format_excel == "General":
+            return None
+        if format_excel in self.nombres:
+            return self.nombres[format_excel][0]
+
+        section = format_excel.split(";")[0]
+        section_nue = re.sub(r'"[^"]*"|\\.|\[[^\]]*\]', "", section)
+        nom = f"N{len(self.nombres) + 1}"
+        decimales = len(re.search(r"\.(0*)", section_nue).group(1)) if "." in section_nue else 0
+        groupes = ' number:grouping="true"' if "," in section_nue else ""
+        if re.search(r"[ymdhs]", section_nue, re.IGNORECASE):
+            xml = self._format_date(nom, section)
+        elif "%" in section_nue:
+            xml = (f'<number:percentage-style style:name="{nom}"><number:number number:decimal-places="{decimales}" '
+                   f'number:min-integer-digits="1"{groupes}/><number:text>%</number:text></number:percentage-style>')
+        elif "E" in section_nue.upper():
+            exposant = re.search(r"E[+-]?(0+)", section_nue, re.IGNORECASE)
+            chiffres = len(exposant.group(1)) if exposant else 2
+            mantisse = section_nue.upper().split("E")[0]
+            decimales = len(mantisse.split(".")[1]) if "." in mantisse else 0
+            xml = (f'<number:number-style style:name="{nom}"><number:scientific-number number:decimal-places="{decimales}" '
+                   f'number:min-integer-digits="1" number:min-exponent-digits="{chiffres}"/></number:number-style>')
+        elif re.fullmatch(r"[#0,.\s]+", section_nue):
+            xml = (f'<number:number-style style:name="{nom}"><number:number number:decimal-places="{decimales}" '
+                   f'number:min-integer-digits="1"{groupes}/></number:number-style>')
+        else:
+            self.nombres[format_excel] = (None, "")
+            return None
+        self.nombres[format_excel] = (nom, xml)
+        return nom
+
+    @staticmethod
+    def _format_date(nom, section):
+        elements = []
+        jetons = _JETONS_DATE.findall(section)
+        heure = any(j.lower() in ("h", "hh") for j in jetons)
+        for index, jeton in enumerate(jetons):
+            bas = jeton.lower()
+            precedent = next((j.lower() for j in reversed(jetons[:index]) if j.strip(" :.-/")), "")
+            suivant = next((j.lower() for j in jetons[index + 1:] if j.strip(" :.-/")), "")
+            if bas in ("yyyy", "yy"):
+                elements.append('<number:year number:style="long"/>' if bas == "yyyy" else "<number:year/>")
+            elif bas in ("m", "mm") and (precedent in ("h", "hh") or suivant in ("s", "ss")):
+                elements.append('<number:minutes number:style="long"/>' if bas == "mm" else "<number:minutes/>")
+            elif bas in ("m", "mm", "mmm", "mmmm"):
+                style = ' number:style="long"' if bas in ("mm", "mmmm") else ""
+                texte = ' number:textual="true"' if bas in ("mmm", "mmmm") else ""
+                elements.append(f"<number:month{style}{texte}/>")
+            elif bas in ("d", "dd"):
+                elements.append('<number:day number:style="long"/>' if bas == "dd" else "<number:day/>")
+            elif bas in ("ddd", "dddd"):
+                elements.append('<number:day-of-week number:style="long"/>' if bas == "dddd" else "<number:day-of-week/>")
+            elif bas in ("h", "hh"):
+                elements.append('<number:hours number:style="long"/>' if bas == "hh" else "<number:hours/>")
+            elif bas in ("s", "ss"):
+                elements.append('<number:seconds number:style="long"/>' if bas == "ss" else "<number:seconds/>")
+            elif bas == "am/pm":
+                elements.append("<number:am-pm/>")
+            else:
+                texte = jeton[1:-1] if jeton.startswith('"') else jeton.lstrip("\\")
+                if texte:
+                    elements.append(f"<number:text>{_echapper(texte)}</number:text>")
+        type_style = "date-style" if not heure or any("year" in e or "month" in e or "day" in e for e in elements) else "time-style"
+        return f'<number:{type_style} style:name="{nom}">{"".join(elements)}</number:{type_style}>'
+
+    def cellule(self, cellule):
+        """
+        Déclare le style d'une cellule openpyxl.
+
+        Returns:
+            str or None: Nom du style, ou None si la cellule n'a pas de mise en forme.
+        """
+        if not cellule.has_style:
+            return None
+        proprietes = []
+        paragraphe = []
+        texte = []
+
+        remplissage = cellule.fill
+        if remplissage is not None and remplissage.fill_type == "solid":
+            couleur = self.couleur(remplissage.fgColor)
+            if couleur:
+                proprietes.append(f'fo:background-color="{couleur}"')
+
+        bordure = cellule.border
+        for cote in ("left", "right", "top", "bottom"):
+            trait = getattr(bordure, cote, None)
+            if trait is not None and trait.style in _BORDURES:
+                couleur = self.couleur(trait.color) or "#000000"
+                proprietes.append(f'fo:border-{cote}="{_BORDURES[trait.style]} {couleur}"')
+
+        alignement = cellule.alignment
+        if alignement.horizontal in _ALIGNEMENTS:
+            paragraphe.append(f'fo:text-align="{_ALIGNEMENTS[alignement.horizontal]}"')
+            proprietes.append('style:text-align-source="fix"')
+        if alignement.vertical in _ALIGNEMENTS_VERTICAUX:
+            proprietes.append(f'style:vertical-align="{_ALIGNEMENTS_VERTICAUX[alignement.vertical]}"')
+        if alignement.wrap_text:
+            proprietes.append('fo:wrap-option="wrap"')
+
+        police = cellule.font
+        if police.name:
+            self.polices.add(police.name)
+            texte.append(f'style:font-name="{_echapper(police.name, True)}"')
+        if police.sz:
+            texte.append(f'fo:font-size="{police.sz:g}pt"')
+        if police.b:
+            texte.append('fo:font-weight="bold"')
+        if police.i:
+            texte.append('fo:font-style="italic"')
+        if police.u:
+            texte.append('style:text-underline-style="solid" style:text-underline-width="auto" style:text-underline-color="font-color"')
+        if police.strike:
+            texte.append('style:text-line-through-style="solid"')
+        couleur = self.couleur(police.color)
+        if couleur:
+            texte.append(f'fo:color="{couleur}"')
+
+        format_nombre = self.format_nombre(cellule.number_format)
+        cle = (tuple(proprietes), tuple(paragraphe), tuple(texte), format_nombre)
+        if cle not in self.cellules:
+            self.cellules[cle] = f"ce{len(self.cellules) + 1}"
+        return self.cellules[cle]
+
+    def format_colonne(self, format_excel):
+        """
+        Déclare le style des cellules d'une colonne en flux ayant un format de nombre.
+
+        Returns:
+            str or None: Nom du style, ou None si le format n'est pas pris en charge.
+        """
+        format_nombre = self.format_nombre(format_excel)
+        if format_nombre is None:
+            return None
+        cle = ((), (), (), format_nombre)
+        if cle not in self.cellules:
+            self.cellules[cle] = f"ce{len(self.cellules) + 1}"
+        return self.cellules[cle]
+
+    def colonne(self, largeur):
+        cle = round(largeur, 3)
+        if cle not in self.colonnes:
+            self.colonnes[cle] = f"co{len(self.colonnes) + 1}"
+        return self.colonnes[cle]
+
+    def ligne(self, hauteur):
+        cle = round(hauteur, 2)
+        if cle not in self.lignes:
+            self.lignes[cle] = f"ro{len(self.lignes) + 1}"
+        return self.lignes[cle]
+
+    def declarations_polices(self):
+        polices = []
+        for nom in sorted(self.polices):
+            # Les noms de police contenant des espaces sont entre apostrophes
+            famille = f"'{nom}'" if " " in nom else nom
+            polices.append(f'<style:font-face style:name="{_echapper(nom, True)}" svg:font-family="{_echapper(famille, True)}"/>')
+        polices = "".join(polices)
+        return f"<office:font-face-decls>{polices}</office:font-face-decls>"
+
+    def styles_automatiques(self):
+        xml = [nombre for _, nombre in self.nombres.values() if nombre]
+        xml.append('<number:date-style style:name="NDate"><number:year number:style="long"/><number:text>-</number:text>'
+                   '<number:month number:style="long"/><number:text>-</number:text><number:day number:style="long"/>'
+                   '<number:text> </number:text><number:hours number:style="long"/><number:text>:</number:text>'
+                   '<number:minutes number:style="long"/><number:text>:</number:text>'
+                   '<number:seconds number:style="long"/></number:date-style>')
+        for largeur, nom in self.colonnes.items():
+            # Largeur Excel en caractères (7 pixels à 96 ppp)
+            xml.append(f'<style:style style:name="{nom}" style:family="table-column">'
+                       f'<style:table-column-properties fo:break-before="auto" style:column-width="{largeur * 7 / 96:.4f}in"/></style:style>')
+        for hauteur, nom in self.lignes.items():
+            xml.append(f'<style:style style:name="{nom}" style:family="table-row">'
+                       f'<style:table-row-properties style:row-height="{hauteur:g}pt" style:use-optimal-row-height="false"/></style:style>')
+        xml.append(f'<style:style style:name="{STYLE_DATE}" style:family="table-cell" style:parent-style-name="Default" '
+                   f'style:data-style-name="NDate"/>')
+        for (proprietes, paragraphe, texte, format_nombre), nom in self.cellules.items():
+            donnees = f' style:data-style-name="{format_nombre}"' if format_nombre else ""
+            xml.append(f'<style:style style:name="{nom}" style:family="table-cell" style:parent-style-name="Default"{donnees}>')
+            if proprietes:
+                xml.append(f'<style:table-cell-properties {" ".join(proprietes)}/>')
+            if paragraphe:
+                xml.append(f'<style:paragraph-properties {" ".join(paragraphe)}/>')
+            if texte:
+                xml.append(f'<style:text-properties {" ".join(texte)}/>')
+            xml.append("</style:style>")
+        return f'<office:automatic-styles>{"".join(xml)}</office:automatic-styles>'
+
+
+def _largeur_colonnes(ws):
+    """
+    Renvoie la largeur (en caractères) et la visibilité de chaque colonne utilisée par la feuille.
+    """
+    defaut = ws.sheet_format.defaultColWidth or ((ws.sheet_format.baseColWidth or 8) + 0.88671875)
+    largeurs = [(defaut, False)] * ws.max_column
+    for dimension in ws.column_dimensions.values():
+        if not dimension.min:
+            continue
+        for index in range(dimension.min, min(dimension.max, ws.max_column) + 1):
+            largeurs[index - 1] = (dimension.width if dimension.customWidth or dimension.width else defaut, bool(dimension.hidden))
+    return largeurs
+
+
+def _xml_feuille(ws, styles):
+    """
+    Produit le XML d'une feuille ordinaire (valeurs, formules, mise en forme),
+    par morceaux. Les styles utilisés sont déclarés dans styles.
+    """
+    yield f'<table:table table:name="{_echapper(ws.title, True)}">'
+
+    colonnes = []
+    for largeur, masquee in _largeur_colonnes(ws):
+        attributs = f'table:style-name="{styles.colonne(largeur)}"'
+        if masquee:
+            attributs += ' table:visibility="collapse"'
+        if colonnes and colonnes[-1][0] == attributs:
+            colonnes[-1][1] += 1
+        else:
+            colonnes.append([attributs, 1])
+    for attributs, nombre in colonnes:
+        repetees = f' table:number-columns-repeated="{nombre}"' if nombre > 1 else ""
+        yield f"<table:table-column {attributs}{repetees} table:default-cell-style-name=\"Default\"/>"
+
+    fusions = {}
+    couvertes = set()
+    for plage in ws.merged_cells.ranges:
+        fusions[(plage.min_row, plage.min_col)] = (plage.max_row - plage.min_row + 1, plage.max_col - plage.min_col + 1)
+        for ligne in range(plage.min_row, plage.max_row + 1):
+            for colonne in range(plage.min_col, plage.max_col + 1):
+                if (ligne, colonne) != (plage.min_row, plage.min_col):
+                    couvertes.add((ligne, colonne))
+
+    lignes_vides = 0
+    for cellules in ws.iter_rows(min_row=1, max_row=ws.max_row, max_col=ws.max_column):
+        numero = cellules[0].row if cellules else 0
+        dimension = ws.row_dimensions.get(numero) if numero in ws.row_dimensions else None
+        attributs_ligne = ""
+        if dimension is not None and dimension.ht:
+            attributs_ligne += f' table:style-name="{styles.ligne(dimension.ht)}"'
+        if dimension is not None and dimension.hidden:
+            attributs_ligne += ' table:visibility="collapse"'
+
+        xml_cellules = []
+        for cellule in cellules:
+            position = (numero, cellule.column)
+            style = styles.cellule(cellule)
+            valeur = cellule.value
+            if position in couvertes:
+                xml = "<table:covered-table-cell/>"
+            elif valeur is None and position not in fusions:
+                xml = f'<table:table-cell table:style-name="{style}"/>' if style else "<table:table-cell/>"
+            else:
+                if isinstance(valeur, str) and cellule.data_type == "f":
+                    attribut_style = f' table:style-name="{style}"' if style else ""
+                    xml = f'<table:table-cell{attribut_style} table:formula="{_echapper(formule_ods(valeur), True)}"/>'
+                elif cellule.data_type == "f":
+                    xml = _cellule_valeur(getattr(valeur, "text", None) or str(valeur), style)
+                else:
+                    xml = _cellule_valeur(valeur, style)
+                if position in fusions:
+                    lignes, colonnes_fusion = fusions[position]
+                    xml = xml.replace("<table:table-cell", f'<table:table-cell table:number-rows-spanned="{lignes}" '
+                                                            f'table:number-columns-spanned="{colonnes_fusion}"', 1)
+            if xml_cellules and xml_cellules[-1][0] == xml and not xml.endswith("</table:table-cell>"):
+                xml_cellules[-1][1] += 1
+            else:
+                xml_cellules.append([xml, 1])
+
+        # Cellules vides sans style en fin de ligne : inutiles
+        if xml_cellules and xml_cellules[-1][0] == "<table:table-cell/>":
+            xml_cellules.pop()
+        if not xml_cellules and not attributs_ligne:
+            lignes_vides += 1
+            continue
+        if lignes_vides:
+            yield f'<table:table-row table:number-rows-repeated="{lignes_vides}"><table:table-cell/></table:table-row>'
+            lignes_vides = 0
+        contenu = "".join(
+            xml if nombre == 1 else xml.replace("<table:table-cell", f'<table:table-cell table:number-columns-repeated="{nombre}"', 1)
+            for xml, nombre in xml_cellules
+        ) or "<table:table-cell/>"
+        yield f"<table:table-row{attributs_ligne}>{contenu}</table:table-row>"
+
+    yield "</table:table>"
+
+
+def _xml_lignes(lignes, styles_colonnes=None):
+    """
+    Produit le XML des lignes d'une feuille en flux, par blocs de LIGNES_PAR_BLOC lignes.
+
+    Args:
+        lignes (iterable): Lignes de la feuille, en-tête compris.
+        styles_colonnes (dict, optional): Style des cellules de données de certaines colonnes {index: style}.
+    """
+    bloc = []
+    lignes = iter(lignes)
+    if styles_colonnes:
+        bloc.append("<table:table-row>" + "".join(map(_cellule_valeur, next(lignes, []))) + "</table:table-row>")
+    for ligne in lignes:
+        if styles_colonnes:
+            cellules = "".join(_cellule_valeur(valeur, styles_colonnes.get(index)) for index, valeur in enumerate(ligne))
+        else:
+            cellules = "".join(map(_cellule_valeur, ligne))
+        bloc.append("<table:table-row>" + cellules + "</table:table-row>")
+        if len(bloc) >= LIGNES_PAR_BLOC:
+            yield "".join(bloc)
+            bloc = []
+    if bloc:
+        yield "".join(bloc)
+
+
+def _xml_feuille_flux(ws, styles_colonnes=None):
+    yield f'<table:table table:name="{_echapper(ws.title, True)}"><table:table-column table:default-cell-style-name="Default"/>'
+    yield from _xml_lignes(ws.fonction(*ws.args), styles_colonnes)
+    yield "</table:table>"
+
+
+def _rendre_lignes(fonction, args, styles_colonnes=None):
+    """
+    Rend le XML des lignes d'une feuille en flux dans un processus de calcul.
+
+    Returns:
+        str: Fichier temporaire contenant les lignes.
+    """
+    descripteur, chemin = tempfile.mkstemp(prefix='star_guardian.', suffix='.xml')
+    with os.fdopen(descripteur, 'w', encoding='utf-8') as fichier:
+        for morceau in _xml_lignes(fonction(*args), styles_colonnes):
+            fichier.write(morceau)
+    return chemin
+
+
+def _manifeste():
+    entrees = "".join(
+        f'<manifest:file-entry manifest:full-path="{nom}" manifest:media-type="text/xml"/>'
+        for nom in ("content.xml", "styles.xml", "meta.xml")
+    )
+    return ('<?xml version="1.0" encoding="UTF-8"?>'
+            '<manifest:manifest xmlns:manifest="urn:oasis:names:tc:opendocument:xmlns:manifest:1.0" manifest:version="1.2">'
+            f'<manifest:file-entry manifest:full-path="/" manifest:version="1.2" manifest:media-type="{MIMETYPE}"/>'
+            f'{entrees}</manifest:manifest>')
+
+
+def _styles_document():
+    return ('<?xml version="1.0" encoding="UTF-8"?>'
+            f'<office:document-styles {NAMESPACES}><office:styles>'
+            '<style:default-style style:family="table-cell"><style:text-properties fo:font-size="11pt"/></style:default-style>'
+            '<style:style style:name="Default" style:family="table-cell"/>'
+            '</office:styles></office:document-styles>')
+
+
+def _meta():
+    maintenant = datetime.now().replace(microsecond=0).isoformat()
+    # Générateur autre que LibreOffice : les formules sont recalculées à l'ouverture
+    return ('<?xml version="1.0" encoding="UTF-8"?>'
+            f'<office:document-meta {NAMESPACES}><office:meta>'
+            '<meta:generator>Star Guardian</meta:generator>'
+            f'<meta:creation-date>{maintenant}</meta:creation-date>'
+            '</office:meta></office:document-meta>')
+
+
+def enregistrer_ods(wb, chemin, workers=None):
+    """
+    Enregistre le classeur au format OpenDocument (.ods) en une seule passe,
+    sans passer par un fichier .xlsx intermédiaire.
+
+    Les feuilles ordinaires (ex: STATISTIQUES) gardent leurs valeurs, leurs
+    formules (traduites en OpenFormula) et leur mise en forme (polices,
+    remplissages, bordures, alignements, formats de nombre, largeurs de
+    colonnes, hauteurs de lignes). Les feuilles en flux (FeuilleFlux) sont
+    écrites directement dans content.xml depuis leur fonction, comme pour
+    Excel ; les plus grosses sont rendues dans des processus séparés.
+    Les graphiques du modèle ne sont pas repris.
+
+    Args:
+        wb (Workbook): Classeur à enregistrer.
+        chemin (str): Chemin du fichier .ods.
+        workers (int, optional): Nombre de processus. Si None, un par cœur ; 1 pour tout rendre ici.
+    """
+    feuilles = [ws for ws in wb.worksheets if isinstance(ws, FeuilleFlux) and not ws.closed]
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = min(workers, len(feuilles))
+
+    # Les styles doivent précéder les feuilles dans content.xml : les feuilles
+    # ordinaires (petites, déjà en mémoire) sont rendues avant les feuilles en flux
+    styles = _Styles(getattr(wb, "loaded_theme", None))
+    ordinaires = {ws.title: "".join(_xml_feuille(ws, styles)) for ws in wb.worksheets if not isinstance(ws, FeuilleFlux)}
+    # Formats de nombre des colonnes des feuilles en flux
+    styles_colonnes = {}
+    for ws in feuilles:
+        colonnes = {index: styles.format_colonne(format_nombre) for index, format_nombre in ws.formats.items()}
+        styles_colonnes[ws.title] = {index: nom for index, nom in colonnes.items() if nom}
+
+    executor = None
+    rendus = {}
+    try:
+        if workers > 1 and sum(ws.taille for ws in feuilles) >= SEUIL_PARALLELE:
+            try:
+                executor = ProcessPoolExecutor(max_workers=workers)
+                rendus = {ws.title: executor.submit(_rendre_lignes, ws.fonction, ws.args, styles_colonnes[ws.title])
+                           for ws in feuilles}
+            except OSError as e:
+                print(f"Rendu parallèle indisponible ({e}), rendu séquentiel des feuilles.")
+
+        with ZipFile(chemin, 'w', ZIP_DEFLATED, allowZip64=True) as archive:
+            # Le type MIME doit être la première entrée, non compressée
+            archive.writestr("mimetype", MIMETYPE, compress_type=ZIP_STORED)
+            archive.writestr("META-INF/manifest.xml", _manifeste())
+            archive.writestr("styles.xml", _styles_document())
+            archive.writestr("meta.xml", _meta())
+
+            with archive.open("content.xml", "w", force_zip64=True) as contenu:
+                contenu.write(('<?xml version="1.0" encoding="UTF-8"?>'
+                               f'<office:document-content {NAMESPACES}>'
+                               f'{styles.declarations_polices()}{styles.styles_automatiques()}'
+                               '<office:body><office:spreadsheet>').encode('utf-8'))
+                for ws in wb.worksheets:
+                    if ws.title in ordinaires:
+                        contenu.write(ordinaires.pop(ws.title).encode('utf-8'))
+                    elif isinstance(ws, FeuilleFlux):
+                        _ecrire_feuille_flux(contenu, ws, rendus.get(ws.title), styles_colonnes.get(ws.title))
+                contenu.write(b'</office:spreadsheet></office:body></office:document-content>')
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+            # Fichiers rendus mais non utilisés (erreur pendant l'enregistrement)
+            for rendu in rendus.values():
+                if rendu.done() and rendu.exception() is None and os.path.exists(rendu.result()):
+                    os.remove(rendu.result())
+
+
+def _ecrire_feuille_flux(contenu, ws, rendu=None, styles_colonnes=None):
+    """
+    Écrit une feuille en flux dans content.xml, depuis son rendu parallèle s'il
+    a réussi, sinon depuis sa fonction.
+    """
+    chemin = None
+    if rendu is not None:
+        try:
+            chemin = rendu.result()
+        except (OSError, BrokenProcessPool) as e:
+            print(f"Rendu parallèle de la feuille {ws.title} impossible ({e}), rendu séquentiel.")
+
+    if chemin is None:
+        for morceau in _xml_feuille_flux(ws, styles_colonnes):
+            contenu.write(morceau.encode('utf-8'))
+    else:
+        contenu.write(f'<table:table table:name="{_echapper(ws.title, True)}">'
+                      '<table:table-column table:default-cell-style-name="Default"/>'.encode('utf-8'))
+        with open(chemin, 'rb') as fichier:
+            shutil.copyfileobj(fichier, contenu)
+        os.remove(chemin)
+        contenu.write(b'</table:table>')
@@ -6,6 +6,7 @@ from collections import defaultdict
 from typing import Dict, List, Set, Optional, Tuple
 
 from backend.script_extraction.ScriptAnalyzerABS import BaseAnalyzer
+from backend.script_extraction.AnalysisGraph import RESULTAT_CONJONCTIONS, RESULTAT_TABLE
 from backend.script_extraction.Conjonction import ConjunctionAnalyzer
 
 class SatelliteAgeAnalyzer(ConjunctionAnalyzer):
@@ -13,59 +14,49 @@ class SatelliteAgeAnalyzer(ConjunctionAnalyzer):
     Classe pour analyser l'âge des satellites impliqués dans les conjonctions.
     """
     
-    def __init__(self, input, output, ws, wb):
-        super().__init__(input, output, ws, wb)
+    DEPENDANCES = (RESULTAT_TABLE, RESULTAT_CONJONCTIONS)
+    
+    def __init__(self, input, output, ws, wb, table=None):
+        super().__init__(input, output, ws, wb, table)
         # Dictionnaire pour stocker le nombre de satellites par catégorie d'âge
         self.age_counts = defaultdict(int)
         # Pour stocker les satellites déjà comptés (éviter les doublons)
         self.processed_satellites = set()
     
-    def extract_satellite_data(self, file_path: str) -> Tuple[str, str, int]:
+    def extract_satellite_data(self, row: int) -> Tuple[str, str, int]:
         """
-        Extrait l'identifiant international du satellite OBJECT2 depuis un fichier CDM.
+        Extrait l'identifiant international du satellite OBJECT2 d'une ligne de la table.
         
         Args:
-            file_path (str): Chemin du fichier à analyser.
+            row (int): Index de la ligne (fichier) à analyser.
             
         Returns:
             tuple: (file_name, international_designator, age)
         """
-        file_name = os.path.basename(file_path)
-        international_designator = None
+        table = self.get_table()
+        file_name = table.filenames[row]
+        international_designator = table.value(row, 'INTERNATIONAL_DESIGNATOR', 'OBJECT2')
         age = None
         
-        try:
-            with open(file_path, 'r', encoding='utf-8') as file:
-                content = file.read()
-                
-                # Rechercher l'identifiant international dans la section OBJECT2
-                id_match = re.search(r'OBJECT\s*=\s*OBJECT2.*?INTERNATIONAL_DESIGNATOR\s*=\s*([^\s]+)', 
-                                    content, re.DOTALL)
+        if international_designator:
+            # Extraire l'année depuis l'identifiant international (format YYYY-NNNX)
+            try:
+                year_str = international_designator.split('-')[0]
+                if len(year_str) == 2:  # Format ancien (YY-NNNX)
+                    year = int(year_str)
+                    # Ajuster pour le siècle (supposer 19xx pour les années > 50, 20xx pour <= 50)
+                    if year > 50:
+                        year += 1900
+                    else:
+                        year += 2000
+                else:  # Format moderne (YYYY-NNNX)
+                    year = int(year_str)
                 
-                if id_match:
-                    international_designator = id_match.group(1).strip()
-                    
-                    # Extraire l'année depuis l'identifiant international (format YYYY-NNNX)
-                    try:
-                        year_str = international_designator.split('-')[0]
-                        if len(year_str) == 2:  # Format ancien (YY-NNNX)
-                            year = int(year_str)
-                            # Ajuster pour le siècle (supposer 19xx pour les années > 50, 20xx pour <= 50)
-                            if year > 50:
-                                year += 1900
-                            else:
-                                year += 2000
-                        else:  # Format moderne (YYYY-NNNX)
-                            year = int(year_str)
-                        
-                        # Calculer l'âge en années
-                        current_year = datetime.now().year
-                        age = current_year - year
-                    except (ValueError, IndexError):
-                        print(f"Format d'identifiant international invalide: {international_designator}")
-        
-        except Exception as e:
-            print(f"Erreur lors de la lecture du fichier {file_path}: {str(e)}")
+                # Calculer l'âge en années
+                current_year = datetime.now().year
+                age = current_year - year
+            except (ValueError, IndexError):
+                print(f"Format d'identifiant international invalide: {international_designator}")
         
         return (file_name, international_designator, age)
     
@@ -107,21 +98,21 @@ class SatelliteAgeAnalyzer(ConjunctionAnalyzer):
         self.age_counts = defaultdict(int)
         self.processed_satellites = set()
         
-        # Extraire d'abord les conjonctions si ce n'est pas déjà fait
+        # Groupes de conjonction partagés (calculés une seule fois par analyse)
         if not self.conjunctions:
-            self.process_data()
+            super().process_data()
         
         # Pour chaque groupe de conjonction, analyser le premier fichier
+        table = self.get_table()
         for group_id, files in self.conjunctions.items():
             if not files:
                 continue
                 
-            # Prendre le premier fichier du groupe
-            first_file = list(files)[0]
-            file_path = os.path.join(self.input, first_file)
+            # Prendre le premier fichier du groupe (dans l'ordre du dossier)
+            first_file = min(files, key=table.index_of)
             
             # Extraire les données du satellite
-            _, international_designator, age = self.extract_satellite_data(file_path)
+            _, international_designator, age = self.extract_satellite_data(table.index_of(first_file))
             
             # Si nous avons un identifiant international valide et que nous ne l'avons pas déjà traité
             if international_designator and international_designator not in self.processed_satellites:
@@ -139,10 +130,13 @@ class SatelliteAgeAnalyzer(ConjunctionAnalyzer):
         
         return final_counts
     
-    def export_age_to_excel(self):
+    def export_age_to_excel(self, age_counts=None):
         """
         Exporte les résultats d'analyse d'âge dans la colonne AI de la feuille Excel.
         
+        Args:
+            age_counts (dict, optional): Résultats déjà calculés. Si None, l'analyse est effectuée.
+        
         Returns:
             bool: True si l'export a réussi, False sinon.
         """
@@ -151,7 +145,8 @@ class SatelliteAgeAnalyzer(ConjunctionAnalyzer):
             return False
         
         # Obtenir les résultats d'âge
-        age_counts = self.analyze_satellite_ages()
+        if age_counts is None:
+            age_counts = self.analyze_satellite_ages()
         
         # Écrire les résultats dans la colonne AI (colonne 35)
   
@@ -163,11 +158,17 @@ class SatelliteAgeAnalyzer(ConjunctionAnalyzer):
         
         return True
     
+    def calculer(self):
+        return self.analyze_satellite_ages()
+    
+    def exporter(self, age_counts):
+        self.export_age_to_excel(age_counts)
+    
     def process_data(self):
         """
         Surcharge de la méthode process_data pour inclure l'analyse d'âge.
         """
-        # Appeler la méthode de la classe parente pour extraire les conjonctions
+        # Récupérer les conjonctions déjà calculées (sans les regrouper à nouveau)
         super().process_data()
         
         # Analyser les âges des satellites
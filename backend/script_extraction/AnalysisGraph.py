@@ -0,0 +1,224 @@
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+
+# Résultats partagés entre les analyseurs
+RESULTAT_TABLE = "table"                    # Table des CDM analysés (CDMTable)
+RESULTAT_CONJONCTIONS = "conjunctions"      # Groupes de conjonction {id: {fichiers}}
+RESULTAT_OPERATEURS = "operator_mapping"    # Correspondance {opérateur: pays}
+
+# Modes d'exécution des analyseurs indépendants
+MODE_SERIE = "serial"
+MODE_THREADS = "thread"
+MODE_PROCESSUS = "process"
+MODES_EXECUTION = (MODE_SERIE, MODE_THREADS, MODE_PROCESSUS)
+
+# Table des CDM transmise une seule fois à chaque processus de calcul
+_table_processus = None
+
+
+def _initialiser_processus(table):
+    global _table_processus
+    _table_processus = table
+
+
+def _calculer_analyseur(classe, resultats: Dict[str, object]):
+    """
+    Recrée un analyseur dans un processus de calcul et renvoie son résultat.
+
+    Args:
+        classe (type): Classe de l'analyseur.
+        resultats (dict): Résultats partagés dont dépend l'analyseur (hors table).
+
+    Returns:
+        Valeur renvoyée par calculer().
+    """
+    analyseur = classe(None, None, None, None, _table_processus)
+    analyseur.resultats.update(resultats)
+    return analyseur.calculer()
+
+
+class AnalysisGraph:
+    """
+    Graphe d'exécution d'une analyse.
+
+    Chaque nœud est un résultat nommé (table des CDM, groupes de conjonction,
+    correspondance opérateur-pays, ou étape d'un analyseur) qui déclare les
+    résultats dont il dépend. Chaque nœud est calculé une seule fois, après
+    ses dépendances, et sa valeur est transmise aux analyseurs qui la demandent.
+    """
+
+    def __init__(self):
+        self.noeuds: Dict[str, Tuple[Callable, Tuple[str, ...]]] = {}
+        self.resultats: Dict[str, object] = {}
+
+    def fournir(self, nom: str, valeur):
+        """
+        Enregistre un résultat déjà calculé (ex: la table des CDM).
+
+        Args:
+            nom (str): Nom du résultat.
+            valeur: Valeur du résultat.
+        """
+        self.noeuds[nom] = (None, ())
+        self.resultats[nom] = valeur
+
+    def declarer(self, nom: str, fonction: Callable, dependances: Iterable[str] = ()):
+        """
+        Déclare un nœud calculé par une fonction sans argument, exécutée
+        une fois que toutes ses dépendances sont disponibles.
+
+        Args:
+            nom (str): Nom du résultat produit.
+            fonction (callable): Fonction qui calcule le résultat.
+            dependances (iterable): Noms des résultats nécessaires au calcul.
+        """
+        self.noeuds[nom] = (fonction, tuple(dependances))
+        self.resultats.pop(nom, None)
+
+    def ajouter_analyseur(self, nom: str, analyseur, etape: str = "process_data",
+                          dependances: Optional[Iterable[str]] = None):
+        """
+        Déclare une étape d'un analyseur. Par défaut, ses dépendances sont celles
+        déclarées par la classe de l'analyseur (DEPENDANCES), qui lira les résultats
+        partagés dans ce graphe.
+
+        Args:
+            nom (str): Nom de l'étape.
+            analyseur (BaseAnalyzer): Analyseur concerné.
+            etape (str): Méthode de l'analyseur à exécuter.
+            dependances (iterable, optional): Dépendances de l'étape, si différentes de DEPENDANCES.
+        """
+        analyseur.set_graphe(self)
+        self.declarer(nom, getattr(analyseur, etape),
+                      analyseur.DEPENDANCES if dependances is None else dependances)
+
+    def connait(self, nom: str) -> bool:
+        return nom in self.noeuds
+
+    def dependances(self, nom: str) -> Tuple[str, ...]:
+        return self.noeuds[nom][1]
+
+    def ordre(self, noms: Optional[Iterable[str]] = None) -> List[str]:
+        """
+        Renvoie les nœuds à exécuter, dépendances comprises, dans un ordre topologique.
+
+        Args:
+            noms (iterable, optional): Nœuds demandés. Si None, tous les nœuds.
+
+        Returns:
+            list: Noms des nœuds, chaque nœud après ses dépendances.
+        """
+        ordre = []
+        visites = set()
+        en_cours = set()
+
+        def visiter(nom):
+            if nom in visites:
+                return
+            if nom not in self.noeuds:
+                raise KeyError(f"Résultat inconnu dans le graphe d'analyse : {nom}")
+            if nom in en_cours:
+                raise ValueError(f"Dépendance circulaire dans le graphe d'analyse : {nom}")
+            en_cours.add(nom)
+            for dependance in self.noeuds[nom][1]:
+                visiter(dependance)
+            en_cours.discard(nom)
+            visites.add(nom)
+            ordre.append(nom)
+
+        for nom in (self.noeuds if noms is None else noms):
+            visiter(nom)
+        return ordre
+
+    def resultat(self, nom: str):
+        """
+        Renvoie un résultat, en le calculant (avec ses dépendances) s'il ne l'a pas encore été.
+
+        Args:
+            nom (str): Nom du résultat.
+
+        Returns:
+            Valeur du résultat.
+        """
+        if nom not in self.resultats:
+            for noeud in self.ordre([nom]):
+                if noeud not in self.resultats:
+                    fonction, _ = self.noeuds[noeud]
+                    self.resultats[noeud] = fonction()
+        return self.resultats[nom]
+
+    def executer(self, noms: Optional[Iterable[str]] = None) -> Dict[str, object]:
+        """
+        Exécute les nœuds demandés et leurs dépendances, chacun une seule fois.
+
+        Args:
+            noms (iterable, optional): Nœuds à exécuter. Si None, tous les nœuds.
+
+        Returns:
+            dict: Résultats des nœuds demandés.
+        """
+        noms = list(self.noeuds if noms is None else noms)
+        return {nom: self.resultat(nom) for nom in noms}
+
+    def invalider(self, nom: str):
+        """
+        Oublie un résultat et tous ceux qui en dépendent, pour qu'ils soient recalculés.
+
+        Args:
+            nom (str): Nom du résultat à invalider.
+        """
+        fonction, _ = self.noeuds.get(nom, (None, ()))
+        # Un résultat fourni ne peut pas être recalculé : seuls ses dépendants sont oubliés
+        if fonction is not None:
+            self.resultats.pop(nom, None)
+        for autre, (_, dependances) in self.noeuds.items():
+            if nom in dependances and autre in self.resultats:
+                self.invalider(autre)
+
+    def calculer_analyseurs(self, analyseurs: Dict[str, object], mode: str = MODE_SERIE,
+                            max_workers: Optional[int] = None) -> Dict[str, object]:
+        """
+        Calcule des analyseurs indépendants les uns des autres.
+
+        Les résultats partagés dont ils dépendent sont d'abord calculés une seule fois,
+        puis les analyseurs sont exécutés l'un après l'autre, dans des threads ou dans
+        des processus. Aucun n'écrit dans le classeur : l'appelant fusionne les résultats
+        avec exporter().
+
+        Args:
+            analyseurs (dict): Analyseurs à calculer, par nom.
+            mode (str): "serial", "thread" ou "process".
+            max_workers (int, optional): Nombre de threads ou de processus. Si None, un par cœur.
+
+        Returns:
+            dict: Valeur renvoyée par calculer() pour chaque analyseur, dans l'ordre demandé.
+        """
+        if mode not in MODES_EXECUTION:
+            raise ValueError(f"Mode d'exécution inconnu : {mode}")
+
+        # Résultats partagés, calculés une fois avant la répartition
+        for analyseur in analyseurs.values():
+            analyseur.set_graphe(self)
+            for dependance in analyseur.DEPENDANCES:
+                self.resultat(dependance)
+
+        if mode == MODE_SERIE or len(analyseurs) < 2:
+            return {nom: analyseur.calculer() for nom, analyseur in analyseurs.items()}
+
+        if mode == MODE_THREADS:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = {nom: executor.submit(analyseur.calculer) for nom, analyseur in analyseurs.items()}
+                return {nom: future.result() for nom, future in futures.items()}
+
+        # Processus : la table est envoyée une fois par processus, les analyseurs y sont recréés
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_initialiser_processus,
+                                 initargs=(self.resultat(RESULTAT_TABLE),)) as executor:
+            futures = {
+                nom: executor.submit(_calculer_analyseur, type(analyseur), {
+                    dependance: self.resultat(dependance)
+                    for dependance in analyseur.DEPENDANCES if dependance != RESULTAT_TABLE
+                })
+                for nom, analyseur in analyseurs.items()
+            }
+            return {nom: future.result() for nom, future in futures.items()}
@@ -0,0 +1,204 @@
+import hashlib
+import marshal
+import os
+import sqlite3
+from typing import Dict, List, Optional, Tuple
+
+from backend.script_extraction.CDMParser import CDMRecord
+
+
+# Version du format stocké : à incrémenter si CDMRecord.to_state() change
+FORMAT_CACHE = 1
+
+# Dossier des fichiers cache (un fichier par dossier de CDM analysé). Le cache
+# n'est pas placé dans le dossier d'entrée pour ne pas fausser le comptage des
+# fichiers ni gêner le tri des CDM.
+DOSSIER_CACHE_UTILISATEUR = os.path.join(os.path.expanduser("~"), ".star_guardian", "cache")
+
+# Nombre maximal de paramètres par requête SQLite
+_TAILLE_LOT = 900
+
+
+class CDMCache:
+    """
+    Cache persistant des CDM déjà analysés, stocké dans une base SQLite.
+
+    Chaque enregistrement est indexé par le chemin du fichier, sa taille et sa
+    date de modification : un fichier modifié est automatiquement ré-analysé.
+    Le nombre d'entrées est borné, les moins récemment utilisées sont évincées.
+    """
+
+    def __init__(self, chemin_base: str, taille_max: int = 200000):
+        """
+        Ouvre (ou crée) la base du cache.
+
+        Args:
+            chemin_base (str): Chemin du fichier SQLite.
+            taille_max (int): Nombre maximal d'enregistrements conservés.
+        """
+        self.chemin_base = chemin_base
+        self.taille_max = taille_max
+        self.hits = 0
+        self.misses = 0
+
+        self.connexion = sqlite3.connect(chemin_base)
+        self.connexion.execute("PRAGMA journal_mode=WAL")
+        self.connexion.execute("PRAGMA synchronous=NORMAL")
+        self.connexion.execute(
+            "CREATE TABLE IF NOT EXISTS cdm_cache ("
+            " path TEXT PRIMARY KEY,"
+            " size INTEGER NOT NULL,"
+            " mtime_ns INTEGER NOT NULL,"
+            " format INTEGER NOT NULL,"
+            " last_access INTEGER NOT NULL,"
+            " data BLOB NOT NULL)"
+        )
+        self.connexion.execute("CREATE INDEX IF NOT EXISTS idx_cdm_cache_access ON cdm_cache(last_access)")
+        self.connexion.commit()
+
+        # Compteur d'accès utilisé pour l'éviction LRU
+        ligne = self.connexion.execute("SELECT COALESCE(MAX(last_access), 0) FROM cdm_cache").fetchone()
+        self._tick = ligne[0] + 1
+
+    @classmethod
+    def pour_dossier(cls, dossier: str, taille_max: int = 200000) -> Optional["CDMCache"]:
+        """
+        Ouvre le cache associé à un dossier de CDM.
+
+        Args:
+            dossier (str): Dossier contenant les CDM.
+            taille_max (int): Nombre maximal d'enregistrements conservés.
+
+        Returns:
+            CDMCache or None: Cache ouvert, ou None si le cache n'est pas utilisable.
+        """
+        if not dossier or not os.path.isdir(dossier):
+            return None
+
+        empreinte = hashlib.sha1(os.path.abspath(dossier).encode('utf-8')).hexdigest()[:16]
+        chemin_base = os.path.join(DOSSIER_CACHE_UTILISATEUR, f"{empreinte}.sqlite")
+
+        try:
+            os.makedirs(DOSSIER_CACHE_UTILISATEUR, exist_ok=True)
+            return cls(chemin_base, taille_max)
+        except (OSError, sqlite3.Error) as e:
+            print(f"Cache indisponible ({chemin_base}): {e}")
+            return None
+
+    def lire(self, fichiers: List[Tuple[str, int, int]]) -> Dict[str, CDMRecord]:
+        """
+        Recherche des fichiers dans le cache.
+
+        Args:
+            fichiers (list): Liste de tuples (chemin, taille, mtime_ns).
+
+        Returns:
+            dict: Enregistrements trouvés et encore valides {chemin: CDMRecord}.
+        """
+        trouves = {}
+        attendus = {os.path.abspath(chemin): (chemin, taille, mtime_ns) for chemin, taille, mtime_ns in fichiers}
+        cles = list(attendus)
+
+        for debut in range(0, len(cles), _TAILLE_LOT):
+            lot = cles[debut:debut + _TAILLE_LOT]
+            requete = (
+                "SELECT path, size, mtime_ns, format, data FROM cdm_cache WHERE path IN (%s)"
+                % ",".join("?" * len(lot))
+            )
+            for path, size, mtime_ns, format_cache, data in self.connexion.execute(requete, lot):
+                chemin, taille, mtime_attendu = attendus[path]
+                if size != taille or mtime_ns != mtime_attendu or format_cache != FORMAT_CACHE:
+                    continue
+                try:
+                    trouves[chemin] = CDMRecord.from_state(marshal.loads(data))
+                except (EOFError, ValueError, TypeError):
+                    continue
+
+        self.hits += len(trouves)
+        self.misses += len(fichiers) - len(trouves)
+
+        # Marquer les entrées utilisées pour l'éviction LRU
+        if trouves:
+            self.connexion.executemany(
+                "UPDATE cdm_cache SET last_access = ? WHERE path = ?",
+                [(self._tick, os.path.abspath(chemin)) for chemin in trouves]
+            )
+            self.connexion.commit()
+        self._tick += 1
+
+        return trouves
+
+    def ecrire(self, entrees: List[Tuple[str, int, int, CDMRecord]]):
+        """
+        Ajoute ou remplace des enregistrements dans le cache, puis applique
+        la limite de taille.
+
+        Args:
+            entrees (list): Liste de tuples (chemin, taille, mtime_ns, CDMRecord).
+        """
+        self.ecrire_etats([
+            (chemin, taille, mtime_ns, marshal.dumps(record.to_state()))
+            for chemin, taille, mtime_ns, record in entrees
+        ])
+
+    def ecrire_etats(self, entrees: List[Tuple[str, int, int, bytes]]):
+        """
+        Ajoute ou remplace des enregistrements déjà sérialisés (marshal de CDMRecord.to_state()),
+        par exemple par les processus d'analyse, puis applique la limite de taille.
+
+        Args:
+            entrees (list): Liste de tuples (chemin, taille, mtime_ns, données).
+        """
+        if not entrees:
+            return
+
+        self.connexion.executemany(
+            "INSERT OR REPLACE INTO cdm_cache (path, size, mtime_ns, format, last_access, data) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            [
+                (os.path.abspath(chemin), taille, mtime_ns, FORMAT_CACHE, self._tick, data)
+                for chemin, taille, mtime_ns, data in entrees
+            ]
+        )
+        self._tick += 1
+        self.evincer()
+        self.connexion.commit()
+
+    def evincer(self):
+        """
+        Supprime les entrées les moins récemment utilisées au-delà de taille_max.
+        """
+        nombre = self.connexion.execute("SELECT COUNT(*) FROM cdm_cache").fetchone()[0]
+        excedent = nombre - self.taille_max
+        if excedent > 0:
+            self.connexion.execute(
+                "DELETE FROM cdm_cache WHERE path IN "
+                "(SELECT path FROM cdm_cache ORDER BY last_access ASC LIMIT ?)",
+                (excedent,)
+            )
+
+    def vider(self):
+        """
+        Supprime toutes les entrées du cache.
+        """
+        self.connexion.execute("DELETE FROM cdm_cache")
+        self.connexion.commit()
+
+    def statistiques(self) -> dict:
+        """
+        Renvoie les compteurs du cache.
+
+        Returns:
+            dict: Nombre de hits, de misses et d'entrées stockées.
+        """
+        entrees = self.connexion.execute("SELECT COUNT(*) FROM cdm_cache").fetchone()[0]
+        return {"hits": self.hits, "misses": self.misses, "entrees": entrees}
+
+    def fermer(self):
+        """
+        Ferme la connexion à la base.
+        """
+        try:
+            self.connexion.close()
+        except sqlite3.Error:
+            pass
@@ -0,0 +1,195 @@
+from typing import Iterable, Optional
+
+import numpy as np
+
+
+# Époque manquante ou invalide (NaT)
+EPOQUE_ABSENTE = np.iinfo(np.int64).min
+
+# Formes d'époque CCSDS reconnues
+FORME_INVALIDE = 0
+FORME_CALENDAIRE = 1    # YYYY-MM-DDThh:mm:ss[.d...][Z]
+FORME_JOUR_ANNEE = 2    # YYYY-DDDThh:mm:ss[.d...][Z]
+
+# Nombre de chaînes décodées à la fois (borne la taille de la matrice de caractères)
+TAILLE_BLOC = 1 << 16
+
+# Plage représentable en nanosecondes int64
+_ANNEE_MIN = 1678
+_ANNEE_MAX = 2261
+
+_JOURS_MOIS = np.array([0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31], dtype=np.int64)
+
+# Positions des séparateurs et des champs (début, nombre de chiffres) de chaque forme
+_SEPARATEURS = {
+    FORME_CALENDAIRE: ((4, '-'), (7, '-'), (10, 'T'), (13, ':'), (16, ':')),
+    FORME_JOUR_ANNEE: ((4, '-'), (8, 'T'), (11, ':'), (14, ':')),
+}
+_CHAMPS = {
+    FORME_CALENDAIRE: {"annee": (0, 4), "mois": (5, 2), "jour": (8, 2), "heure": (11, 2), "minute": (14, 2), "seconde": (17, 2)},
+    FORME_JOUR_ANNEE: {"annee": (0, 4), "jour": (5, 3), "heure": (9, 2), "minute": (12, 2), "seconde": (15, 2)},
+}
+_DEBUT_FRACTION = {FORME_CALENDAIRE: 19, FORME_JOUR_ANNEE: 17}
+
+
+def _bissextile(annees: np.ndarray) -> np.ndarray:
+    return (annees % 4 == 0) & ((annees % 100 != 0) | (annees % 400 == 0))
+
+
+def _jours_depuis_1970(annees: np.ndarray, mois: np.ndarray, jours: np.ndarray) -> np.ndarray:
+    """
+    Nombre de jours entre le 1970-01-01 et une date du calendrier grégorien.
+    """
+    annees = annees - (mois <= 2)
+    eres = np.floor_divide(annees, 400)
+    annee_ere = annees - eres * 400
+    jour_annee = (153 * ((mois + 9) % 12) + 2) // 5 + jours - 1
+    jour_ere = annee_ere * 365 + annee_ere // 4 - annee_ere // 100 + jour_annee
+    return eres * 146097 + jour_ere - 719468
+
+
+def _lire_champ(chiffres: np.ndarray, debut: int, nombre: int):
+    """
+    Lit un champ numérique de largeur fixe dans la matrice des chiffres.
+
+    Returns:
+        tuple: (valeurs int64, masque des lignes où le champ ne contient que des chiffres)
+    """
+    bloc = chiffres[:, debut:debut + nombre]
+    valide = ((bloc >= 0) & (bloc <= 9)).all(axis=1)
+    valeurs = np.zeros(len(bloc), dtype=np.int64)
+    for colonne in range(nombre):
+        valeurs = valeurs * 10 + bloc[:, colonne]
+    return np.where(valide, valeurs, 0), valide
+
+
+def _decoder_bloc(chaines: np.ndarray):
+    """
+    Décode un bloc de chaînes (tableau numpy de type unicode).
+
+    Returns:
+        tuple: (époques int64, formes, nombres de décimales)
+    """
+    nombre_chaines = len(chaines)
+    largeur = max(chaines.dtype.itemsize // 4, _DEBUT_FRACTION[FORME_CALENDAIRE] + 1)
+    codes = chaines.astype(f'<U{largeur}').view(np.uint32).reshape(nombre_chaines, largeur)
+    # Seuls les caractères ASCII sont significatifs
+    caracteres = np.where(codes < 128, codes, 0).astype(np.int16)
+    longueurs = np.char.str_len(chaines).astype(np.int64)
+
+    # Un suffixe "Z" (UTC) est accepté et ignoré
+    lignes = np.arange(nombre_chaines)
+    dernier = caracteres[lignes, np.maximum(longueurs - 1, 0)]
+    longueurs = longueurs - ((dernier == ord('Z')) & (longueurs > 0))
+
+    chiffres = caracteres - ord('0')
+    positions = np.arange(largeur)
+
+    epoques = np.full(nombre_chaines, EPOQUE_ABSENTE, dtype=np.int64)
+    formes = np.full(nombre_chaines, FORME_INVALIDE, dtype=np.int8)
+    decimales = np.zeros(nombre_chaines, dtype=np.int8)
+
+    for forme in (FORME_CALENDAIRE, FORME_JOUR_ANNEE):
+        debut_fraction = _DEBUT_FRACTION[forme]
+        valide = (formes == FORME_INVALIDE) & (longueurs >= debut_fraction)
+        for position, separateur in _SEPARATEURS[forme]:
+            valide &= caracteres[:, position] == ord(separateur)
+        if not valide.any():
+            continue
+
+        champs = {}
+        for nom, (debut, nombre) in _CHAMPS[forme].items():
+            champs[nom], chiffres_valides = _lire_champ(chiffres, debut, nombre)
+            valide &= chiffres_valides
+
+        annees = champs["annee"]
+        valide &= (annees >= _ANNEE_MIN) & (annees <= _ANNEE_MAX)
+        bissextile = _bissextile(annees)
+        if forme == FORME_CALENDAIRE:
+            mois = np.clip(champs["mois"], 0, 12)
+            valide &= (champs["mois"] >= 1) & (champs["mois"] <= 12)
+            valide &= (champs["jour"] >= 1) & (champs["jour"] <= _JOURS_MOIS[mois] + (bissextile & (mois == 2)))
+            jours = _jours_depuis_1970(annees, np.maximum(mois, 1), champs["jour"])
+        else:
+            valide &= (champs["jour"] >= 1) & (champs["jour"] <= 365 + bissextile)
+            jours = _jours_depuis_1970(annees, np.ones_like(annees), np.ones_like(annees)) + champs["jour"] - 1
+        # La seconde 60 (seconde intercalaire) est admise par le CCSDS
+        valide &= (champs["heure"] <= 23) & (champs["minute"] <= 59) & (champs["seconde"] <= 60)
+
+        # Fraction de seconde facultative : ".d..." jusqu'à la fin de la chaîne
+        avec_fraction = longueurs > debut_fraction
+        valide &= ~avec_fraction | ((caracteres[:, debut_fraction] == ord('.')) & (longueurs > debut_fraction + 1))
+        dans_fraction = (positions > debut_fraction) & (positions[None, :] < longueurs[:, None])
+        valide &= ((chiffres >= 0) & (chiffres <= 9) | ~dans_fraction).all(axis=1)
+        # Seules les neuf premières décimales sont significatives en nanosecondes
+        nanosecondes = np.zeros(nombre_chaines, dtype=np.int64)
+        for rang in range(9):
+            position = debut_fraction + 1 + rang
+            chiffre = chiffres[:, position] if position < largeur else 0
+            nanosecondes = nanosecondes * 10 + np.where(position < longueurs, chiffre, 0)
+
+        secondes = ((jours * 24 + champs["heure"]) * 60 + champs["minute"]) * 60 + champs["seconde"]
+        epoques[valide] = (secondes * 1_000_000_000 + nanosecondes)[valide]
+        formes[valide] = forme
+        decimales[valide] = np.maximum(longueurs - debut_fraction - 1, 0)[valide]
+
+    return epoques, formes, decimales
+
+
+def parse_epochs(values: Iterable[Optional[str]], return_format: bool = False):
+    """
+    Convertit en une passe des dates CCSDS (CREATION_DATE, TCA, ...) en époques
+    int64 (nanosecondes depuis 1970). Les formes calendaire "YYYY-MM-DDThh:mm:ss.d"
+    et jour de l'année "YYYY-DDDThh:mm:ss.d" sont reconnues, avec ou sans fraction
+    de seconde et suffixe "Z".
+
+    Args:
+        values (iterable): Chaînes à décoder (None accepté).
+        return_format (bool): Si True, renvoie aussi la forme et le nombre de décimales.
+
+    Returns:
+        ndarray or tuple: Époques (EPOQUE_ABSENTE si absente ou invalide), ou
+                          (époques, formes, nombres de décimales).
+    """
+    valeurs = np.array(values, dtype=object).reshape(-1)
+    valeurs[np.equal(valeurs, None)] = ''
+    chaines = np.char.strip(valeurs.astype(str)) if len(valeurs) else np.array([], dtype='<U1')
+
+    epoques = np.full(len(chaines), EPOQUE_ABSENTE, dtype=np.int64)
+    formes = np.full(len(chaines), FORME_INVALIDE, dtype=np.int8)
+    decimales = np.zeros(len(chaines), dtype=np.int8)
+    for debut in range(0, len(chaines), TAILLE_BLOC):
+        fin = debut + TAILLE_BLOC
+        epoques[debut:fin], formes[debut:fin], decimales[debut:fin] = _decoder_bloc(chaines[debut:fin])
+
+    if return_format:
+        return epoques, formes, decimales
+    return epoques
+
+
+def parse_epoch(value: Optional[str]) -> Optional[int]:
+    """
+    Convertit une seule date CCSDS en époque (nanosecondes depuis 1970).
+
+    Returns:
+        int or None: Époque, ou None si la date est absente ou invalide.
+    """
+    epoque = int(parse_epochs([value])[0])
+    return None if epoque == EPOQUE_ABSENTE else epoque
+
+
+def format_epochs(epochs: np.ndarray, unit: str = 'us') -> np.ndarray:
+    """
+    Convertit des époques en chaînes ISO "YYYY-MM-DDThh:mm:ss.ffffff".
+
+    Args:
+        epochs (ndarray): Époques int64 en nanosecondes.
+        unit (str): Précision des secondes ('s', 'ms', 'us' ou 'ns').
+
+    Returns:
+        ndarray: Tableau d'objets (None pour les époques absentes).
+    """
+    epochs = np.asarray(epochs, dtype=np.int64)
+    chaines = np.datetime_as_string(epochs.view('datetime64[ns]'), unit=unit).astype(object)
+    chaines[epochs == EPOQUE_ABSENTE] = None
+    return chaines
@@ -0,0 +1,343 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from backend.script_extraction.CDMEpoch import EPOQUE_ABSENTE
+from backend.script_extraction.CDMTable import CDMTable
+
+
+# Version du schéma de la base : à incrémenter si les tables de l'index changent
+FORMAT_INDEX = 3
+
+# Dossier des index (un fichier par dossier de CDM analysé), hors du dossier d'entrée
+DOSSIER_INDEX_UTILISATEUR = os.path.join(os.path.expanduser("~"), ".star_guardian", "index")
+
+# Colonnes indexées : (colonne SQL, clé CDM, section, type)
+COLONNES_INDEX = (
+    ("creation_date", "CREATION_DATE", None, "date"),
+    ("tca", "TCA", None, "date"),
+    ("collision_probability", "COLLISION_PROBABILITY", None, "nombre"),
+    ("miss_distance", "MISS_DISTANCE", None, "nombre"),
+    ("object_designator", "OBJECT_DESIGNATOR", "OBJECT2", "texte"),
+    ("international_designator", "INTERNATIONAL_DESIGNATOR", "OBJECT2", "texte"),
+    ("object_type", "OBJECT_TYPE", "OBJECT2", "texte"),
+    ("operator_organization", "OPERATOR_ORGANIZATION", "OBJECT2", "texte"),
+)
+
+# Opérateurs de comparaison acceptés par compter_categories
+_COMPARAISONS = ("<", "<=", ">", ">=")
+
+
+class CDMIndex:
+    """
+    Index SQLite des CDM d'un dossier.
+
+    Chaque CDM y est une ligne (dans l'ordre de la table) avec les champs utilisés
+    par les statistiques : dates (époques en nanosecondes), probabilité de collision,
+    distance de rapprochement et champs de l'objet secondaire. Les comptages par
+    catégorie, pays ou type d'objet sont des agrégats SQL sur les colonnes indexées,
+    sans relire ni parcourir les fichiers.
+
+    Les comptages par seuils sont aussi enregistrés dans la base : une indexation
+    incrémentale y retire les CDM supprimés et y ajoute les CDM lus.
+    """
+
+    def __init__(self, chemin_base: str):
+        """
+        Ouvre (ou crée) la base de l'index.
+
+        Args:
+            chemin_base (str): Chemin du fichier SQLite.
+        """
+        self.chemin_base = chemin_base
+        # Les analyseurs exécutés dans des threads partagent la connexion
+        self._verrou = threading.Lock()
+
+        self.connexion = sqlite3.connect(chemin_base, check_same_thread=False)
+        self.connexion.execute("PRAGMA journal_mode=WAL")
+        self.connexion.execute("PRAGMA synchronous=NORMAL")
+
+        # Schéma d'une version précédente : la table est reconstruite à la prochaine indexation
+        if self.connexion.execute("PRAGMA user_version").fetchone()[0] != FORMAT_INDEX:
+            self.connexion.execute("DROP TABLE IF EXISTS cdm")
+            self.connexion.execute("DROP TABLE IF EXISTS cdm_etat")
+            self.connexion.execute("DROP TABLE IF EXISTS cdm_categorisation")
+            self.connexion.execute("DROP TABLE IF EXISTS cdm_comptage")
+            self.connexion.execute(f"PRAGMA user_version = {FORMAT_INDEX}")
+
+        colonnes = ",".join(
+            f" {colonne} {'REAL' if type_colonne == 'nombre' else 'INTEGER' if type_colonne == 'date' else 'TEXT'}"
+            for colonne, _, _, type_colonne in COLONNES_INDEX
+        )
+        self.connexion.execute(
+            "CREATE TABLE IF NOT EXISTS cdm ("
+            " filename TEXT PRIMARY KEY,"
+            " ligne INTEGER NOT NULL,"
+            " objet2 INTEGER NOT NULL,"
+            f"{colonnes})"
+        )
+        # Génération du manifeste dont l'index reflète la table (voir ManifesteCDM)
+        self.connexion.execute("CREATE TABLE IF NOT EXISTS cdm_etat (generation TEXT)")
+        # Comptages par seuils déjà demandés (voir compter_categories), tenus à jour par indexer
+        self.connexion.execute(
+            "CREATE TABLE IF NOT EXISTS cdm_categorisation ("
+            " colonne TEXT NOT NULL,"
+            " seuils TEXT NOT NULL,"
+            " PRIMARY KEY (colonne, seuils))"
+        )
+        self.connexion.execute(
+            "CREATE TABLE IF NOT EXISTS cdm_comptage ("
+            " colonne TEXT NOT NULL,"
+            " seuils TEXT NOT NULL,"
+            " categorie TEXT NOT NULL,"
+            " rang INTEGER NOT NULL,"
+            " nombre INTEGER NOT NULL,"
+            " PRIMARY KEY (colonne, seuils, categorie))"
+        )
+        # Fichiers d'un lot de changements (propre à la connexion)
+        self.connexion.execute("CREATE TEMP TABLE IF NOT EXISTS cdm_lot (filename TEXT PRIMARY KEY)")
+        for colonne in ("ligne", "object_designator", "tca", "creation_date", "collision_probability",
+                        "miss_distance", "international_designator"):
+            self.connexion.execute(f"CREATE INDEX IF NOT EXISTS idx_cdm_{colonne} ON cdm({colonne})")
+        self.connexion.commit()
+
+    @classmethod
+    def pour_dossier(cls, dossier: str) -> Optional["CDMIndex"]:
+        """
+        Ouvre l'index associé à un dossier de CDM.
+
+        Args:
+            dossier (str): Dossier contenant les CDM.
+
+        Returns:
+            CDMIndex or None: Index ouvert, ou None si l'index n'est pas utilisable.
+        """
+        if not dossier or not os.path.isdir(dossier):
+            return None
+
+        empreinte = hashlib.sha1(os.path.abspath(dossier).encode('utf-8')).hexdigest()[:16]
+        chemin_base = os.path.join(DOSSIER_INDEX_UTILISATEUR, f"{empreinte}.sqlite")
+        try:
+            os.makedirs(DOSSIER_INDEX_UTILISATEUR, exist_ok=True)
+            return cls(chemin_base)
+        except (OSError, sqlite3.Error) as e:
+            print(f"Index indisponible ({chemin_base}): {e}")
+            return None
+
+    @staticmethod
+    def _valeurs_colonne(table: CDMTable, cle: str, section: Optional[str], type_colonne: str) -> list:
+        """
+        Renvoie les valeurs d'une colonne de la table, None pour les valeurs absentes.
+        """
+        if type_colonne == "date":
+            valeurs = table.epochs(cle, section)
+            return np.where(valeurs == EPOQUE_ABSENTE, None, valeurs.astype(object)).tolist()
+        if type_colonne == "nombre":
+            valeurs = table.numeric(cle, section)
+            return np.where(np.isnan(valeurs), None, valeurs.astype(object)).tolist()
+        codes, categories = table.codes(cle, section)
+        return np.append(categories.astype(object), None)[codes].tolist()
+
+    def _inserer(self, table: CDMTable, rows: Optional[np.ndarray] = None):
+        """
+        Insère des lignes de la table dans l'index.
+
+        Args:
+            table (CDMTable): Table des CDM du dossier.
+            rows (ndarray, optional): Lignes à insérer. Si None, toute la table.
+        """
+        lignes = np.arange(len(table)) if rows is None else rows
+        if rows is not None:
+            table = table.select(rows)
+        colonnes = [
+            self._valeurs_colonne(table, cle, section, type_colonne)
+            for _, cle, section, type_colonne in COLONNES_INDEX
+        ]
+        noms = ", ".join(colonne for colonne, _, _, _ in COLONNES_INDEX)
+        self.connexion.executemany(
+            f"INSERT INTO cdm (filename, ligne, objet2, {noms}) "
+            f"VALUES ({','.join('?' * (len(COLONNES_INDEX) + 3))})",
+            zip(table.filenames.tolist(), lignes.tolist(),
+                table.sections_presentes["OBJECT2"].astype(int).tolist(), *colonnes)
+        )
+
+    def indexer(self, table: CDMTable, manifeste=None):
+        """
+        Met l'index à jour avec la table (une transaction).
+
+        Si l'index reflète la table de l'ingestion précédente du manifeste, seuls les
+        changements de la dernière ingestion y sont appliqués : fichiers retirés, lus,
+        ou dont la ligne a changé. Sinon, son contenu est remplacé par toute la table.
+
+        Args:
+            table (CDMTable): Table des CDM du dossier.
+            manifeste (ManifesteCDM, optional): Manifeste qui a produit la table.
+        """
+        with self._verrou, self.connexion:
+            ligne = self.connexion.execute("SELECT generation FROM cdm_etat").fetchone()
+            generation = ligne[0] if ligne else None
+            if (manifeste is not None and generation is not None
+                    and generation == manifeste.generation_precedente):
+                if manifeste.supprimes:
+                    self._preparer_lot(manifeste.supprimes)
+                    self._ajuster_comptages(-1)
+                    self.connexion.execute("DELETE FROM cdm WHERE filename IN (SELECT filename FROM cdm_lot)")
+                self.connexion.executemany("UPDATE cdm SET ligne = ? WHERE filename = ?", manifeste.lignes_deplacees)
+                if manifeste.modifies:
+                    self._inserer(table, table.rows_of(manifeste.modifies))
+                    self._preparer_lot(manifeste.modifies)
+                    self._ajuster_comptages(1)
+                self.connexion.execute("DELETE FROM cdm_comptage WHERE nombre <= 0")
+            elif manifeste is None or generation != manifeste.generation:
+                self.connexion.execute("DELETE FROM cdm")
+                self.connexion.execute("DELETE FROM cdm_categorisation")
+                self.connexion.execute("DELETE FROM cdm_comptage")
+                self._inserer(table)
+            self.connexion.execute("DELETE FROM cdm_etat")
+            self.connexion.execute("INSERT INTO cdm_etat (generation) VALUES (?)",
+                                   (manifeste.generation if manifeste is not None else None,))
+
+    def _preparer_lot(self, noms):
+        """
+        Remplace le contenu de la table temporaire cdm_lot par des noms de fichiers.
+        """
+        self.connexion.execute("DELETE FROM cdm_lot")
+        self.connexion.executemany("INSERT OR IGNORE INTO cdm_lot (filename) VALUES (?)", ((nom,) for nom in noms))
+
+    def _ajuster_comptages(self, signe: int):
+        """
+        Ajoute (signe 1) ou retire (signe -1) les CDM du lot des comptages enregistrés.
+        """
+        categorisations = self.connexion.execute("SELECT colonne, seuils FROM cdm_categorisation").fetchall()
+        for colonne, cle in categorisations:
+            seuils, defaut = json.loads(cle)
+            for categorie, rang, nombre in self._agreger(colonne, seuils, defaut,
+                                                         "filename IN (SELECT filename FROM cdm_lot)"):
+                self.connexion.execute(
+                    "INSERT INTO cdm_comptage (colonne, seuils, categorie, rang, nombre) VALUES (?, ?, ?, ?, ?)"
+                    " ON CONFLICT (colonne, seuils, categorie) DO UPDATE SET nombre = nombre + excluded.nombre",
+                    (colonne, cle, categorie, rang, signe * nombre)
+                )
+
+    def _agreger(self, colonne: str, seuils: Sequence, defaut: str, condition: str = "1") -> List[tuple]:
+        """
+        Compte les CDM par catégorie d'une colonne numérique, sur les lignes qui respectent
+        une condition SQL.
+
+        Returns:
+            list: Tuples (catégorie, rang, nombre). Le rang est celui du premier seuil
+                  de la catégorie, le nombre de seuils pour la catégorie par défaut.
+        """
+        rangs = {}
+        for rang, (_, _, categorie) in enumerate(seuils):
+            rangs.setdefault(categorie, rang)
+        rangs.setdefault(defaut, len(seuils))
+
+        cas = []
+        parametres = []
+        for comparaison, seuil, categorie in seuils:
+            cas.append(f"WHEN {colonne} {comparaison} ? THEN ?")
+            parametres.extend((seuil, categorie))
+        parametres.append(defaut)
+        comptages = self.connexion.execute(
+            f"SELECT CASE {' '.join(cas)} ELSE ? END AS categorie, COUNT(*) FROM cdm "
+            f"WHERE {colonne} IS NOT NULL AND {condition} GROUP BY categorie",
+            parametres
+        ).fetchall()
+        return [(categorie, rangs[categorie], nombre) for categorie, nombre in comptages]
+
+    def _requete(self, requete: str, parametres: Sequence = ()) -> List[tuple]:
+        with self._verrou:
+            return self.connexion.execute(requete, parametres).fetchall()
+
+    def nombre(self) -> int:
+        """
+        Renvoie le nombre de CDM indexés.
+        """
+        return self._requete("SELECT COUNT(*) FROM cdm")[0][0]
+
+    def compter_categories(self, colonne: str, seuils: Sequence[Tuple[str, float, str]],
+                           defaut: str) -> List[Tuple[str, int]]:
+        """
+        Compte les CDM par catégorie d'une colonne numérique (valeurs absentes exclues).
+        Les seuils sont testés dans l'ordre, comme np.select.
+
+        Le premier appel pour des seuils parcourt la table cdm et enregistre le résultat.
+        Les appels suivants lisent les comptages enregistrés, tenus à jour par indexer.
+
+        Args:
+            colonne (str): Colonne numérique ("collision_probability" ou "miss_distance").
+            seuils (list): Tuples (comparaison, seuil, catégorie), ex: (">=", 1e-4, "≥1E-4").
+            defaut (str): Catégorie des valeurs qui ne respectent aucun seuil.
+
+        Returns:
+            list: Tuples (catégorie, nombre) des catégories présentes, dans l'ordre des seuils
+                  puis la catégorie par défaut.
+        """
+        if colonne not in ("collision_probability", "miss_distance"):
+            raise ValueError(f"Colonne non numérique : {colonne}")
+        for comparaison, _, _ in seuils:
+            if comparaison not in _COMPARAISONS:
+                raise ValueError(f"Comparaison inconnue : {comparaison}")
+        cle = json.dumps([[list(seuil) for seuil in seuils], defaut])
+
+        with self._verrou, self.connexion:
+            if not self.connexion.execute("SELECT 1 FROM cdm_categorisation WHERE colonne = ? AND seuils = ?",
+                                          (colonne, cle)).fetchone():
+                self.connexion.execute("INSERT INTO cdm_categorisation (colonne, seuils) VALUES (?, ?)",
+                                       (colonne, cle))
+                self.connexion.executemany(
+                    "INSERT INTO cdm_comptage (colonne, seuils, categorie, rang, nombre) VALUES (?, ?, ?, ?, ?)",
+                    ((colonne, cle, categorie, rang, nombre)
+                     for categorie, rang, nombre in self._agreger(colonne, seuils, defaut))
+                )
+            return self.connexion.execute(
+                "SELECT categorie, nombre FROM cdm_comptage WHERE colonne = ? AND seuils = ?"
+                " AND nombre > 0 ORDER BY rang",
+                (colonne, cle)
+            ).fetchall()
+
+    def types_objets(self) -> List[str]:
+        """
+        Renvoie le type de l'objet secondaire de chaque INTERNATIONAL_DESIGNATOR distinct
+        (première ligne du désignateur dont le type est renseigné, hors "NONE").
+
+        Returns:
+            list: Types d'objets, dans l'ordre des fichiers.
+        """
+        return [type_objet for type_objet, in self._requete(
+            "SELECT object_type FROM cdm WHERE ligne IN ("
+            " SELECT MIN(ligne) FROM cdm"
+            " WHERE object_type IS NOT NULL AND object_type NOT IN ('', 'NONE')"
+            " AND international_designator IS NOT NULL"
+            " GROUP BY international_designator)"
+            " ORDER BY ligne"
+        )]
+
+    def compter_operateurs(self) -> List[Tuple[str, int]]:
+        """
+        Compte les OPERATOR_ORGANIZATION des objets secondaires, une seule fois par
+        INTERNATIONAL_DESIGNATOR (les CDM sans désignateur sont tous comptés).
+
+        Returns:
+            list: Tuples (opérateur, nombre), dans l'ordre de première apparition.
+        """
+        return self._requete(
+            "SELECT operator_organization, COUNT(*) FROM cdm"
+            " WHERE objet2 AND operator_organization IS NOT NULL"
+            " AND (international_designator IS NULL OR international_designator = ''"
+            "  OR ligne IN (SELECT MIN(ligne) FROM cdm WHERE objet2 AND international_designator <> ''"
+            "   GROUP BY international_designator))"
+            " GROUP BY operator_organization ORDER BY MIN(ligne)"
+        )
+
+    def fermer(self):
+        """
+        Ferme la connexion à la base.
+        """
+        self.connexion.close()
@@ -0,0 +1,421 @@
+import hashlib
+import os
+import pickle
+import sqlite3
+import uuid
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from backend.script_extraction import CDMParser
+from backend.script_extraction.CDMTable import CDMTable, ColonneCategorielle
+from backend.script_extraction.RegroupeurConjonctions import RegroupeurConjonctions
+
+
+# Version du format des manifestes : à incrémenter si leur schéma ou CDMTable change
+FORMAT_MANIFESTE = 4
+
+# Dossier des manifestes (un fichier par dossier de CDM analysé), hors du dossier d'entrée
+DOSSIER_MANIFESTES = os.path.join(os.path.expanduser("~"), ".star_guardian", "manifestes")
+
+# Nombre maximal de segments de table : au-delà, ils sont fusionnés en un seul
+SEGMENTS_MAX = 16
+
+
+def empreinte_fichier(chemin: str) -> Optional[str]:
+    """
+    Calcule l'empreinte du contenu d'un fichier.
+
+    Args:
+        chemin (str): Chemin du fichier.
+
+    Returns:
+        str or None: Empreinte SHA-1, ou None si le fichier n'est pas lisible.
+    """
+    empreinte = hashlib.sha1()
+    try:
+        with open(chemin, 'rb') as fichier:
+            for bloc in iter(lambda: fichier.read(1 << 20), b''):
+                empreinte.update(bloc)
+    except OSError:
+        return None
+    return empreinte.hexdigest()
+
+
+class ManifesteCDM:
+    """
+    Manifeste des CDM déjà ingérés d'un dossier, stocké dans une base SQLite.
+
+    Pour chaque fichier, le manifeste garde son nom, sa taille, sa date de
+    modification, l'empreinte de son contenu et l'emplacement de sa ligne : un
+    segment (table en colonnes des fichiers lus par une ingestion) et la ligne
+    dans ce segment. La table du dossier est réassemblée à partir des lignes
+    encore valides des segments. Les groupes de conjonction sont gardés par
+    objet secondaire, et les événements de conjonction dans un regroupeur en
+    ligne (RegroupeurConjonctions) auquel chaque ingestion ajoute les fichiers lus.
+
+    Une nouvelle ingestion ne lit que les fichiers ajoutés ou dont le contenu a
+    changé, et son enregistrement n'écrit que ces changements : un segment pour
+    les fichiers lus, les lignes des fichiers touchés et les groupes recalculés.
+    """
+
+    def __init__(self, dossier: str, chemin: Optional[str] = None):
+        """
+        Args:
+            dossier (str): Dossier des CDM.
+            chemin (str, optional): Fichier du manifeste. Si None, fichier de l'utilisateur
+                                    associé au dossier.
+        """
+        self.dossier = dossier
+        if chemin is None:
+            nom = hashlib.sha1(os.path.abspath(dossier).encode('utf-8')).hexdigest()[:16]
+            chemin = os.path.join(DOSSIER_MANIFESTES, f"{nom}.sqlite")
+        self.chemin = chemin
+
+        # Fichiers ingérés {nom: (taille, mtime_ns, empreinte)} et table correspondante
+        self.fichiers: Dict[str, Tuple[int, int, str]] = {}
+        self.table: Optional[CDMTable] = None
+
+        # Groupes de conjonction de chaque désignateur {désignateur: (fichiers, groupes)}
+        self.groupes: Dict[str, tuple] = {}
+
+        # Génération de la table : change à chaque ingestion qui modifie la table
+        self.generation: Optional[str] = None
+        self.generation_precedente: Optional[str] = None
+
+        # Changements de la dernière ingestion (noms de fichiers)
+        self.modifies = set()
+        self.supprimes = set()
+        self.lignes_deplacees = []
+
+        # Changements à enregistrer : table des fichiers lus, fichiers dont seules la taille
+        # ou la date ont changé, table à réécrire entièrement ; groupes tels qu'enregistrés
+        self._nouvelle: Optional[CDMTable] = None
+        self._identites_changees = set()
+        self._complete = False
+        self._a_enregistrer = False
+        self._groupes_enregistres: Dict[str, tuple] = {}
+
+        # Événements de conjonction des CDM de la table, identifiants stables d'une ingestion à l'autre
+        self.regroupeur: Optional[RegroupeurConjonctions] = None
+        self._regroupeur_a_enregistrer = False
+
+    @classmethod
+    def charger(cls, dossier: str, chemin: Optional[str] = None) -> "ManifesteCDM":
+        """
+        Lit le manifeste d'un dossier. Un manifeste absent, illisible ou d'un autre
+        format donne un manifeste vide : tous les fichiers seront lus.
+
+        Args:
+            dossier (str): Dossier des CDM.
+            chemin (str, optional): Fichier du manifeste.
+
+        Returns:
+            ManifesteCDM: Manifeste du dossier.
+        """
+        manifeste = cls(dossier, chemin)
+        if not os.path.exists(manifeste.chemin):
+            return manifeste
+        try:
+            connexion = sqlite3.connect(manifeste.chemin)
+            try:
+                manifeste._lire(connexion)
+            finally:
+                connexion.close()
+        except Exception as e:
+            print(f"Manifeste illisible ({manifeste.chemin}), tous les fichiers seront lus: {e}")
+            return cls(dossier, chemin)
+        return manifeste
+
+    def _lire(self, connexion: sqlite3.Connection):
+        """
+        Lit les fichiers, la table et les groupes enregistrés. Une table qui ne peut pas
+        être réassemblée laisse le manifeste vide.
+        """
+        if connexion.execute("PRAGMA user_version").fetchone()[0] != FORMAT_MANIFESTE:
+            return
+        lignes = connexion.execute(
+            "SELECT nom, taille, mtime_ns, empreinte, segment, ligne_segment FROM fichier ORDER BY ligne"
+        ).fetchall()
+        if not lignes:
+            return
+        segments = {identifiant: pickle.loads(data)
+                    for identifiant, data in connexion.execute("SELECT id, data FROM segment")}
+        table = self._assembler_segments(segments, [(segment, ligne) for *_, segment, ligne in lignes])
+        if table is None or table.filenames.tolist() != [nom for nom, *_ in lignes]:
+            print("Manifeste CDM : la table enregistrée ne peut pas être réassemblée, lecture complète.")
+            return
+
+        self.table = table
+        self.fichiers = {nom: (taille, mtime_ns, empreinte) for nom, taille, mtime_ns, empreinte, _, _ in lignes}
+        self.groupes = {designateur: pickle.loads(data)
+                        for designateur, data in connexion.execute("SELECT designateur, data FROM groupe")}
+        self._groupes_enregistres = dict(self.groupes)
+        etat = connexion.execute("SELECT generation FROM etat").fetchone()
+        self.generation = etat[0] if etat else None
+        regroupeur = connexion.execute("SELECT data FROM regroupeur").fetchone()
+        self.regroupeur = pickle.loads(regroupeur[0]) if regroupeur else None
+
+    @staticmethod
+    def _assembler_segments(segments: Dict[int, CDMTable], emplacements: List[Tuple[int, int]]
+                            ) -> Optional[CDMTable]:
+        """
+        Réassemble la table à partir des segments.
+
+        Args:
+            segments (dict): Tables des segments {identifiant: CDMTable}.
+            emplacements (list): (segment, ligne dans le segment) de chaque ligne de la table.
+
+        Returns:
+            CDMTable or None: Table, ou None si elle ne peut pas être réassemblée
+                              (voir CDMTable.sans_lignes).
+        """
+        identifiants = sorted(segments)
+        tables = [segments[identifiant] for identifiant in identifiants]
+        decalages = dict(zip(identifiants, np.cumsum([0] + [len(table) for table in tables]).tolist()))
+        total = sum(len(table) for table in tables)
+        if any(segment not in segments or not 0 <= ligne < len(segments[segment]) for segment, ligne in emplacements):
+            return None
+
+        # Lignes valides dans l'ordre de la table, puis lignes des fichiers retirés ou relus
+        valides = np.array([decalages[segment] + ligne for segment, ligne in emplacements], dtype=np.int64)
+        if len(tables) == 1 and total == len(valides) and (valides == np.arange(total)).all():
+            return tables[0]
+        retirees = np.setdiff1d(np.arange(total), valides)
+        table = CDMTable.concatener(tables, np.concatenate([valides, retirees]))
+        return table.sans_lignes(np.arange(len(valides), total))
+
+    def enregistrer(self):
+        """
+        Enregistre les changements de la dernière ingestion et les groupes recalculés
+        (une transaction). Les segments sont fusionnés en un seul quand ils sont trop
+        nombreux ou contiennent surtout des lignes de fichiers retirés ou relus.
+        """
+        if self.table is None:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.chemin), exist_ok=True)
+            connexion = sqlite3.connect(self.chemin)
+            try:
+                with connexion:
+                    self._ecrire(connexion)
+            finally:
+                connexion.close()
+        except (OSError, sqlite3.Error) as e:
+            print(f"Impossible d'enregistrer le manifeste ({self.chemin}): {e}")
+            return
+        self._nouvelle = None
+        self._identites_changees = set()
+        self._complete = False
+        self._a_enregistrer = False
+        self._groupes_enregistres = dict(self.groupes)
+        self._regroupeur_a_enregistrer = False
+
+    def _ecrire(self, connexion: sqlite3.Connection):
+        """
+        Écrit les changements dans la base (voir enregistrer).
+        """
+        complete = self._complete
+        if connexion.execute("PRAGMA user_version").fetchone()[0] != FORMAT_MANIFESTE:
+            for nom in ("fichier", "segment", "groupe", "regroupeur", "etat"):
+                connexion.execute(f"DROP TABLE IF EXISTS {nom}")
+            connexion.execute(f"PRAGMA user_version = {FORMAT_MANIFESTE}")
+            complete = True
+        connexion.execute(
+            "CREATE TABLE IF NOT EXISTS fichier ("
+            " nom TEXT PRIMARY KEY, taille INTEGER NOT NULL, mtime_ns INTEGER NOT NULL, empreinte TEXT,"
+            " segment INTEGER NOT NULL, ligne_segment INTEGER NOT NULL, ligne INTEGER NOT NULL)"
+        )
+        connexion.execute("CREATE TABLE IF NOT EXISTS segment (id INTEGER PRIMARY KEY, lignes INTEGER NOT NULL, data BLOB NOT NULL)")
+        connexion.execute("CREATE TABLE IF NOT EXISTS groupe (designateur TEXT PRIMARY KEY, data BLOB NOT NULL)")
+        connexion.execute("CREATE TABLE IF NOT EXISTS regroupeur (data BLOB NOT NULL)")
+        connexion.execute("CREATE TABLE IF NOT EXISTS etat (generation TEXT)")
+
+        if complete:
+            # Table entièrement relue (ou manifeste d'un autre format) : tout est réécrit
+            for nom in ("fichier", "segment", "groupe"):
+                connexion.execute(f"DELETE FROM {nom}")
+            self._groupes_enregistres = {}
+            self._ecrire_segment(connexion, self.table, self.table.filenames.tolist())
+        else:
+            connexion.executemany("DELETE FROM fichier WHERE nom = ?", ((nom,) for nom in self.supprimes))
+            if self._nouvelle is not None and len(self._nouvelle):
+                self._ecrire_segment(connexion, self._nouvelle, self._nouvelle.filenames.tolist())
+            connexion.executemany("UPDATE fichier SET ligne = ? WHERE nom = ?", self.lignes_deplacees)
+            connexion.executemany(
+                "UPDATE fichier SET taille = ?, mtime_ns = ? WHERE nom = ?",
+                ((*self.fichiers[nom][:2], nom) for nom in self._identites_changees)
+            )
+
+            # Fusion des segments : la table est alors écrite en un seul segment
+            nombre, lignes = connexion.execute("SELECT COUNT(*), COALESCE(SUM(lignes), 0) FROM segment").fetchone()
+            if nombre > SEGMENTS_MAX or lignes > 2 * len(self.table):
+                connexion.execute("DELETE FROM segment")
+                self._ecrire_segment(connexion, self.table, self.table.filenames.tolist())
+
+        # Groupes des désignateurs recalculés ou disparus
+        connexion.executemany(
+            "DELETE FROM groupe WHERE designateur = ?",
+            ((designateur,) for designateur in self._groupes_enregistres if designateur not in self.groupes)
+        )
+        connexion.executemany(
+            "INSERT OR REPLACE INTO groupe (designateur, data) VALUES (?, ?)",
+            ((designateur, pickle.dumps(groupes, protocol=pickle.HIGHEST_PROTOCOL))
+             for designateur, groupes in self.groupes.items()
+             if self._groupes_enregistres.get(designateur) != groupes)
+        )
+        if (complete or self._regroupeur_a_enregistrer) and self.regroupeur is not None:
+            connexion.execute("DELETE FROM regroupeur")
+            connexion.execute("INSERT INTO regroupeur (data) VALUES (?)",
+                              (pickle.dumps(self.regroupeur, protocol=pickle.HIGHEST_PROTOCOL),))
+        connexion.execute("DELETE FROM etat")
+        connexion.execute("INSERT INTO etat (generation) VALUES (?)", (self.generation,))
+
+    def _ecrire_segment(self, connexion: sqlite3.Connection, segment: CDMTable, noms: List[str]):
+        """
+        Ajoute un segment et y place les lignes de ses fichiers.
+        """
+        curseur = connexion.execute(
+            "INSERT INTO segment (lignes, data) VALUES (?, ?)",
+            (len(segment), pickle.dumps(segment, protocol=pickle.HIGHEST_PROTOCOL))
+        )
+        connexion.executemany(
+            "INSERT OR REPLACE INTO fichier (nom, taille, mtime_ns, empreinte, segment, ligne_segment, ligne) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            ((nom, *self.fichiers[nom], curseur.lastrowid, ligne_segment, self.table.index_of(nom))
+             for ligne_segment, nom in enumerate(noms))
+        )
+
+    def ingerer(self, cache=None, workers: Optional[int] = None, progression=None) -> CDMTable:
+        """
+        Met à jour la table avec le contenu actuel du dossier.
+
+        Un fichier dont la taille et la date de modification n'ont pas changé est repris
+        de la table enregistrée ; sinon, son contenu est comparé à l'empreinte du
+        manifeste. Seuls les fichiers nouveaux ou modifiés sont lus, puis fusionnés
+        dans l'ordre du dossier : la table est identique à une lecture complète.
+
+        Args:
+            cache (CDMCache, optional): Cache des CDM utilisé pour les fichiers à lire.
+            workers (int, optional): Nombre de processus de lecture.
+            progression (callable, optional): Voir CDMTable.from_files.
+
+        Returns:
+            CDMTable: Table de tous les CDM du dossier.
+        """
+        precedente = self.table
+        fichiers = CDMParser.identify_files(CDMParser.list_files(self.dossier))
+
+        noms = []
+        lignes_gardees = []
+        positions_gardees = []
+        a_lire = []
+        entrees = {}
+        identites_changees = set()
+        for position, (chemin, taille, mtime_ns) in enumerate(fichiers):
+            nom = os.path.basename(chemin)
+            noms.append(nom)
+            connu = self.fichiers.get(nom)
+            ligne = precedente.index_of(nom) if connu is not None and precedente is not None else None
+            if ligne is not None and connu[:2] == (taille, mtime_ns):
+                entrees[nom] = connu
+            else:
+                # Fichier nouveau ou touché : seul un contenu différent est relu
+                empreinte = empreinte_fichier(chemin)
+                if ligne is not None and empreinte == connu[2]:
+                    entrees[nom] = (taille, mtime_ns, empreinte)
+                    identites_changees.add(nom)
+                else:
+                    a_lire.append((chemin, (taille, mtime_ns, empreinte)))
+                    continue
+            lignes_gardees.append(ligne)
+            positions_gardees.append(position)
+
+        lignes_gardees = np.array(lignes_gardees, dtype=np.int64)
+        positions_gardees = np.array(positions_gardees, dtype=np.int64)
+        nombre_precedent = len(precedente) if precedente is not None else 0
+        retirees = np.setdiff1d(np.arange(nombre_precedent), lignes_gardees)
+
+        base = None
+        # Les changements d'une ingestion non enregistrée ne sont pas connus un par un
+        complete = precedente is None or self._a_enregistrer
+        if precedente is not None:
+            # Lignes gardées dans l'ordre de la table enregistrée
+            tri = np.argsort(lignes_gardees, kind='stable')
+            lignes_gardees, positions_gardees = lignes_gardees[tri], positions_gardees[tri]
+            base = precedente.sans_lignes(retirees)
+        if base is None and len(lignes_gardees):
+            # Table enregistrée inutilisable : tout relire
+            print("Manifeste CDM : la table enregistrée ne peut pas être mise à jour, lecture complète.")
+            a_lire = [(fichiers[position][0], entrees[noms[position]]) for position in positions_gardees.tolist()] + a_lire
+            lignes_gardees = positions_gardees = np.array([], dtype=np.int64)
+            retirees = np.arange(nombre_precedent)
+            identites_changees = set()
+            complete = True
+
+        self.generation_precedente = self.generation
+        self.modifies = set()
+        self.supprimes = set(precedente.filenames[retirees].tolist()) if precedente is not None else set()
+        self.lignes_deplacees = []
+        self._identites_changees = identites_changees
+        self._nouvelle = None
+        self._complete = complete
+        self._a_enregistrer = complete or bool(identites_changees)
+
+        if not a_lire and not len(retirees) and (np.diff(positions_gardees) > 0).all():
+            # Aucun changement : la table enregistrée est reprise telle quelle
+            if progression is not None:
+                progression(len(fichiers), len(fichiers))
+            self.fichiers = entrees
+            if self.generation is None:
+                self.generation = uuid.uuid4().hex
+            if self.regroupeur is None:
+                self.regroupeur = RegroupeurConjonctions.depuis_table(self.table)
+                self._regroupeur_a_enregistrer = True
+            return self.table
+
+        # Les colonnes déjà gardées en texte le restent pour les nouveaux fichiers
+        categorielles = None
+        if base is not None:
+            categorielles = {cle for cle, colonne in base.colonnes.items() if isinstance(colonne, ColonneCategorielle)}
+        nouvelle = CDMTable.from_files([chemin for chemin, _ in a_lire], cache=cache, workers=workers,
+                                       progression=progression, categorielles=categorielles)
+        identites = {os.path.basename(chemin): identite for chemin, identite in a_lire}
+        for nom in nouvelle.filenames.tolist():
+            entrees[nom] = identites[nom]
+        self.modifies = set(nouvelle.filenames.tolist())
+        self._nouvelle = nouvelle
+
+        # Fusion dans l'ordre actuel du dossier
+        position_nom = {nom: position for position, nom in enumerate(noms)}
+        positions = np.concatenate([
+            positions_gardees,
+            np.array([position_nom[nom] for nom in nouvelle.filenames.tolist()], dtype=np.int64),
+        ])
+        ordre = np.argsort(positions, kind='stable')
+        tables = [base, nouvelle] if base is not None else [nouvelle]
+        self.table = CDMTable.concatener(tables, ordre)
+
+        # Fichiers gardés dont la ligne a changé, avec leur nouvelle ligne (index SQLite)
+        if base is not None:
+            rang = np.empty(len(ordre), dtype=np.int64)
+            rang[ordre] = np.arange(len(ordre))
+            nouvelles_lignes = rang[:len(base)]
+            deplacees = np.flatnonzero(nouvelles_lignes != lignes_gardees)
+            self.lignes_deplacees = list(zip(nouvelles_lignes[deplacees].tolist(),
+                                             base.filenames[deplacees].tolist()))
+
+        # Les fichiers lus sont ajoutés aux événements ; un fichier retiré ou relu
+        # ne peut pas en être enlevé, les événements sont alors recalculés
+        if self.regroupeur is not None and not self.supprimes:
+            self.regroupeur.ajouter_table(nouvelle)
+        else:
+            self.regroupeur = RegroupeurConjonctions.depuis_table(self.table)
+        self._regroupeur_a_enregistrer = True
+
+        self.fichiers = entrees
+        self.generation = uuid.uuid4().hex
+        self._a_enregistrer = True
+        print(f"Manifeste CDM : {len(self.modifies)} fichiers lus, {len(self.supprimes)} retirés, "
+              f"{len(lignes_gardees)} repris")
+        return self.table
@@ -0,0 +1,375 @@
+import mmap
+import os
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+# Sections objets d'un CDM (format KVN)
+SECTIONS_OBJETS = ("OBJECT1", "OBJECT2")
+
+# Unités entre crochets à retirer des lignes (ex: "[m]", "[m**2]")
+_UNITE_PATTERN = re.compile(rb'\[.*?\]')
+
+# Clé des commentaires d'inclinaison ("COMMENT Inclination = 97.5 [deg]")
+CLE_INCLINAISON = "COMMENT Inclination"
+
+# Clés déjà décodées (le vocabulaire d'un CDM est très réduit)
+_CLES_DECODEES: Dict[bytes, str] = {}
+
+
+@lru_cache(maxsize=64)
+def _motifs_cles(keys: frozenset):
+    """
+    Compile les motifs repérant les lignes "CLE = valeur" des seules clés demandées
+    (plus les lignes "OBJECT = ..." qui délimitent les sections).
+
+    Returns:
+        tuple: (motif de la première ligne, motif des lignes suivantes)
+    """
+    alternatives = b'|'.join(re.escape(key) for key in sorted(keys | {b'OBJECT'}, key=len, reverse=True))
+    ligne = rb'[ \t]*(' + alternatives + rb')[ \t]*=([^=\r\n]*)(?=[\r\n]|\Z)'
+    # Le préfixe littéral "\n" permet au moteur de sauter directement d'une ligne à l'autre
+    return re.compile(ligne), re.compile(rb'\n' + ligne)
+
+
+class CDMRecord:
+    """
+    Représentation structurée d'un fichier CDM lu une seule fois.
+
+    L'en-tête (métadonnées du message et données relatives) et les sections
+    OBJECT1 et OBJECT2 sont conservés séparément. Les valeurs sont stockées
+    sans leurs unités, et les champs numériques usuels sont exposés typés.
+    """
+
+    __slots__ = ("filename", "header", "objects")
+
+    def __init__(self, filename: str, header: Optional[Dict[str, str]] = None,
+                 objects: Optional[Dict[str, Dict[str, str]]] = None):
+        """
+        Initialise l'enregistrement.
+
+        Args:
+            filename (str): Nom du fichier CDM (sans le dossier).
+            header (dict, optional): Clés situées avant la première section objet.
+            objects (dict, optional): Mapping {"OBJECT1": {...}, "OBJECT2": {...}}.
+        """
+        self.filename = filename
+        self.header = header if header is not None else {}
+        self.objects = objects if objects is not None else {section: {} for section in SECTIONS_OBJETS}
+
+    def __repr__(self):
+        return f"CDMRecord({self.filename!r})"
+
+    @property
+    def object1(self) -> Dict[str, str]:
+        return self.objects.get("OBJECT1", {})
+
+    @property
+    def object2(self) -> Dict[str, str]:
+        return self.objects.get("OBJECT2", {})
+
+    def get(self, key: str, section: Optional[str] = None, default=None):
+        """
+        Renvoie la valeur brute d'une clé.
+
+        Args:
+            key (str): Clé à rechercher (ex: "MISS_DISTANCE").
+            section (str, optional): Section où chercher la clé (ex: "OBJECT2").
+                                     Si None, cherche dans l'ordre du fichier.
+            default: Valeur par défaut si la clé n'est pas trouvée.
+
+        Returns:
+            str: Valeur trouvée ou la valeur par défaut.
+        """
+        if section is not None:
+            return self.objects.get(section, {}).get(key, default)
+
+        if key in self.header:
+            return self.header[key]
+        for section_name in SECTIONS_OBJETS:
+            values = self.objects.get(section_name, {})
+            if key in values:
+                return values[key]
+        return default
+
+    def get_float(self, key: str, section: Optional[str] = None, default=None):
+        """
+        Renvoie la valeur d'une clé convertie en nombre.
+
+        Returns:
+            float: Valeur numérique ou la valeur par défaut si absente ou invalide.
+        """
+        value = self.get(key, section)
+        if value is None:
+            return default
+        try:
+            return float(value)
+        except ValueError:
+            return default
+
+    @property
+    def creation_date(self) -> Optional[str]:
+        return self.header.get("CREATION_DATE")
+
+    @property
+    def tca(self) -> Optional[str]:
+        return self.header.get("TCA")
+
+    @property
+    def collision_probability(self) -> Optional[float]:
+        return self.get_float("COLLISION_PROBABILITY")
+
+    @property
+    def miss_distance(self) -> Optional[float]:
+        value = self.get("MISS_DISTANCE")
+        if value is None:
+            return None
+        # Ne garder que les chiffres et le point décimal
+        clean_value = ''.join(c for c in value if c.isdigit() or c == '.')
+        try:
+            return float(clean_value)
+        except ValueError:
+            return None
+
+    def inclination(self, section: str = "OBJECT2") -> Optional[float]:
+        """
+        Renvoie l'inclinaison indiquée en commentaire dans la section objet.
+
+        Args:
+            section (str): Section objet ("OBJECT1" ou "OBJECT2").
+
+        Returns:
+            float or None: Inclinaison en degrés.
+        """
+        return self.get_float(CLE_INCLINAISON, section)
+
+    def to_state(self) -> tuple:
+        """
+        Renvoie une forme compacte de l'enregistrement (tuples de chaînes),
+        utilisée pour la sérialisation (cache, échanges entre processus).
+
+        Returns:
+            tuple: (filename, clés/valeurs de l'en-tête, clés/valeurs de chaque section)
+        """
+        return (
+            self.filename,
+            tuple(self.header.items()),
+            tuple((section, tuple(values.items())) for section, values in self.objects.items()),
+        )
+
+    @classmethod
+    def from_state(cls, state: tuple) -> "CDMRecord":
+        """
+        Reconstruit un enregistrement à partir de sa forme compacte.
+
+        Args:
+            state (tuple): Valeur renvoyée par to_state().
+
+        Returns:
+            CDMRecord: Enregistrement reconstruit.
+        """
+        filename, header, objects = state
+        return cls(filename, dict(header), {section: dict(values) for section, values in objects})
+
+    def as_dict(self) -> Dict[str, str]:
+        """
+        Aplatit l'enregistrement en un seul dictionnaire, dans l'ordre du fichier.
+        Comme dans l'export historique, une clé présente dans les deux objets
+        prend la valeur de la dernière section (OBJECT2).
+
+        Returns:
+            dict: Dictionnaire {clé: valeur}.
+        """
+        data = dict(self.header)
+        for section_name in SECTIONS_OBJETS:
+            data.update(self.objects.get(section_name, {}))
+        return data
+
+
+def parse_bytes(content, filename: str = "", keys: Optional[Iterable[str]] = None) -> CDMRecord:
+    """
+    Construit un enregistrement à partir du contenu binaire d'un CDM.
+
+    Les couples "CLE = valeur [unité]" sont repérés directement sur les octets.
+    Sans liste de clés, les unités sont retirées en une seule passe puis toutes
+    les lignes sont découpées. Avec une liste de clés, seules les lignes de ces
+    clés sont recherchées et seules leurs valeurs sont décodées.
+
+    Args:
+        content (bytes or mmap): Contenu du fichier.
+        filename (str): Nom du fichier d'origine.
+        keys (iterable, optional): Clés à conserver. Si None, toutes les clés sont conservées.
+
+    Returns:
+        CDMRecord: Enregistrement structuré.
+    """
+    if keys is None:
+        pairs = (line.split(b'=') for line in _UNITE_PATTERN.sub(b'', content).splitlines())
+    else:
+        premiere_ligne, lignes_suivantes = _motifs_cles(frozenset(key.encode('utf-8') for key in keys))
+        match = premiere_ligne.match(content)
+        pairs = ([match.groups()] if match else []) + lignes_suivantes.findall(content)
+
+    cles_decodees = _CLES_DECODEES
+    record = CDMRecord(filename)
+    objects = record.objects
+    current = record.header
+
+    for parts in pairs:
+        if len(parts) != 2:
+            continue
+        raw_key, raw_value = parts
+        raw_key = raw_key.strip()
+        if not raw_key:
+            continue
+        if keys is not None and b'[' in raw_value:
+            raw_value = _UNITE_PATTERN.sub(b'', raw_value)
+        value = raw_value.strip().decode('utf-8', errors='replace')
+
+        # Une ligne "OBJECT = OBJECTx" ouvre la section correspondante
+        if raw_key == b'OBJECT' and value in objects:
+            current = objects[value]
+
+        key = cles_decodees.get(raw_key)
+        if key is None:
+            key = cles_decodees[raw_key] = raw_key.decode('utf-8', errors='replace')
+        current[key] = value
+
+    return record
+
+
+def parse_text(content: str, filename: str = "", keys: Optional[Iterable[str]] = None) -> CDMRecord:
+    """
+    Construit un enregistrement à partir du contenu texte d'un CDM.
+
+    Args:
+        content (str): Contenu du fichier.
+        filename (str): Nom du fichier d'origine.
+        keys (iterable, optional): Clés à conserver.
+
+    Returns:
+        CDMRecord: Enregistrement structuré.
+    """
+    return parse_bytes(content.encode('utf-8'), filename, keys)
+
+
+def parse_file(file_path: str, keys: Optional[Iterable[str]] = None) -> CDMRecord:
+    """
+    Lit un fichier CDM une seule fois (projection mémoire) et renvoie son enregistrement.
+
+    Args:
+        file_path (str): Chemin du fichier à analyser.
+        keys (iterable, optional): Clés à conserver. Si None, toutes les clés sont conservées.
+
+    Returns:
+        CDMRecord: Enregistrement structuré.
+    """
+    filename = os.path.basename(file_path)
+    with open(file_path, 'rb') as file:
+        # mmap refuse les fichiers vides
+        if os.fstat(file.fileno()).st_size == 0:
+            return CDMRecord(filename)
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as content:
+            return parse_bytes(content, filename, keys)
+
+
+def identify_files(file_paths) -> List[Tuple[str, int, int]]:
+    """
+    Identifie chaque fichier par sa taille et sa date de modification (clé du cache).
+    Les fichiers inaccessibles sont signalés et ignorés.
+
+    Args:
+        file_paths (list): Chemins des fichiers.
+
+    Returns:
+        list: Tuples (chemin, taille, mtime_ns).
+    """
+    fichiers = []
+    for file_path in file_paths:
+        try:
+            stat = os.stat(file_path)
+        except OSError as e:
+            print(f"Erreur lors de la lecture du fichier {file_path}: {str(e)}")
+            continue
+        fichiers.append((file_path, stat.st_size, stat.st_mtime_ns))
+    return fichiers
+
+
+def parse_files(file_paths, cache=None) -> List[CDMRecord]:
+    """
+    Analyse une liste de fichiers CDM. Les fichiers illisibles sont ignorés.
+
+    Args:
+        file_paths (list): Chemins des fichiers à analyser.
+        cache (CDMCache, optional): Cache persistant ; seuls les fichiers absents
+                                    ou modifiés depuis leur mise en cache sont relus.
+
+    Returns:
+        list: Liste des enregistrements, dans l'ordre des chemins.
+    """
+    if cache is None:
+        records = []
+        for file_path in file_paths:
+            try:
+                records.append(parse_file(file_path))
+            except Exception as e:
+                print(f"Erreur lors de la lecture du fichier {file_path}: {str(e)}")
+        return records
+
+    fichiers = identify_files(file_paths)
+    trouves = cache.lire(fichiers)
+
+    records = []
+    nouveaux = []
+    for file_path, taille, mtime_ns in fichiers:
+        record = trouves.get(file_path)
+        if record is None:
+            try:
+                record = parse_file(file_path)
+            except Exception as e:
+                print(f"Erreur lors de la lecture du fichier {file_path}: {str(e)}")
+                continue
+            nouveaux.append((file_path, taille, mtime_ns, record))
+        records.append(record)
+
+    cache.ecrire(nouveaux)
+    return records
+
+
+def list_files(folder: str, extension: str = ".txt") -> List[str]:
+    """
+    Renvoie les fichiers d'un dossier ayant l'extension demandée.
+
+    Args:
+        folder (str): Dossier à parcourir.
+        extension (str): Extension des fichiers à garder.
+
+    Returns:
+        list: Chemins complets des fichiers, dans l'ordre du système de fichiers.
+    """
+    if not folder or not os.path.isdir(folder):
+        return []
+
+    file_paths = []
+    for file_name in os.listdir(folder):
+        if file_name.endswith(extension):
+            file_path = os.path.join(folder, file_name)
+            if os.path.isfile(file_path):
+                file_paths.append(file_path)
+    return file_paths
+
+
+def parse_folder(folder: str, extension: str = ".txt", cache=None) -> List[CDMRecord]:
+    """
+    Analyse tous les fichiers CDM d'un dossier, chacun lu une seule fois.
+
+    Args:
+        folder (str): Dossier contenant les CDM.
+        extension (str): Extension des fichiers à analyser.
+        cache (CDMCache, optional): Cache persistant des enregistrements.
+
+    Returns:
+        list: Liste des enregistrements.
+    """
+    return parse_files(list_files(folder, extension), cache)
@@ -0,0 +1,88 @@
+import hashlib
+import json
+import os
+import tempfile
+from typing import Optional
+
+
+# Version du format des résumés : à incrémenter si leurs champs changent
+FORMAT_RESUME = 1
+
+# Dossier des résumés (un fichier JSON par dossier de CDM analysé)
+DOSSIER_RESUMES = os.path.join(os.path.expanduser("~"), ".star_guardian", "resumes")
+
+
+def empreinte_dossier(dossier: str) -> Optional[str]:
+    """
+    Calcule l'empreinte du contenu d'un dossier à partir du nom, de la taille et
+    de la date de modification de chaque fichier, sans en lire aucun.
+
+    Args:
+        dossier (str): Dossier des CDM.
+
+    Returns:
+        str or None: Empreinte, ou None si le dossier n'est pas lisible.
+    """
+    try:
+        with os.scandir(dossier) as entrees:
+            fichiers = []
+            for entree in entrees:
+                if entree.is_file():
+                    etat = entree.stat()
+                    fichiers.append((entree.name, etat.st_size, etat.st_mtime_ns))
+    except OSError:
+        return None
+
+    empreinte = hashlib.sha1()
+    for nom, taille, mtime_ns in sorted(fichiers):
+        empreinte.update(f"{nom}\0{taille}\0{mtime_ns}\n".encode('utf-8', 'surrogateescape'))
+    return empreinte.hexdigest()
+
+
+def chemin_resume(dossier: str) -> str:
+    """
+    Renvoie le fichier du résumé associé à un dossier de CDM.
+    """
+    nom = hashlib.sha1(os.path.abspath(dossier).encode('utf-8')).hexdigest()[:16]
+    return os.path.join(DOSSIER_RESUMES, f"{nom}.json")
+
+
+def lire_resume(dossier: str) -> Optional[dict]:
+    """
+    Lit le résumé de la dernière analyse d'un dossier.
+
+    Args:
+        dossier (str): Dossier des CDM.
+
+    Returns:
+        dict or None: Résumé (satellite, fichiers, debut, fin, conjonctions, empreinte),
+                      ou None s'il n'existe pas ou n'est pas lisible.
+    """
+    try:
+        with open(chemin_resume(dossier), 'r', encoding='utf-8') as fichier:
+            resume = json.load(fichier)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(resume, dict) or resume.get("format") != FORMAT_RESUME:
+        return None
+    return resume
+
+
+def ecrire_resume(dossier: str, resume: dict):
+    """
+    Enregistre le résumé d'une analyse (écriture atomique).
+
+    Args:
+        dossier (str): Dossier des CDM.
+        resume (dict): Résumé de l'analyse.
+    """
+    chemin = chemin_resume(dossier)
+    contenu = dict(resume, format=FORMAT_RESUME, dossier=os.path.abspath(dossier))
+    try:
+        os.makedirs(DOSSIER_RESUMES, exist_ok=True)
+        descripteur, temporaire = tempfile.mkstemp(dir=DOSSIER_RESUMES, suffix='.tmp')
+        with os.fdopen(descripteur, 'w', encoding='utf-8') as fichier:
+            json.dump(contenu, fichier, ensure_ascii=False)
+        os.replace(temporaire, chemin)
+    except OSError as e:
+        print(f"Impossible d'enregistrer le résumé de l'analyse ({chemin}): {e}")
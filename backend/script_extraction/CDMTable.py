@@ -0,0 +1,836 @@
+import marshal
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import repeat
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+from backend.script_extraction import CDMParser
+from backend.script_extraction.CDMParser import CDMRecord, SECTIONS_OBJETS, CLE_INCLINAISON
+from backend.script_extraction.CDMEpoch import EPOQUE_ABSENTE, FORME_CALENDAIRE, format_epochs, parse_epochs
+
+
+# Section des clés situées avant les objets (métadonnées et données relatives)
+SECTION_ENTETE = "HEADER"
+SECTIONS = (SECTION_ENTETE,) + SECTIONS_OBJETS
+
+# Clés stockées en float64
+CLES_NUMERIQUES = {
+    "MISS_DISTANCE", "RELATIVE_SPEED", "COLLISION_PROBABILITY",
+    "RELATIVE_POSITION_R", "RELATIVE_POSITION_T", "RELATIVE_POSITION_N",
+    "RELATIVE_VELOCITY_R", "RELATIVE_VELOCITY_T", "RELATIVE_VELOCITY_N",
+    "X", "Y", "Z", "X_DOT", "Y_DOT", "Z_DOT",
+    "AREA_PC", "AREA_DRG", "AREA_SRP", "MASS", "CD_AREA_OVER_MASS", "CR_AREA_OVER_MASS",
+    "THRUST_ACCELERATION", "SEDR", "RECOMMENDED_OD_SPAN", "ACTUAL_OD_SPAN",
+    "RESIDUALS_ACCEPTED", "WEIGHTED_RMS", CLE_INCLINAISON,
+}
+
+# Termes de covariance (CR_R, CT_R, ..., CNDOT_NDOT, CDRG_R, ...)
+_COVARIANCE_PATTERN = re.compile(r'^C(R|T|N|RDOT|TDOT|NDOT|DRG|SRP|THR)_(R|T|N|RDOT|TDOT|NDOT|DRG|SRP|THR)$')
+
+# Clés stockées en époques int64 (nanosecondes depuis 1970)
+CLES_DATES = {
+    "CREATION_DATE", "TCA", "START_SCREEN_PERIOD", "STOP_SCREEN_PERIOD",
+    "SCREEN_ENTRY_TIME", "SCREEN_EXIT_TIME", "TIME_LASTOB_START", "TIME_LASTOB_END",
+}
+
+_UNITES_FRACTION = {0: 's', 3: 'ms', 6: 'us', 9: 'ns'}
+
+# Nombre minimal de fichiers à lire pour répartir l'analyse entre plusieurs processus
+SEUIL_PARALLELE = 2000
+
+# Nombre de lots confiés à chaque processus (équilibre la charge)
+LOTS_PAR_PROCESSUS = 4
+
+# Nombre de fichiers lus entre deux appels de la fonction de progression (lecture séquentielle)
+PAS_PROGRESSION = 50
+
+
+def est_cle_numerique(key: str) -> bool:
+    return key in CLES_NUMERIQUES or _COVARIANCE_PATTERN.match(key) is not None
+
+
+def _sans_progression(traites, total):
+    pass
+
+
+def _type_codes(nombre_categories: int):
+    """Renvoie le plus petit type entier capable de stocker les codes."""
+    for dtype in (np.int8, np.int16, np.int32):
+        if nombre_categories < np.iinfo(dtype).max:
+            return dtype
+    return np.int64
+
+
+class ColonneCategorielle:
+    """
+    Colonne de chaînes stockée sous forme de codes entiers (-1 = absente)
+    et d'une table des valeurs distinctes.
+    """
+
+    __slots__ = ("codes", "categories")
+
+    def __init__(self, codes: np.ndarray, categories: np.ndarray):
+        self.codes = codes
+        self.categories = categories
+
+    @classmethod
+    def construire(cls, nombre_lignes: int, lignes: List[int], valeurs: List[str]) -> "ColonneCategorielle":
+        codes_valeurs, categories = pd.factorize(np.array(valeurs, dtype=object))
+        codes = np.full(nombre_lignes, -1, dtype=_type_codes(len(categories)))
+        codes[lignes] = codes_valeurs
+        return cls(codes, np.asarray(categories, dtype=object))
+
+    @property
+    def presente(self) -> np.ndarray:
+        return self.codes >= 0
+
+    @property
+    def nbytes(self) -> int:
+        return self.codes.nbytes + sum(len(value) for value in self.categories)
+
+    def chaines(self) -> np.ndarray:
+        # La dernière case reçoit les codes -1 (valeur absente)
+        valeurs = np.append(self.categories, None)
+        return valeurs[self.codes]
+
+    def nombres(self) -> np.ndarray:
+        converties = np.full(len(self.categories) + 1, np.nan)
+        for index, value in enumerate(self.categories):
+            try:
+                converties[index] = float(value)
+            except ValueError:
+                pass
+        return converties[self.codes]
+
+    def epoques(self) -> np.ndarray:
+        # Chaque valeur distincte n'est décodée qu'une fois
+        converties = np.append(parse_epochs(self.categories), EPOQUE_ABSENTE)
+        return converties[self.codes]
+
+    def valeurs_export(self) -> np.ndarray:
+        valeurs = np.append(self.categories, np.nan)
+        return valeurs[self.codes]
+
+    def chaine(self, ligne: int) -> Optional[str]:
+        code = self.codes[ligne]
+        return self.categories[code] if code >= 0 else None
+
+
+class ColonneNumerique:
+    """
+    Colonne de nombres stockée en float64 (NaN = absente).
+    Le texte d'origine des valeurs (ex: 5.414583E+03) est gardé en octets pour l'export,
+    sauf si str(float) le restitue déjà à l'identique pour toute la colonne.
+    """
+
+    __slots__ = ("valeurs", "textes")
+
+    def __init__(self, valeurs: np.ndarray, textes: Optional[np.ndarray] = None):
+        self.valeurs = valeurs
+        self.textes = textes
+
+    @classmethod
+    def construire(cls, nombre_lignes: int, lignes: List[int], valeurs: List[str]) -> Optional["ColonneNumerique"]:
+        try:
+            converties = np.array(valeurs, dtype=np.float64)
+            sources = np.array(valeurs, dtype=np.bytes_)
+        except (ValueError, UnicodeEncodeError):
+            return None
+        # NaN représente une valeur absente : un texte "nan" reste une chaîne
+        if np.isnan(converties).any():
+            return None
+        colonne = np.full(nombre_lignes, np.nan)
+        colonne[lignes] = converties
+        textes = None
+        if not (converties.astype(np.bytes_) == sources).all():
+            textes = np.zeros(nombre_lignes, dtype=sources.dtype)
+            textes[lignes] = sources
+        return cls(colonne, textes)
+
+    @property
+    def presente(self) -> np.ndarray:
+        return ~np.isnan(self.valeurs)
+
+    @property
+    def nbytes(self) -> int:
+        return self.valeurs.nbytes + (self.textes.nbytes if self.textes is not None else 0)
+
+    def octets(self) -> np.ndarray:
+        """Renvoie le texte d'origine de chaque valeur en octets (b'' si absente)."""
+        if self.textes is not None:
+            return self.textes
+        textes = self.valeurs.astype(np.bytes_)
+        textes[~self.presente] = b''
+        return textes
+
+    def chaines(self) -> np.ndarray:
+        textes = self.valeurs if self.textes is None else self.textes
+        chaines = textes.astype(str).astype(object)
+        chaines[~self.presente] = None
+        return chaines
+
+    def nombres(self) -> np.ndarray:
+        return self.valeurs
+
+    def epoques(self) -> np.ndarray:
+        return np.full(len(self.valeurs), EPOQUE_ABSENTE, dtype=np.int64)
+
+    def valeurs_export(self) -> np.ndarray:
+        valeurs = self.chaines()
+        valeurs[~self.presente] = np.nan
+        return valeurs
+
+    def chaine(self, ligne: int) -> Optional[str]:
+        value = self.valeurs[ligne]
+        if np.isnan(value):
+            return None
+        return str(value) if self.textes is None else self.textes[ligne].decode()
+
+
+class ColonneDate:
+    """
+    Colonne de dates stockée en époques int64 (nanosecondes, EPOQUE_ABSENTE = absente).
+    Le nombre de décimales des secondes est conservé pour restituer le texte d'origine.
+    """
+
+    __slots__ = ("valeurs", "unite")
+
+    def __init__(self, valeurs: np.ndarray, unite: str):
+        self.valeurs = valeurs
+        self.unite = unite
+
+    @classmethod
+    def construire(cls, nombre_lignes: int, lignes: List[int], valeurs: List[str]) -> Optional["ColonneDate"]:
+        # Toutes les dates doivent partager le même format calendaire pour être restituées à l'identique
+        epoques, formes, decimales = parse_epochs(valeurs, return_format=True)
+        if not len(epoques) or (formes != FORME_CALENDAIRE).any() or (decimales != decimales[0]).any():
+            return None
+        unite = _UNITES_FRACTION.get(int(decimales[0]))
+        if unite is None or not (format_epochs(epoques, unite) == np.array(valeurs, dtype=object)).all():
+            return None
+
+        colonne = np.full(nombre_lignes, EPOQUE_ABSENTE, dtype=np.int64)
+        colonne[lignes] = epoques
+        return cls(colonne, unite)
+
+    @property
+    def presente(self) -> np.ndarray:
+        return self.valeurs != EPOQUE_ABSENTE
+
+    @property
+    def nbytes(self) -> int:
+        return self.valeurs.nbytes
+
+    def chaines(self) -> np.ndarray:
+        return format_epochs(self.valeurs, self.unite)
+
+    def nombres(self) -> np.ndarray:
+        return np.full(len(self.valeurs), np.nan)
+
+    def epoques(self) -> np.ndarray:
+        return self.valeurs
+
+    def valeurs_export(self) -> np.ndarray:
+        valeurs = self.chaines()
+        valeurs[~self.presente] = np.nan
+        return valeurs
+
+    def chaine(self, ligne: int) -> Optional[str]:
+        value = self.valeurs[ligne]
+        if value == EPOQUE_ABSENTE:
+            return None
+        return format_epochs(np.array([value]), self.unite)[0]
+
+
+class CDMTable:
+    """
+    Table en colonnes de tous les CDM d'une campagne.
+
+    Chaque couple (section, clé) est une colonne : float64 pour les grandeurs
+    numériques (distances, probabilités, covariances), époques int64 pour les
+    dates et codes catégoriels pour les noms et désignateurs. La table est
+    partagée par tous les analyseurs et exportateurs.
+    """
+
+    def __init__(self, filenames: np.ndarray, colonnes: Dict[Tuple[str, str], object],
+                 ordre_cles: List[str], sections_presentes: Dict[str, np.ndarray],
+                 premieres_cles: Optional[Dict[str, Tuple[int, int]]] = None):
+        """
+        Initialise la table.
+
+        Args:
+            filenames (ndarray): Nom de fichier de chaque ligne.
+            colonnes (dict): Colonnes indexées par (section, clé).
+            ordre_cles (list): Clés dans l'ordre d'apparition des fichiers (ordre de l'export).
+            sections_presentes (dict): Masque des lignes ayant au moins une clé dans chaque section.
+            premieres_cles (dict, optional): Première apparition de chaque clé
+                                             {clé: (ligne, position dans le fichier)}.
+        """
+        self.filenames = filenames
+        self.colonnes = colonnes
+        self.ordre_cles = ordre_cles
+        self.sections_presentes = sections_presentes
+        self.premieres_cles = premieres_cles if premieres_cles is not None else {}
+        self._index_fichiers = None
+        self._epoques: Dict[Tuple[str, Optional[str]], np.ndarray] = {}
+
+    @classmethod
+    def from_records(cls, records: Iterable[CDMRecord],
+                     categorielles: Optional[Set[Tuple[str, str]]] = None) -> "CDMTable":
+        """
+        Construit la table à partir d'enregistrements CDM.
+
+        Args:
+            records (iterable): Enregistrements CDMRecord.
+            categorielles (set, optional): Colonnes (section, clé) à garder en texte même si
+                                           leurs valeurs sont des nombres ou des dates.
+
+        Returns:
+            CDMTable: Table en colonnes.
+        """
+        filenames = []
+        ordre_cles = {}
+        valeurs: Dict[Tuple[str, str], Tuple[List[int], List[str]]] = {}
+        sections_presentes = {section: [] for section in SECTIONS}
+
+        for ligne, record in enumerate(records):
+            filenames.append(record.filename)
+            position = 0
+            for section, values in ((SECTION_ENTETE, record.header),) + tuple(
+                    (section, record.objects.get(section, {})) for section in SECTIONS_OBJETS):
+                if values:
+                    sections_presentes[section].append(ligne)
+                for key, value in values.items():
+                    if key not in ordre_cles:
+                        ordre_cles[key] = (ligne, position)
+                    position += 1
+                    colonne = valeurs.get((section, key))
+                    if colonne is None:
+                        colonne = valeurs[(section, key)] = ([], [])
+                    colonne[0].append(ligne)
+                    colonne[1].append(value)
+
+        nombre_lignes = len(filenames)
+        colonnes = {}
+        for (section, key), (lignes, values) in valeurs.items():
+            colonne = None
+            if categorielles and (section, key) in categorielles:
+                pass
+            elif key in CLES_DATES:
+                colonne = ColonneDate.construire(nombre_lignes, lignes, values)
+            elif est_cle_numerique(key):
+                colonne = ColonneNumerique.construire(nombre_lignes, lignes, values)
+            if colonne is None:
+                colonne = ColonneCategorielle.construire(nombre_lignes, lignes, values)
+            colonnes[(section, key)] = colonne
+
+        masques = {}
+        for section, lignes in sections_presentes.items():
+            masque = np.zeros(nombre_lignes, dtype=bool)
+            masque[lignes] = True
+            masques[section] = masque
+
+        return cls(np.array(filenames, dtype=object), colonnes, list(ordre_cles), masques, ordre_cles)
+
+    @classmethod
+    def from_files(cls, file_paths, cache=None, workers: Optional[int] = None, progression=None,
+                   categorielles: Optional[Set[Tuple[str, str]]] = None) -> "CDMTable":
+        """
+        Construit la table à partir de fichiers CDM, chacun lu une seule fois.
+
+        Pour les gros dossiers, les fichiers à lire sont répartis par lots entre
+        plusieurs processus. Chaque processus renvoie la table en colonnes de son lot
+        (tableaux numpy et valeurs distinctes), et non des dictionnaires de chaînes.
+        Les tables des lots sont ensuite assemblées dans l'ordre des fichiers.
+        Le résultat est identique à une lecture séquentielle.
+
+        Args:
+            file_paths (list): Chemins des fichiers à analyser.
+            cache (CDMCache, optional): Cache persistant ; seuls les fichiers absents
+                                        ou modifiés depuis leur mise en cache sont relus.
+            workers (int, optional): Nombre de processus. Si None, un par cœur ; 1 pour tout lire ici.
+            progression (callable, optional): Appelée avec (fichiers traités, total) au fil de la
+                                              lecture ; une exception levée par la fonction
+                                              (ex: annulation) interrompt la lecture.
+            categorielles (set, optional): Colonnes à garder en texte (voir from_records).
+
+        Returns:
+            CDMTable: Table en colonnes, une ligne par fichier lisible.
+        """
+        file_paths = list(file_paths)
+        if progression is None:
+            progression = _sans_progression
+        if cache is None:
+            fichiers = [(file_path, None, None) for file_path in file_paths]
+            trouves = {}
+        else:
+            fichiers = CDMParser.identify_files(file_paths)
+            trouves = cache.lire(fichiers)
+
+        manquants = [index for index, fichier in enumerate(fichiers) if fichier[0] not in trouves]
+        progression(len(trouves), len(fichiers))
+        if workers is None:
+            workers = os.cpu_count() or 1
+        workers = min(workers, len(manquants) // LOTS_PAR_PROCESSUS)
+
+        resultats = None
+        if workers > 1 and len(manquants) >= SEUIL_PARALLELE:
+            taille_lot = -(-len(manquants) // (workers * LOTS_PAR_PROCESSUS))
+            lots = [manquants[debut:debut + taille_lot] for debut in range(0, len(manquants), taille_lot)]
+            try:
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    resultats = []
+                    traites = len(trouves)
+                    for lot, resultat in zip(lots, executor.map(
+                        _table_lot, ([fichiers[index][0] for index in lot] for lot in lots), repeat(cache is not None),
+                        repeat(categorielles)
+                    )):
+                        resultats.append(resultat)
+                        traites += len(lot)
+                        try:
+                            progression(traites, len(fichiers))
+                        except BaseException:
+                            # Ne pas attendre les lots qui n'ont pas commencé
+                            executor.shutdown(wait=False, cancel_futures=True)
+                            raise
+            except (OSError, BrokenProcessPool) as e:
+                print(f"Analyse parallèle indisponible ({e}), lecture séquentielle des fichiers.")
+
+        if resultats is None:
+            # Lecture séquentielle
+            records = []
+            nouveaux = []
+            for numero, (file_path, taille, mtime_ns) in enumerate(fichiers, 1):
+                if numero % PAS_PROGRESSION == 0:
+                    progression(numero, len(fichiers))
+                record = trouves.get(file_path)
+                if record is None:
+                    try:
+                        record = CDMParser.parse_file(file_path)
+                    except Exception as e:
+                        print(f"Erreur lors de la lecture du fichier {file_path}: {str(e)}")
+                        continue
+                    nouveaux.append((file_path, taille, mtime_ns, record))
+                records.append(record)
+            if cache is not None:
+                cache.ecrire(nouveaux)
+            progression(len(fichiers), len(fichiers))
+            return cls.from_records(records, categorielles)
+
+        # Assembler la table des fichiers trouvés dans le cache et celles des lots,
+        # chaque ligne reprenant la position de son fichier dans la liste
+        caches = [index for index, fichier in enumerate(fichiers) if fichier[0] in trouves]
+        tables = [cls.from_records((trouves[fichiers[index][0]] for index in caches), categorielles)]
+        positions = [caches]
+        entrees_cache = []
+        for lot, (table, lus, etats, erreurs) in zip(lots, resultats):
+            for file_path, message in erreurs:
+                print(f"Erreur lors de la lecture du fichier {file_path}: {message}")
+            tables.append(table)
+            positions.append([lot[index] for index in lus])
+            entrees_cache.extend(fichiers[lot[index]] + (etat,) for index, etat in zip(lus, etats))
+
+        positions = np.concatenate([np.asarray(p, dtype=np.int64) for p in positions])
+        table = cls.concatener(tables, np.argsort(positions, kind='stable'))
+
+        if cache is not None:
+            cache.ecrire_etats(entrees_cache)
+        return table
+
+    @classmethod
+    def concatener(cls, tables: List["CDMTable"], ordre: np.ndarray) -> "CDMTable":
+        """
+        Concatène des tables (ex: lots lus en parallèle, CDM déjà ingérés et nouveaux CDM)
+        puis réordonne leurs lignes.
+
+        Les colonnes gardent le type qu'aurait donné une lecture des fichiers en une fois :
+        une colonne devient catégorielle dès qu'une table ne peut pas la typer, avec le
+        texte d'origine des nombres et des dates.
+
+        Args:
+            tables (list): Tables à concaténer.
+            ordre (ndarray): Ligne concaténée placée à chaque position de la table finale.
+
+        Returns:
+            CDMTable: Table concaténée.
+        """
+        tailles = [len(table) for table in tables]
+        decalages = np.cumsum([0] + tailles)
+        total = int(decalages[-1])
+        rang = np.empty(total, dtype=np.int64)
+        rang[ordre] = np.arange(total)
+
+        # Ordre des clés : première ligne où la clé apparaît, puis position dans le fichier
+        premieres_cles = {}
+        for table, decalage in zip(tables, decalages.tolist()):
+            for key, (ligne, position) in table.premieres_cles.items():
+                candidat = (int(rang[decalage + ligne]), position)
+                if key not in premieres_cles or candidat < premieres_cles[key]:
+                    premieres_cles[key] = candidat
+        ordre_cles = sorted(premieres_cles, key=premieres_cles.get)
+
+        colonnes = {}
+        for cle in dict.fromkeys(cle for table in tables for cle in table.colonnes):
+            morceaux = [table.colonnes.get(cle) for table in tables]
+            presents = [morceau for morceau in morceaux if morceau is not None]
+            if all(isinstance(morceau, ColonneNumerique) for morceau in presents):
+                valeurs = np.concatenate([
+                    morceau.valeurs if morceau is not None else np.full(taille, np.nan)
+                    for morceau, taille in zip(morceaux, tailles)
+                ])
+                textes = None
+                if any(morceau.textes is not None for morceau in presents):
+                    textes = np.concatenate([
+                        morceau.octets() if morceau is not None else np.zeros(taille, dtype=np.bytes_)
+                        for morceau, taille in zip(morceaux, tailles)
+                    ])[ordre]
+                colonnes[cle] = ColonneNumerique(valeurs[ordre], textes)
+            elif (all(isinstance(morceau, ColonneDate) for morceau in presents)
+                  and len({morceau.unite for morceau in presents}) == 1):
+                valeurs = np.concatenate([
+                    morceau.valeurs if morceau is not None else np.full(taille, EPOQUE_ABSENTE, dtype=np.int64)
+                    for morceau, taille in zip(morceaux, tailles)
+                ])
+                colonnes[cle] = ColonneDate(valeurs[ordre], presents[0].unite)
+            else:
+                # Les nombres et les dates restituent leur texte d'origine à l'identique
+                chaines = np.concatenate([
+                    morceau.chaines() if morceau is not None else np.full(taille, None, dtype=object)
+                    for morceau, taille in zip(morceaux, tailles)
+                ])[ordre]
+                lignes = np.flatnonzero(np.not_equal(chaines, None))
+                colonnes[cle] = ColonneCategorielle.construire(total, lignes, chaines[lignes])
+
+        filenames = np.concatenate([table.filenames for table in tables])[ordre]
+        sections_presentes = {
+            section: np.concatenate([table.sections_presentes[section] for table in tables])[ordre]
+            for section in SECTIONS
+        }
+        return cls(filenames, colonnes, ordre_cles, sections_presentes, premieres_cles)
+
+    def __getstate__(self):
+        # Les index calculés à la demande ne sont pas transmis (processus, manifeste)
+        etat = self.__dict__.copy()
+        etat["_index_fichiers"] = None
+        etat["_epoques"] = {}
+        return etat
+
+    def __len__(self):
+        return len(self.filenames)
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Taille approximative des données de la table en octets.
+        """
+        return (sum(colonne.nbytes for colonne in self.colonnes.values())
+                + sum(len(filename) for filename in self.filenames))
+
+    def index_of(self, filename: str) -> Optional[int]:
+        """
+        Renvoie l'index de la ligne d'un fichier.
+
+        Args:
+            filename (str): Nom du fichier CDM.
+
+        Returns:
+            int or None: Index de la ligne.
+        """
+        if self._index_fichiers is None:
+            self._index_fichiers = {name: index for index, name in enumerate(self.filenames)}
+        return self._index_fichiers.get(filename)
+
+    def rows_of(self, filenames: Iterable[str]) -> np.ndarray:
+        """
+        Renvoie les index (triés) des lignes correspondant à des noms de fichiers.
+        """
+        index = [self.index_of(filename) for filename in filenames]
+        return np.array(sorted(i for i in index if i is not None), dtype=np.int64)
+
+    def select(self, rows: np.ndarray) -> "CDMTable":
+        """
+        Renvoie une table restreinte à certaines lignes, dans l'ordre donné.
+        Les clés (et donc les colonnes exportées) restent celles de la table complète.
+
+        Args:
+            rows (ndarray): Index des lignes à garder.
+
+        Returns:
+            CDMTable: Nouvelle table.
+        """
+        colonnes = {}
+        for cle, colonne in self.colonnes.items():
+            if isinstance(colonne, ColonneCategorielle):
+                colonnes[cle] = ColonneCategorielle(colonne.codes[rows], colonne.categories)
+            elif isinstance(colonne, ColonneDate):
+                colonnes[cle] = ColonneDate(colonne.valeurs[rows], colonne.unite)
+            else:
+                colonnes[cle] = ColonneNumerique(colonne.valeurs[rows],
+                                                 None if colonne.textes is None else colonne.textes[rows])
+        sections_presentes = {section: masque[rows] for section, masque in self.sections_presentes.items()}
+        return CDMTable(self.filenames[rows], colonnes, list(self.ordre_cles), sections_presentes)
+
+    def sans_lignes(self, rows: np.ndarray) -> Optional["CDMTable"]:
+        """
+        Renvoie la table privée de certaines lignes (fichiers supprimés ou modifiés),
+        telle que l'aurait construite la lecture des seuls fichiers restants.
+
+        Args:
+            rows (ndarray): Index des lignes à retirer.
+
+        Returns:
+            CDMTable or None: Nouvelle table, ou None si une ligne retirée est la première
+                              où apparaît une clé (la position de la clé dans les fichiers
+                              suivants, qui fixe l'ordre des colonnes, n'est pas connue).
+        """
+        if not len(rows):
+            return self
+        premieres = np.array([ligne for ligne, _ in self.premieres_cles.values()], dtype=np.int64)
+        if np.isin(premieres, rows).any():
+            return None
+
+        gardees = np.setdiff1d(np.arange(len(self)), rows)
+        table = self.select(gardees)
+        table.premieres_cles = {
+            key: (int(np.searchsorted(gardees, ligne)), position)
+            for key, (ligne, position) in self.premieres_cles.items()
+        }
+
+        # Une colonne gardée en texte à cause d'une valeur retirée redevient numérique
+        for (section, key), colonne in table.colonnes.items():
+            if not isinstance(colonne, ColonneCategorielle) or not (key in CLES_DATES or est_cle_numerique(key)):
+                continue
+            lignes = np.flatnonzero(colonne.presente)
+            values = colonne.categories[colonne.codes[lignes]].tolist()
+            typee = (ColonneDate.construire(len(table), lignes, values) if key in CLES_DATES
+                     else ColonneNumerique.construire(len(table), lignes, values))
+            if typee is not None:
+                table.colonnes[(section, key)] = typee
+        return table
+
+    def has(self, key: str, section: Optional[str] = None) -> bool:
+        sections = SECTIONS if section is None else (section,)
+        return any((nom, key) in self.colonnes for nom in sections)
+
+    def _combiner(self, key: str, section: Optional[str], conversion: str, absente):
+        """
+        Combine les colonnes d'une clé sur plusieurs sections, ligne par ligne,
+        en prenant la première section présente (en-tête, OBJECT1, OBJECT2).
+        """
+        sections = SECTIONS if section is None else (section,)
+        resultat = None
+        for nom in reversed(sections):
+            colonne = self.colonnes.get((nom, key))
+            if colonne is None:
+                continue
+            valeurs = getattr(colonne, conversion)()
+            if resultat is None:
+                resultat = valeurs.copy()
+            else:
+                presente = colonne.presente
+                resultat[presente] = valeurs[presente]
+        if resultat is None:
+            resultat = np.full(len(self), absente, dtype=type(absente) if absente is not None else object)
+        return resultat
+
+    def value(self, row: int, key: str, section: Optional[str] = None, default=None):
+        """
+        Renvoie la valeur d'une clé pour une ligne, sous forme de chaîne.
+
+        Args:
+            row (int): Index de la ligne.
+            key (str): Clé à rechercher.
+            section (str, optional): Section où chercher la clé. Si None, cherche dans l'ordre du fichier.
+            default: Valeur par défaut si la clé n'est pas trouvée.
+
+        Returns:
+            str: Valeur trouvée ou la valeur par défaut.
+        """
+        sections = SECTIONS if section is None else (section,)
+        for nom in sections:
+            colonne = self.colonnes.get((nom, key))
+            if colonne is not None:
+                value = colonne.chaine(row)
+                if value is not None:
+                    return value
+        return default
+
+    def strings(self, key: str, section: Optional[str] = None) -> np.ndarray:
+        """
+        Renvoie les valeurs d'une clé sous forme de chaînes (None si absente).
+
+        Args:
+            key (str): Clé à rechercher (ex: "OBJECT_DESIGNATOR").
+            section (str, optional): Section ("HEADER", "OBJECT1", "OBJECT2").
+                                     Si None, cherche dans l'ordre du fichier.
+
+        Returns:
+            ndarray: Tableau d'objets de même longueur que la table.
+        """
+        return self._combiner(key, section, "chaines", None)
+
+    def numeric(self, key: str, section: Optional[str] = None) -> np.ndarray:
+        """
+        Renvoie les valeurs d'une clé en float64 (NaN si absente ou invalide).
+        """
+        return self._combiner(key, section, "nombres", np.nan)
+
+    def epochs(self, key: str, section: Optional[str] = None) -> np.ndarray:
+        """
+        Renvoie les valeurs d'une clé en époques int64 (EPOQUE_ABSENTE si absente ou invalide).
+        Les dates ne sont décodées qu'une fois par clé ; le tableau renvoyé est en lecture seule.
+        """
+        epoques = self._epoques.get((key, section))
+        if epoques is None:
+            epoques = self._combiner(key, section, "epoques", EPOQUE_ABSENTE)
+            epoques.flags.writeable = False
+            self._epoques[(key, section)] = epoques
+        return epoques
+
+    def sorted_rows(self, key: str, section: Optional[str] = None) -> np.ndarray:
+        """
+        Renvoie les index des lignes triées par date croissante (tri stable),
+        les lignes sans date valide en dernier.
+
+        Args:
+            key (str): Clé de date (ex: "CREATION_DATE").
+            section (str, optional): Section de la clé.
+
+        Returns:
+            ndarray: Index des lignes.
+        """
+        epoques = self.epochs(key, section)
+        absentes = epoques == EPOQUE_ABSENTE
+        return np.lexsort((epoques, absentes))
+
+    def codes(self, key: str, section: str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Renvoie les codes catégoriels d'une clé d'une section (-1 si absente).
+
+        Returns:
+            tuple: (codes, catégories)
+        """
+        colonne = self.colonnes.get((section, key))
+        if isinstance(colonne, ColonneCategorielle):
+            return colonne.codes, colonne.categories
+        codes, categories = pd.factorize(self.strings(key, section))
+        return codes, np.asarray(categories, dtype=object)
+
+    def to_frame(self, rows: Optional[np.ndarray] = None) -> pd.DataFrame:
+        """
+        Aplatit la table en DataFrame, une colonne par clé dans l'ordre du fichier.
+        Comme dans l'export historique, une clé présente dans les deux objets
+        prend la valeur de la dernière section (OBJECT2).
+
+        Args:
+            rows (ndarray, optional): Index des lignes à exporter. Si None, toutes les lignes.
+
+        Returns:
+            DataFrame: Données à exporter.
+        """
+        data = {}
+        for key in self.ordre_cles:
+            resultat = None
+            for section in SECTIONS:
+                colonne = self.colonnes.get((section, key))
+                if colonne is None:
+                    continue
+                valeurs = colonne.valeurs_export()
+                if resultat is None:
+                    resultat = valeurs
+                else:
+                    if resultat.dtype != valeurs.dtype:
+                        resultat = resultat.astype(object)
+                    resultat = np.where(colonne.presente, valeurs, resultat)
+            if rows is not None:
+                resultat = resultat[rows]
+                # Une clé absente de toutes les lignes retenues n'a pas de colonne
+                if not pd.notna(resultat).any():
+                    continue
+            data[key] = resultat
+        return pd.DataFrame(data)
+
+    def to_typed_frame(self, rows: Optional[np.ndarray] = None) -> pd.DataFrame:
+        """
+        Aplatit la table en DataFrame typé, pour les exports en colonnes (Parquet, Arrow) :
+        float64 pour les grandeurs numériques, dates UTC (époques int64 en nanosecondes)
+        et catégories pour les noms et désignateurs. Comme to_frame, une clé présente
+        dans plusieurs sections prend la valeur de la dernière section présente.
+
+        Args:
+            rows (ndarray, optional): Index des lignes à exporter. Si None, toutes les lignes.
+
+        Returns:
+            DataFrame: Données typées, une colonne par clé dans l'ordre du fichier.
+        """
+        data = {}
+        for key in self.ordre_cles:
+            colonnes = [self.colonnes[(section, key)] for section in SECTIONS if (section, key) in self.colonnes]
+            types = {type(colonne) for colonne in colonnes}
+            if types == {ColonneNumerique}:
+                conversion = "nombres"
+            elif types == {ColonneDate}:
+                conversion = "epoques"
+            else:
+                conversion = "chaines"
+
+            if len(colonnes) == 1 and conversion == "chaines":
+                # Colonne catégorielle unique : ses codes sont repris tels quels
+                colonne = colonnes[0]
+                codes = colonne.codes if rows is None else colonne.codes[rows]
+                valeurs = pd.Categorical.from_codes(codes.astype(np.int32), categories=pd.Index(colonne.categories, dtype=object))
+            else:
+                resultat = None
+                for colonne in colonnes:
+                    converties = getattr(colonne, conversion)()
+                    resultat = converties if resultat is None else np.where(colonne.presente, converties, resultat)
+                if rows is not None:
+                    resultat = resultat[rows]
+                if conversion == "nombres":
+                    valeurs = resultat.astype(np.float64)
+                elif conversion == "epoques":
+                    # EPOQUE_ABSENTE est la représentation de NaT
+                    valeurs = pd.DatetimeIndex(resultat.astype(np.int64).view("datetime64[ns]")).tz_localize("UTC")
+                else:
+                    valeurs = pd.Categorical(resultat)
+
+            if rows is not None and not pd.notna(np.asarray(valeurs)).any():
+                continue
+            data[key] = valeurs
+        index = pd.RangeIndex(len(self) if rows is None else len(rows))
+        return pd.DataFrame(data, index=index)
+
+
+def _table_lot(file_paths: List[str], avec_etats: bool, categorielles: Optional[Set[Tuple[str, str]]] = None):
+    """
+    Analyse un lot de fichiers dans un processus de calcul.
+
+    Args:
+        file_paths (list): Chemins des fichiers du lot.
+        avec_etats (bool): Si True, renvoie aussi chaque enregistrement sérialisé pour le cache.
+        categorielles (set, optional): Colonnes à garder en texte (voir CDMTable.from_records).
+
+    Returns:
+        tuple: (table du lot, index des fichiers lus, enregistrements sérialisés,
+                erreurs (chemin, message))
+    """
+    records = []
+    lus = []
+    etats = []
+    erreurs = []
+    for index, file_path in enumerate(file_paths):
+        try:
+            record = CDMParser.parse_file(file_path)
+        except Exception as e:
+            erreurs.append((file_path, str(e)))
+            continue
+        records.append(record)
+        lus.append(index)
+        if avec_etats:
+            etats.append(marshal.dumps(record.to_state()))
+    return CDMTable.from_records(records, categorielles), lus, etats, erreurs
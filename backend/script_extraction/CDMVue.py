@@ -0,0 +1,178 @@
+import os
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from backend.script_extraction.CDMEpoch import EPOQUE_ABSENTE, parse_epoch
+from backend.script_extraction.CDMTable import CDMTable
+
+
+# Colonnes affichées : (clé, section, titre)
+COLONNES_VUE = (
+    ("FILENAME", None, "Fichier"),
+    ("OBJECT_DESIGNATOR", "OBJECT2", "Désignateur"),
+    ("TCA", None, "TCA"),
+    ("COLLISION_PROBABILITY", None, "Pc"),
+    ("MISS_DISTANCE", None, "Distance (m)"),
+)
+
+# Clés selon lesquelles la vue peut être triée
+CLES_TRI = ("OBJECT_DESIGNATOR", "TCA", "COLLISION_PROBABILITY", "MISS_DISTANCE")
+
+_NANOSECONDES_PAR_JOUR = 86400 * 10**9
+
+
+def borne_date(texte: str, fin: bool = False) -> int:
+    """
+    Convertit une borne de filtre ("2024-01-05" ou "2024-01-05T12:00:00") en époque.
+    Une date sans heure désigne toute la journée : son début, ou sa fin si fin est vrai.
+
+    Raises:
+        ValueError: Si la date n'est pas reconnue.
+    """
+    texte = texte.strip()
+    jour_seul = "T" not in texte
+    epoque = parse_epoch(texte + "T00:00:00" if jour_seul else texte)
+    if epoque is None:
+        raise ValueError(f"Date invalide : {texte}")
+    if jour_seul and fin:
+        epoque += _NANOSECONDES_PAR_JOUR - 1
+    return epoque
+
+
+class VueCDM:
+    """
+    Vue triée et filtrée de la table des CDM, pour un affichage par pages.
+
+    L'ordre de chaque clé de tri est calculé une seule fois sur toute la table
+    (argsort) ; un filtre est un masque booléen appliqué à cet ordre. Seules
+    les lignes d'une page sont mises en forme, quelle que soit la taille de la table.
+    """
+
+    def __init__(self, table: CDMTable):
+        """
+        Args:
+            table (CDMTable): Table des CDM.
+        """
+        self.table = table
+        self.cle_tri = None
+        self.decroissant = False
+        self.masque = None
+        self._ordres = {}
+        self.lignes = np.arange(len(table))
+
+    def __len__(self) -> int:
+        return len(self.lignes)
+
+    def _valeurs(self, cle: str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Renvoie les valeurs de tri d'une clé et le masque des lignes où elle est absente.
+        """
+        if cle == "TCA":
+            valeurs = self.table.epochs(cle)
+            return valeurs, valeurs == EPOQUE_ABSENTE
+        if cle == "OBJECT_DESIGNATOR":
+            # Rang alphabétique de chaque valeur distincte
+            codes, categories = self.table.codes(cle, "OBJECT2")
+            rangs = np.empty(len(categories) + 1, dtype=np.int64)
+            rangs[np.argsort(categories.astype(str), kind='stable')] = np.arange(len(categories))
+            rangs[-1] = -1
+            return rangs[codes], codes < 0
+        valeurs = self.table.numeric(cle)
+        return valeurs, np.isnan(valeurs)
+
+    def ordre(self, cle: str, decroissant: bool = False) -> np.ndarray:
+        """
+        Renvoie l'ordre de toutes les lignes selon une clé (tri stable), les lignes
+        où la clé est absente en dernier. Le résultat est gardé pour les tris suivants.
+        """
+        ordre = self._ordres.get((cle, decroissant))
+        if ordre is None:
+            valeurs, absentes = self._valeurs(cle)
+            presentes = np.flatnonzero(~absentes)
+            valeurs = valeurs[presentes]
+            ordre = np.concatenate([
+                presentes[np.argsort(-valeurs if decroissant else valeurs, kind='stable')],
+                np.flatnonzero(absentes),
+            ])
+            self._ordres[(cle, decroissant)] = ordre
+        return ordre
+
+    def trier(self, cle: Optional[str], decroissant: bool = False):
+        """
+        Trie la vue selon une clé de CLES_TRI (None : ordre des fichiers).
+        """
+        if cle is not None and cle not in CLES_TRI:
+            raise ValueError(f"Tri impossible selon {cle}.")
+        self.cle_tri = cle
+        self.decroissant = decroissant
+        self._appliquer()
+
+    def filtrer(self, designateur: str = "", tca_min: Optional[int] = None, tca_max: Optional[int] = None,
+                pc_min: Optional[float] = None, pc_max: Optional[float] = None,
+                distance_min: Optional[float] = None, distance_max: Optional[float] = None):
+        """
+        Ne garde que les CDM qui respectent tous les critères donnés (bornes incluses).
+
+        Args:
+            designateur (str): Texte contenu dans le désignateur de l'objet secondaire (sans casse).
+            tca_min, tca_max (int, optional): Bornes de TCA en époques (voir borne_date).
+            pc_min, pc_max (float, optional): Bornes de COLLISION_PROBABILITY.
+            distance_min, distance_max (float, optional): Bornes de MISS_DISTANCE.
+        """
+        masque = np.ones(len(self.table), dtype=bool)
+
+        if designateur:
+            # Le texte n'est cherché qu'une fois par valeur distincte
+            codes, categories = self.table.codes("OBJECT_DESIGNATOR", "OBJECT2")
+            recherche = designateur.strip().upper()
+            correspond = np.array([recherche in str(valeur).upper() for valeur in categories] + [False], dtype=bool)
+            masque &= correspond[codes]
+
+        if tca_min is not None or tca_max is not None:
+            tca = self.table.epochs("TCA")
+            masque &= tca != EPOQUE_ABSENTE
+            if tca_min is not None:
+                masque &= tca >= tca_min
+            if tca_max is not None:
+                masque &= tca <= tca_max
+
+        for cle, minimum, maximum in (("COLLISION_PROBABILITY", pc_min, pc_max),
+                                      ("MISS_DISTANCE", distance_min, distance_max)):
+            if minimum is None and maximum is None:
+                continue
+            valeurs = self.table.numeric(cle)
+            # Les comparaisons avec NaN sont fausses : les valeurs absentes sont exclues
+            if minimum is not None:
+                masque &= valeurs >= minimum
+            if maximum is not None:
+                masque &= valeurs <= maximum
+
+        self.masque = None if masque.all() else masque
+        self._appliquer()
+
+    def _appliquer(self):
+        ordre = self.ordre(self.cle_tri, self.decroissant) if self.cle_tri else np.arange(len(self.table))
+        self.lignes = ordre if self.masque is None else ordre[self.masque[ordre]]
+
+    def page(self, debut: int, nombre: int) -> List[Tuple[int, tuple]]:
+        """
+        Met en forme les lignes d'une page.
+
+        Args:
+            debut (int): Position de la première ligne dans la vue.
+            nombre (int): Nombre de lignes.
+
+        Returns:
+            list: Tuples (ligne de la table, valeurs affichées dans l'ordre de COLONNES_VUE).
+        """
+        page = []
+        for ligne in self.lignes[max(debut, 0):debut + nombre].tolist():
+            valeurs = []
+            for cle, section, _ in COLONNES_VUE:
+                if cle == "FILENAME":
+                    valeurs.append(os.path.basename(self.table.filenames[ligne]))
+                else:
+                    valeurs.append(self.table.value(ligne, cle, section, ""))
+            page.append((ligne, tuple(valeurs)))
+        return page
@@ -1,131 +1,237 @@
 import os
 import re
+import numpy as np
 import pandas as pd
-from datetime import datetime
 from typing import Dict, List, Set, Optional
 from openpyxl import Workbook, load_workbook
-from openpyxl.utils.dataframe import dataframe_to_rows
 
+from backend.script_execl.Execl_Flux import enregistrer_classeur, lignes_dataframe, remplacer_feuille
 from backend.script_extraction.ScriptAnalyzerABS import BaseAnalyzer
+from backend.script_extraction.AnalysisGraph import RESULTAT_CONJONCTIONS
+from backend.script_extraction.CDMEpoch import EPOQUE_ABSENTE, parse_epochs
+from backend.script_extraction.CDMTable import SECTION_ENTETE
+from backend.script_extraction.UnionFind import UnionFind
 
 class ConjunctionAnalyzer(BaseAnalyzer):
-    def __init__(self, input, output, ws, wb):
-        super().__init__(input, output, ws, wb)
+    # Écart maximal entre deux CDM d'une même conjonction (24 heures)
+    FENETRE_CONJONCTION = 86400
+    
+    # Nombre de paires de CDM énumérées à la fois lors du rejeu d'une composante
+    TAILLE_BLOC_PAIRES = 1 << 20
+
+    # Formats de nombre Excel des colonnes numériques de la SHORTLIST (séparateurs
+    # décimal et des milliers affichés selon la langue du tableur)
+    FORMATS_SHORTLIST = {
+        'COLLISION_PROBABILITY': '0.00E+00',
+        'MISS_DISTANCE': '#,##0',
+        'RELATIVE_SPEED': '#,##0.0',
+    }
+
+    def __init__(self, input, output, ws, wb, table=None):
+        super().__init__(input, output, ws, wb, table)
         self.object_designator_files_map: Dict[str, list] = {}
+        self.object_designator_rows_map: Dict[str, np.ndarray] = {}
         self.conjunctions: Dict[int, Set[str]] = {}
-        self.all_data: List[Dict] = []
-
-    def extract_data_from_txt(self, file_path: str) -> Dict:
-        data = {}
-        with open(file_path, 'r', encoding='utf-8') as file:
-            lines = file.readlines()
-            for line in lines:
-                if line.strip():
-                    line = re.sub(r'\[.*?\]', '', line).strip()
-                    parts = line.split('=')
-                    if len(parts) == 2:
-                        key = parts[0].strip()
-                        value = parts[1].strip()
-                        data[key] = value
-        return data
+        
+        # Groupes de chaque désignateur {désignateur: (fichiers, groupes)} : ceux de
+        # l'ingestion précédente (voir ManifesteCDM) et ceux de la dernière analyse
+        self.groupes_precedents: Dict[str, tuple] = {}
+        self.fichiers_modifies: Set[str] = set()
+        self.groupes_par_designateur: Dict[str, tuple] = {}
+    
+    def set_groupes_precedents(self, groupes: Dict[str, tuple], fichiers_modifies: Set[str]):
+        """
+        Fournit les groupes de conjonction de l'analyse précédente. Les groupes d'un
+        désignateur sont repris tels quels si ses fichiers sont les mêmes, dans le même
+        ordre, et qu'aucun n'a été modifié ; seuls les autres désignateurs sont regroupés.
+        
+        Args:
+            groupes (dict): Groupes par désignateur {désignateur: (fichiers, groupes)}.
+            fichiers_modifies (set): Fichiers lus (nouveaux ou modifiés) depuis l'analyse précédente.
+        """
+        self.groupes_precedents = groupes
+        self.fichiers_modifies = fichiers_modifies
 
     def extract_object_designators(self) -> Dict[str, list]:
         self.object_designator_files_map.clear()
-        self.all_data.clear()
+        self.object_designator_rows_map.clear()
+        table = self.get_table()
 
-        for filename in os.listdir(self.input):
-            if filename.endswith('.txt'):
-                file_path = os.path.join(self.input, filename)
-                
-                try:
-                    file_data = self.extract_data_from_txt(file_path)
-                    file_data['FILENAME'] = filename
-                    self.all_data.append(file_data)
-
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                    
-                    object_designator_matches = re.finditer(r'OBJECT\s*=\s*OBJECT2.*?OBJECT_DESIGNATOR\s*=\s*(\d+)', content, re.DOTALL)
-                    
-                    for match in object_designator_matches:
-                        object_designator = match.group(1).strip()
-                        if not object_designator:
-                            continue
-                            
-                        if object_designator in self.object_designator_files_map:
-                            if filename not in self.object_designator_files_map[object_designator]:
-                                self.object_designator_files_map[object_designator].append(filename)
-                        else:
-                            self.object_designator_files_map[object_designator] = [filename]
-                        
-                except Exception as e:
-                    print(f"Erreur de lecture du fichier {filename}: {str(e)}")
+        # Le désignateur retenu est le numéro en tête de OBJECT_DESIGNATOR (OBJECT2),
+        # calculé une seule fois par valeur distincte
+        codes, categories = table.codes('OBJECT_DESIGNATOR', 'OBJECT2')
+        numeros = {}
+        groupe_categorie = np.full(len(categories) + 1, -1, dtype=np.int64)
+        for index, value in enumerate(categories):
+            match = re.match(r'\d+', value)
+            if match:
+                groupe_categorie[index] = numeros.setdefault(match.group(0), len(numeros))
+        groupe_ligne = groupe_categorie[codes]
+
+        # Regrouper les fichiers par désignateur, dans l'ordre de première apparition
+        lignes = np.flatnonzero(groupe_ligne >= 0)
+        lignes = lignes[np.argsort(groupe_ligne[lignes], kind='stable')]
+        _, debuts = np.unique(groupe_ligne[lignes], return_index=True)
+        for object_designator, bloc in zip(numeros, np.split(lignes, debuts[1:])):
+            self.object_designator_rows_map[object_designator] = bloc
+            self.object_designator_files_map[object_designator] = table.filenames[bloc].tolist()
         
         return self.object_designator_files_map or {}
 
     @staticmethod
-    def extract_tca(file_content: str) -> Optional[str]:
-        tca_match = re.search(r'CREATION_DATE\s*=\s*([0-9\-T:.]+)', file_content)
-        return tca_match.group(1).strip() if tca_match else None
+    def is_conjunction(date1: str, date2: str) -> bool:
+        epoch1, epoch2 = parse_epochs([date1, date2])
+        if EPOQUE_ABSENTE in (epoch1, epoch2):
+            print(f"Error parsing dates: {date1} or {date2}.")
+            return False
+        
+        deltaT = abs(int(epoch1) - int(epoch2))
+        return deltaT <= ConjunctionAnalyzer.FENETRE_CONJONCTION * 10**9  # 24 hours
+
+    def _creation_epochs(self):
+        """
+        Renvoie pour chaque ligne si CREATION_DATE est renseigné, et son époque en
+        nanosecondes (EPOQUE_ABSENTE si la date n'est pas une date CCSDS valide).
+        
+        Returns:
+            tuple: (masque des lignes datées, époques int64)
+        """
+        table = self.get_table()
+        epoques = table.epochs('CREATION_DATE', SECTION_ENTETE)
+        
+        codes, categories = table.codes('CREATION_DATE', SECTION_ENTETE)
+        datees = np.append(categories != '', False)[codes]
+        
+        # Signaler une seule fois chaque date illisible
+        for value in pd.unique(categories[np.unique(codes[datees & (epoques == EPOQUE_ABSENTE)])]):
+            print(f"Error parsing date: {value}.")
+        return datees, epoques
+
+    def _group_designator(self, filenames: List[str], epochs: np.ndarray, fenetre: int):
+        """
+        Regroupe les CDM datés d'un même objet secondaire.
+        
+        Les époques sont triées une seule fois et chaque CDM est fusionné avec son
+        voisin chronologique s'ils sont à moins de 24 h (union-find). Les groupes
+        obtenus sont ceux du parcours historique par paires de fichiers.
+        
+        Args:
+            filenames (list): Fichiers du désignateur, dans l'ordre du dossier.
+            epochs (ndarray): Époques correspondantes (EPOQUE_ABSENTE si invalide).
+            fenetre (int): Écart maximal en nanosecondes.
+            
+        Returns:
+            list: Couples (arête de création, ensemble de fichiers), où l'arête de
+                  création (i, j) situe le groupe dans l'ordre du parcours par paires.
+        """
+        valides = np.flatnonzero(epochs != EPOQUE_ABSENTE)
+        if len(valides) < 2:
+            return []
+        temps = epochs[valides]
+        
+        # Balayage : trier les époques une fois, unir les voisins consécutifs dans la fenêtre
+        ordre = np.argsort(temps, kind='stable')
+        union_find = UnionFind(len(valides))
+        for k in np.flatnonzero(np.diff(temps[ordre]) <= fenetre).tolist():
+            union_find.union(int(ordre[k]), int(ordre[k + 1]))
+        
+        groupes = []
+        for membres in union_find.groups().values():
+            if len(membres) < 2:
+                continue
+            positions = np.array(membres)
+            fichiers = [filenames[valides[p]] for p in membres]
+            if (np.diff(temps[positions]) >= 0).all():
+                # Fichiers déjà dans l'ordre chronologique : le parcours par paires
+                # forme exactement la composante, créée par ses deux premiers fichiers
+                groupes.append(((int(valides[membres[0]]), int(valides[membres[1]])), set(fichiers)))
+            else:
+                groupes.extend(self._replay_component(valides[positions], fichiers, temps[positions], fenetre))
+        return groupes
 
     @staticmethod
-    def is_conjunction(date1: str, date2: str) -> bool:
-        try:
-            date_format = "%Y-%m-%dT%H:%M:%S.%f"
-            dt1 = datetime.strptime(date1, date_format)
-            dt2 = datetime.strptime(date2, date_format)
+    def _replay_component(positions: np.ndarray, fichiers: List[str], temps: np.ndarray, fenetre: int):
+        """
+        Rejoue le parcours historique par paires (i < j) sur une composante dont les
+        fichiers ne sont pas dans l'ordre chronologique : une paire proche rejoint le
+        premier groupe contenant l'un des deux fichiers, sinon elle crée un groupe.
+        Seules les paires de la fenêtre sont énumérées, à partir des époques triées.
+        
+        Returns:
+            list: Couples (arête de création, ensemble de fichiers).
+        """
+        ordre = np.argsort(temps, kind='stable')
+        tri = temps[ordre]
+        bas = np.searchsorted(tri, temps - fenetre, side='left')
+        haut = np.searchsorted(tri, temps + fenetre, side='right')
+        nombres = haut - bas
+        
+        # Les paires sont générées par blocs de fichiers consécutifs pour borner la mémoire
+        cumul = np.cumsum(nombres)
+        limites = np.searchsorted(cumul, np.arange(0, cumul[-1], ConjunctionAnalyzer.TAILLE_BLOC_PAIRES), side='right')
+        limites = np.unique(np.r_[0, limites, len(temps)])
+        
+        premier_groupe = {}
+        groupes = []
+        for debut, fin in zip(limites[:-1].tolist(), limites[1:].tolist()):
+            # Toutes les paires (i, j) à moins de 24 h, puis i < j dans l'ordre du dossier
+            bloc = nombres[debut:fin]
+            i = np.repeat(np.arange(debut, fin), bloc)
+            decalages = np.arange(bloc.sum()) - np.repeat(np.cumsum(bloc) - bloc, bloc)
+            j = ordre[np.repeat(bas[debut:fin], bloc) + decalages]
+            garder = j > i
+            i, j = i[garder], j[garder]
+            paires = np.lexsort((j, i))
             
-            deltaT = abs((dt1 - dt2).total_seconds())
-            return deltaT <= 86400  # 24 hours in seconds
-        except ValueError as e:
-            print(f"Error parsing dates: {date1} or {date2}. Error: {str(e)}")
-            return False
+            for a, b in zip(i[paires].tolist(), j[paires].tolist()):
+                groupe = min(premier_groupe.get(a, len(groupes)), premier_groupe.get(b, len(groupes)))
+                if groupe == len(groupes):
+                    groupes.append(((int(positions[a]), int(positions[b])), {fichiers[a], fichiers[b]}))
+                else:
+                    groupes[groupe][1].add(fichiers[a])
+                    groupes[groupe][1].add(fichiers[b])
+                premier_groupe[a] = premier_groupe[b] = groupe
+        return groupes
 
     def analyze_conjunctions(self) -> Dict[int, Set[str]]:
-        self.conjunctions.clear()
+        # Nouveaux dictionnaires : les groupes déjà transmis à d'autres analyseurs restent intacts
+        self.conjunctions = {}
+        self.groupes_par_designateur = {}
         conjunction_id = 1
+        datees, epoques = self._creation_epochs()
+        fenetre = self.FENETRE_CONJONCTION * 10**9
+        
+        modifiees = None
+        if self.groupes_precedents:
+            table = self.get_table()
+            modifiees = np.zeros(len(table), dtype=bool)
+            modifiees[table.rows_of(self.fichiers_modifies)] = True
 
         for object_designator, files in self.object_designator_files_map.items():
-            tca_list = []
+            rows = self.object_designator_rows_map[object_designator]
             
-            # Extract TCAs for files
-            for file in files:
-                file_path = os.path.join(self.input, file)
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                        tca = self.extract_tca(content)
-                        if tca:
-                            tca_list.append((file, tca))
-                except Exception as e:
-                    print(f"Error reading file {file}: {str(e)}")
+            precedent = self.groupes_precedents.get(object_designator)
+            if precedent is not None and precedent[0] == files and not modifiees[rows].any():
+                groups = precedent[1]
+            else:
+                # Ne garder que les fichiers ayant un CREATION_DATE
+                avec_date = datees[rows]
+                dated_files = [file for file, garder in zip(files, avec_date.tolist()) if garder]
+                
+                if len(dated_files) == 1:
+                    # If only one file, create a group for this file
+                    groups = [{dated_files[0]}]
+                else:
+                    # Groups are numbered in the order of the pairwise scan
+                    groups = [group for _, group in sorted(
+                        self._group_designator(dated_files, epoques[rows[avec_date]], fenetre),
+                        key=lambda item: item[0]
+                    )]
+            self.groupes_par_designateur[object_designator] = (files, groups)
             
-            # If only one file, create a group for this file
-            if len(tca_list) == 1:
-                self.conjunctions[conjunction_id] = {tca_list[0][0]}
+            for group in groups:
+                self.conjunctions[conjunction_id] = group
                 conjunction_id += 1
-                continue
-            
-            # Compare files
-            for i in range(len(tca_list)):
-                for j in range(i + 1, len(tca_list)):
-                    file1, tca1 = tca_list[i]
-                    file2, tca2 = tca_list[j]
-                    
-                    if self.is_conjunction(tca1, tca2):
-                        # Look for existing groups containing either file
-                        existing_group = None
-                        for group_id, group in self.conjunctions.items():
-                            if file1 in group or file2 in group:
-                                existing_group = group_id
-                                break
-                        
-                        if existing_group is not None:
-                            self.conjunctions[existing_group].add(file1)
-                            self.conjunctions[existing_group].add(file2)
-                        else:
-                            self.conjunctions[conjunction_id] = {file1, file2}
-                            conjunction_id += 1
             
         return self.conjunctions or {}        
     
@@ -138,67 +244,82 @@ class ConjunctionAnalyzer(BaseAnalyzer):
         """
         return len(self.conjunctions)
 
-    def process_data(self):
+    def calculer_conjonctions(self) -> Dict[int, Set[str]]:
+        """
+        Regroupe les CDM en conjonctions.
+        
+        Returns:
+            dict: Groupes de conjonction {id: {fichiers}}
+        """
         self.extract_object_designators()
-        self.analyze_conjunctions()
+        return self.analyze_conjunctions()
     
-    def generer_excel_avec_donnees(self):
+    def calculer_resultat(self, nom):
+        if nom == RESULTAT_CONJONCTIONS:
+            return self.calculer_conjonctions()
+        return super().calculer_resultat(nom)
+
+    def process_data(self):
+        # Les groupes ne sont calculés qu'une fois par analyse et partagés par le graphe
+        self.conjunctions = self.get_resultat(RESULTAT_CONJONCTIONS)
+    
+    def lignes_shortlist(self) -> np.ndarray:
         """
-        Génère un fichier Excel avec seulement le premier fichier de chaque groupe de conjonction.
-        Remplace les points par des virgules dans toutes les valeurs.
+        Renvoie les lignes de la table retenues pour la SHORTLIST :
+        le premier fichier de chaque groupe de conjonction.
+        
+        Returns:
+            ndarray: Index (triés) des lignes dans la table.
         """
-        # Collecter les premiers fichiers de chaque groupe de conjonction
+        # Récupérer les groupes partagés si process_data n'a pas encore été appelé
+        if not self.conjunctions:
+            self.process_data()
+        
+        # Collecter le premier fichier (dans l'ordre du dossier) de chaque groupe de conjonction
+        table = self.get_table()
         first_files_in_conjunctions = set()
         for group in self.conjunctions.values():
-            first_files_in_conjunctions.add(list(group)[0])
+            first_files_in_conjunctions.add(min(group, key=table.index_of))
+        
+        return table.rows_of(first_files_in_conjunctions)
 
-        # Filtrer les données pour n'inclure que les fichiers des groupes de conjonction
-        filtered_data = [
-            data for data in self.all_data 
-            if data['FILENAME'] in first_files_in_conjunctions
-        ]
+    def generer_excel_avec_donnees(self, sauvegarder=True):
+        """
+        Génère un fichier Excel avec seulement le premier fichier de chaque groupe de conjonction.
+        Les grandeurs de FORMATS_SHORTLIST sont écrites en nombres avec un format par colonne ;
+        les points des autres valeurs sont remplacés par des virgules.
+        
+        Args:
+            sauvegarder (bool): Si True, enregistre le classeur. Sinon, la feuille SHORTLIST
+                                est écrite en flux lors de l'enregistrement fait par l'appelant.
+        """
+        # Ne garder que les lignes des fichiers des groupes de conjonction
+        table = self.get_table()
+        rows = self.lignes_shortlist()
         
         # Créer un DataFrame avec les données filtrées
-        df = pd.DataFrame(filtered_data)
+        df = table.to_frame(rows)
+        if len(rows):
+            df['FILENAME'] = table.filenames[rows]
         
-        # Fonction pour formater les nombres et remplacer les points par des virgules
-        def formater_valeur(valeur):
-            # Convertir en chaîne pour pouvoir remplacer les points
-            valeur_str = str(valeur)
-            
-            # Remplacer les points par des virgules
-            valeur_str = valeur_str.replace('.', ',')
-            
-            return valeur_str
-
-        # Appliquer le formatage à toutes les colonnes
+        # Les valeurs (texte d'origine des CDM) ont leurs points remplacés par des virgules
+        # en une opération par colonne, les valeurs absentes sont des cellules vides
         for col in df.columns:
-            df[col] = df[col].apply(formater_valeur)
-
-        # Gestion spécifique de la colonne MISS_DISTANCE
-        if 'MISS_DISTANCE' in df.columns:
-            # Convertir la colonne MISS_DISTANCE en nombres
-            df['MISS_DISTANCE'] = df['MISS_DISTANCE'].str.replace(',', '.').astype(float)
-            
-            
-        if 'COLLISION_PROBABILITY' in df.columns:
-            # Formatter la colonne COLLISION_PROBABILITY spécifiquement
-            df['COLLISION_PROBABILITY'] = df['COLLISION_PROBABILITY'].str.replace(',', '.').astype(float)
-            
-        # Supprimer la feuille 'SHORTLIST' si elle existe déjà
-        if 'SHORTLIST' in self.wb.sheetnames:
-            del self.wb['SHORTLIST']
-        
-        # Créer une nouvelle feuille 'SHORTLIST'
-        ws = self.wb.create_sheet('SHORTLIST')
+            serie = df[col]
+            presente = serie.notna()
+            texte = serie.astype(str).str.replace('.', ',', regex=False).astype(object).where(presente, None)
+            if col in self.FORMATS_SHORTLIST:
+                # Grandeurs écrites en nombres ; une valeur non numérique (ex: "n/a") reste du texte
+                nombres = pd.to_numeric(serie, errors='coerce')
+                texte = nombres.astype(object).where(nombres.notna(), texte)
+            df[col] = texte
 
-        # Ajouter l'en-tête
-        for col_num, column_name in enumerate(df.columns, 1):
-            ws.cell(row=1, column=col_num, value=column_name)
+        formats = {index: self.FORMATS_SHORTLIST[col] for index, col in enumerate(df.columns)
+                   if col in self.FORMATS_SHORTLIST}
 
-        # Ajouter les données
-        for r in dataframe_to_rows(df, index=False, header=False):
-            ws.append(r)
+        # Remplacer la feuille 'SHORTLIST' (lignes écrites en flux à l'enregistrement)
+        remplacer_feuille(self.wb, 'SHORTLIST', lignes_dataframe, (df,), len(df), formats=formats)
         
         # Sauvegarder le fichier
-        self.wb.save(self.output)
\ No newline at end of file
+        if sauvegarder:
+            enregistrer_classeur(self.wb, self.output)
\ No newline at end of file
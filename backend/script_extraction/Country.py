@@ -1,9 +1,10 @@
 import os
-import re
+import numpy as np
 from collections import Counter
 from openpyxl import load_workbook
 
 from backend.script_extraction.ScriptAnalyzerABS import BaseAnalyzer
+from backend.script_extraction.AnalysisGraph import RESULTAT_OPERATEURS, RESULTAT_TABLE
 
 class CountryAnalyzer(BaseAnalyzer):
     """
@@ -11,7 +12,9 @@ class CountryAnalyzer(BaseAnalyzer):
     et exporter les résultats dans un fichier Excel.
     """
     
-    def __init__(self, input=None, output=None, ws=None, wb=None):
+    DEPENDANCES = (RESULTAT_TABLE, RESULTAT_OPERATEURS)
+    
+    def __init__(self, input=None, output=None, ws=None, wb=None, table=None):
         """
         Initialise l'analyseur de données satellite.
         
@@ -21,8 +24,17 @@ class CountryAnalyzer(BaseAnalyzer):
         """
 
         self.database_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "../../config/Country_2025-01-24.xlsx")
-        super().__init__(input, output, ws, wb)
-        self.operator_mapping = self._get_operator_country_mapping()
+        super().__init__(input, output, ws, wb, table)
+    
+    @property
+    def operator_mapping(self):
+        # Le fichier de correspondance n'est lu qu'une fois, à la première utilisation
+        return self.get_resultat(RESULTAT_OPERATEURS)
+    
+    def calculer_resultat(self, nom):
+        if nom == RESULTAT_OPERATEURS:
+            return self._get_operator_country_mapping()
+        return super().calculer_resultat(nom)
     
     def _get_operator_country_mapping(self):
         """
@@ -71,47 +83,64 @@ class CountryAnalyzer(BaseAnalyzer):
         Returns:
             list: Liste des pays trouvés
         """
+        if self.index is not None:
+            return self._pays_depuis_index()
+        
+        table = self.get_table()
+        
+        # Seule la section OBJECT2 est analysée
+        presente = table.sections_presentes['OBJECT2']
+        designator_codes, designators = table.codes('INTERNATIONAL_DESIGNATOR', 'OBJECT2')
+        operator_codes, operators = table.codes('OPERATOR_ORGANIZATION', 'OBJECT2')
+        
+        # Garder la première ligne de chaque INTERNATIONAL_DESIGNATOR ;
+        # les lignes sans désignateur sont toutes conservées
+        sans_designator = np.append(designators == '', True)[designator_codes]
+        lignes_avec = np.flatnonzero(presente & ~sans_designator)
+        _, premieres = np.unique(designator_codes[lignes_avec], return_index=True)
+        retenues = presente & sans_designator
+        retenues[lignes_avec[premieres]] = True
+        
+        # Pays de chaque OPERATOR_ORGANIZATION distinct (None si inconnu ou "NONE")
+        country_by_operator = [
+            self.operator_mapping.get(operator, None) if operator and operator != "NONE" else None
+            for operator in operators
+        ] + [None]
+        
         countries = []
-        seen_designators = set()
+        for code in operator_codes[retenues].tolist():
+            country = country_by_operator[code]
+            if country is not None:
+                countries.append(country)
         
-        # Parcourir tous les fichiers .txt du dossier
-        for filename in os.listdir(self.input):
-            if filename.endswith('.txt'):
-                file_path = os.path.join(self.input, filename)
-                
-                try:
-                    with open(file_path, 'r') as file:
-                        contenu = file.read()
-                        
-                        # Chercher toutes les sections qui contiennent OBJECT2
-                        sections = contenu.split('OBJECT                             =')
-                        for section in sections:
-                            if section.startswith('OBJECT2'):
-                                
-                                # Récupérer le INTERNATIONAL_DESIGNATOR
-                                designator_match = re.search(r'INTERNATIONAL_DESIGNATOR\s*=\s*(\S+)', section)
-                                if designator_match:
-                                    designator = designator_match.group(1).strip()
-                                    
-                                    # Vérifier si déjà vu
-                                    if designator in seen_designators:
-                                        continue  # Ignorer si déjà traité
-                                    seen_designators.add(designator)
-                                
-                                # Chercher la ligne OPERATOR_ORGANIZATION
-                                operator_match = re.search(r'OPERATOR_ORGANIZATION\s*=\s*(.+)', section)
-                                if operator_match:
-                                    operator = operator_match.group(1).strip()
-                                    if operator and operator != "NONE":
-                                        country = self.operator_mapping.get(operator, None)
-                                        if country is not None:
-                                            countries.append(country)
-                                        
-                except Exception as e:
-                    print(f"Erreur lors de la lecture du fichier {filename}: {str(e)}")
+        return countries
+    
+    def _pays_depuis_index(self):
+        """
+        Calcule la liste des pays à partir des comptages par opérateur de l'index SQLite.
+        Chaque pays y est répété autant de fois qu'il est compté, les pays étant dans
+        l'ordre de leur première apparition (comme Counter sur le parcours de la table).
+        
+        Returns:
+            list: Liste des pays trouvés
+        """
+        counts = {}
+        for operator, count in self.index.compter_operateurs():
+            country = self.operator_mapping.get(operator, None) if operator and operator != "NONE" else None
+            if country is not None:
+                counts[country] = counts.get(country, 0) + count
         
+        countries = []
+        for country, count in counts.items():
+            countries.extend([country] * count)
         return countries
     
+    def calculer(self):
+        return self.analyze_folder()
+    
+    def exporter(self, countries):
+        self.export_to_excel(countries)
+    
     def get_unique_countries(self, countries):
         """
         Obtient la liste des pays uniques.
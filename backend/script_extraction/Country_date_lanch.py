@@ -8,13 +8,13 @@ class CountryLaunch(BaseAnalyzer):
     Classe pour classifier les objets selon leur année de lancement.
     """
     
-    def __init__(self, input=None, output=None, ws=None, wb=None):
-        super().__init__(input, output, ws, wb)
+    def __init__(self, input=None, output=None, ws=None, wb=None, table=None):
+        super().__init__(input, output, ws, wb, table)
         self._results = None
     
-    def extract_launch_year(self, file_path):
+    def extract_launch_year(self, row):
         """Extrait l'année de lancement depuis l'INTERNATIONAL_DESIGNATOR."""
-        designator = self.extract_value(file_path, "INTERNATIONAL_DESIGNATOR")
+        designator = self.extract_value(row, "INTERNATIONAL_DESIGNATOR")
         if designator:
             try:
                 return int(designator.split('-')[0])  # Extraction de l'année
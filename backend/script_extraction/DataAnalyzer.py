@@ -1,5 +1,4 @@
 import os
-import re
 import pandas as pd
 from abc import ABC, abstractmethod
 from datetime import datetime
@@ -9,6 +8,8 @@ from openpyxl.utils.dataframe import dataframe_to_rows
 from collections import Counter
 import statistics
 
+from backend.script_extraction import CDMParser
+
 class BaseAnalyzer(ABC):
     """
     Classe abstraite mère pour tous les analyseurs de données.
@@ -77,31 +78,22 @@ class BaseAnalyzer(ABC):
         """
         pass
     
-    def extract_data_from_txt(self, file_path):
+    def extract_data_from_txt(self, file_path, keys=None):
         """
         Extrait les données d'un fichier texte.
         
         Args:
             file_path (str): Chemin du fichier texte.
+            keys (iterable, optional): Clés à extraire. Si None, toutes les clés sont extraites.
             
         Returns:
             dict: Dictionnaire des données extraites.
         """
-        data = {}
         try:
-            with open(file_path, 'r', encoding='utf-8') as file:
-                lines = file.readlines()
-                for line in lines:
-                    if line.strip():
-                        line = re.sub(r'\[.*?\]', '', line).strip()
-                        parts = line.split('=')
-                        if len(parts) == 2:
-                            key = parts[0].strip()
-                            value = parts[1].strip()
-                            data[key] = value
+            return CDMParser.parse_file(file_path, keys).as_dict()
         except Exception as e:
             print(f"Erreur lors de la lecture du fichier {file_path}: {str(e)}")
-        return data
+            return {}
     
     def count_files(self):
         """
@@ -1,8 +1,7 @@
-import os
 import openpyxl
-import re
-from datetime import datetime
 from backend.script_extraction.ScriptAnalyzerABS import BaseAnalyzer
+from backend.script_extraction.CDMEpoch import EPOQUE_ABSENTE, format_epochs
+from backend.script_extraction.CDMTable import SECTION_ENTETE
 
 class DateAnalyzer(BaseAnalyzer):
     """
@@ -10,32 +9,26 @@ class DateAnalyzer(BaseAnalyzer):
     et exporter les résultats vers un fichier Excel.
     """
     
-    def __init__(self, input, output, ws, wb):
+    def __init__(self, input, output, ws, wb, table=None):
         """Initialise l'extracteur de dates."""
-        super().__init__(input, output, ws, wb)
+        super().__init__(input, output, ws, wb, table)
         
-    def extract_dates(self, file_path):
+    def extract_dates(self, row):
         """
-        Extrait les dates de création à partir d'un fichier texte.
+        Extrait les dates de création d'une ligne de la table.
         
         Args:
-            file_path (str): Chemin vers le fichier à analyser
+            row (int): Index de la ligne (fichier) à analyser
             
         Returns:
             list: Liste des dates trouvées au format 'YYYY-MM-DD'
         """
-        try:
-            with open(file_path, 'r') as file:
-                content = file.read()
-                # Recherche de la date associée à CREATION_DATE
-                match = re.search(r'CREATION_DATE\s*=\s*(\d{4}-\d{2}-\d{2})', content)
-                if match:
-                    return [match.group(1)]  # Retourne une liste contenant la date trouvée
-                else:
-                    return []  # Si CREATION_DATE n'est pas trouvé, retourne une liste vide
-        except Exception as e:
-            print(f"Erreur lors de la lecture du fichier {file_path}: {str(e)}")
-            return []
+        # Époque de CREATION_DATE, décodée une seule fois pour toute la table
+        epoch = self.get_table().epochs('CREATION_DATE', SECTION_ENTETE)[row]
+        if epoch != EPOQUE_ABSENTE:
+            return [format_epochs([epoch], 'D')[0]]  # Retourne une liste contenant la date trouvée
+        else:
+            return []  # Si CREATION_DATE n'est pas trouvé, retourne une liste vide
         
     def find_min_date(self, dates):
         """
@@ -92,24 +85,11 @@ class DateAnalyzer(BaseAnalyzer):
         Returns:
             list: Liste des objets datetime correspondant aux dates trouvées
         """
-        all_dates = []
+        epochs = self.get_table().epochs('CREATION_DATE', SECTION_ENTETE)
         
-        for filename in os.listdir(self.input):
-            if filename.endswith('.txt'):
-                file_path = os.path.join(self.input, filename)
-                file_dates = self.extract_dates(file_path)
-                
-                for date in file_dates:
-                    try:
-                        # Tente de convertir chaque date au format '%Y-%m-%d'
-                        parsed_date = datetime.strptime(date, '%Y-%m-%d')
-                        all_dates.append(parsed_date)
-                    except ValueError:
-                        # Si la date est invalide, on l'ignore et passe à la suivante
-                        print(f"Ignorer date invalide: {date}")
-                        continue
-        
-        return all_dates
+        # Tronquer les époques valides au jour
+        days = epochs[epochs != EPOQUE_ABSENTE].view('datetime64[ns]').astype('datetime64[D]')
+        return days.astype('datetime64[s]').tolist()
     
     def process_directory(self):
         """
@@ -122,15 +102,14 @@ class DateAnalyzer(BaseAnalyzer):
         
         row = 2
         try:
-            for filename in os.listdir(self.input):
-                if filename.endswith('.txt'):
-                    file_path = os.path.join(self.input, filename)
-                    file_dates = self.extract_dates(file_path)
-                    
-                    for date in file_dates:
-                        ws.cell(row=row, column=1, value=filename)
-                        ws.cell(row=row, column=2, value=date)
-                        row += 1
+            table = self.get_table()
+            for index in range(len(table)):
+                file_dates = self.extract_dates(index)
+                
+                for date in file_dates:
+                    ws.cell(row=row, column=1, value=table.filenames[index])
+                    ws.cell(row=row, column=2, value=date)
+                    row += 1
             
             wb.save(self.output)
             print(f"Données exportées avec succès vers {self.output}")
@@ -160,9 +139,8 @@ class DateAnalyzer(BaseAnalyzer):
             }
         
         # Compter les fichiers
-        total_files = sum(1 for f in os.listdir(self.input) if f.endswith('.txt'))
-        files_with_dates = sum(1 for f in os.listdir(self.input) 
-                              if f.endswith('.txt') and self.extract_dates(os.path.join(self.input, f)))
+        total_files = len(self.get_table())
+        files_with_dates = int((self.get_table().epochs('CREATION_DATE', SECTION_ENTETE) != EPOQUE_ABSENTE).sum())
         
         earliest_date = min(all_dates)
         latest_date = max(all_dates)
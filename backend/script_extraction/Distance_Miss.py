@@ -1,16 +1,30 @@
+import numpy as np
+
 from backend.script_extraction.ScriptAnalyzerABS import BaseAnalyzer
 
 
+# Seuils de classify_miss_distances, pour les agrégats de l'index SQLite
+SEUILS_DISTANCE = (
+    ("<=", 100, "≤100m"),
+    ("<=", 200, "100m>X≥200m"),
+    ("<=", 300, "200m>X≥300m"),
+    ("<=", 400, "300m>X≥400m"),
+    ("<=", 500, "400m>X≥500m"),
+    (">", 1000, "1000m>X"),
+)
+CATEGORIE_DISTANCE_DEFAUT = "Non classifié"
+
+
 class MissDistanceAnalyzer(BaseAnalyzer):
     """
     Classe pour analyser les distances de rapprochement (MISS_DISTANCE) dans des fichiers TXT.
     """
     
-    def __init__(self, input=None, output=None, ws=None, wb=None):
+    def __init__(self, input=None, output=None, ws=None, wb=None, table=None):
         """
         Initialise l'analyseur de distances de rapprochement.
         """
-        super().__init__(input, output, ws, wb)
+        super().__init__(input, output, ws, wb, table)
         
         self.categories = [
             "≤100m",
@@ -23,11 +37,21 @@ class MissDistanceAnalyzer(BaseAnalyzer):
         ]
         self._results = None
 
-    def extract_miss_distance(self, file_path):
+    def extract_miss_distance(self, row):
+        """
+        Extrait la distance de rapprochement (MISS_DISTANCE) d'une ligne de la table.
+        """
+        return self.extract_numeric_value(row, "MISS_DISTANCE")
+    
+    def extract_miss_distances(self):
         """
-        Extrait la distance de rapprochement (MISS_DISTANCE) d'un fichier TXT.
+        Extrait les distances de rapprochement de toutes les lignes de la table.
+        
+        Returns:
+            ndarray: Distances trouvées (float64), dans l'ordre des fichiers.
         """
-        return self.extract_numeric_value(file_path, "MISS_DISTANCE")
+        distances = self.get_table().numeric("MISS_DISTANCE")
+        return distances[~np.isnan(distances)]
     
     def classify_miss_distance(self, distance):
         """
@@ -48,15 +72,32 @@ class MissDistanceAnalyzer(BaseAnalyzer):
         else:
             return "Non classifié"
     
+    def classify_miss_distances(self, distances):
+        """
+        Classifie un tableau de distances (version vectorisée de classify_miss_distance).
+        """
+        return np.select(
+            [
+                distances <= 100,
+                distances <= 200,
+                distances <= 300,
+                distances <= 400,
+                distances <= 500,
+                distances > 1000,
+            ],
+            ["≤100m", "100m>X≥200m", "200m>X≥300m", "300m>X≥400m", "400m>X≥500m", "1000m>X"],
+            default="Non classifié"
+        ).astype(object)
+    
     def process_data(self):
         """
         Analyse les distances de rapprochement dans les fichiers.
         """
-        # Extraire et classifier les distances
-        self._results = self.analyze_files(
-            extraction_func=self.extract_miss_distance,
-            classification_func=self.classify_miss_distance
-        )
+        # Extraire et classifier toutes les distances en une seule opération
+        self._results = self.classify_miss_distances(self.extract_miss_distances()).tolist()
+    
+    def calculer(self):
+        return self.get_category_counts()
     
     def analyze_folder(self):
         """
@@ -70,6 +111,10 @@ class MissDistanceAnalyzer(BaseAnalyzer):
         """
         Renvoie un dictionnaire avec le nombre de fichiers par catégorie.
         """
+        if self.index is not None:
+            # Agrégat SQL sur la colonne indexée
+            counts = dict(self.index.compter_categories("miss_distance", SEUILS_DISTANCE, CATEGORIE_DISTANCE_DEFAUT))
+            return {category: counts.get(category, 0) for category in self.categories}
         if self._results is None:
             self.process_data()
         return self.count_by_category(self.categories, self._results)
@@ -78,5 +123,13 @@ class MissDistanceAnalyzer(BaseAnalyzer):
         """
         Calcule des statistiques sur les distances de rapprochement.
         """
-        raw_distances = self.analyze_files(extraction_func=self.extract_miss_distance)
-        return self.get_statistics(raw_distances)
\ No newline at end of file
+        raw_distances = self.extract_miss_distances()
+        if not len(raw_distances):
+            return self.get_statistics([])
+        
+        return {
+            "min": float(raw_distances.min()),
+            "max": float(raw_distances.max()),
+            "moyenne": float(raw_distances.mean()),
+            "nombre_total": len(raw_distances)
+        }
\ No newline at end of file
@@ -1,8 +1,11 @@
-import os
-import re
 from collections import Counter
 import statistics
 
+import numpy as np
+
+from backend.script_extraction.CDMParser import CLE_INCLINAISON
+
+from backend.script_extraction.AnalysisGraph import RESULTAT_CONJONCTIONS, RESULTAT_TABLE
 from backend.script_extraction.Conjonction import ConjunctionAnalyzer
 from backend.script_extraction.ScriptAnalyzerABS import BaseAnalyzer
 
@@ -12,17 +15,20 @@ class InclinationAnalyzer(BaseAnalyzer):
     à partir de fichiers texte et exporter les résultats.
     """
     
-    def __init__(self, input, output, ws, wb):
+    DEPENDANCES = (RESULTAT_TABLE, RESULTAT_CONJONCTIONS)
+    
+    def __init__(self, input, output, ws, wb, table=None):
         """Initialise l'analyseur d'inclinaison."""
-        super().__init__(input, output, ws, wb)
+        super().__init__(input, output, ws, wb, table)
     
-    def export_to_excel(self, inclinations):
+    def export_to_excel(self, inclinations, sauvegarder=True):
         """
         Exporte les données d'inclinaison dans une feuille de calcul Excel
         en nettoyant complètement la feuille avant l'insertion.
         
         Args:
             inclinations (list): Liste des inclinaisons groupées
+            sauvegarder (bool): Si True, sauvegarde le classeur après l'écriture
         """
         # Calculer la distribution des inclinaisons
         counter = Counter(inclinations)
@@ -40,7 +46,8 @@ class InclinationAnalyzer(BaseAnalyzer):
                 self.ws[f'U{i}'] = count
             
             # Sauvegarder les modifications
-            self.wb.save(self.output)
+            if sauvegarder:
+                self.wb.save(self.output)
         
         except Exception as e:
             print(f"Erreur lors de l'export Excel: {str(e)}")
@@ -124,35 +131,17 @@ class InclinationAnalyzer(BaseAnalyzer):
         Returns:
             list: Liste des inclinaisons trouvées (triées par ordre croissant)
         """
-        inclinations = []
+        table = self.get_table()
         
-        # Parcourir tous les fichiers .txt du dossier
-        for filename in os.listdir(self.input):
-            if filename.endswith('.txt'):
-                # Si des fichiers de conjonction sont spécifiés, vérifier que le fichier en fait partie
-                if conjunction_files is not None and filename not in conjunction_files:
-                    continue
-                
-                file_path = os.path.join(self.input, filename)
-                
-                try:
-                    with open(file_path, 'r') as file:
-                        contenu = file.read()
-                        # Chercher toutes les sections qui contiennent OBJECT2
-                        sections = contenu.split('OBJECT                             =')
-                        for section in sections:
-                            if section.startswith('OBJECT2'):
-                                # Chercher la ligne d'inclinaison dans cette section
-                                match = re.search(r'COMMENT Inclination = ([\d.]+)\s+\[deg\]', section)
-                                if match:
-                                    inclination = float(match.group(1))
-                                    inclinations.append(inclination)
-                except Exception as e:
-                    print(f"Erreur lors de la lecture du fichier {filename}: {str(e)}")
+        # Inclinaisons de la section OBJECT2 (NaN si absente)
+        inclinations = table.numeric(CLE_INCLINAISON, "OBJECT2")
+        
+        # Si des fichiers de conjonction sont spécifiés, ne garder que leurs lignes
+        if conjunction_files is not None:
+            inclinations = inclinations[table.rows_of(conjunction_files)]
         
         # Trier la liste des inclinaisons par ordre croissant
-        inclinations.sort()
-        return inclinations
+        return np.sort(inclinations[~np.isnan(inclinations)]).tolist()
 
     def group_inclinations(self, inclinations, threshold=2.0):
         """
@@ -229,20 +218,28 @@ class InclinationAnalyzer(BaseAnalyzer):
         
         return grouped_inclinations
 
-    def process_data(self):
-        """
-        Traite les données du dossier et exporte les résultats.
+    def calculer_resultat(self, nom):
+        # Utilisé seul : regrouper les conjonctions sur la même table
+        if nom == RESULTAT_CONJONCTIONS:
+            conjunction_analyzer = ConjunctionAnalyzer(self.input, self.output, self.ws, self.wb, self.get_table())
+            return conjunction_analyzer.calculer_conjonctions()
+        return super().calculer_resultat(nom)
+
+    def calculer(self):
         """
-        # Créer une instance de ConjunctionAnalyzer
-        conjunction_analyzer = ConjunctionAnalyzer(self.input, self.output, self.ws, self.wb)
+        Calcule les inclinaisons groupées des objets en conjonction.
         
-        # Extraire les fichiers de conjonction
-        conjunction_analyzer.process_data()
+        Returns:
+            dict: Inclinaisons groupées, statistiques et plages
+        """
+        # Groupes de conjonction partagés (calculés une seule fois par analyse)
+        conjunctions = self.get_resultat(RESULTAT_CONJONCTIONS)
         
-        # Récupérer le premier fichier de chaque groupe de conjonction
+        # Récupérer le premier fichier (dans l'ordre du dossier) de chaque groupe de conjonction
+        table = self.get_table()
         first_conjunction_files = set()
-        for group in conjunction_analyzer.conjunctions.values():
-            first_conjunction_files.add(list(group)[0])
+        for group in conjunctions.values():
+            first_conjunction_files.add(min(group, key=table.index_of))
         
         # Analyser les inclinaisons uniquement pour ces fichiers
         inclinations = self.analyze_folder(first_conjunction_files)
@@ -253,11 +250,23 @@ class InclinationAnalyzer(BaseAnalyzer):
         # Obtenir les statistiques
         stats = self.get_inclination_statistics(grouped_inclinations)
         
-        # Exporter vers Excel
-        self.export_to_excel(grouped_inclinations)
-        
         return {
             "inclinations": grouped_inclinations,
             "statistics": stats,
             "ranges": self.get_inclination_ranges(grouped_inclinations)
-        }
\ No newline at end of file
+        }
+    
+    def exporter(self, resultat):
+        # Le classeur est sauvegardé une seule fois par l'appelant
+        self.export_to_excel(resultat["inclinations"], sauvegarder=False)
+
+    def process_data(self):
+        """
+        Traite les données du dossier et exporte les résultats.
+        """
+        resultat = self.calculer()
+        
+        # Exporter vers Excel
+        self.export_to_excel(resultat["inclinations"])
+        
+        return resultat
@@ -1,3 +1,5 @@
+import numpy as np
+
 from backend.script_extraction.ScriptAnalyzerABS import BaseAnalyzer
 
 
@@ -6,7 +8,7 @@ class ManeuvrableAnalyzer(BaseAnalyzer):
     Analyseur pour déterminer si les objets sont manœuvrables.
     """
     
-    def __init__(self, input=None, output=None, ws=None, wb=None):
+    def __init__(self, input=None, output=None, ws=None, wb=None, table=None):
         """
         Initialise l'analyseur de manœuvrabilité.
         
@@ -15,44 +17,26 @@ class ManeuvrableAnalyzer(BaseAnalyzer):
             output (str, optional): Chemin de sortie pour les résultats.
             ws (worksheet, optional): Feuille de calcul Excel pour l'export.
             wb (workbook, optional): Classeur Excel pour l'export.
+            table (CDMTable, optional): Table des CDM déjà analysés.
         """
-        super().__init__(input, output, ws, wb)
+        super().__init__(input, output, ws, wb, table)
         self.maneuvrable_count = 0
         self.non_maneuvrable_count = 0
         self.na_count = 0  # Nouveau compteur pour N/A
     
-    def extract_maneuvrable_status(self, file_path):
+    def extract_maneuvrable_status(self, row):
         """
-        Extrait le statut de manœuvrabilité des objets dans un fichier.
+        Extrait le statut de manœuvrabilité de l'objet OBJECT2 d'une ligne de la table.
         
         Args:
-            file_path (str): Chemin du fichier à analyser.
+            row (int): Index de la ligne (fichier) à analyser.
             
         Returns:
-            list: Liste contenant les statuts de manœuvrabilité [objet1, objet2]
+            list: Liste contenant le statut de manœuvrabilité [objet2]
         """
-        status2 = None
-        current_object = None
-        
-        try:
-            with open(file_path, 'r', encoding='utf-8') as file:
-                for line in file:
-                    line = line.strip()
-                    
-                    # Identifier la section d'objet actuelle
-                    if line.startswith("OBJECT"):
-                        if "OBJECT2" in line:
-                            current_object = "OBJECT2"
-                    
-                    # Chercher la valeur MANEUVERABLE dans la section actuelle
-                    elif "MANEUVERABLE" in line and current_object == "OBJECT2":
-                        parts = line.split('=', 1)
-                        if len(parts) > 1:
-                            status2 = parts[1].strip().upper()  # Convertir à la casse supérieure pour uniformiser
-                            break  # Sort de la boucle une fois la valeur trouvée
-        
-        except Exception as e:
-            print(f"Erreur lors de la lecture du fichier {file_path}: {e}")
+        status2 = self.extract_value(row, "MANEUVERABLE", section="OBJECT2")
+        if status2 is not None:
+            status2 = status2.upper()  # Convertir à la casse supérieure pour uniformiser
         
         # Normaliser les valeurs
         return [
@@ -86,20 +70,17 @@ class ManeuvrableAnalyzer(BaseAnalyzer):
         Returns:
             list: Liste contenant les comptages [manœuvrables, non manœuvrables, N/A]
         """
-        self.maneuvrable_count = 0
-        self.non_maneuvrable_count = 0
-        self.na_count = 0
+        codes, statuses = self.get_table().codes("MANEUVERABLE", "OBJECT2")
         
-        for file_path in self.get_all_files():
-            statuses = self.extract_maneuvrable_status(file_path)
-            
-            for status in statuses:
-                if status == "YES":
-                    self.maneuvrable_count += 1
-                elif status == "NO":
-                    self.non_maneuvrable_count += 1
-                elif status == "N/A":
-                    self.na_count += 1
+        # Normaliser chaque statut distinct une seule fois, puis compter les codes
+        normalized = np.array(
+            [self._normalize_maneuvrable_status(status.upper()) for status in statuses] + ["UNKNOWN"],
+            dtype=object
+        )[codes]
+        
+        self.maneuvrable_count = int(np.count_nonzero(normalized == "YES"))
+        self.non_maneuvrable_count = int(np.count_nonzero(normalized == "NO"))
+        self.na_count = int(np.count_nonzero(normalized == "N/A"))
         
         return [self.maneuvrable_count, self.na_count, self.non_maneuvrable_count]
     
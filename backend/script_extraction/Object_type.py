@@ -1,3 +1,5 @@
+import numpy as np
+
 from backend.script_extraction.ScriptAnalyzerABS import BaseAnalyzer
 
 
@@ -6,22 +8,22 @@ class ObjectTypeAnalyzer(BaseAnalyzer):
     Classe pour analyser les types d'objets dans des fichiers TXT.
     """
     
-    def __init__(self, input=None, output=None, ws=None, wb=None):
+    def __init__(self, input=None, output=None, ws=None, wb=None, table=None):
         """
         Initialise l'analyseur de types d'objets.
         """
-        super().__init__(input, output, ws, wb)
+        super().__init__(input, output, ws, wb, table)
         self._object_types = None
     
-    def extract_object_data(self, file_path):
+    def extract_object_data(self, row):
         """
         Extrait le type d'objet et le désignateur international.
         
         Returns:
             tuple: (object_type, designator) ou (None, None) si non trouvé.
         """
-        object_type = self.extract_value(file_path, "OBJECT_TYPE", section="OBJECT2")
-        designator = self.extract_value(file_path, "INTERNATIONAL_DESIGNATOR", section="OBJECT2")
+        object_type = self.extract_value(row, "OBJECT_TYPE", section="OBJECT2")
+        designator = self.extract_value(row, "INTERNATIONAL_DESIGNATOR", section="OBJECT2")
         
         if object_type and object_type != "NONE":
             return (object_type, designator)
@@ -31,19 +33,28 @@ class ObjectTypeAnalyzer(BaseAnalyzer):
         """
         Analyse tous les fichiers et extrait les types d'objets.
         """
-        # Fonction qui filtre les résultats nuls
-        def is_valid(result):
-            return result[0] is not None and result[1] is not None
+        if self.index is not None:
+            # Dédoublonnage par désignateur fait par l'index SQLite
+            self._object_types = self.index.types_objets()
+            return
+        
+        table = self.get_table()
+        type_codes, object_types = table.codes("OBJECT_TYPE", "OBJECT2")
+        designator_codes, _ = table.codes("INTERNATIONAL_DESIGNATOR", "OBJECT2")
         
-        # Extraire les paires (type, designator)
-        results = self.analyze_files(
-            extraction_func=self.extract_object_data, 
-            filter_func=is_valid,
-            unique_key=1  # Le designator est l'élément à l'index 1
+        # Lignes valides : type renseigné (hors "NONE") et désignateur présent
+        valid_types = np.array(
+            [bool(object_type) and object_type != "NONE" for object_type in object_types] + [False],
+            dtype=bool
         )
+        rows = np.flatnonzero(valid_types[type_codes] & (designator_codes >= 0))
+        
+        # Ne garder que la première ligne de chaque désignateur
+        _, first = np.unique(designator_codes[rows], return_index=True)
+        rows = rows[np.sort(first)]
         
         # Extraire seulement les types d'objets
-        self._object_types = [result[0] for result in results]
+        self._object_types = object_types[type_codes[rows]].tolist()
     
     def analyze_folder(self):
         """
@@ -53,6 +64,9 @@ class ObjectTypeAnalyzer(BaseAnalyzer):
             self.process_data()
         return self._object_types
     
+    def calculer(self):
+        return self.analyze_folder()
+    
     def nombre_Payload_Debris(self):
         """
         Compte le nombre de PAYLOAD et DEBRIS dans le dossier spécifié.
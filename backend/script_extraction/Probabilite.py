@@ -1,21 +1,34 @@
-import os
-from collections import defaultdict
+from collections import Counter, defaultdict
+
+import numpy as np
 
 from backend.script_extraction.ScriptAnalyzerABS import BaseAnalyzer
 
+
+# Seuils de classify_collision_probabilities, pour les agrégats de l'index SQLite
+SEUILS_PROBABILITE = (
+    (">=", 1e-4, "≥1E-4"),
+    (">=", 1e-5, "1E-4>X≥1E-5"),
+    (">=", 1e-6, "1E-5>X≥1E-6"),
+    (">=", 1e-7, "1E-6>X≥1E-7"),
+    ("<=", 1e-8, "≤1E-8"),
+)
+CATEGORIE_PROBABILITE_DEFAUT = "Entre 1E-7 et 1E-8"
+
+
 class CollisionProbabilityAnalyzer(BaseAnalyzer):
     """
     Classe pour analyser les probabilités de collision dans des fichiers CDM.
     """
     
-    def __init__(self, input, output, ws, wb):
+    def __init__(self, input, output, ws, wb, table=None):
         """
         Initialise l'analyseur de probabilités de collision.
         
         Args:
             dossier (str, optional): Chemin du dossier contenant les fichiers à analyser.
         """
-        super().__init__(input, output, ws, wb)
+        super().__init__(input, output, ws, wb, table)
         self.categories = [
             "≥1E-4",
             "1E-4>X≥1E-5",
@@ -28,27 +41,35 @@ class CollisionProbabilityAnalyzer(BaseAnalyzer):
     def process_data(self):
         self.analyze_folder()
     
-    def extract_probability(self, file_path):
+    def calculer(self):
+        return self.get_category_counts()
+    
+    def extract_probability(self, row):
         """
-        Extrait la probabilité de collision d'un fichier CDM.
+        Extrait la probabilité de collision d'une ligne de la table.
         
         Args:
-            file_path (str): Chemin du fichier à analyser.
+            row (int): Index de la ligne (fichier) à analyser.
             
         Returns:
             float or None: La probabilité de collision ou None si non trouvée.
         """
+        probability = self.get_table().value(row, "COLLISION_PROBABILITY")
         try:
-            with open(file_path, 'r') as file:
-                for line in file:
-                    if 'COLLISION_PROBABILITY' in line:
-                        probability = float(line.split('=')[1].strip())
-                        return probability
-            return None
-        except Exception as e:
-            print(f"Erreur lors de l'extraction de la probabilité: {e}")
+            return float(probability) if probability is not None else None
+        except ValueError:
             return None
     
+    def extract_probabilities(self):
+        """
+        Extrait les probabilités de collision de toutes les lignes de la table.
+        
+        Returns:
+            ndarray: Probabilités trouvées (float64), dans l'ordre des fichiers.
+        """
+        probabilities = self.get_table().numeric("COLLISION_PROBABILITY")
+        return probabilities[~np.isnan(probabilities)]
+    
     def classify_collision_probability(self, probability):
         """
         Classifie une probabilité de collision selon des seuils définis.
@@ -72,6 +93,29 @@ class CollisionProbabilityAnalyzer(BaseAnalyzer):
         else:
             return "Entre 1E-7 et 1E-8"
     
+    def classify_collision_probabilities(self, probabilities):
+        """
+        Classifie un tableau de probabilités de collision (version vectorisée
+        de classify_collision_probability).
+        
+        Args:
+            probabilities (ndarray): Probabilités de collision.
+            
+        Returns:
+            ndarray: Catégorie de chaque probabilité.
+        """
+        return np.select(
+            [
+                probabilities >= 1e-4,
+                probabilities >= 1e-5,
+                probabilities >= 1e-6,
+                probabilities >= 1e-7,
+                probabilities <= 1e-8,
+            ],
+            ["≥1E-4", "1E-4>X≥1E-5", "1E-5>X≥1E-6", "1E-6>X≥1E-7", "≤1E-8"],
+            default="Entre 1E-7 et 1E-8"
+        ).astype(object)
+    
     def nombre_donnee(self):
         """
         Compte le nombre de fichiers par catégorie de probabilité de collision.
@@ -80,18 +124,8 @@ class CollisionProbabilityAnalyzer(BaseAnalyzer):
             tuple: Un tuple contenant le nombre de fichiers pour chaque catégorie de probabilité.
         """
 
-        categories_count = defaultdict(int)
-        
-        # Parcours des fichiers dans le dossier
-        for file_name in os.listdir(self.input):
-            if file_name.endswith(".txt"):  # Vérifie si c'est un fichier .txt
-                file_path = os.path.join(self.input, file_name)  # Chemin complet du fichier
-                
-                # Extraction de la probabilité de collision
-                probability = self.extract_probability(file_path)
-                if probability is not None:  # Si une probabilité est trouvée
-                    category = self.classify_collision_probability(probability)
-                    categories_count[category] += 1  # Incrémente le compteur pour la catégorie
+        # Comptage des catégories des probabilités trouvées
+        categories_count = Counter(self.analyze_folder())
         
         # On s'assure que les catégories de probabilité sont présentes, sinon on les initialise à 0
         result = (
@@ -113,20 +147,8 @@ class CollisionProbabilityAnalyzer(BaseAnalyzer):
             list: Liste des catégories de probabilité trouvées.
         """
 
-        # Liste pour stocker les catégories
-        categories_list = []
-        
-        # Parcourt tous les fichiers .txt du dossier
-        for filename in os.listdir(self.input):
-            if filename.endswith('.txt'):
-                file_path = os.path.join(self.input, filename)
-                probability = self.extract_probability(file_path)
-                
-                if probability is not None:
-                    category = self.classify_collision_probability(probability)
-                    categories_list.append(category)  # Ajoute la catégorie à la liste
-        
-        return categories_list
+        # Classifie toutes les probabilités trouvées en une seule opération
+        return self.classify_collision_probabilities(self.extract_probabilities()).tolist()
     
     def get_category_counts(self):
         """
@@ -135,11 +157,15 @@ class CollisionProbabilityAnalyzer(BaseAnalyzer):
         Returns:
             dict: Dictionnaire avec les catégories comme clés et le nombre de fichiers comme valeurs.
         """
-        categories_list = self.analyze_folder()
         category_counts = defaultdict(int)
-        
-        for category in categories_list:
-            category_counts[category] += 1
+        if self.index is not None:
+            # Agrégat SQL sur la colonne indexée
+            category_counts.update(self.index.compter_categories(
+                "collision_probability", SEUILS_PROBABILITE, CATEGORIE_PROBABILITE_DEFAUT
+            ))
+        else:
+            for category in self.analyze_folder():
+                category_counts[category] += 1
         
         # S'assurer que toutes les catégories sont présentes
         for category in self.categories:
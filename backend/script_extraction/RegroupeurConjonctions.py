@@ -0,0 +1,222 @@
+import re
+from typing import Dict, List, Optional, Set
+
+import numpy as np
+from sortedcontainers import SortedList
+
+from backend.script_extraction.CDMEpoch import EPOQUE_ABSENTE, parse_epoch
+from backend.script_extraction.CDMParser import CDMRecord
+from backend.script_extraction.CDMTable import SECTION_ENTETE, CDMTable
+from backend.script_extraction.Conjonction import ConjunctionAnalyzer
+from backend.script_extraction.UnionFind import UnionFind
+
+
+class RegroupeurConjonctions:
+    """
+    Regroupement en ligne des CDM en conjonctions (événements), CDM par CDM.
+
+    Les époques de création des CDM de chaque objet secondaire sont gardées dans une
+    liste triée (SortedList : insertion et recherche en O(log n)). Un nouveau CDM y est
+    placé et comparé à ses deux voisins chronologiques. S'il est à moins de 24 h de l'un
+    d'eux, il rejoint son événement. S'il est proche des deux, il fusionne leurs événements
+    (union-find). Sinon, il crée un nouvel événement. Le reste de l'archive n'est jamais
+    regroupé à nouveau.
+
+    Un événement garde son identifiant quand des CDM s'y ajoutent. Quand deux événements
+    fusionnent, l'identifiant le plus petit est conservé (voir resoudre). Les CDM ne
+    peuvent pas être retirés : un regroupeur est reconstruit (depuis_table) quand des
+    fichiers disparaissent ou changent.
+
+    Les événements sont les composantes connexes des CDM à moins de 24 h l'un de l'autre.
+    Ce ne sont pas toujours les groupes du rapport : ConjunctionAnalyzer rejoue le parcours
+    historique par paires de fichiers, qui dépend de l'ordre du dossier quand il n'est pas
+    chronologique. Par exemple, six CDM d'un objet aux époques 70, 25, 64, 52, 62 et 45 h
+    (fichiers f0 à f5) donnent dans le rapport les groupes {f0, f2, f3, f4, f5} et {f1, f5},
+    et ici un seul événement. Les deux coïncident quand les fichiers de chaque objet sont
+    dans l'ordre chronologique.
+    """
+
+    def __init__(self, fenetre: int = ConjunctionAnalyzer.FENETRE_CONJONCTION * 10**9):
+        """
+        Args:
+            fenetre (int): Écart maximal en nanosecondes entre deux CDM d'un même événement.
+        """
+        self.fenetre = fenetre
+        self.union_find = UnionFind()
+
+        # Fichier et désignateur de chaque CDM (élément de l'union-find)
+        self.fichiers: List[str] = []
+        self.designateurs: List[str] = []
+        self._elements_fichiers: Dict[str, int] = {}
+
+        # Identifiant de l'événement de chaque racine, et identifiants absorbés par une fusion
+        self.identifiants: Dict[int, int] = {}
+        self.fusions: Dict[int, int] = {}
+        self._prochain_identifiant = 1
+
+        # Par désignateur : couples (époque, élément) triés, nombre de CDM datés
+        self._chronologies: Dict[str, SortedList] = {}
+        self._dates: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.fichiers)
+
+    @classmethod
+    def depuis_table(cls, table: CDMTable, fenetre: int = ConjunctionAnalyzer.FENETRE_CONJONCTION * 10**9
+                     ) -> "RegroupeurConjonctions":
+        """
+        Crée un regroupeur contenant les CDM d'une table, insérés dans l'ordre des lignes.
+
+        Args:
+            table (CDMTable): Table des CDM.
+            fenetre (int): Écart maximal en nanosecondes.
+
+        Returns:
+            RegroupeurConjonctions: Regroupeur prêt à recevoir de nouveaux CDM.
+        """
+        regroupeur = cls(fenetre)
+        regroupeur.ajouter_table(table)
+        return regroupeur
+
+    def ajouter_table(self, table: CDMTable):
+        """
+        Ajoute les CDM datés d'une table, dans l'ordre des lignes (voir ajouter).
+
+        Args:
+            table (CDMTable): Table des CDM à ajouter.
+        """
+        codes, categories = table.codes('OBJECT_DESIGNATOR', 'OBJECT2')
+        designateurs = np.append(categories, None)[codes]
+        codes_dates, dates = table.codes('CREATION_DATE', SECTION_ENTETE)
+        datees = np.append(dates != '', False)[codes_dates]
+        epoques = table.epochs('CREATION_DATE', SECTION_ENTETE)
+
+        lignes = np.flatnonzero(datees & (codes >= 0))
+        for fichier, designateur, epoque in zip(table.filenames[lignes].tolist(), designateurs[lignes].tolist(),
+                                                epoques[lignes].tolist()):
+            self.ajouter(fichier, designateur, epoque)
+
+    def ajouter_record(self, record: CDMRecord) -> Optional[int]:
+        """
+        Ajoute un CDM analysé (voir ajouter).
+
+        Args:
+            record (CDMRecord): CDM à ajouter.
+
+        Returns:
+            int or None: Identifiant de l'événement du CDM.
+        """
+        creation = record.header.get('CREATION_DATE')
+        if not creation:
+            return None
+        epoque = parse_epoch(creation)
+        return self.ajouter(record.filename, record.get('OBJECT_DESIGNATOR', 'OBJECT2'),
+                            EPOQUE_ABSENTE if epoque is None else epoque)
+
+    def ajouter(self, fichier: str, designateur: Optional[str], epoque: int) -> Optional[int]:
+        """
+        Ajoute un CDM daté à l'événement de ses voisins chronologiques, ou à un nouvel événement.
+
+        Args:
+            fichier (str): Nom du fichier CDM.
+            designateur (str): OBJECT_DESIGNATOR de l'objet secondaire (le numéro en tête est retenu).
+            epoque (int): Époque de CREATION_DATE en nanosecondes. EPOQUE_ABSENTE pour une date
+                          illisible : le CDM forme alors un événement à lui seul.
+
+        Returns:
+            int or None: Identifiant de l'événement du CDM, None si le désignateur n'a pas de numéro.
+
+        Raises:
+            ValueError: Si le fichier a déjà été ajouté.
+        """
+        if fichier in self._elements_fichiers:
+            raise ValueError(f"CDM déjà regroupé : {fichier}")
+        match = re.match(r'\d+', designateur or '')
+        if not match:
+            return None
+        numero = match.group(0)
+
+        element = self.union_find.ajouter()
+        self.fichiers.append(fichier)
+        self.designateurs.append(numero)
+        self._elements_fichiers[fichier] = element
+        self._dates[numero] = self._dates.get(numero, 0) + 1
+
+        voisins = []
+        if epoque != EPOQUE_ABSENTE:
+            chronologie = self._chronologies.setdefault(numero, SortedList())
+            # Les éléments sont numérotés dans l'ordre d'arrivée : le nouveau CDM
+            # se place après les CDM de même époque
+            position = chronologie.bisect_right((epoque, element))
+            if position > 0 and epoque - chronologie[position - 1][0] <= self.fenetre:
+                voisins.append(chronologie[position - 1][1])
+            if position < len(chronologie) and chronologie[position][0] - epoque <= self.fenetre:
+                voisins.append(chronologie[position][1])
+            chronologie.add((epoque, element))
+
+        if not voisins:
+            identifiant = self._prochain_identifiant
+            self._prochain_identifiant += 1
+            self.identifiants[element] = identifiant
+            return identifiant
+
+        for voisin in voisins:
+            racine_element = self.union_find.find(element)
+            racine_voisin = self.union_find.find(voisin)
+            if racine_element == racine_voisin:
+                continue
+            identifiant_voisin = self.identifiants.pop(racine_voisin)
+            identifiant_element = self.identifiants.pop(racine_element, None)
+            racine = self.union_find.union(racine_element, racine_voisin)
+            if identifiant_element is None:
+                # Le CDM rejoint l'événement de son voisin
+                self.identifiants[racine] = identifiant_voisin
+            else:
+                # Le CDM relie deux événements : le plus ancien absorbe l'autre
+                garde, absorbe = sorted((identifiant_element, identifiant_voisin))
+                self.identifiants[racine] = garde
+                self.fusions[absorbe] = garde
+        return self.identifiants[self.union_find.find(element)]
+
+    def resoudre(self, identifiant: int) -> int:
+        """
+        Renvoie l'identifiant actuel d'un événement (celui qui l'a absorbé s'il a été fusionné).
+        """
+        while identifiant in self.fusions:
+            identifiant = self.fusions[identifiant]
+        return identifiant
+
+    def evenement(self, fichier: str) -> Optional[int]:
+        """
+        Renvoie l'identifiant de l'événement d'un fichier, None s'il n'a pas été regroupé.
+        """
+        element = self._elements_fichiers.get(fichier)
+        if element is None:
+            return None
+        return self.identifiants[self.union_find.find(element)]
+
+    def evenements(self) -> Dict[int, Set[str]]:
+        """
+        Renvoie tous les événements, y compris ceux d'un seul CDM.
+
+        Returns:
+            dict: {identifiant: {fichiers}}, par identifiant croissant.
+        """
+        evenements = {}
+        for element, fichier in enumerate(self.fichiers):
+            evenements.setdefault(self.identifiants[self.union_find.find(element)], set()).add(fichier)
+        return dict(sorted(evenements.items()))
+
+    def groupes(self) -> Dict[int, Set[str]]:
+        """
+        Renvoie les événements d'au moins deux CDM, et le CDM des objets qui n'en ont
+        qu'un de daté, comme les groupes de ConjunctionAnalyzer (qui peuvent différer
+        quand les fichiers ne sont pas dans l'ordre chronologique, voir la classe).
+
+        Returns:
+            dict: {identifiant: {fichiers}}, par identifiant croissant.
+        """
+        return {
+            identifiant: fichiers for identifiant, fichiers in self.evenements().items()
+            if len(fichiers) > 1 or self._dates[self.designateurs[self._elements_fichiers[next(iter(fichiers))]]] == 1
+        }
@@ -1,12 +1,19 @@
 from abc import ABC, abstractmethod
 
+from backend.script_extraction import CDMParser
+from backend.script_extraction.AnalysisGraph import RESULTAT_TABLE
+from backend.script_extraction.CDMTable import CDMTable
+
 
 class BaseAnalyzer(ABC):
     """
     Classe abstraite mère pour les analyseurs de données.
     """
     
-    def __init__(self, input=None, output=None, ws=None, wb=None):
+    # Résultats partagés dont l'analyseur a besoin (voir AnalysisGraph)
+    DEPENDANCES = (RESULTAT_TABLE,)
+    
+    def __init__(self, input=None, output=None, ws=None, wb=None, table=None):
         """
         Initialise la classe mère avec le chemin du dossier.
         
@@ -15,18 +22,96 @@ class BaseAnalyzer(ABC):
             output (str, optional): Chemin de sortie pour les résultats.
             ws (worksheet, optional): Feuille de calcul Excel pour l'export.
             wb (workbook, optional): Classeur Excel pour l'export.
+            table (CDMTable, optional): Table des CDM déjà analysés, partagée entre les analyseurs.
+                                        Si None, le dossier est analysé à la demande.
         """
         self.input = input
         self.output = output
         self.ws = ws
         self.wb = wb
+        self.table = table
+        self.index = None
+        self.graphe = None
+        self.resultats = {}
+    
+    def set_table(self, table):
+        """
+        Définit la table des CDM partagée entre les analyseurs.
+        
+        Args:
+            table (CDMTable): Table des CDM.
+        """
+        self.table = table
+    
+    def set_index(self, index):
+        """
+        Définit l'index SQLite des CDM : les analyseurs qui le savent répondent
+        alors par des agrégats SQL au lieu de parcourir la table.
+        
+        Args:
+            index (CDMIndex): Index du dossier, à jour avec la table (ou None).
+        """
+        self.index = index
+    
+    def get_table(self):
+        """
+        Renvoie la table des CDM du dossier d'entrée.
+        Chaque fichier n'est lu qu'une seule fois, à la première demande.
+        
+        Returns:
+            CDMTable: Table des CDM (une ligne par fichier).
+        """
+        if self.table is None:
+            if self.graphe is not None and self.graphe.connait(RESULTAT_TABLE):
+                self.table = self.graphe.resultat(RESULTAT_TABLE)
+            else:
+                self.table = CDMTable.from_files(self.get_all_files())
+        return self.table
+    
+    def set_graphe(self, graphe):
+        """
+        Rattache l'analyseur au graphe d'exécution qui lui fournit les résultats partagés.
+        
+        Args:
+            graphe (AnalysisGraph): Graphe de l'analyse en cours.
+        """
+        self.graphe = graphe
+    
+    def get_resultat(self, nom):
+        """
+        Renvoie un résultat partagé (groupes de conjonction, correspondance opérateur-pays...).
+        Le résultat est lu dans le graphe d'exécution, où il n'est calculé qu'une fois ;
+        sans graphe, il est calculé localement à la première demande.
+        
+        Args:
+            nom (str): Nom du résultat.
+            
+        Returns:
+            Valeur du résultat.
+        """
+        if nom == RESULTAT_TABLE:
+            return self.get_table()
+        if self.graphe is not None and self.graphe.connait(nom):
+            return self.graphe.resultat(nom)
+        if nom not in self.resultats:
+            self.resultats[nom] = self.calculer_resultat(nom)
+        return self.resultats[nom]
     
-    def extract_value(self, file_path, key, section=None, default=None):
+    def calculer_resultat(self, nom):
         """
-        Fonction générique pour extraire une valeur à partir d'une clé dans un fichier texte.
+        Calcule un résultat partagé lorsque l'analyseur est utilisé seul, sans graphe.
         
         Args:
-            file_path (str): Chemin du fichier à analyser.
+            nom (str): Nom du résultat.
+        """
+        raise KeyError(f"Résultat inconnu : {nom}")
+    
+    def extract_value(self, row, key, section=None, default=None):
+        """
+        Fonction générique pour extraire une valeur à partir d'une clé d'une ligne de la table.
+        
+        Args:
+            row (int): Index de la ligne (fichier) à analyser.
             key (str): Clé à rechercher (ex: "MISS_DISTANCE").
             section (str, optional): Section où chercher la clé (ex: "OBJECT2").
             default: Valeur par défaut si la clé n'est pas trouvée.
@@ -34,40 +119,14 @@ class BaseAnalyzer(ABC):
         Returns:
             Valeur extraite ou la valeur par défaut si non trouvée.
         """
-        try:
-            in_target_section = section is None  # Si section est None, on cherche partout
-            
-            with open(file_path, 'r', encoding='utf-8') as file:
-                for line in file:
-                    line = line.strip()
-                    
-                    # Vérifier si on entre dans la section cible
-                    if section and line.startswith("OBJECT") and section in line:
-                        in_target_section = True
-                    # Vérifier si on sort de la section cible (ligne vide ou nouvelle section)
-                    elif section and in_target_section and (line == "" or (line.startswith("OBJECT") and section not in line)):
-                        in_target_section = False
-                    
-                    # Si on est dans la section cible (ou pas de section spécifiée) et que la clé est trouvée
-                    if in_target_section and key in line:
-                        # Extraire la valeur après le signe '='
-                        parts = line.split('=', 1)
-                        if len(parts) > 1:
-                            value = parts[1].strip()
-                            return value
+        return self.get_table().value(row, key, section, default)
             
-            return default
-        except Exception as e:
-            print(f"Erreur lors de l'extraction de {key}: {e}")
-            return default
-
-            
-    def extract_numeric_value(self, file_path, key, section=None, default=None):
+    def extract_numeric_value(self, row, key, section=None, default=None):
         """
-        Extrait une valeur numérique d'un fichier texte.
+        Extrait une valeur numérique d'une ligne de la table.
         
         Args:
-            file_path (str): Chemin du fichier à analyser.
+            row (int): Index de la ligne (fichier) à analyser.
             key (str): Clé à rechercher (ex: "MISS_DISTANCE").
             section (str, optional): Section où chercher la clé (ex: "OBJECT2").
             default: Valeur par défaut si la clé n'est pas trouvée ou la conversion échoue.
@@ -75,7 +134,7 @@ class BaseAnalyzer(ABC):
         Returns:
             float: Valeur numérique extraite ou la valeur par défaut.
         """
-        value = self.extract_value(file_path, key, section, default)
+        value = self.extract_value(row, key, section, default)
         
         if value is not None and value != default:
             # Nettoyer la valeur pour garder uniquement les chiffres et le point décimal
@@ -98,25 +157,15 @@ class BaseAnalyzer(ABC):
         Returns:
             list: Liste des chemins complets des fichiers.
         """
-        import os
-        
-        file_paths = []
-        
-        if self.input and os.path.isdir(self.input):
-            for file_name in os.listdir(self.input):
-                if file_name.endswith(extension):
-                    file_path = os.path.join(self.input, file_name)
-                    file_paths.append(file_path)
-        
-        return file_paths
+        return CDMParser.list_files(self.input, extension)
     
     def analyze_files(self, extraction_func, classification_func=None, filter_func=None, unique_key=None):
         """
-        Analyse tous les fichiers avec une fonction d'extraction et éventuellement une fonction de classification.
+        Analyse toutes les lignes de la table avec une fonction d'extraction et éventuellement une fonction de classification.
         
         Args:
-            extraction_func: Fonction qui extrait des données d'un fichier. 
-                           Doit accepter un chemin de fichier comme paramètre.
+            extraction_func: Fonction qui extrait des données d'une ligne de la table. 
+                           Doit accepter l'index de la ligne comme paramètre.
             classification_func: Fonction facultative qui classifie le résultat de l'extraction.
             filter_func: Fonction facultative qui filtre les résultats (renvoie True pour inclure, False pour exclure).
             unique_key: Clé facultative pour éviter les doublons (ex: "INTERNATIONAL_DESIGNATOR").
@@ -128,9 +177,9 @@ class BaseAnalyzer(ABC):
         results = []
         unique_values = set()
         
-        for file_path in self.get_all_files():
+        for row in range(len(self.get_table())):
             # Extraire les données
-            extracted_data = extraction_func(file_path)
+            extracted_data = extraction_func(row)
             
             # Vérifier si on doit filtrer les doublons
             if unique_key is not None:
@@ -222,6 +271,26 @@ class BaseAnalyzer(ABC):
             "nombre_total": len(numeric_data)
         }
     
+    def calculer(self):
+        """
+        Calcule les résultats de l'analyseur sans écrire dans le classeur.
+        Le résultat doit pouvoir être transmis d'un processus à l'autre.
+        
+        Returns:
+            Résultats de l'analyse.
+        """
+        return self.process_data()
+    
+    def exporter(self, resultat):
+        """
+        Écrit dans la feuille Excel les résultats renvoyés par calculer().
+        Par défaut, l'analyseur n'écrit rien dans le classeur.
+        
+        Args:
+            resultat: Valeur renvoyée par calculer().
+        """
+        pass
+    
     @abstractmethod
     def process_data(self):
         """
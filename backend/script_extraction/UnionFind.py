@@ -0,0 +1,76 @@
+from typing import Dict, List
+
+
+class UnionFind:
+    """
+    Structure union-find (ensembles disjoints) sur les entiers 0..n-1,
+    avec compression de chemin et union par taille.
+    """
+
+    def __init__(self, taille: int = 0):
+        """
+        Initialise la structure avec des singletons.
+
+        Args:
+            taille (int): Nombre d'éléments initiaux.
+        """
+        self.parent = list(range(taille))
+        self.tailles = [1] * taille
+
+    def __len__(self):
+        return len(self.parent)
+
+    def ajouter(self) -> int:
+        """
+        Ajoute un nouvel élément isolé.
+
+        Returns:
+            int: Index du nouvel élément.
+        """
+        index = len(self.parent)
+        self.parent.append(index)
+        self.tailles.append(1)
+        return index
+
+    def find(self, element: int) -> int:
+        """
+        Renvoie le représentant de l'ensemble contenant l'élément.
+        """
+        parent = self.parent
+        while parent[element] != element:
+            # Compression de chemin (par division)
+            parent[element] = parent[parent[element]]
+            element = parent[element]
+        return element
+
+    def union(self, a: int, b: int) -> int:
+        """
+        Fusionne les ensembles contenant a et b.
+
+        Returns:
+            int: Représentant de l'ensemble fusionné.
+        """
+        racine_a = self.find(a)
+        racine_b = self.find(b)
+        if racine_a == racine_b:
+            return racine_a
+        if self.tailles[racine_a] < self.tailles[racine_b]:
+            racine_a, racine_b = racine_b, racine_a
+        self.parent[racine_b] = racine_a
+        self.tailles[racine_a] += self.tailles[racine_b]
+        return racine_a
+
+    def connected(self, a: int, b: int) -> bool:
+        return self.find(a) == self.find(b)
+
+    def groups(self) -> Dict[int, List[int]]:
+        """
+        Renvoie les ensembles, chacun trié par index croissant.
+
+        Returns:
+            dict: {représentant: [éléments]}, dans l'ordre du plus petit élément.
+        """
+        groupes: Dict[int, List[int]] = {}
+        for element in range(len(self.parent)):
+            groupes.setdefault(self.find(element), []).append(element)
+        return groupes
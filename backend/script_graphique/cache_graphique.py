@@ -0,0 +1,151 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from typing import Optional
+
+
+# Version du contenu des clés : à incrémenter si le rendu de rendre_camembert change
+FORMAT_CACHE = 1
+
+# Dossier des images en cache, partagé par toutes les analyses
+DOSSIER_CACHE_GRAPHIQUES = os.path.join(os.path.expanduser("~"), ".star_guardian", "graphiques")
+
+
+class CacheGraphiques:
+    """
+    Cache des graphiques déjà rendus, adressé par leur contenu.
+
+    La clé d'un graphique est l'empreinte de ses données, de son titre, de son
+    style et du format de l'image (PNG, SVG...) : un graphique identique à un
+    rendu précédent est copié depuis le cache au lieu d'être redessiné.
+    La taille totale du cache est bornée, les images les moins récemment
+    utilisées sont évincées.
+    """
+
+    def __init__(self, dossier: str = DOSSIER_CACHE_GRAPHIQUES, taille_max: int = 100 * 1024 * 1024,
+                 version: str = ""):
+        """
+        Ouvre (ou crée) le dossier du cache.
+
+        Args:
+            dossier (str): Dossier des images en cache.
+            taille_max (int): Taille totale maximale des images conservées, en octets.
+            version (str): Version du moteur de rendu, incluse dans les clés (ex: version de matplotlib).
+        """
+        self.dossier = dossier
+        self.taille_max = taille_max
+        self.version = version
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(dossier, exist_ok=True)
+
+    @classmethod
+    def par_defaut(cls, version: str = "") -> Optional["CacheGraphiques"]:
+        """
+        Ouvre le cache de l'utilisateur.
+
+        Returns:
+            CacheGraphiques or None: Cache ouvert, ou None si le dossier n'est pas utilisable.
+        """
+        try:
+            return cls(version=version)
+        except OSError as e:
+            print(f"Cache des graphiques indisponible ({DOSSIER_CACHE_GRAPHIQUES}): {e}")
+            return None
+
+    def cle(self, graphique: dict) -> str:
+        """
+        Calcule la clé d'un graphique : tous ses paramètres sauf le chemin de
+        sortie, plus l'extension du fichier.
+
+        Args:
+            graphique (dict): Paramètres de rendre_camembert.
+
+        Returns:
+            str: Nom du fichier en cache (empreinte et extension).
+        """
+        extension = os.path.splitext(graphique["chemin"])[1].lower() or ".png"
+        contenu = {cle: valeur for cle, valeur in graphique.items() if cle != "chemin"}
+        texte = json.dumps([FORMAT_CACHE, self.version, extension, contenu], sort_keys=True, default=str)
+        return hashlib.sha256(texte.encode('utf-8')).hexdigest() + extension
+
+    def restaurer(self, cle: str, chemin: str) -> bool:
+        """
+        Copie l'image en cache vers le chemin demandé.
+
+        Args:
+            cle (str): Clé du graphique.
+            chemin (str): Fichier à écrire.
+
+        Returns:
+            bool: True si l'image était en cache.
+        """
+        source = os.path.join(self.dossier, cle)
+        try:
+            dossier = os.path.dirname(chemin)
+            if dossier:
+                os.makedirs(dossier, exist_ok=True)
+            shutil.copyfile(source, chemin)
+            # Marquer l'image comme récemment utilisée pour l'éviction LRU
+            os.utime(source)
+        except OSError:
+            self.misses += 1
+            return False
+        self.hits += 1
+        return True
+
+    def ajouter(self, cle: str, chemin: str):
+        """
+        Ajoute une image rendue au cache (écriture atomique).
+
+        Args:
+            cle (str): Clé du graphique.
+            chemin (str): Image rendue.
+        """
+        try:
+            descripteur, temporaire = tempfile.mkstemp(dir=self.dossier, suffix='.tmp')
+            os.close(descripteur)
+            shutil.copyfile(chemin, temporaire)
+            os.replace(temporaire, os.path.join(self.dossier, cle))
+        except OSError as e:
+            print(f"Impossible de mettre le graphique {os.path.basename(chemin)} en cache: {e}")
+
+    def evincer(self):
+        """
+        Supprime les images les moins récemment utilisées au-delà de taille_max.
+        """
+        images = []
+        for entree in os.scandir(self.dossier):
+            if entree.is_file() and not entree.name.endswith('.tmp'):
+                etat = entree.stat()
+                images.append((etat.st_mtime_ns, etat.st_size, entree.path))
+
+        excedent = sum(taille for _, taille, _ in images) - self.taille_max
+        for _, taille, chemin in sorted(images):
+            if excedent <= 0:
+                break
+            try:
+                os.remove(chemin)
+            except OSError:
+                continue
+            excedent -= taille
+
+    def vider(self):
+        """
+        Supprime toutes les images du cache.
+        """
+        for entree in os.scandir(self.dossier):
+            if entree.is_file():
+                os.remove(entree.path)
+
+    def statistiques(self) -> dict:
+        """
+        Renvoie les compteurs du cache.
+
+        Returns:
+            dict: Nombre de hits, de misses, d'images stockées et leur taille totale.
+        """
+        tailles = [entree.stat().st_size for entree in os.scandir(self.dossier) if entree.is_file()]
+        return {"hits": self.hits, "misses": self.misses, "entrees": len(tailles), "octets": sum(tailles)}
@@ -1,12 +1,98 @@
 from collections import Counter
 import os
 import re
-import matplotlib.pyplot as plt
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import matplotlib
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from backend.script_graphique.cache_graphique import CacheGraphiques
+
+
+def rendre_camembert(chemin, labels, tailles, titre, couleurs=None, taille_figure=(8, 6),
+                     angle_depart=90, legende=False):
+    """
+    Rend un camembert dans un fichier image, sans interface graphique : la figure
+    est créée explicitement et rendue par Agg, sans l'état global de pyplot.
+    La fonction peut donc être exécutée dans un processus de calcul.
+
+    Args:
+        chemin (str): Fichier image à écrire (le dossier est créé si besoin).
+        labels (list): Libellé de chaque part.
+        tailles (list): Effectif de chaque part.
+        titre (str): Titre du graphique.
+        couleurs (list, optional): Couleurs des parts.
+        taille_figure (tuple): Taille de la figure en pouces.
+        angle_depart (float): Angle de la première part.
+        legende (bool): Si True, ajoute une légende des catégories à droite.
+
+    Returns:
+        str: Chemin du fichier écrit.
+    """
+    dossier = os.path.dirname(chemin)
+    if dossier:
+        os.makedirs(dossier, exist_ok=True)
+
+    figure = Figure(figsize=taille_figure)
+    FigureCanvasAgg(figure)
+    axe = figure.add_subplot()
+    patches, _, _ = axe.pie(tailles, labels=labels, colors=couleurs, autopct='%1.1f%%', startangle=angle_depart)
+    axe.axis('equal')  # Assure que le camembert est un cercle
+
+    if legende:
+        axe.set_title(titre, fontsize=14, pad=20)
+        axe.legend(patches, labels,
+                   title="Catégories",
+                   loc="center left",
+                   bbox_to_anchor=(1.2, 0.5))
+        figure.tight_layout()
+        figure.savefig(chemin, bbox_inches='tight', facecolor='white')
+    else:
+        axe.set_title(titre)
+        figure.savefig(chemin)
+    return chemin
+
+
+def rendre_graphiques(graphiques, workers=None):
+    """
+    Rend les graphiques d'un rapport, chacun dans un processus séparé : l'ensemble
+    prend à peu près le temps du graphique le plus long.
+
+    Args:
+        graphiques (list): Paramètres de rendre_camembert de chaque graphique (dict).
+        workers (int, optional): Nombre de processus. Si None, un par cœur ; 1 pour tout rendre ici.
+
+    Returns:
+        list: Chemins des fichiers écrits, dans l'ordre des graphiques.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = min(workers, len(graphiques))
+
+    if workers > 1:
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                rendus = [executor.submit(rendre_camembert, **graphique) for graphique in graphiques]
+                return [rendu.result() for rendu in rendus]
+        except (OSError, BrokenProcessPool) as e:
+            print(f"Rendu parallèle indisponible ({e}), rendu séquentiel des graphiques.")
+    return [rendre_camembert(**graphique) for graphique in graphiques]
+
 
 class GenerateurGraphique:
     
-    def __init__(self):
+    def __init__(self, cache=True):
+        """
+        Args:
+            cache (bool or CacheGraphiques): Cache des graphiques déjà rendus. True pour
+                                             le cache de l'utilisateur, False pour tout redessiner.
+        """
         self.compteur = 0
+        if cache is True:
+            cache = CacheGraphiques.par_defaut(matplotlib.__version__)
+        self.cache = cache or None
         
         # Définition des couleurs
         self.colors = [ 
@@ -54,132 +140,110 @@ class GenerateurGraphique:
                     return None
         return None
     
-    def demande_dossier_sortie(self):
-        dossier = input("Entrez le chemin du dossier où enregistrer l'image (ou appuyez sur Entrée pour le dossier par défaut) : ")
-        
-        if not dossier:  # Si aucun chemin n'est fourni, utiliser le dossier par défaut
-            dossier = self.dossier_sortie_defaut
-            print(f"Utilisation du dossier par défaut : {dossier}")
-        
-        if not os.path.isdir(dossier):  # Vérifier si le dossier existe
-            print(f"Le dossier spécifié '{dossier}' n'existe pas. Création du dossier...")
-            os.makedirs(dossier)  # Crée le dossier s'il n'existe pas
-        return dossier
-
-    def demande_nom_fichier_sortie(self):
-        nom_fichier = input("Entrez le nom du fichier (avec extension, ex. graphique.png (par defaut)) : ")
-        
-        if not nom_fichier:
-            nom_fichier = "graphique.png"  # Nom par défaut
-            print(f"Utilisation du nom de fichier par défaut : {nom_fichier}")
-        
-        return nom_fichier
-
-    def generer_graphique_pays(self, countries, title, demande):
-        if(demande):
-            dossier = self.demande_dossier_sortie() 
-            nom_fichier = self.demande_nom_fichier_sortie()
-            chemin_complet = os.path.join(dossier, nom_fichier)  
-        else :
-            chemin_complet = "./Star_Guardian/output/graphique/graphiqueCountry.png"
-        
-        # Calculer la distribution des pays
+    def chemin_sortie(self, chemin, nom_defaut):
+        """
+        Choisit le fichier d'un graphique : le chemin fourni par l'appelant, sinon le
+        fichier par défaut. Le choix interactif du fichier est fait par l'appelant.
+        """
+        if chemin:
+            return chemin
+        return os.path.join(self.dossier_sortie_defaut, nom_defaut)
+
+    def graphique_pays(self, countries, title, chemin):
+        """
+        Paramètres du camembert de la distribution des pays (voir rendre_camembert).
+        Renvoie None s'il n'y a aucun pays.
+        """
         counter = Counter(countries)
-        labels, sizes = zip(*counter.items())  # Extraire les labels et leurs proportions
-        
-        # Demander les informations d'enregistrement
-        dossier = self.demande_dossier_sortie()  # Demander le dossier de sauvegarde à l'utilisateur
-        nom_fichier = self.demande_nom_fichier_sortie()  # Demander le nom du fichier à l'utilisateur
-        chemin_complet = os.path.join(dossier, nom_fichier)  # Construire le chemin complet
-
-        # Générer le graphique
-        plt.figure(figsize=(8, 6))
-        plt.pie(sizes, labels=labels, autopct='%1.1f%%', startangle=90, colors=self.colors)
-        plt.title(title)
-        plt.axis('equal')
-
-        # Sauvegarder et fermer la figure
-        plt.savefig(chemin_complet)
-        plt.close()
-        print(f"Graphique sauvegardé dans : {chemin_complet}")
-
-    def generer_graphique_type(self, data, title, demande):
-        if(demande):
-            dossier = self.demande_dossier_sortie() 
-            nom_fichier = self.demande_nom_fichier_sortie()
-            chemin_complet = os.path.join(dossier, nom_fichier)  
-        else :
-            chemin_complet = "./Star_Guardian/output/graphique/graphiqueType.png"
-            
-        counts = Counter(data)  
-        types = list(counts.keys())
-        frequencies = list(counts.values())
-
-        # Création d'un camembert
-        plt.figure(figsize=(8, 8))
-        plt.pie(frequencies, labels=types, autopct='%1.1f%%', startangle=90, colors=plt.cm.tab20.colors)
-        plt.title(title)
-        plt.axis('equal')  # Assure que le camembert est un cercle
-        plt.savefig(chemin_complet)
-
-    def generer_graphique_inclination(self, inclinations, title, demande):
-        if(demande):
-            dossier = self.demande_dossier_sortie() 
-            nom_fichier = self.demande_nom_fichier_sortie()
-            chemin_complet = os.path.join(dossier, nom_fichier)  
-        else :
-            chemin_complet = "./Star_Guardian/output/graphique/graphiqueInclination.png"
-        
+        if not counter:
+            print("Aucun pays trouvé dans les fichiers.")
+            return None
+        return {"chemin": chemin, "labels": list(counter.keys()), "tailles": list(counter.values()),
+                "titre": title, "couleurs": self.colors}
+
+    def graphique_type(self, data, title, chemin):
+        """
+        Paramètres du camembert des types d'objets (voir rendre_camembert).
+        """
+        counts = Counter(data)
+        if not counts:
+            print("Aucun type d'objet trouvé dans les fichiers.")
+            return None
+        return {"chemin": chemin, "labels": list(counts.keys()), "tailles": list(counts.values()),
+                "titre": title, "couleurs": matplotlib.colormaps["tab20"].colors, "taille_figure": (8, 8)}
+
+    def graphique_inclination(self, inclinations, title, chemin):
+        """
+        Paramètres du camembert des inclinaisons (voir rendre_camembert).
+        """
         if not inclinations:
             print("Aucune inclinaison trouvée dans les fichiers.")
-            return
-            
+            return None
         counter = Counter(inclinations)
-        
-        plt.figure(figsize=(10, 8))
-        plt.pie(counter.values(), 
-                labels=[f'{k}°' for k in counter.keys()], 
-                autopct='%1.1f%%',
-                colors=self.colors)
-        plt.title(title)
-        plt.axis('equal')   
-        plt.savefig(chemin_complet)
-    
-    def generer_graphique_avec_legend(self, data, title, categories_order, demande):
-        if(demande):
-            dossier = self.demande_dossier_sortie() 
-            nom_fichier = self.demande_nom_fichier_sortie()
-            chemin_complet = os.path.join(dossier, nom_fichier)  
-        else :
+        return {"chemin": chemin, "labels": [f'{k}°' for k in counter.keys()], "tailles": list(counter.values()),
+                "titre": title, "couleurs": self.colors, "taille_figure": (10, 8), "angle_depart": 0}
+
+    def graphique_avec_legend(self, data, title, categories_order, chemin):
+        """
+        Paramètres du camembert avec légende, parts dans l'ordre des catégories
+        (les catégories vides sont omises).
+        """
+        counts = Counter(data)
+        labels = [category for category in categories_order if counts[category] > 0]
+        if not labels:
+            print("Aucune donnée à représenter.")
+            return None
+        return {"chemin": chemin, "labels": labels, "tailles": [counts[category] for category in labels],
+                "titre": title, "couleurs": self.colors[:len(labels)], "taille_figure": (12, 8), "legende": True}
+
+    def generer_graphiques(self, graphiques, workers=None):
+        """
+        Rend plusieurs graphiques en parallèle.
+
+        Args:
+            graphiques (list): Paramètres des graphiques (graphique_pays, graphique_type...) ;
+                               les valeurs None sont ignorées.
+            workers (int, optional): Nombre de processus.
+
+        Returns:
+            list: Chemins des fichiers écrits.
+        """
+        graphiques = [graphique for graphique in graphiques if graphique]
+
+        # Les graphiques déjà rendus avec les mêmes données et le même style sont
+        # copiés depuis le cache ; seuls les autres sont redessinés
+        a_rendre = []
+        for graphique in graphiques:
+            cle = self.cache.cle(graphique) if self.cache else None
+            if cle is None or not self.cache.restaurer(cle, graphique["chemin"]):
+                a_rendre.append((cle, graphique))
+
+        rendre_graphiques([graphique for _, graphique in a_rendre], workers)
+        if self.cache:
+            for cle, graphique in a_rendre:
+                self.cache.ajouter(cle, graphique["chemin"])
+            if a_rendre:
+                self.cache.evincer()
+
+        chemins = [graphique["chemin"] for graphique in graphiques]
+        for chemin in chemins:
+            print(f"Graphique sauvegardé dans : {chemin}")
+        return chemins
+
+    def generer_graphique_pays(self, countries, title, chemin=None):
+        chemin_complet = self.chemin_sortie(chemin, "graphiqueCountry.png")
+        return self.generer_graphiques([self.graphique_pays(countries, title, chemin_complet)], 1)
+
+    def generer_graphique_type(self, data, title, chemin=None):
+        chemin_complet = self.chemin_sortie(chemin, "graphiqueType.png")
+        return self.generer_graphiques([self.graphique_type(data, title, chemin_complet)], 1)
+
+    def generer_graphique_inclination(self, inclinations, title, chemin=None):
+        chemin_complet = self.chemin_sortie(chemin, "graphiqueInclination.png")
+        return self.generer_graphiques([self.graphique_inclination(inclinations, title, chemin_complet)], 1)
+
+    def generer_graphique_avec_legend(self, data, title, categories_order, chemin=None):
+        if not chemin:
             self.compteur = self.compteur + 1
-            chemin_complet = "./Star_Guardian/output/graphique/graphique" + str(self.compteur) + ".png"
-
-        # Prépare les données pour le graphique
-        labels = []
-        sizes = []
-        for category in categories_order:
-            count = data.count(category)
-            if count > 0:  # N'inclut que les catégories non vides
-                labels.append(category)
-                sizes.append(count)
-
-        # Création du graphique en camembert
-        plt.figure(figsize=(12, 8))  
-        patches, texts, autotexts = plt.pie(sizes,
-                                            labels=labels,
-                                            colors=self.colors[:len(labels)],
-                                            autopct='%1.1f%%',
-                                            startangle=90)
-
-        plt.axis('equal')  # Égalise l'aspect du camembert
-        plt.title(title, fontsize=14, pad=20)
-
-        # Ajout de la légende
-        plt.legend(patches, labels,
-                title="Catégories",
-                loc="center left",
-                bbox_to_anchor=(1.2, 0.5))
-
-        plt.tight_layout()
-        plt.savefig(chemin_complet, bbox_inches='tight', facecolor='white')  # Sauvegarde du graphique
-        plt.close()
\ No newline at end of file
+        chemin_complet = self.chemin_sortie(chemin, "graphique" + str(self.compteur) + ".png")
+        return self.generer_graphiques([self.graphique_avec_legend(data, title, categories_order, chemin_complet)], 1)
@@ -5,6 +5,9 @@ from tkinter import ttk, filedialog, messagebox
 from ttkthemes import ThemedTk
 import os
 import json
+import queue
+import threading
+import time
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
@@ -12,12 +15,23 @@ import backend.script_execl.Execl as Execl
 import backend.script_execl.Execl_Brut as Execl_Brut
 
 from backend.script_extraction import (
-    Probabilite, Object_type, Country
+    Probabilite, Object_type, Country, CDMCache, CDMParser, CDMResume, CDMVue,
+    Distance_Miss, Inclination, Maneuvrable
 )
+from backend.script_extraction.CDMTable import CDMTable
 
 import backend.classement.script_classement as script_classement
 import backend.script_graphique.generateur_graphique as generateur_graphique
 
+# Intervalle de relève des événements du thread d'analyse (millisecondes)
+INTERVALLE_SUIVI_ANALYSE = 100
+
+# Graphiques de la page de graphiques, tous préparés par graphiques_dossier
+TYPES_GRAPHIQUES = ("country", "type", "probability", "distance", "maneuverable", "inclination")
+
+# Nombre de lignes affichées par l'explorateur de CDM
+LIGNES_PAGE_CDM = 25
+
 class ModernButton(ttk.Button):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -65,6 +79,22 @@ class SatelliteAnalysisGUI:
         self.execl = Execl.SatelliteDataProcessor()
         self.ConjonctionAnalyzer = self.execl.getConjonctionAnalyzer()
         
+        # Analyse exécutée en arrière-plan (None si aucune)
+        self.analyse_en_cours = None
+        # File du rafraîchissement du tableau de bord en cours (None si aucun)
+        self.rafraichissement_resume = None
+        
+        # Explorateur de CDM : vue sur la table du dossier et position affichée
+        self.vue_cdm = None
+        self.dossier_vue_cdm = None
+        self.debut_vue_cdm = 0
+        self.chargement_cdm = None
+        self.arbre_cdm = None
+        
+        # Génération de graphiques en arrière-plan (None si aucune) et son état affiché
+        self.graphiques_en_cours = None
+        self.statut_graphiques = None
+        
         # Variable 
         self.input_dir = tk.StringVar()
         self.output_dir = tk.StringVar()
@@ -166,6 +196,7 @@ class SatelliteAnalysisGUI:
         menu_items = [
             ("Tableau de bord", self.show_dashboard),
             ("Trier les fichiers", self.show_file_sorting),
+            ("Explorateur CDM", self.show_cdm_browser),
             # ("Graphiques", self.show_graphics_page),
             ("Export Excel", self.show_excel_page),
             ("Paramètres", self.show_settings_page),
@@ -322,38 +353,68 @@ class SatelliteAnalysisGUI:
             self.update_dashboard_info() """
         
     def update_dashboard_info(self):
+        """
+        Affiche immédiatement le résumé enregistré de la dernière analyse du dossier.
+        Un thread vérifie ensuite l'empreinte du dossier : le résumé n'est recalculé,
+        en arrière-plan, que si des fichiers ont changé depuis.
+        """
+        dossier = self.input_dir.get() or self.execl.dossier
+        if not dossier:
+            self.afficher_resume(None)
+            return
+        
+        resume = CDMResume.lire_resume(dossier)
+        self.afficher_resume(resume)
+        
+        # Un seul rafraîchissement à la fois
+        if self.rafraichissement_resume is not None:
+            return
+        self.rafraichissement_resume = queue.Queue()
+        threading.Thread(
+            target=self.rafraichir_resume_thread,
+            args=(dossier, resume, self.rafraichissement_resume),
+            daemon=True
+        ).start()
+        self.root.after(INTERVALLE_SUIVI_ANALYSE, self.suivre_rafraichissement_resume)
+    
+    @staticmethod
+    def rafraichir_resume_thread(dossier, resume, file_evenements):
+        """
+        Recalcule le résumé d'un dossier si son empreinte a changé (n'accède jamais à Tk).
+        """
         try:
-            satellite = self.execl.nom_satellite()
-            self.satellite_name.set(satellite if satellite else "Non défini")
-            
-            files = self.execl.compter_fichiers()
-            self.files_count.set(str(files) if files is not None else "0")
-            
-            # Vérifiez si date_analyzer existe avant d'appeler ses méthodes
-            if hasattr(self.execl, 'date_analyzer') and self.execl.date_analyzer is not None:
-                all_dates = self.execl.date_analyzer._collect_dates()  # Collecter toutes les dates
-
-                # Trouver les dates minimales et maximales
-                start_date = self.execl.date_analyzer.find_min_date(all_dates)  # Passer la liste de dates à la méthode
-                end_date = self.execl.date_analyzer.find_max_date(all_dates)  # Passer la liste de dates à la méthode
-                
-                self.start_date.set(start_date if start_date else "--/--/----")
-                self.end_date.set(end_date if end_date else "--/--/----")
-            else:
-                self.start_date.set("--/--/----")
-                self.end_date.set("--/--/----")
-            
-            self.ConjonctionAnalyzer  = self.execl.getConjonctionAnalyzer()
-            
-            # Vérifiez si ConjonctionAnalyzer existe avant d'appeler ses méthodes
-            if self.ConjonctionAnalyzer  is not None:
-                self.ConjonctionAnalyzer.process_data()
-                self.conjunction_count.set(str(self.ConjonctionAnalyzer.get_conjunction_count()))
-            else:
-                self.conjunction_count.set("0")
-                
+            if resume is not None and resume.get("empreinte") == CDMResume.empreinte_dossier(dossier):
+                file_evenements.put(("resume", None))
+                return
+            processeur = Execl.SatelliteDataProcessor()
+            processeur.set_dossier(dossier)
+            file_evenements.put(("resume", processeur.calculer_resume()))
         except Exception as e:
-            messagebox.showerror("Erreur", f"Une erreur est survenue lors de la mise à jour du tableau de bord: {str(e)}")
+            file_evenements.put(("erreur", str(e)))
+    
+    def suivre_rafraichissement_resume(self):
+        try:
+            evenement = self.rafraichissement_resume.get_nowait()
+        except queue.Empty:
+            self.root.after(INTERVALLE_SUIVI_ANALYSE, self.suivre_rafraichissement_resume)
+            return
+        
+        self.rafraichissement_resume = None
+        if evenement[0] == "erreur":
+            messagebox.showerror("Erreur", f"Une erreur est survenue lors de la mise à jour du tableau de bord: {evenement[1]}")
+        elif evenement[1] is not None:
+            self.afficher_resume(evenement[1])
+    
+    def afficher_resume(self, resume):
+        """
+        Met à jour le tableau de bord à partir d'un résumé d'analyse (None : valeurs par défaut).
+        """
+        resume = resume or {}
+        self.satellite_name.set(resume.get("satellite") or "Non défini")
+        self.files_count.set(str(resume.get("fichiers") or 0))
+        self.start_date.set(resume.get("debut") or "--/--/----")
+        self.end_date.set(resume.get("fin") or "--/--/----")
+        self.conjunction_count.set(str(resume.get("conjonctions") or 0))
     
     def create_stat_card(self, parent, title, value_var, row, col):
         card = ttk.Frame(parent, style='Card.TFrame')
@@ -374,6 +435,207 @@ class SatelliteAnalysisGUI:
         parent.grid_columnconfigure(col, weight=1)
         parent.grid_rowconfigure(row, weight=1)
         
+    def show_cdm_browser(self):
+        """
+        Page d'exploration des CDM : liste virtualisée (seules les lignes visibles
+        sont créées dans le Treeview), triée et filtrée par VueCDM.
+        """
+        self.clear_content()
+        
+        title_frame = ttk.Frame(self.content, style='Content.TFrame')
+        title_frame.pack(fill=tk.X, padx=20, pady=20)
+        ttk.Label(
+            title_frame,
+            text="Explorateur de CDM",
+            style='Title.TLabel'
+        ).pack(anchor='w')
+        ttk.Label(
+            title_frame,
+            text="Cliquez sur un en-tête de colonne pour trier",
+            style='Subtitle.TLabel'
+        ).pack(anchor='w')
+        
+        # Filtres
+        filtres_frame = ttk.Frame(self.content, style='Card.TFrame')
+        filtres_frame.pack(fill=tk.X, padx=20, pady=(0, 10))
+        champs = [
+            ("designateur", "Désignateur"),
+            ("tca_min", "TCA du"), ("tca_max", "au"),
+            ("pc_min", "Pc min"), ("pc_max", "Pc max"),
+            ("distance_min", "Distance min"), ("distance_max", "Distance max"),
+        ]
+        self.filtres_cdm = {}
+        for colonne, (nom, libelle) in enumerate(champs):
+            ttk.Label(filtres_frame, text=libelle).grid(row=0, column=colonne, padx=5, pady=(10, 0), sticky='w')
+            variable = tk.StringVar()
+            ttk.Entry(filtres_frame, textvariable=variable, width=12).grid(row=1, column=colonne, padx=5, pady=(0, 10))
+            self.filtres_cdm[nom] = variable
+        ModernButton(filtres_frame, text="Filtrer", command=self.filtrer_vue_cdm).grid(
+            row=1, column=len(champs), padx=5, pady=(0, 10))
+        ModernButton(filtres_frame, text="Réinitialiser", command=self.reinitialiser_vue_cdm).grid(
+            row=1, column=len(champs) + 1, padx=5, pady=(0, 10))
+        
+        # Liste des CDM
+        liste_frame = ttk.Frame(self.content, style='Content.TFrame')
+        liste_frame.pack(fill=tk.BOTH, expand=True, padx=20)
+        self.arbre_cdm = ttk.Treeview(
+            liste_frame,
+            columns=[cle for cle, _, _ in CDMVue.COLONNES_VUE],
+            show='headings',
+            height=LIGNES_PAGE_CDM,
+            selectmode='browse'
+        )
+        for cle, _, titre in CDMVue.COLONNES_VUE:
+            if cle in CDMVue.CLES_TRI:
+                self.arbre_cdm.heading(cle, text=titre, command=lambda cle=cle: self.trier_vue_cdm(cle))
+            else:
+                self.arbre_cdm.heading(cle, text=titre)
+            self.arbre_cdm.column(cle, width=160, anchor='w')
+        self.barre_cdm = ttk.Scrollbar(liste_frame, orient=tk.VERTICAL, command=self.defiler_vue_cdm)
+        self.arbre_cdm.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.barre_cdm.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        # La molette et le clavier déplacent la fenêtre sur la vue, pas le Treeview
+        self.arbre_cdm.bind('<MouseWheel>', lambda event: self.deplacer_vue_cdm(-3 if event.delta > 0 else 3))
+        self.arbre_cdm.bind('<Button-4>', lambda event: self.deplacer_vue_cdm(-3))
+        self.arbre_cdm.bind('<Button-5>', lambda event: self.deplacer_vue_cdm(3))
+        self.arbre_cdm.bind('<Prior>', lambda event: self.deplacer_vue_cdm(-LIGNES_PAGE_CDM))
+        self.arbre_cdm.bind('<Next>', lambda event: self.deplacer_vue_cdm(LIGNES_PAGE_CDM))
+        
+        self.statut_cdm = tk.StringVar(value="")
+        ttk.Label(self.content, textvariable=self.statut_cdm).pack(anchor='w', padx=20, pady=10)
+        
+        dossier = self.input_dir.get() or self.execl.dossier
+        if not dossier:
+            self.statut_cdm.set("Sélectionnez un répertoire source pour explorer ses CDM")
+            return
+        if self.vue_cdm is not None and self.dossier_vue_cdm == dossier:
+            self.afficher_page_cdm(self.debut_vue_cdm)
+            return
+        
+        # La table déjà construite par la dernière analyse est réutilisée
+        if self.execl.table is not None and self.execl.dossier == dossier:
+            self.ouvrir_vue_cdm(dossier, self.execl.table)
+            return
+        
+        if self.chargement_cdm is None:
+            self.statut_cdm.set("Lecture des CDM...")
+            self.chargement_cdm = queue.Queue()
+            threading.Thread(target=self.charger_table_thread, args=(dossier, self.chargement_cdm), daemon=True).start()
+            self.root.after(INTERVALLE_SUIVI_ANALYSE, self.suivre_chargement_cdm)
+    
+    @staticmethod
+    def charger_table_thread(dossier, file_evenements):
+        """
+        Lit les CDM du dossier (via le cache) sans bloquer l'interface.
+        """
+        cache = None
+        try:
+            cache = CDMCache.CDMCache.pour_dossier(dossier)
+            table = CDMTable.from_files(CDMParser.list_files(dossier), cache=cache)
+            file_evenements.put(("table", dossier, table))
+        except Exception as e:
+            file_evenements.put(("erreur", dossier, str(e)))
+        finally:
+            if cache is not None:
+                cache.fermer()
+    
+    def suivre_chargement_cdm(self):
+        try:
+            evenement = self.chargement_cdm.get_nowait()
+        except queue.Empty:
+            self.root.after(INTERVALLE_SUIVI_ANALYSE, self.suivre_chargement_cdm)
+            return
+        
+        self.chargement_cdm = None
+        if evenement[0] == "erreur":
+            messagebox.showerror("Erreur", f"Impossible de lire les CDM: {evenement[2]}")
+            return
+        self.ouvrir_vue_cdm(evenement[1], evenement[2])
+    
+    def ouvrir_vue_cdm(self, dossier, table):
+        self.vue_cdm = CDMVue.VueCDM(table)
+        self.dossier_vue_cdm = dossier
+        self.afficher_page_cdm(0)
+    
+    def page_cdm_visible(self):
+        # La page a pu être quittée pendant le chargement
+        return self.vue_cdm is not None and self.arbre_cdm is not None and self.arbre_cdm.winfo_exists()
+    
+    def afficher_page_cdm(self, debut):
+        """
+        Remplace les lignes du Treeview par celles de la vue à partir de la position debut.
+        """
+        if not self.page_cdm_visible():
+            return
+        total = len(self.vue_cdm)
+        debut = max(0, min(debut, total - LIGNES_PAGE_CDM))
+        self.debut_vue_cdm = debut
+        
+        self.arbre_cdm.delete(*self.arbre_cdm.get_children())
+        for ligne, valeurs in self.vue_cdm.page(debut, LIGNES_PAGE_CDM):
+            self.arbre_cdm.insert('', tk.END, iid=str(ligne), values=valeurs)
+        
+        if total:
+            fin = min(debut + LIGNES_PAGE_CDM, total)
+            self.barre_cdm.set(debut / total, fin / total)
+            self.statut_cdm.set(f"CDM {debut + 1} à {fin} sur {total}")
+        else:
+            self.barre_cdm.set(0, 1)
+            self.statut_cdm.set("Aucun CDM ne correspond aux filtres")
+    
+    def defiler_vue_cdm(self, action, valeur, unite=None):
+        """
+        Commande de la barre de défilement ("moveto" fraction, ou "scroll" n units/pages).
+        """
+        if not self.page_cdm_visible():
+            return
+        if action == 'moveto':
+            self.afficher_page_cdm(int(float(valeur) * len(self.vue_cdm)))
+        elif action == 'scroll':
+            pas = LIGNES_PAGE_CDM if unite == 'pages' else 1
+            self.deplacer_vue_cdm(int(valeur) * pas)
+    
+    def deplacer_vue_cdm(self, lignes):
+        if self.page_cdm_visible():
+            self.afficher_page_cdm(self.debut_vue_cdm + lignes)
+        return "break"
+    
+    def trier_vue_cdm(self, cle):
+        if not self.page_cdm_visible():
+            return
+        # Un second clic sur la même colonne inverse l'ordre
+        decroissant = self.vue_cdm.cle_tri == cle and not self.vue_cdm.decroissant
+        self.vue_cdm.trier(cle, decroissant)
+        for colonne, _, titre in CDMVue.COLONNES_VUE:
+            if colonne == cle:
+                titre += " ▼" if decroissant else " ▲"
+            self.arbre_cdm.heading(colonne, text=titre)
+        self.afficher_page_cdm(0)
+    
+    def filtrer_vue_cdm(self):
+        if not self.page_cdm_visible():
+            return
+        valeurs = {nom: variable.get().strip() for nom, variable in self.filtres_cdm.items()}
+        try:
+            criteres = {"designateur": valeurs["designateur"]}
+            for nom in ("tca_min", "tca_max"):
+                if valeurs[nom]:
+                    criteres[nom] = CDMVue.borne_date(valeurs[nom], fin=nom == "tca_max")
+            for nom in ("pc_min", "pc_max", "distance_min", "distance_max"):
+                if valeurs[nom]:
+                    criteres[nom] = float(valeurs[nom].replace(',', '.'))
+        except ValueError as e:
+            messagebox.showerror("Erreur", f"Filtre invalide: {e}")
+            return
+        self.vue_cdm.filtrer(**criteres)
+        self.afficher_page_cdm(0)
+    
+    def reinitialiser_vue_cdm(self):
+        for variable in self.filtres_cdm.values():
+            variable.set("")
+        self.filtrer_vue_cdm()
+    
     def show_graphics_page(self):
         self.clear_content()
         
@@ -404,6 +666,11 @@ class SatelliteAnalysisGUI:
                 text=text,
                 command=command
             ).pack(pady=10, padx=20, fill=tk.X)
+        
+        self.statut_graphiques = tk.StringVar(
+            value="Génération des graphiques..." if self.graphiques_en_cours is not None else ""
+        )
+        ttk.Label(self.content, textvariable=self.statut_graphiques).pack(anchor='w', padx=20, pady=10)
             
     def show_file_sorting(self):
         self.clear_content()
@@ -552,7 +819,7 @@ class SatelliteAnalysisGUI:
             nom_satellite = self.execl.nom_satellite() or "Satellite_Anonyme"
             nom_fichier = re.sub(r'[^\w\s-]', '', nom_satellite)
             
-            # Créer un chemin de sortie temporaire pour Excel (toujours travailler avec Excel en interne)
+            # Chemin de sortie (l'extension est adaptée au format par executer_analyse)
             output_dir = self.default_output_dir.get() or os.path.dirname(os.path.realpath(__file__))  # Changer ici
             temp_excel_output = os.path.join(output_dir, f"{nom_fichier}_Analyse.xlsx")
             
@@ -575,27 +842,8 @@ class SatelliteAnalysisGUI:
                 messagebox.showerror("Erreur", "L'analyse a échoué.")
                 return
             
-            # Si le format n'est pas Excel, convertir le fichier
-            final_output = temp_excel_output
-            if format_final != "excel":
-                # Construire le chemin pour le fichier de sortie final
-                if format_final == "calc":
-                    final_output = os.path.join(output_dir, f"{nom_fichier}_Analyse.ods")
-                
-                # Convertir le fichier Excel en format final
-                conversion_success = self.execl.convert_to_format(temp_excel_output, final_output, format_final)
-                if conversion_success:
-                    # Supprimer le fichier Excel temporaire si la conversion a réussi
-                    try:
-                        os.remove(temp_excel_output)
-                        # Mettre à jour le chemin de sortie
-                        self.execl.chemin_sortie = final_output
-                    except Exception as e:
-                        print(f"Avertissement: Impossible de supprimer le fichier temporaire: {e}")
-                else:
-                    messagebox.showwarning("Attention", 
-                        f"La conversion vers {format_final} a échoué. Le fichier Excel a été conservé.")
-                    final_output = temp_excel_output
+            # Pour Calc, executer_analyse a directement écrit le fichier .ods
+            final_output = self.execl.chemin_sortie
 
             if self.auto_update_dashboard.get():
                 self.update_dashboard_info()
@@ -607,6 +855,75 @@ class SatelliteAnalysisGUI:
             messagebox.showerror("Erreur", f"Une erreur est survenue: {str(e)}\n\nDétails: {error_details}")
 
 
+    def graphiques_dossier(self, directory, graph_types, chemins=None, table=None):
+        """
+        Prépare les graphiques d'un dossier : les CDM sont lus une seule fois et les
+        effectifs calculés ici ; le rendu est fait ensuite par generer_graphiques.
+        N'accède pas à Tk : appelée depuis le thread des graphiques.
+        
+        Args:
+            directory (str): Dossier des CDM.
+            graph_types (list): Graphiques voulus (voir TYPES_GRAPHIQUES).
+            chemins (dict, optional): Fichier de chaque graphique ; sinon le dossier par défaut.
+            table (CDMTable, optional): Table du dossier déjà construite ; sinon les CDM sont lus.
+            
+        Returns:
+            list: Paramètres des graphiques (None pour un graphique sans données).
+        """
+        chemins = chemins or {}
+        if table is None:
+            cache = CDMCache.CDMCache.pour_dossier(directory)
+            try:
+                table = CDMTable.from_files(CDMParser.list_files(directory), cache=cache)
+            finally:
+                if cache is not None:
+                    cache.fermer()
+        titre = self.graphique.recuperer_titre_graphique_fichier(directory)
+        
+        graphiques = []
+        for graph_type in graph_types:
+            if graph_type == "country":
+                countries = Country.CountryAnalyzer(directory, table=table).analyze_folder()
+                chemin = self.graphique.chemin_sortie(chemins.get(graph_type), "graphiqueCountry.png")
+                graphiques.append(self.graphique.graphique_avec_legend(
+                    countries, f"{titre} - Country", sorted(set(countries), key=str), chemin
+                ))
+            elif graph_type == "type":
+                chemin = self.graphique.chemin_sortie(chemins.get(graph_type), "graphiqueType.png")
+                graphiques.append(self.graphique.graphique_type(
+                    Object_type.ObjectTypeAnalyzer(directory, table=table).analyze_folder(),
+                    f"{titre} - Object type", chemin
+                ))
+            elif graph_type == "probability":
+                analyzer = Probabilite.CollisionProbabilityAnalyzer(directory, None, None, None, table)
+                chemin = self.graphique.chemin_sortie(chemins.get(graph_type), "graphiqueProbabilite.png")
+                graphiques.append(self.graphique.graphique_avec_legend(
+                    analyzer.analyze_folder(), f"{titre} - Collision_Prob",
+                    ["≥1E-4", "1E-4>X≥1E-5", "1E-5>X≥1E-6", "1E-6>X≥1E-7", "Entre 1E-7 et 1E-8", "≤1E-8"],
+                    chemin
+                ))
+            elif graph_type == "distance":
+                analyzer = Distance_Miss.MissDistanceAnalyzer(directory, table=table)
+                chemin = self.graphique.chemin_sortie(chemins.get(graph_type), "graphiqueDistance.png")
+                graphiques.append(self.graphique.graphique_avec_legend(
+                    analyzer.analyze_folder(), f"{titre} - Miss_Distance", analyzer.categories, chemin
+                ))
+            elif graph_type == "maneuverable":
+                manoeuvrables, na, non_manoeuvrables = Maneuvrable.ManeuvrableAnalyzer(directory, table=table).process_data()
+                chemin = self.graphique.chemin_sortie(chemins.get(graph_type), "graphiqueManeuvrable.png")
+                graphiques.append(self.graphique.graphique_avec_legend(
+                    {"YES": manoeuvrables, "NO": non_manoeuvrables, "N/A": na}, f"{titre} - Maneuverable",
+                    ["YES", "NO", "N/A"], chemin
+                ))
+            elif graph_type == "inclination":
+                # Inclinaisons groupées du premier CDM de chaque conjonction, comme dans le rapport
+                analyzer = Inclination.InclinationAnalyzer(directory, None, None, None, table)
+                chemin = self.graphique.chemin_sortie(chemins.get(graph_type), "graphiqueInclination.png")
+                graphiques.append(self.graphique.graphique_inclination(
+                    analyzer.calculer()["inclinations"], f"{titre} - Inclination", chemin
+                ))
+        return graphiques
+
     def generate_all_graphics(self):
         directory = self.input_dir.get()
         if not directory:
@@ -614,22 +931,8 @@ class SatelliteAnalysisGUI:
             if not directory:
                 return
 
-        try:
-            self.graphique.generer_graphique_type(
-                Object_type.analyze_folder(directory),
-                f"{self.graphique.recuperer_titre_graphique_fichier(directory)} - Object type",
-                False
-            )
-            self.graphique.generer_graphique_avec_legend(
-                Probabilite.analyze_folder(directory),
-                f"{self.graphique.recuperer_titre_graphique_fichier(directory)} - Collision_Prob",
-                ["≥1E-4", "1E-4>X≥1E-5", "1E-5>X≥1E-6", "1E-6>X≥1E-7", "Entre 1E-7 et 1E-8", "≤1E-8"],
-                False
-            )
-
-            messagebox.showinfo("Succès", "Tous les graphiques ont été générés")
-        except Exception as e:
-            messagebox.showerror("Erreur", f"Une erreur est survenue: {str(e)}")
+        # Tous les graphiques sont rendus en même temps, chacun dans un processus
+        self.lancer_graphiques(directory, TYPES_GRAPHIQUES, None, None, "Tous les graphiques ont été générés")
             
     def generate_specific_graph(self, graph_type):
         directory = self.input_dir.get()
@@ -637,26 +940,75 @@ class SatelliteAnalysisGUI:
             directory = filedialog.askdirectory()
             if not directory:
                 return
+        
+        chemin = filedialog.asksaveasfilename(
+            title="Enregistrer le graphique sous",
+            initialdir=self.graphique.dossier_sortie_defaut,
+            defaultextension=".png",
+            filetypes=[("Images PNG", "*.png")]
+        )
+        if not chemin:
+            return  # L'utilisateur a annulé
             
+        self.lancer_graphiques(directory, [graph_type], {graph_type: chemin}, 1, "Le graphique a été généré")
+    
+    def lancer_graphiques(self, directory, graph_types, chemins, workers, message_succes):
+        """
+        Prépare et rend des graphiques dans un thread, comme l'analyse (voir lancer_analyse) :
+        la lecture des CDM et le rendu ne bloquent pas la fenêtre.
+        
+        Args:
+            directory (str): Dossier des CDM.
+            graph_types (list): Graphiques voulus (voir TYPES_GRAPHIQUES).
+            chemins (dict, optional): Fichier de chaque graphique.
+            workers (int, optional): Nombre de processus de rendu.
+            message_succes (str): Message affiché à la fin.
+        """
+        if self.graphiques_en_cours is not None:
+            messagebox.showinfo("Information", "Des graphiques sont déjà en cours de génération")
+            return
+        
+        # La table déjà construite par la dernière analyse est réutilisée
+        table = self.execl.table if self.execl.table is not None and self.execl.dossier == directory else None
+        
+        self.graphiques_en_cours = {"file": queue.Queue(), "message": message_succes}
+        if self.statut_graphiques is not None:
+            self.statut_graphiques.set("Génération des graphiques...")
+        threading.Thread(
+            target=self.generer_graphiques_thread,
+            args=(directory, graph_types, chemins, table, workers, self.graphiques_en_cours["file"]),
+            daemon=True
+        ).start()
+        self.root.after(INTERVALLE_SUIVI_ANALYSE, self.suivre_graphiques)
+    
+    def generer_graphiques_thread(self, directory, graph_types, chemins, table, workers, file_evenements):
+        """
+        Corps du thread des graphiques : n'accède jamais à Tk, tout passe par la file.
+        """
         try:
-            if graph_type == "country":
-                self.graphique.generer_graphique_avec_legend(
-                    Country.analyze_folder(directory),
-                    f"{self.graphique.recuperer_titre_graphique_fichier(directory)} - Country",
-                    Country.get_unique_countries(Country.analyze_folder(directory)),
-                    True
-                )
-            elif graph_type == "type":
-                self.graphique.generer_graphique_type(
-                    Object_type.analyze_folder(directory),
-                    f"{self.graphique.recuperer_titre_graphique_fichier(directory)} - Object type",
-                    True
-                )
-            # TODO: Ajouter les autres types de graphiques (probabilité, distance, etc.)
-            
-            messagebox.showinfo("Succès", "Le graphique a été généré")
+            graphiques = self.graphiques_dossier(directory, graph_types, chemins, table)
+            file_evenements.put(("termine", self.graphique.generer_graphiques(graphiques, workers)))
         except Exception as e:
-            messagebox.showerror("Erreur", f"Une erreur est survenue: {str(e)}")
+            file_evenements.put(("erreur", str(e)))
+    
+    def suivre_graphiques(self):
+        try:
+            fin = self.graphiques_en_cours["file"].get_nowait()
+        except queue.Empty:
+            self.root.after(INTERVALLE_SUIVI_ANALYSE, self.suivre_graphiques)
+            return
+        
+        message_succes = self.graphiques_en_cours["message"]
+        self.graphiques_en_cours = None
+        if self.statut_graphiques is not None:
+            self.statut_graphiques.set("")
+        
+        if fin[0] == "erreur":
+            messagebox.showerror("Erreur", f"Une erreur est survenue: {fin[1]}")
+        elif not fin[1]:
+            messagebox.showwarning("Attention", "Aucune donnée à représenter")
+        else:
+            messagebox.showinfo("Succès", message_succes)
             
     def show_settings_page(self):
         """Affiche la page des paramètres"""
@@ -725,7 +1077,7 @@ class SatelliteAnalysisGUI:
         # Options de format
         format_options = [
             ("Microsoft Excel (*.xlsx)", "excel"),
-            # ("LibreOffice Calc (*.ods)", "calc"),
+            ("LibreOffice Calc (*.ods)", "calc"),
         ]
         
         config_files_frame = ttk.LabelFrame(settings_frame, text="Fichiers de configuration", style='Settings.TLabelframe')
@@ -819,6 +1171,10 @@ class SatelliteAnalysisGUI:
         ).pack(side=tk.LEFT, padx=5)
     
     def generate_excel(self):
+        if self.analyse_en_cours is not None:
+            messagebox.showinfo("Information", "Une analyse est déjà en cours")
+            return
+        
         input_directory = self.input_dir.get()
         if not input_directory:
             input_directory = filedialog.askdirectory(title="Sélectionnez le répertoire source")
@@ -848,17 +1204,19 @@ class SatelliteAnalysisGUI:
                 messagebox.showerror("Erreur", f"Le fichier modèle n'existe pas: {model_calc}")
                 return
             
-            # Configurer le processeur
-            self.execl.set_dossier(input_directory)
-            self.execl.setCheminModel(model_calc)
+            # Configurer un nouveau processeur : l'analyse s'exécute dans un thread et
+            # self.execl (lu par le tableau de bord) n'est remplacé qu'à la fin
+            processeur = Execl.SatelliteDataProcessor()
+            processeur.set_dossier(input_directory)
+            processeur.setCheminModel(model_calc)
             
             # Obtenir le nom du satellite pour le fichier de sortie
-            nom_satellite = self.execl.nom_satellite() or "Satellite_Anonyme"
+            nom_satellite = processeur.nom_satellite() or "Satellite_Anonyme"
             nom_fichier = re.sub(r'[^\w\s-]', '', nom_satellite)
             
             # Générer un nom versionné pour le fichier
             output_dir = self.default_output_dir.get() or os.path.dirname(model_calc)
-            nom_fichier_versionne = self.execl.generer_nom_fichier_versionne(output_dir, nom_fichier)
+            nom_fichier_versionne = processeur.generer_nom_fichier_versionne(output_dir, nom_fichier)
             
             # Déterminer l'extension selon le format choisi
             format_final = self.model_format.get()
@@ -878,61 +1236,179 @@ class SatelliteAnalysisGUI:
             # Extraire le répertoire et le nom du fichier
             output_dir = os.path.dirname(output_file)
             
-            # Créer un chemin de sortie temporaire pour Excel (toujours travailler avec Excel en interne)
+            # Créer un chemin de sortie temporaire (l'extension est adaptée au format par executer_analyse)
             temp_excel_output = os.path.join(output_dir, f"{os.path.basename(output_file).split('.')[0]}_temp.xlsx")
             
             # Définir le chemin de sortie temporaire pour le traitement interne
-            self.execl.set_chemin_sortie(temp_excel_output)
+            processeur.set_chemin_sortie(temp_excel_output)
             
             # Définir le format à utiliser pour la conversion finale
-            self.execl.set_format(format_final)   
-                
-            success = self.execl.executer_analyse()
-            
-            if not success:
-                messagebox.showerror("Erreur", "L'analyse a échoué.")
-                return
-            
-            # Si le format n'est pas Excel, convertir le fichier
-            if format_final != "excel":
-                # Convertir le fichier Excel en format final
-                conversion_success = self.execl.convert_to_format(temp_excel_output, output_file, format_final)
-                if conversion_success:
-                    # Supprimer le fichier Excel temporaire si la conversion a réussi
-                    try:
-                        os.remove(temp_excel_output)
-                        # Mettre à jour le chemin de sortie
-                        self.execl.chemin_sortie = output_file
-                    except Exception as e:
-                        print(f"Avertissement: Impossible de supprimer le fichier temporaire: {e}")
-                else:
-                    messagebox.showwarning("Attention", 
-                        f"La conversion vers {format_final} a échoué. Le fichier Excel a été conservé.")
-                    # Renommer le fichier temporaire vers le nom choisi par l'utilisateur
-                    try:
-                        os.rename(temp_excel_output, output_file.replace(extension, ".xlsx"))
-                        self.execl.chemin_sortie = output_file.replace(extension, ".xlsx")
-                    except Exception as e:
-                        print(f"Erreur lors du renommage du fichier: {e}")
-                        self.execl.chemin_sortie = temp_excel_output
-            else:
-                # Pour Excel, renommer simplement le fichier temporaire vers le nom choisi par l'utilisateur
-                try:
-                    os.rename(temp_excel_output, output_file)
-                    self.execl.chemin_sortie = output_file
-                except Exception as e:
-                    print(f"Erreur lors du renommage du fichier: {e}")
-                    self.execl.chemin_sortie = temp_excel_output
-
-            if self.auto_update_dashboard.get():
-                self.update_dashboard_info()
+            processeur.set_format(format_final)   
             
-            messagebox.showinfo("Succès", f"Le fichier a été généré: {self.execl.chemin_sortie}")
+            self.lancer_analyse(processeur, output_file)
         except Exception as e:
             import traceback
             error_details = traceback.format_exc()
             messagebox.showerror("Erreur", f"Une erreur est survenue: {str(e)}\n\nDétails: {error_details}")
     
+    def lancer_analyse(self, processeur, output_file):
+        """
+        Exécute l'analyse dans un thread pour que la fenêtre reste utilisable.
+        Le thread envoie ses événements (progression, fin) dans une file relevée
+        par root.after ; seul le thread de Tk modifie l'interface.
+        
+        Args:
+            processeur (SatelliteDataProcessor): Processeur configuré.
+            output_file (str): Fichier choisi par l'utilisateur.
+        """
+        fenetre = tk.Toplevel(self.root)
+        fenetre.title("Analyse en cours")
+        fenetre.transient(self.root)
+        fenetre.resizable(False, False)
+        fenetre.protocol("WM_DELETE_WINDOW", self.annuler_analyse)
+        
+        etape = tk.StringVar(value="Préparation de l'analyse...")
+        detail = tk.StringVar(value="")
+        ttk.Label(fenetre, textvariable=etape).pack(anchor='w', padx=20, pady=(20, 5))
+        barre = ttk.Progressbar(fenetre, length=420, mode='indeterminate')
+        barre.pack(padx=20, pady=5)
+        ttk.Label(fenetre, textvariable=detail).pack(anchor='w', padx=20, pady=5)
+        bouton = ModernButton(fenetre, text="Annuler", command=self.annuler_analyse)
+        bouton.pack(pady=(5, 20))
+        barre.start(10)
+        
+        self.analyse_en_cours = {
+            "processeur": processeur,
+            "output_file": output_file,
+            "file": queue.Queue(),
+            "annulation": threading.Event(),
+            "fenetre": fenetre,
+            "etape": etape,
+            "detail": detail,
+            "barre": barre,
+            "bouton": bouton,
+            "debut_lecture": None,
+        }
+        threading.Thread(
+            target=self.executer_analyse_thread,
+            args=(processeur, self.analyse_en_cours["file"], self.analyse_en_cours["annulation"]),
+            daemon=True
+        ).start()
+        self.root.after(INTERVALLE_SUIVI_ANALYSE, self.suivre_analyse)
+    
+    @staticmethod
+    def executer_analyse_thread(processeur, file_evenements, annulation):
+        """
+        Corps du thread d'analyse : n'accède jamais à Tk, tout passe par la file.
+        """
+        processeur.set_progression(
+            lambda etape, fait, total: file_evenements.put(("progression", etape, fait, total)),
+            annulation
+        )
+        try:
+            file_evenements.put(("termine", processeur.executer_analyse()))
+        except Execl.AnalyseAnnulee:
+            file_evenements.put(("annule",))
+        except Exception as e:
+            import traceback
+            file_evenements.put(("erreur", str(e), traceback.format_exc()))
+        finally:
+            processeur.set_progression()
+    
+    def annuler_analyse(self):
+        analyse = self.analyse_en_cours
+        if analyse is None:
+            return
+        analyse["annulation"].set()
+        analyse["etape"].set("Annulation en cours...")
+        analyse["bouton"].state(['disabled'])
+    
+    def suivre_analyse(self):
+        """
+        Relève les événements du thread d'analyse, puis se reprogramme jusqu'à la fin.
+        """
+        analyse = self.analyse_en_cours
+        fin = None
+        try:
+            while fin is None:
+                evenement = analyse["file"].get_nowait()
+                if evenement[0] == "progression":
+                    self.afficher_progression(*evenement[1:])
+                else:
+                    fin = evenement
+        except queue.Empty:
+            pass
+        
+        if fin is None:
+            self.root.after(INTERVALLE_SUIVI_ANALYSE, self.suivre_analyse)
+            return
+        
+        analyse["barre"].stop()
+        analyse["fenetre"].destroy()
+        self.analyse_en_cours = None
+        self.terminer_analyse(analyse["processeur"], analyse["output_file"], fin)
+    
+    def afficher_progression(self, etape, fait, total):
+        """
+        Affiche l'étape en cours ; pendant la lecture des CDM, la barre suit le
+        nombre de fichiers lus, avec le débit et le temps restant estimé.
+        """
+        analyse = self.analyse_en_cours
+        if analyse["annulation"].is_set():
+            return
+        analyse["etape"].set(Execl.ETAPES_ANALYSE.get(etape, etape))
+        barre = analyse["barre"]
+        
+        if etape != "lecture" or not total:
+            if str(barre['mode']) != 'indeterminate':
+                barre.configure(mode='indeterminate', value=0)
+                barre.start(10)
+            analyse["detail"].set("")
+            return
+        
+        if str(barre['mode']) != 'determinate':
+            barre.stop()
+            barre.configure(mode='determinate', maximum=total)
+        barre.configure(value=fait)
+        
+        # Débit mesuré depuis le premier événement de lecture (fichiers en cache compris)
+        maintenant = time.monotonic()
+        if analyse["debut_lecture"] is None:
+            analyse["debut_lecture"] = (maintenant, fait)
+        debut, fait_debut = analyse["debut_lecture"]
+        texte = f"{fait} / {total} fichiers"
+        if maintenant > debut and fait > fait_debut:
+            vitesse = (fait - fait_debut) / (maintenant - debut)
+            restant = int((total - fait) / vitesse)
+            texte += f" - {vitesse:.0f} fichiers/s - reste {restant // 60}:{restant % 60:02d}"
+        analyse["detail"].set(texte)
+    
+    def terminer_analyse(self, processeur, output_file, fin):
+        if fin[0] == "annule":
+            messagebox.showinfo("Information", "L'analyse a été annulée")
+            return
+        if fin[0] == "erreur":
+            messagebox.showerror("Erreur", f"Une erreur est survenue: {fin[1]}\n\nDétails: {fin[2]}")
+            return
+        if not fin[1]:
+            messagebox.showerror("Erreur", "L'analyse a échoué.")
+            return
+        
+        # Renommer le fichier produit (.xlsx, ou .ods écrit directement pour Calc)
+        # vers le nom choisi par l'utilisateur
+        fichier_produit = processeur.chemin_sortie
+        try:
+            os.replace(fichier_produit, output_file)
+            processeur.chemin_sortie = output_file
+        except Exception as e:
+            print(f"Erreur lors du renommage du fichier: {e}")
+        
+        self.execl = processeur
+        if self.auto_update_dashboard.get():
+            self.update_dashboard_info()
+        
+        messagebox.showinfo("Succès", f"Le fichier a été généré: {self.execl.chemin_sortie}")
+    
     def apply_theme(self):
         """Applique le thème sélectionné"""
         try:
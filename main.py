@@ -14,8 +14,8 @@ __author__ = "Alexis Michaux-Kinet"
 __copyright__ = "Copyright (c) 2025"
 __license__ = "Propriétaire"
 
-from ttkthemes import ThemedTk
-from gui.interface import SatelliteAnalysisGUI
+import multiprocessing
+import sys
 
 LEGAL_NOTICE = """
 Star Guardian Project v{version}
@@ -26,9 +26,21 @@ Développé par : {author}
 """.format(version=__version__, copyright=__copyright__, author=__author__)
 
 def main():
+    # Avec des arguments (ex: "main.py analyze <dossier>"), analyse sans interface graphique
+    if len(sys.argv) > 1:
+        import star_guardian
+        return star_guardian.main(sys.argv[1:])
+    
+    # L'interface n'est chargée que si elle est utilisée
+    from ttkthemes import ThemedTk
+    from gui.interface import SatelliteAnalysisGUI
+    
     root = ThemedTk(theme="arc")
     app = SatelliteAnalysisGUI(root, legal_notice=LEGAL_NOTICE, version=__version__)
     root.mainloop()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    # Avant tout : dans l'exécutable PyInstaller, chaque processus d'un pool relance
+    # l'exécutable, qui doit alors exécuter la tâche au lieu de démarrer l'application
+    multiprocessing.freeze_support()
+    sys.exit(main())
\ No newline at end of file
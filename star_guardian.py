@@ -0,0 +1,243 @@
+"""
+Star Guardian Project - analyse en ligne de commande (sans interface graphique).
+
+Exemples :
+    python -m star_guardian analyze dossier_cdm --out rapport.xlsx
+    python -m star_guardian analyze dossier_1 dossier_2 --out rapports/ --jobs 2 --summary resume.json
+    python -m star_guardian analyze dossier_cdm --out rapport.xlsx --data parquet
+
+Ce module n'importe ni tkinter ni ttkthemes : il peut être lancé depuis cron
+ou sur un serveur sans affichage.
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from datetime import datetime
+
+from backend.script_execl import Execl
+from backend.script_execl.Execl_Brut import DECOUPAGES_TOUS
+from backend.script_execl.Execl_Donnees import FORMATS_DONNEES, pyarrow_disponible
+from backend.script_extraction.AnalysisGraph import MODE_SERIE, MODES_EXECUTION
+
+# Modèle utilisé par défaut, comme dans l'interface graphique
+MODELE_PAR_DEFAUT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'config', 'config_excel.xlsx')
+
+FORMATS = ("excel", "calc")
+EXTENSIONS = {"excel": ".xlsx", "calc": ".ods"}
+
+
+def nom_sortie(dossier, format_type):
+    """
+    Construit le nom du fichier de sortie d'un dossier, comme l'interface graphique.
+
+    Args:
+        dossier (str): Dossier des CDM.
+        format_type (str): "excel" ou "calc".
+
+    Returns:
+        str: Nom du fichier ("<satellite>_Analyse.xlsx").
+    """
+    nom_satellite = Execl.SatelliteDataProcessor(dossier).nom_satellite() or "Satellite_Anonyme"
+    nom_fichier = re.sub(r'[^\w\s-]', '', nom_satellite)
+    return f"{nom_fichier}_Analyse{EXTENSIONS[format_type]}"
+
+
+def chemins_sortie(dossiers, sortie, format_type):
+    """
+    Associe un fichier de sortie à chaque dossier.
+
+    Avec un seul dossier, --out peut être le fichier lui-même. Sinon, --out est un
+    répertoire et chaque rapport porte le nom du satellite (suivi du nom du dossier
+    si deux dossiers concernent le même satellite).
+
+    Args:
+        dossiers (list): Dossiers à analyser.
+        sortie (str or None): Valeur de --out.
+        format_type (str): "excel" ou "calc".
+
+    Returns:
+        list: Chemin de sortie de chaque dossier.
+    """
+    if len(dossiers) == 1 and sortie and not os.path.isdir(sortie) and os.path.splitext(sortie)[1]:
+        return [os.path.abspath(sortie)]
+
+    repertoire = os.path.abspath(sortie or os.getcwd())
+    os.makedirs(repertoire, exist_ok=True)
+    noms = [nom_sortie(dossier, format_type) for dossier in dossiers]
+    chemins = []
+    for dossier, nom in zip(dossiers, noms):
+        if noms.count(nom) > 1:
+            base, extension = os.path.splitext(nom)
+            nom = f"{base}_{os.path.basename(os.path.normpath(dossier))}{extension}"
+        chemins.append(os.path.join(repertoire, nom))
+    return chemins
+
+
+def analyser_dossier(dossier, chemin_sortie, modele, format_type="excel", mode=MODE_SERIE,
+                     nombre_workers=None, utiliser_cache=True, format_donnees=None,
+                     decoupage_tous="taille", classeurs_tous=False, utiliser_index=False,
+                     ingestion_incrementale=True):
+    """
+    Exécute l'analyse complète d'un dossier et renvoie son résumé.
+    Les messages de l'analyse sont écrits sur la sortie d'erreur.
+
+    Args:
+        dossier (str): Dossier des CDM.
+        chemin_sortie (str): Fichier de sortie.
+        modele (str): Modèle Excel à copier.
+        format_type (str): "excel" ou "calc".
+        mode (str): Exécution des analyseurs indépendants ("serial", "thread" ou "process").
+        nombre_workers (int, optional): Nombre de processus ou de threads de l'analyse.
+        utiliser_cache (bool): Utiliser le cache persistant des CDM du dossier.
+        format_donnees (str, optional): Exporter aussi TOUS et SHORTLIST en "parquet" ou "arrow".
+        decoupage_tous (str): Découpage de TOUS, "taille" ou "mois".
+        classeurs_tous (bool): Écrire TOUS dans des classeurs séparés du rapport.
+        utiliser_index (bool): Remplir l'index SQLite du dossier et en tirer les statistiques.
+        ingestion_incrementale (bool): Ne lire que les CDM ajoutés ou modifiés depuis la dernière analyse.
+
+    Returns:
+        dict: Résumé de l'analyse (succès, sortie, nombres de fichiers et de conjonctions, durées).
+    """
+    debut = time.perf_counter()
+    resume = {"dossier": os.path.abspath(dossier), "sortie": None, "succes": False}
+    with redirect_stdout(sys.stderr):
+        processeur = Execl.SatelliteDataProcessor()
+        processeur.utiliser_cache = utiliser_cache
+        processeur.utiliser_index = utiliser_index
+        processeur.ingestion_incrementale = ingestion_incrementale
+        processeur.set_dossier(dossier)
+        processeur.setCheminModel(modele)
+        processeur.set_format(format_type)
+        processeur.set_mode_execution(mode, nombre_workers)
+        if not processeur.set_format_donnees(format_donnees):
+            resume["erreur"] = f"Export des données en {format_donnees} impossible"
+            return resume
+        processeur.set_decoupage_tous(decoupage_tous, classeurs_tous)
+        # Pas de set_chemin_sortie : le fichier n'existe pas encore, executer_analyse le crée
+        processeur.chemin_sortie = os.path.splitext(chemin_sortie)[0] + '.xlsx'
+        try:
+            resume["succes"] = bool(processeur.executer_analyse())
+            resume["sortie"] = processeur.getSortie()
+            if classeurs_tous:
+                resume["classeurs_tous"] = processeur.classeurs_tous
+            if format_donnees:
+                resume["donnees"] = processeur.fichiers_donnees
+                resume["succes"] = resume["succes"] and bool(processeur.fichiers_donnees)
+            if processeur.table is not None:
+                resume["fichiers"] = len(processeur.table)
+            if processeur.conjunction_analyzer is not None:
+                resume["conjonctions"] = processeur.conjunction_analyzer.get_conjunction_count()
+        except Exception as e:
+            print(f"Erreur lors de l'analyse du dossier {dossier}: {e}")
+            resume["erreur"] = str(e)
+        finally:
+            if processeur.cache:
+                processeur.cache.fermer()
+            if processeur.index:
+                processeur.index.fermer()
+    resume["durees"] = {nom: round(duree, 3) for nom, duree in processeur.durees.items()}
+    resume["durees"]["total"] = round(time.perf_counter() - debut, 3)
+    return resume
+
+
+def analyze(args):
+    """
+    Sous-commande "analyze" : analyse un ou plusieurs dossiers, en parallèle si --jobs > 1.
+
+    Returns:
+        int: Code de sortie (0 si toutes les analyses ont réussi).
+    """
+    debut = time.perf_counter()
+    dossiers = [dossier for dossier in args.dossiers if os.path.isdir(dossier)]
+    introuvables = {
+        dossier: {"dossier": os.path.abspath(dossier), "sortie": None, "succes": False, "erreur": "Dossier introuvable"}
+        for dossier in args.dossiers if not os.path.isdir(dossier)
+    }
+    if not os.path.exists(args.template):
+        print(f"Le fichier modèle n'existe pas: {args.template}", file=sys.stderr)
+        return 2
+    if args.data and not pyarrow_disponible():
+        print(f"L'export --data {args.data} nécessite pyarrow : pip install pyarrow", file=sys.stderr)
+        return 2
+
+    with redirect_stdout(sys.stderr):
+        sorties = chemins_sortie(dossiers, args.out, args.format) if dossiers else []
+
+    jobs = max(1, min(args.jobs, len(dossiers)))
+    # Plusieurs dossiers en parallèle : chaque analyse lit ses fichiers dans son propre processus
+    nombre_workers = args.workers if args.workers is not None or jobs == 1 else 1
+    options = (os.path.abspath(args.template), args.format, args.mode, nombre_workers, not args.no_cache, args.data,
+               args.split_tous, args.tous_workbooks, args.index,
+               not args.full)
+
+    if jobs == 1:
+        analyses = [analyser_dossier(dossier, sortie, *options) for dossier, sortie in zip(dossiers, sorties)]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            futures = [executor.submit(analyser_dossier, dossier, sortie, *options)
+                       for dossier, sortie in zip(dossiers, sorties)]
+            analyses = [future.result() for future in futures]
+
+    # Résumés dans l'ordre des dossiers demandés
+    analyses = iter(analyses)
+    resumes = [introuvables[dossier] if dossier in introuvables else next(analyses) for dossier in args.dossiers]
+
+    resume = {
+        "date": datetime.now().isoformat(timespec='seconds'),
+        "modele": os.path.abspath(args.template),
+        "format": args.format,
+        "jobs": jobs,
+        "succes": all(analyse["succes"] for analyse in resumes),
+        "duree_totale": round(time.perf_counter() - debut, 3),
+        "analyses": resumes,
+    }
+    texte = json.dumps(resume, ensure_ascii=False, indent=2)
+    if args.summary:
+        with open(args.summary, 'w', encoding='utf-8') as fichier:
+            fichier.write(texte + "\n")
+    else:
+        print(texte)
+    return 0 if resume["succes"] else 1
+
+
+def construire_parser():
+    parser = argparse.ArgumentParser(prog="star_guardian", description="Star Guardian - analyse de CDM sans interface graphique.")
+    sous_commandes = parser.add_subparsers(dest="commande", required=True)
+
+    analyse = sous_commandes.add_parser("analyze", help="Analyser un ou plusieurs dossiers de CDM.")
+    analyse.add_argument("dossiers", nargs="+", help="Dossiers contenant les fichiers CDM.")
+    analyse.add_argument("--template", default=MODELE_PAR_DEFAUT, help="Modèle Excel (config/config_excel.xlsx par défaut).")
+    analyse.add_argument("--out", help="Fichier de sortie (un seul dossier) ou répertoire des rapports.")
+    analyse.add_argument("--format", choices=FORMATS, default="excel", help="Format du rapport.")
+    analyse.add_argument("--data", choices=FORMATS_DONNEES, help="Exporter aussi TOUS et SHORTLIST en Parquet ou Arrow IPC, à côté du rapport.")
+    analyse.add_argument("--split-tous", choices=DECOUPAGES_TOUS, default="taille",
+                         help="Découpage de TOUS : par taille (au-delà de la limite d'Excel) ou par mois de CREATION_DATE.")
+    analyse.add_argument("--tous-workbooks", action="store_true", help="Écrire TOUS dans des classeurs séparés du rapport.")
+    analyse.add_argument("--jobs", type=int, default=1, help="Nombre de dossiers analysés en parallèle.")
+    analyse.add_argument("--mode", choices=MODES_EXECUTION, default=MODE_SERIE, help="Exécution des analyseurs indépendants.")
+    analyse.add_argument("--workers", type=int, help="Processus ou threads utilisés par chaque analyse.")
+    analyse.add_argument("--no-cache", action="store_true", help="Ne pas utiliser le cache des CDM.")
+    analyse.add_argument("--full", action="store_true",
+                         help="Relire tous les CDM, sans reprendre ceux de l'analyse précédente du dossier.")
+    analyse.add_argument("--index", action="store_true",
+                         help="Remplir l'index SQLite des CDM du dossier et en tirer les statistiques.")
+    analyse.add_argument("--summary", help="Écrire le résumé JSON dans ce fichier plutôt que sur la sortie standard.")
+    analyse.set_defaults(fonction=analyze)
+    return parser
+
+
+def main(argv=None):
+    args = construire_parser().parse_args(argv)
+    return args.fonction(args)
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Les tests importent les modules du projet depuis sa racine (comme main.py)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,100 @@
+import pytest
+
+from backend.script_extraction.AgeAnalyzer import SatelliteAgeAnalyzer
+from backend.script_extraction.AnalysisGraph import (
+    MODE_PROCESSUS, MODE_SERIE, MODE_THREADS, RESULTAT_CONJONCTIONS, RESULTAT_OPERATEURS, RESULTAT_TABLE,
+    AnalysisGraph,
+)
+from backend.script_extraction.CDMParser import CLE_INCLINAISON, CDMRecord
+from backend.script_extraction.CDMTable import CDMTable
+from backend.script_extraction.Conjonction import ConjunctionAnalyzer
+from backend.script_extraction.Country import CountryAnalyzer
+from backend.script_extraction.Inclination import InclinationAnalyzer
+
+
+def test_ordre_topologique():
+    graphe = AnalysisGraph()
+    graphe.fournir("table", 1)
+    graphe.declarer("groupes", lambda: 2, ("table",))
+    graphe.declarer("rapport", lambda: 3, ("groupes", "operateurs"))
+    graphe.declarer("operateurs", lambda: 4)
+
+    ordre = graphe.ordre()
+    for nom, (_, dependances) in graphe.noeuds.items():
+        assert all(ordre.index(dependance) < ordre.index(nom) for dependance in dependances)
+    assert graphe.ordre(["groupes"]) == ["table", "groupes"]
+
+
+def test_chaque_noeud_calcule_une_fois():
+    appels = []
+    graphe = AnalysisGraph()
+    graphe.declarer("a", lambda: appels.append("a") or 1)
+    graphe.declarer("b", lambda: appels.append("b") or graphe.resultat("a") + 1, ("a",))
+    graphe.declarer("c", lambda: appels.append("c") or graphe.resultat("a") + 2, ("a",))
+    assert graphe.executer(["b", "c"]) == {"b": 2, "c": 3}
+    assert appels == ["a", "b", "c"]
+
+    graphe.invalider("a")
+    assert graphe.executer(["c"]) == {"c": 3}
+    assert appels == ["a", "b", "c", "a", "c"]
+
+
+def test_dependance_circulaire():
+    graphe = AnalysisGraph()
+    graphe.declarer("a", lambda: 1, ("c",))
+    graphe.declarer("b", lambda: 2, ("a",))
+    graphe.declarer("c", lambda: 3, ("b",))
+    with pytest.raises(ValueError, match="circulaire"):
+        graphe.ordre()
+    with pytest.raises(ValueError):
+        graphe.resultat("b")
+
+
+def test_resultat_inconnu():
+    graphe = AnalysisGraph()
+    graphe.declarer("a", lambda: 1, ("absent",))
+    with pytest.raises(KeyError):
+        graphe.ordre(["a"])
+
+
+def table_analyse(nombre=40):
+    operateurs = ["SpaceX", "PRC", "CIS", "IST NanosatLab", "INCONNU"]
+    records = []
+    for k in range(nombre):
+        objet2 = {
+            "OBJECT_DESIGNATOR": str(40000 + k % 7),
+            "INTERNATIONAL_DESIGNATOR": f"{1990 + k % 30}-0{k % 9}A",
+            "OPERATOR_ORGANIZATION": operateurs[k % len(operateurs)],
+            CLE_INCLINAISON: f"{(k * 13) % 180}.5",
+        }
+        header = {"CREATION_DATE": f"2024-01-{1 + k % 20:02d}T{k % 24:02d}:00:00.000"}
+        records.append(CDMRecord(f"cdm_{k:03d}.txt", header, {"OBJECT1": {}, "OBJECT2": objet2}))
+    return CDMTable.from_records(records)
+
+
+def calculer_en_mode(table, mode):
+    graphe = AnalysisGraph()
+    graphe.fournir(RESULTAT_TABLE, table)
+    conjonctions = ConjunctionAnalyzer(None, None, None, None, table)
+    pays = CountryAnalyzer(None, None, None, None, table)
+    graphe.declarer(RESULTAT_CONJONCTIONS, conjonctions.calculer_conjonctions, (RESULTAT_TABLE,))
+    graphe.declarer(RESULTAT_OPERATEURS, pays._get_operator_country_mapping)
+    analyseurs = {
+        "pays": pays,
+        "inclinaisons": InclinationAnalyzer(None, None, None, None, table),
+        "ages": SatelliteAgeAnalyzer(None, None, None, None, table),
+    }
+    return graphe.calculer_analyseurs(analyseurs, mode, max_workers=2)
+
+
+def test_modes_execution_identiques():
+    table = table_analyse()
+    serie = calculer_en_mode(table, MODE_SERIE)
+    assert serie["pays"] and serie["inclinaisons"]["inclinations"]
+    assert calculer_en_mode(table, MODE_THREADS) == serie
+    assert calculer_en_mode(table, MODE_PROCESSUS) == serie
+
+
+def test_mode_inconnu():
+    with pytest.raises(ValueError):
+        AnalysisGraph().calculer_analyseurs({}, "gpu")
@@ -0,0 +1,78 @@
+import os
+
+import pytest
+
+from backend.script_extraction.CDMCache import CDMCache
+from backend.script_extraction.CDMParser import CDMRecord, identify_files
+from backend.script_extraction.CDMTable import CDMTable
+
+
+def ecrire_cdm(chemin, distance):
+    with open(chemin, "w") as fichier:
+        fichier.write("CREATION_DATE = 2024-01-01T00:00:00.000\n")
+        fichier.write(f"MISS_DISTANCE = {distance} [m]\n")
+        fichier.write("OBJECT = OBJECT1\nOBJECT_DESIGNATOR = 12345\n")
+    return str(chemin)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = CDMCache(str(tmp_path / "cache.sqlite"))
+    yield cache
+    cache.fermer()
+
+
+def test_miss_puis_hit(tmp_path, cache):
+    chemins = [ecrire_cdm(tmp_path / f"cdm_{i}.txt", 100 + i) for i in range(3)]
+    premiere = CDMTable.from_files(chemins, cache=cache, workers=1)
+    assert cache.statistiques() == {"hits": 0, "misses": 3, "entrees": 3}
+
+    seconde = CDMTable.from_files(chemins, cache=cache, workers=1)
+    assert cache.statistiques() == {"hits": 3, "misses": 3, "entrees": 3}
+    assert seconde.to_frame().equals(premiere.to_frame())
+
+
+def test_invalidation_taille_et_date(tmp_path, cache):
+    chemin = ecrire_cdm(tmp_path / "cdm.txt", 100)
+    cache.ecrire([(chemin, size, mtime_ns, CDMRecord("cdm.txt", {"MISS_DISTANCE": "100"}))
+                  for chemin, size, mtime_ns in identify_files([chemin])])
+    fichier = identify_files([chemin])
+    assert chemin in cache.lire(fichier)
+
+    # Même fichier, taille différente
+    ecrire_cdm(chemin, 1000)
+    assert cache.lire(identify_files([chemin])) == {}
+
+    # Même taille, date de modification différente
+    _, taille, mtime_ns = fichier[0]
+    assert cache.lire([(chemin, taille, mtime_ns + 1)]) == {}
+    assert cache.lire([(chemin, taille, mtime_ns)]) != {}
+
+    table = CDMTable.from_files([chemin], cache=cache, workers=1)
+    assert table.numeric("MISS_DISTANCE").tolist() == [1000.0]
+
+
+def test_eviction_lru(tmp_path):
+    cache = CDMCache(str(tmp_path / "cache.sqlite"), taille_max=2)
+    try:
+        entrees = [(str(tmp_path / f"cdm_{i}.txt"), 10, i, CDMRecord(f"cdm_{i}.txt")) for i in range(3)]
+        cache.ecrire(entrees[:2])
+        # cdm_0 est relu : cdm_1 devient l'entrée la moins récemment utilisée
+        assert len(cache.lire([entrees[0][:3]])) == 1
+        cache.ecrire(entrees[2:])
+
+        trouves = cache.lire([entree[:3] for entree in entrees])
+        assert set(trouves) == {entrees[0][0], entrees[2][0]}
+        assert cache.statistiques()["entrees"] == 2
+    finally:
+        cache.fermer()
+
+
+def test_pour_dossier(tmp_path, monkeypatch):
+    monkeypatch.setattr("backend.script_extraction.CDMCache.DOSSIER_CACHE_UTILISATEUR", str(tmp_path / "caches"))
+    assert CDMCache.pour_dossier(str(tmp_path / "absent")) is None
+    cache = CDMCache.pour_dossier(str(tmp_path))
+    try:
+        assert os.path.dirname(cache.chemin_base) == str(tmp_path / "caches")
+    finally:
+        cache.fermer()
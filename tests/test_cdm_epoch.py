@@ -0,0 +1,62 @@
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+
+from backend.script_extraction.CDMEpoch import (EPOQUE_ABSENTE, FORME_CALENDAIRE, FORME_INVALIDE,
+                                                FORME_JOUR_ANNEE, format_epochs, parse_epoch, parse_epochs)
+
+
+def epoque(*champs, nanosecondes=0):
+    date = datetime(*champs, tzinfo=timezone.utc)
+    return int(date.timestamp()) * 10**9 + nanosecondes
+
+
+@pytest.mark.parametrize("valeur, attendu", [
+    ("2024-01-12T02:31:38.000", epoque(2024, 1, 12, 2, 31, 38)),
+    ("2024-01-12T02:31:38", epoque(2024, 1, 12, 2, 31, 38)),
+    ("2024-01-12T02:31:38Z", epoque(2024, 1, 12, 2, 31, 38)),
+    ("2024-01-12T02:31:38.5Z", epoque(2024, 1, 12, 2, 31, 38, nanosecondes=500_000_000)),
+    (" 2024-02-29T00:00:00.000 ", epoque(2024, 2, 29)),
+    ("2024-01-01T00:00:00.123456789", epoque(2024, 1, 1, nanosecondes=123_456_789)),
+    ("2024-01-01T00:00:00.1234567891", epoque(2024, 1, 1, nanosecondes=123_456_789)),
+    ("2024-060T00:00:00", epoque(2024, 2, 29)),
+    ("2024-366T23:59:59.5", epoque(2024, 12, 31, 23, 59, 59, nanosecondes=500_000_000)),
+    ("1970-01-01T00:00:00", 0),
+])
+def test_dates_valides(valeur, attendu):
+    assert parse_epoch(valeur) == attendu
+
+
+@pytest.mark.parametrize("valeur", [
+    None, "", "   ", "invalide", "2024-02-30T00:00:00", "2023-02-29T00:00:00", "2023-366T00:00:00",
+    "2024-000T00:00:00", "2024-13-01T00:00:00", "2024-01-01T24:00:00", "2024-01-01T00:60:00",
+    "2024-01-01 00:00:00", "2024-1-01T00:00:00", "2024-01-01T00:00:00.", "2024-01-01T00:00:00.1x",
+    "2024-01-01T00:00:00.1é", "1600-01-01T00:00:00",
+])
+def test_dates_invalides(valeur):
+    assert parse_epoch(valeur) is None
+    assert parse_epochs([valeur])[0] == EPOQUE_ABSENTE
+
+
+def test_formes_et_decimales():
+    epoques, formes, decimales = parse_epochs(["2024-01-01T00:00:00.123", "2024-001T00:00:00", "x"], True)
+
+    assert formes.tolist() == [FORME_CALENDAIRE, FORME_JOUR_ANNEE, FORME_INVALIDE]
+    assert decimales.tolist()[:2] == [3, 0]
+    assert epoques[0] == epoques[1] + 123_000_000
+
+
+def test_tableaux_vides_et_blocs():
+    assert parse_epochs([]).shape == (0,)
+
+    valeurs = ["2024-01-01T00:00:00", None] * 70_000
+    epoques = parse_epochs(valeurs)
+    assert (epoques[::2] == epoque(2024, 1, 1)).all()
+    assert (epoques[1::2] == EPOQUE_ABSENTE).all()
+
+
+def test_format_epochs():
+    chaines = format_epochs(np.array([epoque(2024, 2, 29, 12, nanosecondes=1_500), EPOQUE_ABSENTE]))
+
+    assert chaines.tolist() == ["2024-02-29T12:00:00.000001", None]
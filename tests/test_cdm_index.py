@@ -0,0 +1,81 @@
+import os
+
+import numpy as np
+import pytest
+
+from backend.script_extraction.CDMIndex import CDMIndex
+from backend.script_extraction.CDMManifeste import ManifesteCDM
+from backend.script_extraction.CDMTable import CDMTable
+
+SEUILS_PROBABILITE = [(">=", 1e-4, "≥1E-4"), (">=", 1e-6, "≥1E-6")]
+
+
+def ecrire_cdm(dossier, numero, probabilite, designateur="40001", operateur="SpaceX"):
+    with open(os.path.join(dossier, f"cdm_{numero:03d}.txt"), "w") as fichier:
+        fichier.write(f"CREATION_DATE = 2024-01-{1 + numero % 28:02d}T00:00:00.000\n")
+        fichier.write(f"TCA = 2024-02-{1 + numero % 28:02d}T00:00:00.000\n")
+        fichier.write(f"MISS_DISTANCE = {100 * numero} [m]\n")
+        fichier.write(f"COLLISION_PROBABILITY = {probabilite}\n")
+        fichier.write("OBJECT = OBJECT1\nOBJECT_DESIGNATOR = 12345\n")
+        fichier.write(f"OBJECT = OBJECT2\nOBJECT_DESIGNATOR = {designateur}\n")
+        fichier.write(f"INTERNATIONAL_DESIGNATOR = 2019-0{numero % 5}A\nOBJECT_TYPE = DEBRIS\n")
+        fichier.write(f"OPERATOR_ORGANIZATION = {operateur}\n")
+
+
+def contenu_index(index):
+    return {
+        "lignes": index._requete("SELECT * FROM cdm ORDER BY ligne"),
+        "probabilites": index.compter_categories("collision_probability", SEUILS_PROBABILITE, "<1E-6"),
+        "types": index.types_objets(),
+        "operateurs": index.compter_operateurs(),
+    }
+
+
+def index_complet(tmp_path, table, nom):
+    index = CDMIndex(str(tmp_path / nom))
+    index.indexer(table)
+    return index
+
+
+@pytest.fixture
+def dossier(tmp_path):
+    dossier = tmp_path / "cdm"
+    dossier.mkdir()
+    for numero in range(12):
+        ecrire_cdm(str(dossier), numero, f"{numero}.0E-0{3 + numero % 5}", str(40000 + numero % 3))
+    return str(dossier)
+
+
+def test_comptages_identiques_a_la_table(tmp_path, dossier):
+    table = CDMTable.from_files(sorted(os.path.join(dossier, nom) for nom in os.listdir(dossier)), workers=1)
+    index = index_complet(tmp_path, table, "index.sqlite")
+    assert index.nombre() == len(table)
+
+    probabilites = table.numeric("COLLISION_PROBABILITY")
+    categories = np.select([probabilites >= 1e-4, probabilites >= 1e-6], ["≥1E-4", "≥1E-6"], "<1E-6")
+    attendu = {categorie: int((categories == categorie).sum()) for categorie in set(categories.tolist())}
+    assert dict(index.compter_categories("collision_probability", SEUILS_PROBABILITE, "<1E-6")) == attendu
+    index.fermer()
+
+
+def test_indexation_incrementale_identique_a_une_reconstruction(tmp_path, dossier):
+    manifeste = ManifesteCDM(dossier, str(tmp_path / "manifeste.sqlite"))
+    index = CDMIndex(str(tmp_path / "incremental.sqlite"))
+    index.indexer(manifeste.ingerer(workers=1), manifeste)
+
+    # Ajout, modification, suppression, puis une ingestion sans changement
+    etapes = [
+        lambda: ecrire_cdm(dossier, 20, "5.0E-05", "40009", "PRC"),
+        lambda: ecrire_cdm(dossier, 3, "9.0E-02", "40001", "CIS"),
+        lambda: os.remove(os.path.join(dossier, "cdm_005.txt")),
+        lambda: None,
+    ]
+    for numero, etape in enumerate(etapes):
+        etape()
+        table = manifeste.ingerer(workers=1)
+        index.indexer(table, manifeste)
+        reconstruit = index_complet(tmp_path, table, f"complet_{numero}.sqlite")
+        assert contenu_index(index) == contenu_index(reconstruit)
+        assert index.nombre() == len(os.listdir(dossier))
+        reconstruit.fermer()
+    index.fermer()
@@ -0,0 +1,120 @@
+import os
+import sqlite3
+
+import pytest
+
+from backend.script_extraction import CDMManifeste, CDMParser
+from backend.script_extraction.CDMManifeste import ManifesteCDM
+from backend.script_extraction.CDMTable import CDMTable
+
+
+def ecrire_cdm(dossier, numero, probabilite="1.0E-05", distance=None):
+    with open(os.path.join(dossier, f"cdm_{numero:03d}.txt"), "w") as fichier:
+        fichier.write(f"CREATION_DATE = 2024-01-{1 + numero % 28:02d}T00:00:00.000\n")
+        fichier.write(f"TCA = 2024-02-{1 + numero % 28:02d}T00:00:00.000\n")
+        fichier.write(f"MISS_DISTANCE = {100 * numero if distance is None else distance} [m]\n")
+        fichier.write(f"COLLISION_PROBABILITY = {probabilite}\n")
+        fichier.write("OBJECT = OBJECT1\nOBJECT_DESIGNATOR = 12345\n")
+        fichier.write(f"OBJECT = OBJECT2\nOBJECT_DESIGNATOR = {40000 + numero % 3}\n")
+
+
+def table_dossier(dossier):
+    return CDMTable.from_files(CDMParser.list_files(dossier), workers=1)
+
+
+def verifier_table(table, attendue):
+    assert table.filenames.tolist() == attendue.filenames.tolist()
+    assert table.to_frame().equals(attendue.to_frame())
+    assert ({cle: type(colonne) for cle, colonne in table.colonnes.items()}
+            == {cle: type(colonne) for cle, colonne in attendue.colonnes.items()})
+
+
+@pytest.fixture
+def dossier(tmp_path):
+    dossier = tmp_path / "cdm"
+    dossier.mkdir()
+    for numero in range(10):
+        ecrire_cdm(str(dossier), numero)
+    return str(dossier)
+
+
+def test_ingestions_identiques_a_une_relecture(tmp_path, dossier):
+    chemin = str(tmp_path / "manifeste.sqlite")
+
+    # Ajout, modification, suppression, valeur non numérique, puis une ingestion sans changement
+    etapes = [
+        lambda: None,
+        lambda: ecrire_cdm(dossier, 15),
+        lambda: ecrire_cdm(dossier, 4, "9.0E-02"),
+        lambda: os.remove(os.path.join(dossier, "cdm_002.txt")),
+        lambda: ecrire_cdm(dossier, 6, distance="n/a"),
+        lambda: os.remove(os.path.join(dossier, "cdm_000.txt")),
+        lambda: None,
+    ]
+    for etape in etapes:
+        etape()
+        manifeste = ManifesteCDM.charger(dossier, chemin)
+        table = manifeste.ingerer(workers=1)
+        verifier_table(table, table_dossier(dossier))
+        manifeste.enregistrer()
+
+        # La table relue de la base est celle de l'ingestion
+        verifier_table(ManifesteCDM.charger(dossier, chemin).table, table)
+
+
+def test_ingestion_sans_changement(tmp_path, dossier):
+    chemin = str(tmp_path / "manifeste.sqlite")
+    manifeste = ManifesteCDM.charger(dossier, chemin)
+    manifeste.ingerer(workers=1)
+    manifeste.groupes = {"40001": (["cdm_001.txt"], [{"cdm_001.txt"}])}
+    manifeste.enregistrer()
+
+    manifeste = ManifesteCDM.charger(dossier, chemin)
+    manifeste.ingerer(workers=1)
+    assert not manifeste.modifies and not manifeste.supprimes
+    assert manifeste.groupes == {"40001": (["cdm_001.txt"], [{"cdm_001.txt"}])}
+
+
+def test_segments_fusionnes(tmp_path, dossier, monkeypatch):
+    monkeypatch.setattr(CDMManifeste, "SEGMENTS_MAX", 2)
+    chemin = str(tmp_path / "manifeste.sqlite")
+    for numero in range(20, 25):
+        ecrire_cdm(dossier, numero)
+        manifeste = ManifesteCDM.charger(dossier, chemin)
+        manifeste.ingerer(workers=1)
+        manifeste.enregistrer()
+
+        with sqlite3.connect(chemin) as connexion:
+            assert connexion.execute("SELECT COUNT(*) FROM segment").fetchone()[0] <= 2
+    verifier_table(ManifesteCDM.charger(dossier, chemin).table, table_dossier(dossier))
+
+
+def test_manifeste_illisible(tmp_path, dossier):
+    chemin = tmp_path / "manifeste.sqlite"
+    chemin.write_bytes(b"pas une base")
+    manifeste = ManifesteCDM.charger(dossier, str(chemin))
+    assert manifeste.table is None
+    verifier_table(manifeste.ingerer(workers=1), table_dossier(dossier))
+
+
+def test_evenements_suivis_entre_ingestions(tmp_path, dossier):
+    chemin = str(tmp_path / "manifeste.sqlite")
+    manifeste = ManifesteCDM.charger(dossier, chemin)
+    manifeste.ingerer(workers=1)
+    manifeste.enregistrer()
+    evenement = ManifesteCDM.charger(dossier, chemin).regroupeur.evenement("cdm_004.txt")
+
+    # Fichier ajouté : rattaché aux événements enregistrés, qui gardent leur identifiant
+    ecrire_cdm(dossier, 31)
+    manifeste = ManifesteCDM.charger(dossier, chemin)
+    manifeste.ingerer(workers=1)
+    assert manifeste.regroupeur.evenement("cdm_004.txt") == evenement
+    assert manifeste.regroupeur.evenement("cdm_031.txt") is not None
+    manifeste.enregistrer()
+
+    # Fichier retiré : les événements sont recalculés sans lui
+    os.remove(os.path.join(dossier, "cdm_031.txt"))
+    manifeste = ManifesteCDM.charger(dossier, chemin)
+    manifeste.ingerer(workers=1)
+    assert manifeste.regroupeur.evenement("cdm_031.txt") is None
+    assert len(manifeste.regroupeur) == 10
@@ -0,0 +1,62 @@
+from backend.script_extraction.CDMParser import CLE_INCLINAISON, parse_bytes
+
+CDM = b"""CCSDS_CDM_VERS                     = 1.0
+CREATION_DATE                      = 2024-01-12T02:31:38.000
+MESSAGE_ID                         = 0_conj_40006
+
+COMMENT Relative Metadata/Data
+TCA                                = 2024-01-14T02:31:38.000
+MISS_DISTANCE                      = 150 [m]
+COLLISION_PROBABILITY              = 1.637306E-10
+
+OBJECT                             =OBJECT1
+OBJECT_DESIGNATOR                  = 12345
+INTERNATIONAL_DESIGNATOR           = 2020-001A
+COMMENT Inclination = 87.9 [deg]
+CR_R                               = 5.414583E+03 [m**2]
+
+OBJECT                             =OBJECT2
+OBJECT_DESIGNATOR                  = 40006
+INTERNATIONAL_DESIGNATOR           = 2021-035C
+COMMENT Inclination = 51.6 [deg]
+CR_R                               = 5.276767E+03 [m**2]
+"""
+
+
+def test_parse_bytes_toutes_les_cles():
+    record = parse_bytes(CDM, "cdm_000000.txt")
+
+    assert record.filename == "cdm_000000.txt"
+    assert record.header["CREATION_DATE"] == "2024-01-12T02:31:38.000"
+    assert record.header["MISS_DISTANCE"] == "150"
+    assert record.get("OBJECT_DESIGNATOR", "OBJECT1") == "12345"
+    assert record.get("OBJECT_DESIGNATOR", "OBJECT2") == "40006"
+    assert record.get(CLE_INCLINAISON, "OBJECT2") == "51.6"
+    assert record.get("CR_R", "OBJECT1") == "5.414583E+03"
+    assert "COMMENT Relative Metadata/Data" not in record.header
+
+
+def test_parse_bytes_cles_demandees():
+    cles = ("CREATION_DATE", "MISS_DISTANCE", "OBJECT_DESIGNATOR", CLE_INCLINAISON)
+    record = parse_bytes(CDM, "cdm_000000.txt", keys=cles)
+    complet = parse_bytes(CDM, "cdm_000000.txt")
+
+    assert record.header == {"CREATION_DATE": "2024-01-12T02:31:38.000", "MISS_DISTANCE": "150"}
+    for section in ("OBJECT1", "OBJECT2"):
+        attendu = {cle: valeur for cle, valeur in complet.objects[section].items() if cle in cles + ("OBJECT",)}
+        assert record.objects[section] == attendu
+
+
+def test_parse_bytes_cle_en_premiere_ligne_et_fin_sans_retour():
+    contenu = b"CREATION_DATE = 2024-01-12T02:31:38.000\r\nOBJECT = OBJECT2\r\nOBJECT_DESIGNATOR = 40006"
+    record = parse_bytes(contenu, keys=("CREATION_DATE", "OBJECT_DESIGNATOR"))
+
+    assert record.header == {"CREATION_DATE": "2024-01-12T02:31:38.000"}
+    assert record.get("OBJECT_DESIGNATOR", "OBJECT2") == "40006"
+    assert parse_bytes(contenu).objects == record.objects
+
+
+def test_parse_bytes_lignes_ignorees():
+    record = parse_bytes(b"CLE_VIDE =\nA = B = C\n= sans_cle\nSANS_EGAL\n", keys=None)
+
+    assert record.header == {"CLE_VIDE": ""}
@@ -0,0 +1,41 @@
+import numpy as np
+
+from backend.script_extraction.CDMParser import CDMRecord
+from backend.script_extraction.CDMTable import CDMTable, ColonneNumerique
+
+
+def record(nom, distance, vitesse=None):
+    header = {"CREATION_DATE": "2024-01-01T00:00:00.000", "MISS_DISTANCE": distance}
+    if vitesse is not None:
+        header["RELATIVE_SPEED"] = vitesse
+    return CDMRecord(nom, header, {"OBJECT1": {"X": "1.000000E+00"}, "OBJECT2": {}})
+
+
+def test_export_garde_le_texte_des_nombres():
+    table = CDMTable.from_records([record("a", "5.414583E+03", "890.0"), record("b", "12.50"), record("c", "7")])
+    colonne = table.colonnes[("HEADER", "MISS_DISTANCE")]
+    assert isinstance(colonne, ColonneNumerique)
+    np.testing.assert_array_equal(table.numeric("MISS_DISTANCE"), [5414.583, 12.5, 7.0])
+
+    df = table.to_frame()
+    assert df["MISS_DISTANCE"].tolist() == ["5.414583E+03", "12.50", "7"]
+    assert df["RELATIVE_SPEED"].tolist()[0] == "890.0"
+    assert np.isnan(df["RELATIVE_SPEED"].tolist()[1])
+    assert table.value(0, "MISS_DISTANCE") == "5.414583E+03"
+    assert table.strings("X", "OBJECT1").tolist() == ["1.000000E+00"] * 3
+
+
+def test_texte_restitue_sans_copie():
+    table = CDMTable.from_records([record("a", "1.5"), record("b", "0.25")])
+    assert table.colonnes[("HEADER", "MISS_DISTANCE")].textes is None
+    assert table.to_frame()["MISS_DISTANCE"].tolist() == ["1.5", "0.25"]
+
+
+def test_selection_et_concatenation_gardent_le_texte():
+    table = CDMTable.from_records([record("a", "1.5"), record("b", "2.0E+01"), record("c", "3.10")])
+    assert table.select(np.array([2, 0])).to_frame()["MISS_DISTANCE"].tolist() == ["3.10", "1.5"]
+
+    autre = CDMTable.from_records([record("d", "4.5")])
+    concatenee = CDMTable.concatener([table, autre], np.array([3, 0, 1, 2]))
+    assert concatenee.filenames.tolist() == ["d", "a", "b", "c"]
+    assert concatenee.to_frame()["MISS_DISTANCE"].tolist() == ["4.5", "1.5", "2.0E+01", "3.10"]
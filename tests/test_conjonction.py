@@ -0,0 +1,121 @@
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from backend.script_extraction.CDMEpoch import parse_epoch
+from backend.script_extraction.CDMParser import CDMRecord
+from backend.script_extraction.CDMTable import CDMTable
+from backend.script_extraction.Conjonction import ConjunctionAnalyzer
+
+
+def regroupement_reference(records):
+    """
+    Regroupement historique par paires de fichiers (i < j) de chaque désignateur :
+    une paire à moins de 24 h rejoint le premier groupe contenant l'un des deux
+    fichiers, sinon elle crée un groupe.
+    """
+    fichiers_par_designateur = {}
+    for record in records:
+        designateur = record.get('OBJECT_DESIGNATOR', 'OBJECT2') or ''
+        numero = designateur[:len(designateur) - len(designateur.lstrip('0123456789'))]
+        if numero:
+            fichiers_par_designateur.setdefault(numero, []).append(record)
+
+    conjonctions = {}
+    identifiant = 1
+    for records_designateur in fichiers_par_designateur.values():
+        dates = [(record.filename, parse_epoch(record.header.get('CREATION_DATE')))
+                 for record in records_designateur if record.header.get('CREATION_DATE')]
+        if len(dates) == 1:
+            conjonctions[identifiant] = {dates[0][0]}
+            identifiant += 1
+            continue
+        for i in range(len(dates)):
+            for j in range(i + 1, len(dates)):
+                fichier1, epoque1 = dates[i]
+                fichier2, epoque2 = dates[j]
+                if epoque1 is None or epoque2 is None:
+                    continue
+                if abs(epoque1 - epoque2) > ConjunctionAnalyzer.FENETRE_CONJONCTION * 10**9:
+                    continue
+                existant = next((cle for cle, groupe in conjonctions.items()
+                                 if fichier1 in groupe or fichier2 in groupe), None)
+                if existant is None:
+                    conjonctions[identifiant] = {fichier1, fichier2}
+                    identifiant += 1
+                else:
+                    conjonctions[existant].update((fichier1, fichier2))
+    return conjonctions
+
+
+def generer_records(graine, nombre, designateurs, dates_anormales):
+    """
+    Génère des CDM dans un ordre de fichiers aléatoire. Une partie des dates tombe sur
+    une grille de 8 h (époques égales et écarts d'exactement 24 h).
+    """
+    aleatoire = random.Random(graine)
+    debut = datetime(2024, 1, 1)
+    records = []
+    for k in range(nombre):
+        if aleatoire.random() < 0.3:
+            date = debut + timedelta(hours=8 * aleatoire.randrange(120))
+        else:
+            date = debut + timedelta(seconds=aleatoire.randrange(40 * 86400))
+        creation = date.strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3]
+
+        # Dates illisibles, vides ou absentes
+        tirage = aleatoire.random() if dates_anormales else 1.0
+        header = {"CCSDS_CDM_VERS": "1.0"}
+        if tirage < 0.04:
+            header["CREATION_DATE"] = "invalide"
+        elif tirage < 0.07:
+            header["CREATION_DATE"] = "2024-02-30T00:00:00.000"
+        elif tirage < 0.10:
+            header["CREATION_DATE"] = ""
+        elif tirage >= 0.13:
+            header["CREATION_DATE"] = creation
+
+        records.append(CDMRecord(f"cdm_{k:05d}.txt", header, {
+            "OBJECT1": {"OBJECT": "OBJECT1", "OBJECT_DESIGNATOR": "12345"},
+            "OBJECT2": {"OBJECT": "OBJECT2", "OBJECT_DESIGNATOR": f"{40000 + aleatoire.randrange(designateurs)}"},
+        }))
+    aleatoire.shuffle(records)
+    return records
+
+
+def regrouper(records):
+    analyseur = ConjunctionAnalyzer(None, None, None, None, CDMTable.from_records(records))
+    return analyseur.calculer_conjonctions()
+
+
+@pytest.mark.parametrize("graine", range(40))
+def test_regroupement_identique_au_parcours_par_paires(graine):
+    aleatoire = random.Random(graine)
+    records = generer_records(graine, aleatoire.randrange(2, 300), aleatoire.randrange(1, 8), graine % 2 == 0)
+
+    attendu = regroupement_reference(records)
+    obtenu = regrouper(records)
+
+    assert list(obtenu) == list(attendu)
+    assert [obtenu[cle] for cle in obtenu] == [attendu[cle] for cle in attendu]
+
+
+def test_epoques_egales_et_ecart_de_24h_regroupes():
+    dates = ["2024-01-02T00:00:00.000", "2024-01-01T00:00:00.000", "2024-01-02T00:00:00.000",
+             "2024-01-05T00:00:00.000", "2024-01-03T00:00:00.001"]
+    records = [CDMRecord(f"cdm_{k}.txt", {"CREATION_DATE": date}, {"OBJECT2": {"OBJECT_DESIGNATOR": "40001"}})
+               for k, date in enumerate(dates)]
+
+    assert regrouper(records) == regroupement_reference(records) == {1: {"cdm_0.txt", "cdm_1.txt", "cdm_2.txt"}}
+
+
+def test_un_seul_fichier_date_forme_un_groupe():
+    records = [
+        CDMRecord("cdm_0.txt", {"CREATION_DATE": "invalide"}, {"OBJECT2": {"OBJECT_DESIGNATOR": "40001"}}),
+        CDMRecord("cdm_1.txt", {}, {"OBJECT2": {"OBJECT_DESIGNATOR": "40001"}}),
+        CDMRecord("cdm_2.txt", {"CREATION_DATE": ""}, {"OBJECT2": {"OBJECT_DESIGNATOR": "40001"}}),
+        CDMRecord("cdm_3.txt", {"CREATION_DATE": "2024-01-01T00:00:00"}, {"OBJECT2": {"OBJECT_DESIGNATOR": "ABC"}}),
+    ]
+
+    assert regrouper(records) == regroupement_reference(records) == {1: {"cdm_0.txt"}}
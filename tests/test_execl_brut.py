@@ -0,0 +1,72 @@
+import os
+
+from openpyxl import Workbook, load_workbook
+
+from backend.script_execl.Execl_Brut import ajouter_feuille_tous, decouper_tous, exporter_classeurs_tous
+from backend.script_execl.Execl_Flux import enregistrer_classeur
+from backend.script_extraction.CDMParser import CDMRecord
+from backend.script_extraction.CDMTable import CDMTable
+
+
+def table_test(dates):
+    return CDMTable.from_records([
+        CDMRecord(f"cdm_{k}.txt", {"CREATION_DATE": date} if date else {"MESSAGE_ID": str(k)})
+        for k, date in enumerate(dates)
+    ])
+
+
+def jours(nombre, mois="01"):
+    return [f"2024-{mois}-{1 + k:02d}T00:00:00.000" for k in range(nombre)]
+
+
+def decoupage(table, *args, **kwargs):
+    return [(suffixe, morceau.filenames.tolist()) for suffixe, morceau in decouper_tous(table, *args, **kwargs)]
+
+
+def test_taille_limite():
+    table = table_test(list(reversed(jours(4))))
+    assert decoupage(table, lignes_max=4) == [("", ["cdm_0.txt", "cdm_1.txt", "cdm_2.txt", "cdm_3.txt"])]
+    # Au-delà de la limite : morceaux dans l'ordre de CREATION_DATE
+    assert decoupage(table, lignes_max=3) == [("", ["cdm_3.txt", "cdm_2.txt", "cdm_1.txt"]), ("_2", ["cdm_0.txt"])]
+    assert decoupage(table, lignes_max=2) == [("", ["cdm_3.txt", "cdm_2.txt"]), ("_2", ["cdm_1.txt", "cdm_0.txt"])]
+
+
+def test_table_vide():
+    table = table_test([])
+    assert [(suffixe, len(morceau)) for suffixe, morceau in decouper_tous(table, "mois", lignes_max=1)] == [("", 0)]
+
+
+def test_mois_et_dates_absentes():
+    table = table_test(jours(3, "02") + [None] + jours(2, "01"))
+    assert decoupage(table, "mois") == [
+        ("_2024-01", ["cdm_4.txt", "cdm_5.txt"]),
+        ("_2024-02", ["cdm_0.txt", "cdm_1.txt", "cdm_2.txt"]),
+        ("_SANS_DATE", ["cdm_3.txt"]),
+    ]
+    # Un mois plus long que la limite est lui-même découpé
+    assert decoupage(table, "mois", lignes_max=2) == [
+        ("_2024-01", ["cdm_4.txt", "cdm_5.txt"]),
+        ("_2024-02", ["cdm_0.txt", "cdm_1.txt"]),
+        ("_2024-02_2", ["cdm_2.txt"]),
+        ("_SANS_DATE", ["cdm_3.txt"]),
+    ]
+
+
+def test_feuilles_tous_par_mois(tmp_path):
+    wb = Workbook()
+    wb.active.title = "STATISTIQUES"
+    wb.create_sheet("TOUS")
+    wb.create_sheet("SHORTLIST")
+    ajouter_feuille_tous(wb, table_test(jours(2, "03") + jours(1, "01")), "mois")
+    chemin = tmp_path / "rapport.xlsx"
+    enregistrer_classeur(wb, str(chemin), workers=1)
+
+    wb = load_workbook(chemin)
+    assert wb.sheetnames == ["STATISTIQUES", "TOUS_2024-01", "TOUS_2024-03", "SHORTLIST"]
+    assert wb["TOUS_2024-03"].max_row == 3
+
+
+def test_classeurs_tous(tmp_path):
+    chemins = exporter_classeurs_tous(table_test(jours(2, "03") + jours(1, "01")), str(tmp_path / "rapport"), "mois", 1)
+    assert [os.path.basename(chemin) for chemin in chemins] == ["rapport_TOUS_2024-01.xlsx", "rapport_TOUS_2024-03.xlsx"]
+    assert [load_workbook(chemin)["TOUS"].max_row for chemin in chemins] == [2, 3]
@@ -0,0 +1,66 @@
+from openpyxl import Workbook, load_workbook
+
+from backend.script_execl.Execl_Flux import enregistrer_classeur, remplacer_feuille
+
+
+def lignes_test(nombre):
+    yield ["FICHIER", "VALEUR", "TEXTE"]
+    for i in range(nombre):
+        yield [f"cdm_{i}.txt", i * 1.5, None if i % 3 else f"ligne {i}"]
+
+
+def classeur_test(nombre):
+    wb = Workbook()
+    wb.active.title = "STATISTIQUES"
+    wb.active["B2"] = "Total"
+    wb.active["C2"] = nombre
+    remplacer_feuille(wb, "TOUS", lignes_test, (nombre,), nombre, formats={1: "0.000"})
+    return wb
+
+
+def test_enregistrer_classeur_relecture(tmp_path):
+    chemin = tmp_path / "rapport.xlsx"
+    enregistrer_classeur(classeur_test(50), str(chemin), workers=1)
+
+    wb = load_workbook(chemin)
+    assert wb.sheetnames == ["STATISTIQUES", "TOUS"]
+    assert wb["STATISTIQUES"]["B2"].value == "Total"
+    assert wb["STATISTIQUES"]["C2"].value == 50
+    lignes = [list(ligne) for ligne in wb["TOUS"].iter_rows(values_only=True)]
+    assert lignes == [list(ligne) for ligne in lignes_test(50)]
+    assert wb["TOUS"]["B2"].number_format == "0.000"
+    assert wb["TOUS"]["A1"].number_format == "General"
+
+
+def test_remplacer_feuille_existante(tmp_path):
+    wb = classeur_test(5)
+    wb.create_sheet("SHORTLIST")["A1"] = "ancien"
+    remplacer_feuille(wb, "SHORTLIST", lignes_test, (2,), 2, index=1)
+    chemin = tmp_path / "rapport.xlsx"
+    enregistrer_classeur(wb, str(chemin), workers=1)
+
+    wb = load_workbook(chemin)
+    assert wb.sheetnames == ["STATISTIQUES", "SHORTLIST", "TOUS"]
+    assert [list(ligne) for ligne in wb["SHORTLIST"].iter_rows(values_only=True)] == \
+        [list(ligne) for ligne in lignes_test(2)]
+
+
+def test_enregistrer_classeur_parallele(tmp_path, monkeypatch):
+    monkeypatch.setattr("backend.script_execl.Execl_Flux.SEUIL_PARALLELE", 10)
+    sequentiel = tmp_path / "sequentiel.xlsx"
+    parallele = tmp_path / "parallele.xlsx"
+
+    wb = classeur_test(200)
+    remplacer_feuille(wb, "SHORTLIST", lignes_test, (30,), 30, formats={1: "0.000"})
+    enregistrer_classeur(wb, str(sequentiel), workers=1)
+    wb = classeur_test(200)
+    remplacer_feuille(wb, "SHORTLIST", lignes_test, (30,), 30, formats={1: "0.000"})
+    enregistrer_classeur(wb, str(parallele), workers=2)
+
+    attendu = load_workbook(sequentiel)
+    obtenu = load_workbook(parallele)
+    assert obtenu.sheetnames == attendu.sheetnames
+    for titre in attendu.sheetnames:
+        cellules_attendues = [[(c.value, c.number_format) for c in ligne] for ligne in attendu[titre].iter_rows()]
+        cellules_obtenues = [[(c.value, c.number_format) for c in ligne] for ligne in obtenu[titre].iter_rows()]
+        assert cellules_obtenues == cellules_attendues
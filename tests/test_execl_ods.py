@@ -0,0 +1,115 @@
+import os
+import zipfile
+from datetime import datetime
+from xml.etree import ElementTree
+
+from openpyxl import load_workbook
+
+from backend.script_execl.Execl_Flux import enregistrer_classeur, remplacer_feuille
+from backend.script_execl.Execl_Ods import MIMETYPE, enregistrer_ods
+
+MODELE = os.path.join(os.path.dirname(__file__), "..", "config", "config_excel.xlsx")
+
+TABLE = "{urn:oasis:names:tc:opendocument:xmlns:table:1.0}"
+OFFICE = "{urn:oasis:names:tc:opendocument:xmlns:office:1.0}"
+TEXTE = "{urn:oasis:names:tc:opendocument:xmlns:text:1.0}"
+
+
+def lignes_test(nombre):
+    yield ["FICHIER", "DISTANCE", "PROBABILITE"]
+    for i in range(nombre):
+        yield [f"cdm_{i}.txt", 100 + i, "1.5E-05" if i % 2 else None]
+
+
+def classeur_test():
+    wb = load_workbook(MODELE)
+    ws = wb.worksheets[0]
+    ws["A60"] = "Texte  avec espaces"
+    ws["B60"] = 12.5
+    ws["C60"] = datetime(2024, 1, 2, 3, 4, 5)
+    remplacer_feuille(wb, "TOUS", lignes_test, (30,), 30, formats={1: "#,##0"})
+    return wb
+
+
+def texte_cellule(cellule):
+    paragraphes = []
+    for paragraphe in cellule.findall(TEXTE + "p"):
+        texte = paragraphe.text or ""
+        for enfant in paragraphe:
+            if enfant.tag == TEXTE + "s":
+                texte += " " * int(enfant.get(TEXTE + "c", "1"))
+            texte += enfant.tail or ""
+        paragraphes.append(texte)
+    return "\n".join(paragraphes)
+
+
+def lire_feuilles_ods(chemin):
+    """Valeurs des cellules de chaque feuille du .ods (formules ignorées : None)."""
+    with zipfile.ZipFile(chemin) as archive:
+        assert archive.namelist()[0] == "mimetype"
+        assert archive.read("mimetype").decode() == MIMETYPE
+        racine = ElementTree.fromstring(archive.read("content.xml"))
+
+    feuilles = {}
+    for table in racine.iter(TABLE + "table"):
+        lignes = []
+        for ligne in table.iter(TABLE + "table-row"):
+            cellules = []
+            for cellule in ligne:
+                type_valeur = cellule.get(OFFICE + "value-type")
+                if cellule.get(TABLE + "formula"):
+                    valeur = None
+                elif type_valeur == "float":
+                    valeur = float(cellule.get(OFFICE + "value"))
+                elif type_valeur == "string":
+                    valeur = texte_cellule(cellule)
+                elif type_valeur == "date":
+                    valeur = datetime.fromisoformat(cellule.get(OFFICE + "date-value"))
+                else:
+                    valeur = None
+                cellules += [valeur] * int(cellule.get(TABLE + "number-columns-repeated", "1"))
+            lignes += [cellules] * int(ligne.get(TABLE + "number-rows-repeated", "1"))
+        feuilles[table.get(TABLE + "name")] = lignes
+    return feuilles
+
+
+def valeurs_xlsx(ws):
+    """Valeurs des cellules de la feuille (formules ignorées : None)."""
+    return [[None if isinstance(valeur, str) and valeur.startswith("=") else valeur for valeur in ligne]
+            for ligne in ws.iter_rows(values_only=True)]
+
+
+def sans_vides(lignes):
+    lignes = [list(ligne) for ligne in lignes]
+    for ligne in lignes:
+        while ligne and ligne[-1] is None:
+            ligne.pop()
+    while lignes and not lignes[-1]:
+        lignes.pop()
+    return lignes
+
+
+def normaliser(valeur):
+    if isinstance(valeur, (int, float)) and not isinstance(valeur, bool):
+        return float(valeur)
+    return valeur
+
+
+def test_ods_identique_au_xlsx(tmp_path):
+    chemin_xlsx = tmp_path / "rapport.xlsx"
+    chemin_ods = tmp_path / "rapport.ods"
+    enregistrer_classeur(classeur_test(), str(chemin_xlsx), workers=1)
+    enregistrer_ods(classeur_test(), str(chemin_ods), workers=1)
+
+    xlsx = load_workbook(chemin_xlsx)
+    ods = lire_feuilles_ods(chemin_ods)
+    assert list(ods) == xlsx.sheetnames
+    for titre in xlsx.sheetnames:
+        attendu = [[normaliser(v) for v in ligne] for ligne in sans_vides(valeurs_xlsx(xlsx[titre]))]
+        obtenu = [[normaliser(v) for v in ligne] for ligne in sans_vides(ods[titre])]
+        assert obtenu == attendu, titre
+
+    tous = sans_vides(ods["TOUS"])
+    assert len(tous) == 31
+    assert tous[1:3] == [["cdm_0.txt", 100.0], ["cdm_1.txt", 101.0, "1.5E-05"]]
+    assert ods[xlsx.sheetnames[0]][59][:3] == ["Texte  avec espaces", 12.5, datetime(2024, 1, 2, 3, 4, 5)]
@@ -0,0 +1,20 @@
+import pytest
+
+pytest.importorskip("matplotlib")
+
+from backend.script_graphique.generateur_graphique import rendre_graphiques
+
+
+def test_rendu_parallele_de_deux_graphiques(tmp_path):
+    graphiques = [
+        {"chemin": str(tmp_path / "pays.png"), "labels": ["FRA", "USA"], "tailles": [3, 5], "titre": "Pays"},
+        {"chemin": str(tmp_path / "sous" / "probabilite.png"), "labels": ["≥1E-4", "≤1E-8"], "tailles": [1, 9],
+         "titre": "Collision_Prob", "taille_figure": (12, 8), "legende": True},
+    ]
+
+    chemins = rendre_graphiques(graphiques, workers=2)
+
+    assert chemins == [graphique["chemin"] for graphique in graphiques]
+    for chemin in chemins:
+        with open(chemin, 'rb') as image:
+            assert image.read(8) == b"\x89PNG\r\n\x1a\n"
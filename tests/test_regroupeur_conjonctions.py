@@ -0,0 +1,98 @@
+import numpy as np
+import pytest
+
+from backend.script_extraction.CDMEpoch import EPOQUE_ABSENTE
+from backend.script_extraction.Conjonction import ConjunctionAnalyzer
+from backend.script_extraction.RegroupeurConjonctions import RegroupeurConjonctions
+
+HEURE = 3600 * 10**9
+
+
+def test_creation_et_rattachement():
+    regroupeur = RegroupeurConjonctions()
+    assert regroupeur.ajouter("a.txt", "40001", 0) == 1
+    # À moins de 24 h : même événement
+    assert regroupeur.ajouter("b.txt", "40001", 20 * HEURE) == 1
+    # Trop loin, ou autre objet : nouvel événement
+    assert regroupeur.ajouter("c.txt", "40001", 100 * HEURE) == 2
+    assert regroupeur.ajouter("d.txt", "40002 DEB", 10 * HEURE) == 3
+    assert regroupeur.evenements() == {1: {"a.txt", "b.txt"}, 2: {"c.txt"}, 3: {"d.txt"}}
+
+
+def test_fusion_garde_le_plus_petit_identifiant():
+    regroupeur = RegroupeurConjonctions()
+    regroupeur.ajouter("a.txt", "40001", 100 * HEURE)
+    regroupeur.ajouter("b.txt", "40001", 60 * HEURE)
+    assert regroupeur.evenement("b.txt") == 2
+
+    # Proche des deux : les événements fusionnent sous l'identifiant 1
+    assert regroupeur.ajouter("c.txt", "40001", 80 * HEURE) == 1
+    assert regroupeur.evenements() == {1: {"a.txt", "b.txt", "c.txt"}}
+    assert regroupeur.resoudre(2) == 1
+    assert regroupeur.resoudre(1) == 1
+
+
+def test_identifiants_stables():
+    regroupeur = RegroupeurConjonctions()
+    rng = np.random.default_rng(3)
+    identifiants = {}
+    for numero, epoque in enumerate(rng.integers(0, 2000, 200).tolist()):
+        fichier = f"cdm_{numero}.txt"
+        identifiants[fichier] = regroupeur.ajouter(fichier, str(40000 + numero % 4), epoque * HEURE)
+
+        # Chaque CDM déjà ajouté reste dans l'événement reçu (ou celui qui l'a absorbé)
+        for deja, identifiant in identifiants.items():
+            assert regroupeur.evenement(deja) == regroupeur.resoudre(identifiant)
+
+
+def test_evenements_sont_les_composantes():
+    rng = np.random.default_rng(7)
+    epoques = np.sort(rng.integers(0, 500, 60)) * HEURE
+    fichiers = [f"cdm_{numero:02d}.txt" for numero in range(len(epoques))]
+
+    regroupeur = RegroupeurConjonctions()
+    for indice in rng.permutation(len(epoques)).tolist():
+        regroupeur.ajouter(fichiers[indice], "40001", int(epoques[indice]))
+
+    # Fichiers dans l'ordre chronologique : mêmes groupes que le rapport
+    analyseur = ConjunctionAnalyzer.__new__(ConjunctionAnalyzer)
+    attendus = [groupe for _, groupe in analyseur._group_designator(fichiers, epoques, regroupeur.fenetre)]
+    assert sorted(map(sorted, regroupeur.groupes().values())) == sorted(map(sorted, attendus))
+
+
+def test_ordre_du_dossier_non_chronologique():
+    fichiers = [f"f{numero}" for numero in range(6)]
+    epoques = np.array([70, 25, 64, 52, 62, 45]) * HEURE
+
+    regroupeur = RegroupeurConjonctions()
+    for fichier, epoque in zip(fichiers, epoques.tolist()):
+        regroupeur.ajouter(fichier, "40001", epoque)
+    assert list(regroupeur.groupes().values()) == [set(fichiers)]
+
+    analyseur = ConjunctionAnalyzer.__new__(ConjunctionAnalyzer)
+    assert [groupe for _, groupe in analyseur._group_designator(fichiers, epoques, regroupeur.fenetre)] == [
+        {"f0", "f2", "f3", "f4", "f5"}, {"f1", "f5"}]
+
+
+def test_fichier_deja_ajoute():
+    regroupeur = RegroupeurConjonctions()
+    regroupeur.ajouter("a.txt", "40001", 0)
+    with pytest.raises(ValueError):
+        regroupeur.ajouter("a.txt", "40001", HEURE)
+
+
+def test_epoque_absente_et_designateur_sans_numero():
+    regroupeur = RegroupeurConjonctions()
+    regroupeur.ajouter("a.txt", "40001", 0)
+    # Date illisible : événement à lui seul, jamais rejoint
+    assert regroupeur.ajouter("b.txt", "40001", EPOQUE_ABSENTE) == 2
+    assert regroupeur.ajouter("c.txt", "40001", HEURE) == 1
+    assert regroupeur.evenements() == {1: {"a.txt", "c.txt"}, 2: {"b.txt"}}
+    assert regroupeur.groupes() == {1: {"a.txt", "c.txt"}}
+
+    # Seul CDM daté de son objet : groupe d'un CDM
+    regroupeur.ajouter("d.txt", "40002", EPOQUE_ABSENTE)
+    assert regroupeur.groupes()[3] == {"d.txt"}
+
+    assert regroupeur.ajouter("e.txt", "UNKNOWN", 0) is None
+    assert regroupeur.evenement("e.txt") is None